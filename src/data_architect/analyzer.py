@@ -0,0 +1,552 @@
+"""Static analysis of generated SQL for load efficiency.
+
+Every statement generated for a spec is parsed and qualified with the
+SQLGlot optimizer against the schema of the generated tables, then checked
+by a set of rules:
+
+- ``implicit-conversion``: a staging column whose declared type differs from
+  the column it is inserted into or joined with, so every row is converted
+  (and joins cannot seek an index on the converted side)
+- ``non-sargable-predicate``: a join or filter condition wrapping a column in
+  a function, cast or arithmetic, which rules out index seeks on it
+- ``missing-unique-key``: an ON CONFLICT or MERGE target without a primary
+  key, unique constraint or unique index on its match columns
+- ``staging-full-scan``: a load reading a whole staging table instead of an
+  incremental window or change feed
+
+Files SQLGlot cannot parse back are reported as ``unparsed-sql`` and skipped.
+
+Findings carry a severity so CI can fail on regressions (see
+AnalysisReport.fails).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+import sqlglot as sg
+import sqlglot.expressions as sge
+from sqlglot.errors import ParseError, SqlglotError
+from sqlglot.optimizer.qualify import qualify
+
+from data_architect.generation.columns import build_column_type
+from data_architect.generation.ddl import generate_all_ddl, identity_types
+from data_architect.generation.dml import (
+    generate_all_dml,
+    knot_value_column,
+    staging_value_column,
+)
+from data_architect.generation.migrate import is_widening
+from data_architect.generation.naming import (
+    LOAD_CONTROL_TABLE,
+    anchor_table_name,
+    attribute_table_name,
+    attribute_value_column,
+    knot_table_name,
+    nexus_table_name,
+    staging_table_name,
+    tie_table_name,
+)
+from data_architect.models.anchor import Anchor
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+    from data_architect.models.spec import Nexus, Spec
+
+
+class Severity(StrEnum):
+    """Severity of a finding, from most to least severe."""
+
+    ERROR = "error"
+    WARNING = "warning"
+    INFO = "info"
+
+
+_RANKS = {Severity.ERROR: 3, Severity.WARNING: 2, Severity.INFO: 1}
+
+
+@dataclass(frozen=True)
+class Finding:
+    """One rule violation.
+
+    Attributes:
+        rule: Rule identifier (e.g. "non-sargable-predicate")
+        severity: How much the violation costs
+        location: Generated file (or staging column) the finding is about
+        message: Human-readable description
+        statement: Index of the statement within the file, if any
+    """
+
+    rule: str
+    severity: Severity
+    location: str
+    message: str
+    statement: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the finding as a JSON-serializable dictionary."""
+        return {
+            "rule": self.rule,
+            "severity": self.severity.value,
+            "location": self.location,
+            "statement": self.statement,
+            "message": self.message,
+        }
+
+
+@dataclass(frozen=True)
+class AnalysisReport:
+    """Findings of one analysis run, sorted by severity then location."""
+
+    dialect: str
+    files: int
+    statements: int
+    findings: list[Finding] = field(default_factory=list)
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of findings per severity."""
+        return {
+            severity.value: sum(1 for f in self.findings if f.severity == severity)
+            for severity in Severity
+        }
+
+    def fails(self, threshold: Severity) -> bool:
+        """Return True if any finding is at least as severe as the threshold."""
+        return any(_RANKS[f.severity] >= _RANKS[threshold] for f in self.findings)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+        return {
+            "dialect": self.dialect,
+            "files": self.files,
+            "statements": self.statements,
+            "counts": self.counts(),
+            "findings": [finding.to_dict() for finding in self.findings],
+        }
+
+
+@dataclass
+class _Schema:
+    """Column types and unique keys of the generated tables."""
+
+    columns: dict[str, dict[str, str]] = field(default_factory=dict)
+    keys: dict[str, list[frozenset[str]]] = field(default_factory=dict)
+
+
+def _parse(sql: str, dialect: str) -> list[sge.Expression]:
+    """Parse a generated file, skipping transaction control statements.
+
+    T-SQL DDL guarded by IF NOT EXISTS (...) EXEC('...') is unwrapped to the
+    statement it executes.
+    """
+    statements = []
+    for statement in sg.parse(sql, dialect=dialect):
+        if statement is None or isinstance(statement, (sge.Transaction, sge.Commit)):
+            continue
+        executed = statement.args.get("true")
+        if (
+            isinstance(statement, sge.If)
+            and isinstance(executed, sge.Anonymous)
+            and executed.name.upper() == "EXEC"
+            and isinstance(executed.expressions[0], sge.Literal)
+        ):
+            statements.extend(_parse(executed.expressions[0].this, dialect))
+        else:
+            statements.append(statement)
+    return statements
+
+
+def _collect_schema(statement: sge.Expression, schema: _Schema) -> None:
+    """Record the columns and unique keys a DDL statement creates."""
+    if not isinstance(statement, sge.Create):
+        return
+    if statement.kind == "INDEX" and statement.args.get("unique"):
+        index = statement.this
+        table = index.args.get("table")
+        params = index.args.get("params")
+        if isinstance(table, sge.Table) and params is not None:
+            key = frozenset(col.name for col in params.find_all(sge.Column))
+            schema.keys.setdefault(table.name, []).append(key)
+        return
+    if statement.kind != "TABLE" or not isinstance(statement.this, sge.Schema):
+        return
+
+    table = statement.this.this.name
+    columns = schema.columns.setdefault(table, {})
+    keys = schema.keys.setdefault(table, [])
+    for expression in statement.this.expressions:
+        if isinstance(expression, sge.ColumnDef):
+            if expression.kind is not None:
+                columns[expression.name] = expression.kind.sql()
+            if any(
+                isinstance(
+                    constraint.kind,
+                    (sge.PrimaryKeyColumnConstraint, sge.UniqueColumnConstraint),
+                )
+                for constraint in expression.constraints
+            ):
+                keys.append(frozenset({expression.name}))
+        elif isinstance(expression, sge.PrimaryKey):
+            keys.append(frozenset(col.name for col in expression.expressions))
+
+
+def _qualified(
+    statement: sge.Expression, schema: Mapping[str, Mapping[str, str]], dialect: str
+) -> sge.Expression:
+    """Qualify a statement's columns with their tables where resolvable.
+
+    Staging tables may declare only some of their columns, so qualification
+    that fails against the full schema is retried against the target tables
+    only, then skipped.
+    """
+    for candidate in (schema, {}):
+        try:
+            return qualify(
+                statement.copy(),
+                schema=dict(candidate),
+                dialect=dialect,
+                validate_qualify_columns=False,
+                quote_identifiers=False,
+                identify=False,
+            )
+        except SqlglotError:
+            continue
+    return statement
+
+
+# ============================================================================
+# Statement rules
+# ============================================================================
+
+_COMPARISONS = (sge.EQ, sge.NEQ, sge.GT, sge.GTE, sge.LT, sge.LTE, sge.Like)
+_WRAPPERS = (sge.Func, sge.Cast, sge.Binary)
+
+
+def _predicates(statement: sge.Expression) -> Iterator[sge.Expression]:
+    """Yield the join, filter and MERGE match conditions of a statement."""
+    for node in statement.walk():
+        if isinstance(node, sge.Where):
+            yield node.this
+        elif isinstance(node, (sge.Join, sge.Merge)) and node.args.get("on"):
+            yield node.args["on"]
+
+
+def _check_sargable(statement: sge.Expression, file: str, index: int) -> list[Finding]:
+    """Flag comparisons applying a function, cast or arithmetic to a column."""
+    findings = []
+    seen: set[str] = set()
+    for predicate in _predicates(statement):
+        for comparison in predicate.find_all(*_COMPARISONS):
+            for side in (comparison.this, comparison.expression):
+                if not isinstance(side, _WRAPPERS) or isinstance(side, _COMPARISONS):
+                    continue
+                column = side.find(sge.Column)
+                if column is None:
+                    continue
+                condition = comparison.sql()
+                if condition in seen:
+                    continue
+                seen.add(condition)
+                findings.append(
+                    Finding(
+                        rule="non-sargable-predicate",
+                        severity=Severity.WARNING,
+                        location=file,
+                        statement=index,
+                        message=(
+                            f"Condition {condition} wraps column {column.sql()} "
+                            "in an expression, so no index on it can be used"
+                        ),
+                    )
+                )
+    return findings
+
+
+def _merge_columns(merge: sge.Merge) -> set[str]:
+    """Return the target columns a MERGE matches on with equalities."""
+    target = merge.this
+    alias = target.alias_or_name if isinstance(target, sge.Table) else ""
+    columns = set()
+    for equality in merge.args["on"].find_all(sge.EQ):
+        for side in (equality.this, equality.expression):
+            if isinstance(side, sge.Column) and side.table in (alias, ""):
+                columns.add(side.name)
+    return columns
+
+
+def _check_unique_key(
+    statement: sge.Expression, file: str, index: int, schema: _Schema
+) -> list[Finding]:
+    """Flag upsert targets without a unique key on their match columns."""
+    if isinstance(statement, sge.Insert) and statement.args.get("conflict"):
+        conflict = statement.args["conflict"]
+        table = statement.find(sge.Table)
+        columns = {col.name for col in conflict.args.get("conflict_keys") or []}
+        # ON CONFLICT needs a unique index on exactly the conflict target
+        supported = frozenset(columns) in schema.keys.get(
+            table.name if table else "", []
+        )
+        severity = Severity.ERROR
+        clause = "ON CONFLICT"
+    elif isinstance(statement, sge.Merge) and statement.args.get("on"):
+        table = statement.this if isinstance(statement.this, sge.Table) else None
+        columns = _merge_columns(statement)
+        # A unique key within the match columns finds the row with a seek
+        supported = any(
+            key <= columns for key in schema.keys.get(table.name if table else "", [])
+        )
+        severity = Severity.WARNING
+        clause = "MERGE"
+    else:
+        return []
+
+    if table is None or table.name not in schema.columns or supported:
+        return []
+    return [
+        Finding(
+            rule="missing-unique-key",
+            severity=severity,
+            location=file,
+            statement=index,
+            message=(
+                f"{clause} target {table.name} has no primary key or unique "
+                f"index on ({', '.join(sorted(columns))})"
+            ),
+        )
+    ]
+
+
+def _full_scans(statement: sge.Expression, staging_tables: set[str]) -> set[str]:
+    """Return the staging tables a statement reads without a load window."""
+    tables = {table.name for table in statement.find_all(sge.Table)}
+    if LOAD_CONTROL_TABLE in tables:
+        return set()
+    return tables & staging_tables
+
+
+# ============================================================================
+# Spec rules
+# ============================================================================
+
+
+def _conversion(
+    source: str,
+    source_type: str,
+    target: str,
+    target_type: str,
+    dialect: str,
+    joined: bool = False,
+) -> Finding | None:
+    """Describe the conversion of a staging column into a target column."""
+    source_dt = build_column_type(source_type, dialect)
+    target_dt = build_column_type(target_type, dialect)
+    if source_dt.this == target_dt.this:
+        return None
+    source_sql = source_dt.sql(dialect=dialect)
+    target_sql = target_dt.sql(dialect=dialect)
+    if joined:
+        return Finding(
+            rule="implicit-conversion",
+            severity=Severity.WARNING,
+            location=source,
+            message=(
+                f"{source} ({source_sql}) is joined with {target} "
+                f"({target_sql}); one side is converted per row"
+            ),
+        )
+    lossless = is_widening(source_type, target_type, dialect)
+    return Finding(
+        rule="implicit-conversion",
+        severity=Severity.INFO if lossless else Severity.WARNING,
+        location=source,
+        message=(
+            f"{source} ({source_sql}) is inserted into {target} ({target_sql})"
+            + (" (lossless)" if lossless else "; every row is converted")
+        ),
+    )
+
+
+def _check_conversions(spec: Spec, dialect: str) -> list[Finding]:
+    """Compare declared staging column types with the columns they load."""
+    knots = {knot.mnemonic: knot for knot in spec.knots}
+    identities = identity_types(spec)
+    # (staging column, declared type, target column, target type, joined)
+    pairs: list[tuple[str, str, str, str, bool]] = []
+
+    owners: list[Anchor | Nexus] = [*spec.anchors, *spec.nexuses]
+    for owner in owners:
+        table = (
+            anchor_table_name(owner)
+            if isinstance(owner, Anchor)
+            else nexus_table_name(owner)
+        )
+        for mapping in owner.staging_mappings:
+            stg = staging_table_name(mapping)
+            declared = {col.name: col.type for col in mapping.columns}
+            targets = {f"{owner.mnemonic}_ID": (table, owner.identity)}
+            if isinstance(owner, Anchor) and owner.keymap:
+                targets = {}  # Identities come from the key map
+            for role in getattr(owner, "roles", []):
+                targets[f"{role.type_}_ID_{role.role}"] = (
+                    table,
+                    identities.get(role.type_, "bigint"),
+                )
+            for column, (target_table, target_type) in targets.items():
+                if column in declared:
+                    pairs.append(
+                        (
+                            f"{stg}.{column}",
+                            declared[column],
+                            f"{target_table}.{column}",
+                            target_type,
+                            False,
+                        )
+                    )
+            for attr in owner.attributes:
+                attr_table = attribute_table_name(owner, attr)
+                knot = knots.get(attr.knot_range or "")
+                knot_column = knot_value_column(owner, attr, mapping)
+                if knot is not None and knot_column is not None:
+                    # Knot values are joined with the knot to resolve knot IDs
+                    column = knot_column
+                    target = f"{knot_table_name(knot)}.{knot_table_name(knot)}"
+                    target_type = knot.data_range
+                    joined = True
+                else:
+                    column = staging_value_column(owner, attr, mapping)
+                    target = f"{attr_table}.{attribute_value_column(owner, attr)}"
+                    target_type = attr.data_range or (
+                        knot.identity if knot else "bigint"
+                    )
+                    joined = False
+                if column in declared:
+                    pairs.append(
+                        (
+                            f"{stg}.{column}",
+                            declared[column],
+                            target,
+                            target_type,
+                            joined,
+                        )
+                    )
+
+    for tie in spec.ties:
+        for tie_mapping in tie.staging_mappings:
+            declared = {col.name: col.type for col in tie_mapping.columns}
+            for role in tie.roles:
+                column = f"{role.type_}_ID_{role.role}"
+                if column in declared and role.role not in (
+                    tie_mapping.natural_key_columns
+                ):
+                    pairs.append(
+                        (
+                            f"{staging_table_name(tie_mapping)}.{column}",
+                            declared[column],
+                            f"{tie_table_name(tie)}.{column}",
+                            identities.get(role.type_, "bigint"),
+                            False,
+                        )
+                    )
+
+    findings = []
+    for source, source_type, target, target_type, joined in pairs:
+        finding = _conversion(source, source_type, target, target_type, dialect, joined)
+        if finding is not None:
+            findings.append(finding)
+    return findings
+
+
+def analyze_spec(
+    spec: Spec, dialect: str, consolidate: bool = False, fanout: bool = False
+) -> AnalysisReport:
+    """Analyze all DDL and DML generated for a spec.
+
+    Args:
+        spec: Top-level Spec model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        consolidate: Analyze consolidated multi-source loads
+        fanout: Analyze fan-out loads (one scan per staging table)
+
+    Returns:
+        AnalysisReport with findings sorted by severity, then location
+    """
+    ddl = generate_all_ddl(spec, dialect)
+    dml = generate_all_dml(spec, dialect, consolidate=consolidate, fanout=fanout)
+
+    findings: list[Finding] = []
+    parsed: dict[str, list[sge.Expression]] = {}
+    for filename, sql in {**ddl, **dml}.items():
+        try:
+            parsed[filename] = _parse(sql, dialect)
+        except ParseError as e:
+            findings.append(
+                Finding(
+                    rule="unparsed-sql",
+                    severity=Severity.INFO,
+                    location=filename,
+                    message=(
+                        "Skipped; SQLGlot cannot parse it back: "
+                        f"{e.errors[0]['description']}"
+                    ),
+                )
+            )
+
+    schema = _Schema()
+    statements = 0
+    for filename in ddl:
+        for statement in parsed.get(filename, []):
+            statements += 1
+            _collect_schema(statement, schema)
+
+    owners: list[Anchor | Nexus] = [*spec.anchors, *spec.nexuses]
+    staging_tables = {
+        staging_table_name(mapping)
+        for owner in owners
+        for mapping in owner.staging_mappings
+        if mapping.cdc is None
+    } | {
+        staging_table_name(mapping)
+        for tie in spec.ties
+        for mapping in tie.staging_mappings
+    }
+
+    findings += _check_conversions(spec, dialect)
+    scans: dict[str, list[tuple[str, int]]] = {}
+    for filename in dml:
+        for index, statement in enumerate(parsed.get(filename, [])):
+            statements += 1
+            qualified = _qualified(statement, schema.columns, dialect)
+            findings += _check_sargable(qualified, filename, index)
+            findings += _check_unique_key(statement, filename, index, schema)
+            for table in _full_scans(statement, staging_tables):
+                scans.setdefault(table, []).append((filename, index))
+
+    for table, readers in scans.items():
+        files = sorted({filename for filename, _ in readers})
+        for filename, index in readers:
+            findings.append(
+                Finding(
+                    rule="staging-full-scan",
+                    severity=Severity.WARNING if len(files) > 1 else Severity.INFO,
+                    location=filename,
+                    statement=index,
+                    message=(
+                        f"Reads all of {table} (scanned in full by {len(files)} "
+                        "load file(s)); a watermark_column loads increments"
+                        + (", --fan-out shares one scan" if len(files) > 1 else "")
+                    ),
+                )
+            )
+
+    findings.sort(
+        key=lambda f: (-_RANKS[f.severity], f.location, f.statement or 0, f.rule)
+    )
+    return AnalysisReport(
+        dialect=dialect,
+        files=len(ddl) + len(dml),
+        statements=statements,
+        findings=findings,
+    )
@@ -0,0 +1,636 @@
+"""Load benchmarks: generated SQL run over synthetic staging batches.
+
+The generated DDL is built in a local engine (DuckDB or sqlite), staging
+tables are filled with synthetic rows and the generated DML runs for several
+consecutive batches, once per load pattern (default, consolidated, fan-out).
+Every load file is timed and the row counts of anchors, attributes and knots
+are checked against the counts the batches imply.
+
+Synthetic values depend only on a row's key, batch and target attribute, so
+the sources of a multi-source anchor deliver overlapping, agreeing rows. The
+first batch delivers every key; later batches re-deliver a share of the keys
+(the change rate) with new values and a later changed_at.
+
+Reports serialize to JSON baselines; compare_baseline lists the loads that
+became slower or stopped loading correct row counts.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Protocol, cast
+
+import sqlglot as sg
+import sqlglot.expressions as sge
+from sqlglot.errors import SqlglotError
+
+from data_architect.generation.columns import build_column_type
+from data_architect.generation.ddl import generate_all_ddl
+from data_architect.generation.dependencies import (
+    build_asset_dependencies,
+    build_dependency_graph,
+    file_node,
+)
+from data_architect.generation.dml import (
+    allows_restatements,
+    generate_all_dml,
+    knot_value_column,
+    staging_value_column,
+)
+from data_architect.generation.naming import (
+    anchor_table_name,
+    attribute_table_name,
+    knot_table_name,
+    materialized_view_name,
+    staging_table_name,
+)
+from data_architect.generation.views import generate_all_views
+from data_architect.runner import run_phases
+from data_architect.synth import KNOT_DOMAIN, classify_columns, column_kind
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+
+    from data_architect.models.knot import Knot
+    from data_architect.models.spec import Spec
+    from data_architect.runner import Connection
+
+LOAD_PATTERNS = ("default", "consolidate", "fanout")
+
+DDL_FILE = "(ddl)"  # LoadTiming.file of a pattern whose DDL failed
+
+_EPOCH = datetime(2024, 1, 1)  # changed_at of the first batch
+
+
+class _QueryCursor(Protocol):
+    """DB-API cursor used to fill staging and count rows."""
+
+    def execute(self, operation: str, /) -> object:
+        """Execute one SQL statement."""
+
+    def executemany(self, operation: str, parameters: Sequence[Any], /) -> object:
+        """Execute one SQL statement for each parameter tuple."""
+
+    def fetchone(self) -> Sequence[Any] | None:
+        """Fetch the next result row."""
+
+
+@dataclass(frozen=True)
+class LoadTiming:
+    """Execution of one generated load file for one batch.
+
+    Attributes:
+        pattern: Load pattern ("default", "consolidate" or "fanout")
+        batch: Batch number, starting at 0
+        file: Generated DML file name
+        seconds: Total execution time of the file's statements
+        staged_rows: Batch rows in the staging tables the file reads
+        error: Error message if the file failed
+    """
+
+    pattern: str
+    batch: int
+    file: str
+    seconds: float
+    staged_rows: int
+    error: str | None = None
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return staged rows processed per second (0 when none)."""
+        return self.staged_rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class RowCountCheck:
+    """Row count of a loaded table compared with the count the batches imply."""
+
+    pattern: str
+    batch: int
+    table: str
+    expected: int
+    actual: int
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the table holds the expected number of rows."""
+        return self.expected == self.actual
+
+
+@dataclass(frozen=True)
+class BenchReport:
+    """Timings and row-count checks of a benchmark run."""
+
+    engine: str
+    dialect: str
+    rows: int
+    batches: int
+    change_rate: float
+    loads: list[LoadTiming] = field(default_factory=list)
+    checks: list[RowCountCheck] = field(default_factory=list)
+
+    @property
+    def built(self) -> bool:
+        """Return True if the DDL of every pattern ran."""
+        return all(load.file != DDL_FILE for load in self.loads)
+
+    @property
+    def ok(self) -> bool:
+        """Return True if every load ran and every row count matched."""
+        return all(load.error is None for load in self.loads) and all(
+            check.ok for check in self.checks
+        )
+
+    def summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Aggregate the batches of each load file.
+
+        Returns:
+            {pattern: {file: {"seconds", "staged_rows", "rows_per_second"}}}
+        """
+        summary: dict[str, dict[str, dict[str, float]]] = {}
+        for load in self.loads:
+            totals = summary.setdefault(load.pattern, {}).setdefault(
+                load.file, {"seconds": 0.0, "staged_rows": 0}
+            )
+            totals["seconds"] += load.seconds
+            totals["staged_rows"] += load.staged_rows
+        for files in summary.values():
+            for totals in files.values():
+                seconds = totals["seconds"]
+                totals["rows_per_second"] = (
+                    totals["staged_rows"] / seconds if seconds > 0 else 0.0
+                )
+        return summary
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable baseline."""
+        return {
+            "engine": self.engine,
+            "dialect": self.dialect,
+            "rows": self.rows,
+            "batches": self.batches,
+            "change_rate": self.change_rate,
+            "ok": self.ok,
+            "summary": self.summary(),
+            "loads": [
+                {
+                    "pattern": load.pattern,
+                    "batch": load.batch,
+                    "file": load.file,
+                    "seconds": load.seconds,
+                    "staged_rows": load.staged_rows,
+                    "rows_per_second": load.rows_per_second,
+                    "error": load.error,
+                }
+                for load in self.loads
+            ],
+            "checks": [
+                {
+                    "pattern": check.pattern,
+                    "batch": check.batch,
+                    "table": check.table,
+                    "expected": check.expected,
+                    "actual": check.actual,
+                    "ok": check.ok,
+                }
+                for check in self.checks
+            ],
+        }
+
+
+def compare_baseline(
+    report: BenchReport,
+    baseline: Mapping[str, Any],
+    tolerance: float = 0.25,
+    min_seconds: float = 0.005,
+) -> list[str]:
+    """List the loads that regressed against a baseline report.
+
+    A load regresses when its total time grows by more than the tolerance
+    (and by more than min_seconds, which absorbs timer noise on tiny loads),
+    or when a row count the baseline got right is now wrong.
+
+    Args:
+        report: Report of the current run
+        baseline: Report dictionary of an earlier run (see to_dict)
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+        min_seconds: Slowdowns below this many seconds are ignored
+
+    Returns:
+        One message per regression, empty if there is none
+    """
+    regressions = []
+    previous = baseline.get("summary", {})
+    for pattern, files in report.summary().items():
+        for file, totals in sorted(files.items()):
+            before = previous.get(pattern, {}).get(file)
+            if before is None:
+                continue
+            slower = totals["seconds"] - before["seconds"]
+            if slower > min_seconds and slower > before["seconds"] * tolerance:
+                regressions.append(
+                    f"{pattern}/{file}: {totals['seconds']:.3f}s, was "
+                    f"{before['seconds']:.3f}s"
+                )
+
+    correct = {
+        (check["pattern"], check["batch"], check["table"])
+        for check in baseline.get("checks", [])
+        if check["ok"]
+    }
+    regressions += [
+        f"{check.pattern}/{check.table} (batch {check.batch}): "
+        f"{check.actual} rows, expected {check.expected}"
+        for check in report.checks
+        if not check.ok and (check.pattern, check.batch, check.table) in correct
+    ]
+    return regressions
+
+
+# ============================================================================
+# Synthetic Data
+# ============================================================================
+
+
+def _timestamp(kind: str, version: int) -> object:
+    """Return the changed_at (or watermark) value of a batch."""
+    if kind in ("integer", "number"):
+        return version + 1
+    moment = _EPOCH + timedelta(days=version)
+    return moment.date().isoformat() if kind == "date" else moment.isoformat(" ")
+
+
+def _value(kind: str, seed: str, key: int, version: int) -> object:
+    """Return the synthetic value of an attribute for a key and batch."""
+    if kind in ("date", "time"):
+        return _timestamp(kind, key % 1000 + version)
+    if kind == "integer":
+        return (key * 7 + version) % 30000
+    if kind == "number":
+        return round(key * 1.5 + version, 2)
+    if kind == "boolean":
+        return (key + version) % 2 == 0
+    return f"{seed}-{key}-{version}"
+
+
+def _knot_value(kind: str, knot: Knot, index: int) -> object:
+    """Return the value with the given index in a knot's synthetic domain."""
+    if kind in ("integer", "number"):
+        return index + 1
+    return f"{knot.descriptor}-{index + 1}"
+
+
+def _batch_keys(
+    rows: int, batches: int, change_rate: float, seed: int
+) -> list[list[int]]:
+    """Pick the keys each batch delivers: all of them, then a changed share."""
+    rng = random.Random(seed)  # noqa: S311 - reproducible, not secret
+    changed = min(rows, round(rows * change_rate))
+    return [list(range(rows))] + [
+        sorted(rng.sample(range(rows), changed)) for _ in range(1, batches)
+    ]
+
+
+class _Expected:
+    """Row counts the batches delivered so far imply per target table."""
+
+    def __init__(self) -> None:
+        self.identities: dict[str, set[object]] = {}
+        self.static: dict[str, set[object]] = {}
+        self.versions: dict[str, dict[object, dict[int, object]]] = {}
+        self.restatable: dict[str, bool] = {}
+        self.knots: dict[str, set[object]] = {}
+
+    def counts(self) -> dict[str, int]:
+        """Return the expected row count per table."""
+        counts = {table: len(ids) for table, ids in self.identities.items()}
+        counts.update({table: len(ids) for table, ids in self.static.items()})
+        counts.update({table: len(values) for table, values in self.knots.items()})
+        for table, histories in self.versions.items():
+            total = 0
+            for history in histories.values():
+                previous: object = None
+                for version in sorted(history):
+                    if self.restatable[table] or history[version] != previous:
+                        total += 1
+                    previous = history[version]
+            counts[table] = total
+        return counts
+
+
+def _fill_batch(
+    spec: Spec,
+    keys: list[int],
+    version: int,
+    dialect: str,
+    expected: _Expected,
+) -> dict[str, tuple[list[str], list[tuple[object, ...]]]]:
+    """Build the staging rows of one batch and record what they load.
+
+    Returns:
+        {staging table: (column names, rows)}
+    """
+    knots = {knot.mnemonic: knot for knot in spec.knots}
+    staged: dict[str, tuple[list[str], list[tuple[object, ...]]]] = {}
+
+    # Knots without staged values read stg_{knot}: the whole domain each batch
+    knot_valued = {
+        attr.knot_range
+        for anchor in spec.anchors
+        for mapping in anchor.staging_mappings
+        for attr in anchor.attributes
+        if knot_value_column(anchor, attr, mapping) is not None
+    }
+    for knot in spec.knots:
+        if knot.mnemonic in knot_valued:
+            continue
+        kind = column_kind(knot.data_range, dialect)
+        identity_kind = column_kind(knot.identity, dialect)
+        table = knot_table_name(knot)
+        domain: list[tuple[object, ...]] = [
+            (
+                index + 1 if identity_kind == "integer" else str(index + 1),
+                _knot_value(kind, knot, index),
+            )
+            for index in range(KNOT_DOMAIN)
+        ]
+        staged[f"stg_{table}"] = ([f"{knot.mnemonic}_ID", table], domain)
+        expected.knots.setdefault(table, set()).update(v for _, v in domain)
+
+    for anchor in spec.anchors:
+        for mapping in anchor.staging_mappings:
+            if mapping.source is not None or mapping.cdc is not None:
+                continue  # Files and change feeds are not staged by the harness
+            columns = classify_columns(anchor, mapping, dialect)
+            names = {column.name for column in columns}
+            declared = {column.role for column in columns}
+            rows = []
+            for key in keys:
+                row: dict[str, object] = {}
+                for column in columns:
+                    if column.role == "key":
+                        row[column.name] = (
+                            key + 1 if column.kind == "integer" else f"K{key + 1}"
+                        )
+                    elif column.role == "identity":
+                        row[column.name] = (
+                            key + 1 if column.kind == "integer" else str(key + 1)
+                        )
+                    elif column.role == "timestamp":
+                        row[column.name] = _timestamp(column.kind, version)
+                    elif column.role == "knot":
+                        knot = knots[column.knot]
+                        index = (key + version) % KNOT_DOMAIN
+                        row[column.name] = _knot_value(column.kind, knot, index)
+                    elif column.role == "value" and column.knot:
+                        # Staged knot IDs stay within the knot's domain
+                        index = (key + version) % KNOT_DOMAIN
+                        row[column.name] = (
+                            index + 1 if column.kind == "integer" else str(index + 1)
+                        )
+                    elif column.role == "value":
+                        row[column.name] = _value(
+                            column.kind,
+                            f"{anchor.mnemonic}_{column.attribute}",
+                            key,
+                            version,
+                        )
+                    else:
+                        row[column.name] = _value(column.kind, column.name, key, 0)
+                rows.append(tuple(row.values()))
+                for column in columns:
+                    if column.role == "knot":
+                        knot = knots[column.knot]
+                        expected.knots.setdefault(knot_table_name(knot), set()).add(
+                            row[column.name]
+                        )
+
+                # Identity the row loads under: staged, or its key-map keyset
+                identity: object
+                if anchor.keymap:
+                    identity = (mapping.system, mapping.tenant, key)
+                elif "identity" in declared:
+                    identity = key
+                else:
+                    continue
+                expected.identities.setdefault(anchor_table_name(anchor), set()).add(
+                    identity
+                )
+                for attr in anchor.attributes:
+                    column_name = knot_value_column(
+                        anchor, attr, mapping
+                    ) or staging_value_column(anchor, attr, mapping)
+                    if column_name not in names:
+                        continue
+                    table = attribute_table_name(anchor, attr)
+                    if attr.time_range is None:
+                        expected.static.setdefault(table, set()).add(identity)
+                        continue
+                    if "changed_at" not in names:
+                        continue
+                    expected.restatable[table] = allows_restatements(attr.metadata_)
+                    history = expected.versions.setdefault(table, {})
+                    history.setdefault(identity, {})[version] = row[column_name]
+            staged[staging_table_name(mapping)] = ([c.name for c in columns], rows)
+    return staged
+
+
+def _knot_staging_ddl(spec: Spec, dialect: str) -> dict[str, str]:
+    """Build stg_{knot} tables for knots loaded from their own staging."""
+    return {
+        f"stg_{knot_table_name(knot)}.sql": (
+            f"CREATE TABLE IF NOT EXISTS stg_{knot_table_name(knot)} ("
+            f"{knot.mnemonic}_ID "
+            f"{build_column_type(knot.identity, dialect).sql(dialect)}, "
+            f"{knot_table_name(knot)} "
+            f"{build_column_type(knot.data_range, dialect).sql(dialect)}, "
+            "metadata_recorded_at TIMESTAMP)"
+        )
+        for knot in spec.knots
+    }
+
+
+def _read_tables(sql: str, dialect: str) -> set[str]:
+    """Return the names of the tables a generated file references."""
+    try:
+        statements = sg.parse(sql, dialect=dialect)
+    except SqlglotError:
+        return set()
+    return {
+        table.name
+        for statement in statements
+        if statement is not None
+        for table in statement.find_all(sge.Table)
+    }
+
+
+# ============================================================================
+# Harness
+# ============================================================================
+
+
+def _stage(
+    connection: Connection,
+    staged: Mapping[str, tuple[list[str], list[tuple[object, ...]]]],
+) -> None:
+    """Replace the contents of staging tables with a batch."""
+    cursor = cast("_QueryCursor", connection.cursor())
+    for table, (columns, rows) in staged.items():
+        cursor.execute(f"DELETE FROM {table}")  # noqa: S608
+        if not rows:
+            continue
+        placeholders = ", ".join("?" for _ in columns)
+        cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}, metadata_recorded_at) "  # noqa: S608
+            f"VALUES ({placeholders}, CURRENT_TIMESTAMP)",
+            rows,
+        )
+
+
+def _count(connection: Connection, table: str) -> int:
+    """Count the rows of a table."""
+    cursor = cast("_QueryCursor", connection.cursor())
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")  # noqa: S608
+    row = cursor.fetchone()
+    return int(row[0]) if row else 0
+
+
+def run_benchmark(
+    spec: Spec,
+    connect: Callable[[str], Callable[[], Connection]],
+    *,
+    engine: str,
+    dialect: str,
+    rows: int = 1000,
+    batches: int = 3,
+    change_rate: float = 0.1,
+    patterns: Sequence[str] = LOAD_PATTERNS,
+    seed: int = 0,
+) -> BenchReport:
+    """Run the generated loads of a spec over synthetic batches.
+
+    Each pattern runs in a fresh database: the DDL (with stg_{knot} tables
+    for knots loaded from their own staging, and the materialized latest
+    state the loads refresh) is built, then every batch is staged and the
+    pattern's DML runs in dependency order. Other perspectives are not
+    built: the loads do not read them. A pattern whose DDL fails gets one
+    LoadTiming for DDL_FILE holding the error.
+
+    Args:
+        spec: Top-level Spec model instance
+        connect: Factory taking a database name (one per pattern) and
+            returning a connection factory (see runner.duckdb_connector)
+        engine: Dialect of the engine executing the SQL ("duckdb", "sqlite")
+        dialect: Dialect the SQL is generated for
+        rows: Keys per staging table in the first batch
+        batches: Number of consecutive batches
+        change_rate: Share of keys re-delivered with new values per later batch
+        patterns: Load patterns to run ("default", "consolidate", "fanout")
+        seed: Seed picking the changed keys of each batch
+
+    Returns:
+        BenchReport with a timing per load file and batch, and the row counts
+        checked after each batch
+
+    Raises:
+        ValueError: If the spec cannot be generated for the dialect
+    """
+    materialized = {
+        f"{materialized_view_name(anchor)}.sql"
+        for anchor in spec.anchors
+        if anchor.materialize is not None
+    }
+    ddl = {
+        **generate_all_ddl(spec, dialect),
+        **_knot_staging_ddl(spec, dialect),
+        **{
+            filename: sql
+            for filename, sql in generate_all_views(spec, dialect).items()
+            if filename in materialized
+        },
+    }
+    graph = build_dependency_graph(spec)
+    batch_keys = _batch_keys(rows, batches, change_rate, seed)
+    report = BenchReport(
+        engine=engine,
+        dialect=dialect,
+        rows=rows,
+        batches=batches,
+        change_rate=change_rate,
+    )
+
+    for pattern in patterns:
+        dml = generate_all_dml(
+            spec,
+            dialect,
+            consolidate=pattern == "consolidate",
+            fanout=pattern == "fanout",
+        )
+        reads = {filename: _read_tables(sql, dialect) for filename, sql in dml.items()}
+        dependencies = build_asset_dependencies(spec, [*ddl, *dml])
+        factory = connect(pattern)
+        setup = run_phases([ddl], graph, factory, read=dialect, write=engine, jobs=1)
+        if not setup.ok:
+            error = next(r.error for r in setup.results if r.error) or "skipped"
+            report.loads.append(LoadTiming(pattern, 0, DDL_FILE, 0.0, 0, error=error))
+            continue
+
+        expected = _Expected()
+        for batch, keys in enumerate(batch_keys):
+            staged = _fill_batch(spec, keys, batch, dialect, expected)
+            connection = factory()
+            try:
+                _stage(connection, staged)
+            finally:
+                connection.close()
+
+            # One worker: timings are not skewed by concurrent loads
+            run = run_phases(
+                [dml],
+                graph,
+                factory,
+                read=dialect,
+                write=engine,
+                jobs=1,
+                dependencies=dependencies,
+            )
+            seconds: dict[str, float] = {}
+            for timing in run.timings:
+                seconds[timing.file] = seconds.get(timing.file, 0.0) + timing.seconds
+            errors = {
+                (r.error or "").partition(":")[0]: r.error
+                for r in run.results
+                if r.error
+            }
+            for filename in dml:
+                node = file_node(filename, graph)
+                skipped = any(r.skipped and r.node == node for r in run.results)
+                report.loads.append(
+                    LoadTiming(
+                        pattern=pattern,
+                        batch=batch,
+                        file=filename,
+                        seconds=seconds.get(filename, 0.0),
+                        staged_rows=sum(
+                            len(staged[table][1])
+                            for table in reads[filename] & staged.keys()
+                        ),
+                        error=errors.get(filename) or ("skipped" if skipped else None),
+                    )
+                )
+
+            connection = factory()
+            try:
+                for table, count in sorted(expected.counts().items()):
+                    report.checks.append(
+                        RowCountCheck(
+                            pattern, batch, table, count, _count(connection, table)
+                        )
+                    )
+            finally:
+                connection.close()
+            if not run.ok:
+                break  # Later batches would compound the failure
+    return report
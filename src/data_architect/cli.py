@@ -2,22 +2,37 @@
 
 from __future__ import annotations
 
+import json
+import tempfile
+import time
 from enum import StrEnum
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from ruamel.yaml import YAML
+from sqlglot.errors import SqlglotError
 
+from data_architect.analyzer import Severity, analyze_spec
+from data_architect.bench import compare_baseline, run_benchmark
 from data_architect.dab_init import generate_spec_template
 from data_architect.generation import (
+    Rendered,
+    build_asset_dependencies,
+    build_dependency_graph,
     format_bruin,
     format_raw,
     generate_all_ddl,
     generate_all_dml,
-    write_output,
+    generate_all_views,
+    generate_migration,
+    render_spec,
+    rerender_spec,
 )
-from data_architect.generation.naming import attribute_table_name, tie_table_name
+from data_architect.models.staging import SourceFormat
+from data_architect.runner import duckdb_connector, run_phases, sqlite_connector
 from data_architect.scaffold import ScaffoldAction, scaffold
+from data_architect.synth import KNOT_DOMAIN, synthesize
 from data_architect.validation.errors import format_errors
 from data_architect.validation.loader import validate_spec
 from data_architect.xml_interop import (
@@ -26,6 +41,11 @@ from data_architect.xml_interop import (
     import_xml_to_spec,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from data_architect.runner import Connection
+
 app = typer.Typer(
     help="Data Architect: Scaffold OpenCode AI agents for data warehouse design.",
 )
@@ -284,6 +304,7 @@ class Dialect(StrEnum):
     POSTGRES = "postgres"
     TSQL = "tsql"
     SNOWFLAKE = "snowflake"
+    DUCKDB = "duckdb"
 
 
 @dab_app.command(name="generate")
@@ -305,7 +326,26 @@ def dab_generate(
         Dialect.POSTGRES,
         "--dialect",
         "-d",
-        help="SQL dialect: postgres, tsql, snowflake",
+        help="SQL dialect: postgres, tsql, snowflake, duckdb",
+    ),
+    consolidate: bool = typer.Option(
+        False,
+        "--consolidate",
+        help="Load multi-source anchors with one statement per target table",
+    ),
+    fanout: bool = typer.Option(
+        False,
+        "--fan-out",
+        help="Load each staging table with one script that scans it once",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        "-w",
+        help="Keep running and regenerate what each edit of the spec changes",
+    ),
+    interval: float = typer.Option(
+        0.5, "--interval", help="Seconds between checks of the spec for edits"
     ),
 ) -> None:
     """Generate SQL from a validated YAML spec."""
@@ -327,68 +367,26 @@ def dab_generate(
         typer.echo(typer.style("Error: failed to load spec", fg="red"))
         raise typer.Exit(code=1)
 
-    # 4. Generate DDL and DML
-    ddl_files = generate_all_ddl(result.spec, dialect.value)
-    dml_files = generate_all_dml(result.spec, dialect.value)
+    # 4. Generate DDL (tables, then the latest views reading them) and DML
+    try:
+        rendered = render_spec(
+            result.spec, dialect.value, consolidate=consolidate, fanout=fanout
+        )
+    except ValueError as e:
+        typer.echo(typer.style(f"Error: {e}", fg="red"))
+        raise typer.Exit(code=1) from e
 
     # 5. Determine output directory
     output_path = output_dir if output_dir is not None else spec_path.parent / "output"
 
-    # 6. Build historized entities lookup for Bruin format
-    historized_entities: set[str] = set()
-    if format == OutputFormat.BRUIN:
-        # Track historized attributes and ties
-        for anchor in result.spec.anchors:
-            for attr in anchor.attributes:
-                if attr.time_range is not None:
-                    historized_entities.add(attribute_table_name(anchor, attr))
-        for tie in result.spec.ties:
-            if tie.time_range is not None:
-                historized_entities.add(tie_table_name(tie))
-
-    # 7. Write DDL files
-    if format == OutputFormat.RAW:
-        ddl_written = write_output(ddl_files, output_path, format_raw, "ddl")
-    else:  # OutputFormat.BRUIN
-        # DDL files always use create+replace strategy
-        def ddl_formatter(sql: str, filename: str = "") -> str:
-            entity_name = filename.replace(".sql", "")
-            return format_bruin(sql, entity_name, "ddl", False)
-
-        # Write DDL files with Bruin formatter
-        ddl_written = []
-        ddl_dir = output_path / "ddl"
-        ddl_dir.mkdir(parents=True, exist_ok=True)
-        for filename in sorted(ddl_files.keys()):
-            sql = ddl_files[filename]
-            entity_name = filename.replace(".sql", "")
-            formatted_sql = format_bruin(sql, entity_name, "ddl", False)
-            file_path = ddl_dir / filename
-            file_path.write_text(formatted_sql)
-            ddl_written.append(file_path)
-
-    # 8. Write DML files
-    if format == OutputFormat.RAW:
-        dml_written = write_output(dml_files, output_path, format_raw, "dml")
-    else:  # OutputFormat.BRUIN
-        # DML files use merge for historized, create+replace for static
-        dml_written = []
-        dml_dir = output_path / "dml"
-        dml_dir.mkdir(parents=True, exist_ok=True)
-        for filename in sorted(dml_files.keys()):
-            sql = dml_files[filename]
-            # Extract entity name (remove _load.sql suffix)
-            entity_name = filename.replace("_load.sql", "")
-            is_historized = entity_name in historized_entities
-            formatted_sql = format_bruin(sql, entity_name, "dml", is_historized)
-            file_path = dml_dir / filename
-            file_path.write_text(formatted_sql)
-            dml_written.append(file_path)
-
-    # 9. Print summary
+    # 6. Format and write the files
+    files = _format_files(rendered, format)
+    _write_files(output_path, files, {})
+
+    # 7. Print summary
     symbol = "\u2713"
-    ddl_count = len(ddl_written)
-    dml_count = len(dml_written)
+    ddl_count = len(rendered.ddl)
+    dml_count = len(rendered.dml)
     typer.echo(
         typer.style(
             f"{symbol} Generated {ddl_count} DDL and {dml_count} DML files",
@@ -396,3 +394,601 @@ def dab_generate(
         )
     )
     typer.echo(f"Output directory: {output_path}")
+
+    # 8. Keep regenerating what each edit changes
+    if watch:
+        _watch(spec_path, result.files, output_path, rendered, files, format, interval)
+
+
+def _format_files(rendered: Rendered, format: OutputFormat) -> dict[Path, str]:
+    """Format generated files, keyed by their path below the output directory."""
+    spec = rendered.spec
+    if format == OutputFormat.RAW:
+        return {
+            **{
+                Path("ddl", name): format_raw(sql) for name, sql in rendered.ddl.items()
+            },
+            **{
+                Path("dml", name): format_raw(sql) for name, sql in rendered.dml.items()
+            },
+        }
+
+    asset_depends = build_asset_dependencies(spec, [*rendered.ddl, *rendered.dml])
+    files: dict[Path, str] = {}
+
+    # Assets are named after their file and run as written: DDL creates the
+    # tables, loads do their own upserts
+    for subdir, generated in (("ddl", rendered.ddl), ("dml", rendered.dml)):
+        for filename, sql in generated.items():
+            entity_name = filename.removesuffix(".sql")
+            files[Path(subdir, filename)] = format_bruin(
+                sql, entity_name, depends=asset_depends[entity_name]
+            )
+    return files
+
+
+def _write_files(
+    output_path: Path, files: dict[Path, str], previous: dict[Path, str]
+) -> tuple[list[Path], list[Path]]:
+    """Write the files that differ from a previous generation, remove the rest.
+
+    Returns:
+        Tuple of (written paths, removed paths), relative to output_path
+    """
+    written = sorted(path for path, sql in files.items() if previous.get(path) != sql)
+    removed = sorted(path for path in previous if path not in files)
+    for path in written:
+        target = output_path / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(files[path])
+    for path in removed:
+        (output_path / path).unlink(missing_ok=True)
+    return written, removed
+
+
+def _stamps(paths: list[Path]) -> dict[Path, tuple[int, int] | None]:
+    """Modification time and size of each file (None if it is gone)."""
+    stamps: dict[Path, tuple[int, int] | None] = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            stamps[path] = None
+        else:
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def _watch(
+    spec_path: Path,
+    spec_files: list[Path],
+    output_path: Path,
+    rendered: Rendered,
+    files: dict[Path, str],
+    format: OutputFormat,
+    interval: float,
+) -> None:
+    """Regenerate the files of the entities each edit of the spec changes.
+
+    The spec files are polled for changes. The validated spec and generated
+    files stay in memory between edits, and only files whose content
+    changed are written. Runs until interrupted.
+    """
+    typer.echo(f"Watching {len(spec_files)} spec file(s) for changes (Ctrl+C to stop)")
+    stamps = _stamps(spec_files)
+    try:
+        while True:
+            time.sleep(interval)
+            if _stamps(spec_files) == stamps:
+                continue
+
+            started = time.perf_counter()
+            result = validate_spec(spec_path)
+            # Includes may have changed; watch the files the spec has now
+            spec_files = result.files or spec_files
+            stamps = _stamps(spec_files)
+            if not result.is_valid or result.spec is None:
+                typer.echo(typer.style("Validation errors:", fg="red"))
+                typer.echo(format_errors(result.errors))
+                continue
+            validated = time.perf_counter()
+
+            try:
+                rendered, changed = rerender_spec(rendered, result.spec)
+            except ValueError as e:
+                typer.echo(typer.style(f"Error: {e}", fg="red"))
+                continue
+            generated = time.perf_counter()
+
+            formatted = _format_files(rendered, format)
+            written, removed = _write_files(output_path, formatted, files)
+            files = formatted
+            finished = time.perf_counter()
+
+            symbol = "\u2713"
+            entities = ", ".join(sorted(changed)) or "none"
+            typer.echo(
+                typer.style(
+                    f"{symbol} Wrote {len(written)} and removed {len(removed)} files "
+                    f"in {(finished - started) * 1000:.0f} ms "
+                    f"(validate {(validated - started) * 1000:.0f} ms, "
+                    f"generate {(generated - validated) * 1000:.0f} ms, "
+                    f"write {(finished - generated) * 1000:.0f} ms)",
+                    fg="green",
+                )
+            )
+            typer.echo(f"  Changed entities: {entities}")
+            for path in written:
+                typer.echo(f"  wrote {path}")
+            for path in removed:
+                typer.echo(f"  removed {path}")
+    except KeyboardInterrupt:
+        typer.echo("Stopped watching")
+
+
+@dab_app.command(name="migrate")
+def dab_migrate(
+    old_spec_path: Path = typer.Argument(..., help="Spec the database was built from"),
+    new_spec_path: Path = typer.Argument(..., help="Spec to migrate to"),
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Migration script (default: output/migrate.sql relative to new spec)",
+    ),
+    dialect: Dialect = typer.Option(
+        Dialect.POSTGRES,
+        "--dialect",
+        "-d",
+        help="SQL dialect: postgres, tsql, snowflake, duckdb",
+    ),
+) -> None:
+    """Generate the DDL migrating a database from one spec to another."""
+    specs = []
+    for spec_path in (old_spec_path, new_spec_path):
+        if not spec_path.exists():
+            typer.echo(
+                typer.style(f"Error: spec file not found: {spec_path}", fg="red")
+            )
+            raise typer.Exit(code=1)
+
+        result = validate_spec(spec_path)
+        if not result.is_valid:
+            typer.echo(typer.style(f"Validation errors in {spec_path}:", fg="red"))
+            typer.echo(format_errors(result.errors))
+            raise typer.Exit(code=1)
+
+        if result.spec is None:
+            typer.echo(typer.style("Error: failed to load spec", fg="red"))
+            raise typer.Exit(code=1)
+        specs.append(result.spec)
+
+    try:
+        files = generate_migration(specs[0], specs[1], dialect.value)
+    except ValueError as e:
+        typer.echo(typer.style(f"Error: {e}", fg="red"))
+        raise typer.Exit(code=1) from e
+
+    symbol = "\u2713"
+    if not files:
+        typer.echo(typer.style(f"{symbol} No schema changes", fg="green"))
+        return
+
+    output_path = (
+        output
+        if output is not None
+        else new_spec_path.parent / "output" / "migrate.sql"
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    script = "\n\n".join(f"-- {filename}\n{sql}" for filename, sql in files.items())
+    output_path.write_text(format_raw(script))
+
+    typer.echo(
+        typer.style(
+            f"{symbol} Migrated {len(files)} objects -> {output_path}", fg="green"
+        )
+    )
+
+
+class Engine(StrEnum):
+    """Local engine executing generated SQL."""
+
+    DUCKDB = "duckdb"
+    SQLITE = "sqlite"
+
+
+@dab_app.command(name="run")
+def dab_run(
+    spec_path: Path = typer.Argument(..., help="Path to YAML spec file"),
+    database: Path | None = typer.Option(
+        None,
+        "--database",
+        help="Database file (default: dab.db relative to spec)",
+    ),
+    engine: Engine = typer.Option(
+        Engine.DUCKDB,
+        "--engine",
+        "-e",
+        help="Local engine: duckdb, sqlite",
+    ),
+    dialect: Dialect | None = typer.Option(
+        None,
+        "--dialect",
+        "-d",
+        help=(
+            "SQL dialect to generate before transpiling to the engine "
+            "(default: duckdb on duckdb, postgres on sqlite)"
+        ),
+    ),
+    jobs: int = typer.Option(
+        4, "--jobs", "-j", min=1, help="Tables loaded concurrently per wave"
+    ),
+    retries: int = typer.Option(
+        0, "--retries", min=0, help="Extra attempts for a failed file"
+    ),
+    fail_fast: bool = typer.Option(
+        True,
+        "--fail-fast/--no-fail-fast",
+        help="Stop after the first wave with a failure",
+    ),
+) -> None:
+    """Execute generated DDL, then DML, in dependency order."""
+    if not spec_path.exists():
+        typer.echo(typer.style(f"Error: spec file not found: {spec_path}", fg="red"))
+        raise typer.Exit(code=1)
+
+    result = validate_spec(spec_path)
+
+    if not result.is_valid:
+        typer.echo(typer.style("Validation errors:", fg="red"))
+        typer.echo(format_errors(result.errors))
+        raise typer.Exit(code=1)
+
+    if result.spec is None:
+        typer.echo(typer.style("Error: failed to load spec", fg="red"))
+        raise typer.Exit(code=1)
+
+    if dialect is None:
+        dialect = Dialect.DUCKDB if engine == Engine.DUCKDB else Dialect.POSTGRES
+
+    phases = [
+        {
+            **generate_all_ddl(result.spec, dialect.value),
+            **generate_all_views(result.spec, dialect.value),
+        },
+        generate_all_dml(result.spec, dialect.value),
+    ]
+    graph = build_dependency_graph(result.spec)
+
+    db_path = database if database is not None else spec_path.parent / "dab.db"
+    try:
+        connect = (
+            duckdb_connector(db_path)
+            if engine == Engine.DUCKDB
+            else sqlite_connector(db_path)
+        )
+    except ImportError as e:
+        typer.echo(typer.style(f"Error: {e}", fg="red"))
+        raise typer.Exit(code=1) from e
+
+    report = run_phases(
+        phases,
+        graph,
+        connect,
+        read=dialect.value,
+        write=engine.value,
+        jobs=jobs,
+        retries=retries,
+        fail_fast=fail_fast,
+        dependencies=build_asset_dependencies(result.spec, [*phases[0], *phases[1]]),
+    )
+
+    for timing in report.timings:
+        typer.echo(f"{timing.file}[{timing.index}] {timing.seconds:.3f}s")
+
+    if not report.ok:
+        for node_result in report.results:
+            if node_result.error is not None:
+                typer.echo(typer.style(f"Error: {node_result.error}", fg="red"))
+            elif node_result.skipped:
+                typer.echo(typer.style(f"Skipped: {node_result.node}", fg="yellow"))
+        raise typer.Exit(code=1)
+
+    symbol = "\u2713"
+    typer.echo(
+        typer.style(
+            f"{symbol} Ran {len(report.results)} objects into {db_path}",
+            fg="green",
+        )
+    )
+
+
+@dab_app.command(name="analyze")
+def dab_analyze(
+    spec_path: Path = typer.Argument(..., help="Path to YAML spec file"),
+    dialect: Dialect = typer.Option(
+        Dialect.POSTGRES,
+        "--dialect",
+        "-d",
+        help="SQL dialect: postgres, tsql, snowflake, duckdb",
+    ),
+    consolidate: bool = typer.Option(
+        False,
+        "--consolidate",
+        help="Analyze consolidated multi-source loads",
+    ),
+    fanout: bool = typer.Option(
+        False,
+        "--fan-out",
+        help="Analyze fan-out loads (one script per staging table)",
+    ),
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Write the JSON report to this file (default: stdout)",
+    ),
+    fail_on: Severity = typer.Option(
+        Severity.ERROR,
+        "--fail-on",
+        help="Exit with 1 on findings of this severity or worse: error, warning, info",
+    ),
+) -> None:
+    """Report load-efficiency issues in the SQL generated from a spec."""
+    if not spec_path.exists():
+        typer.echo(typer.style(f"Error: spec file not found: {spec_path}", fg="red"))
+        raise typer.Exit(code=1)
+
+    result = validate_spec(spec_path)
+
+    if not result.is_valid:
+        typer.echo(typer.style("Validation errors:", fg="red"))
+        typer.echo(format_errors(result.errors))
+        raise typer.Exit(code=1)
+
+    if result.spec is None:
+        typer.echo(typer.style("Error: failed to load spec", fg="red"))
+        raise typer.Exit(code=1)
+
+    try:
+        report = analyze_spec(
+            result.spec, dialect.value, consolidate=consolidate, fanout=fanout
+        )
+    except ValueError as e:
+        typer.echo(typer.style(f"Error: {e}", fg="red"))
+        raise typer.Exit(code=1) from e
+
+    text = json.dumps(report.to_dict(), indent=2)
+    if output is None:
+        typer.echo(text)
+    else:
+        output.write_text(text + "\n")
+        counts = ", ".join(f"{n} {severity}" for severity, n in report.counts().items())
+        typer.echo(f"Wrote {output} ({counts})")
+
+    if report.fails(fail_on):
+        raise typer.Exit(code=1)
+
+
+class LoadPattern(StrEnum):
+    """Load pattern generated for a benchmark run."""
+
+    DEFAULT = "default"
+    CONSOLIDATE = "consolidate"
+    FANOUT = "fanout"
+
+
+@dab_app.command(name="bench")
+def dab_bench(
+    spec_path: Path = typer.Argument(..., help="Path to YAML spec file"),
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Baseline file to write (default: bench.json relative to spec)",
+    ),
+    baseline: Path | None = typer.Option(
+        None,
+        "--baseline",
+        help="Earlier baseline file to compare against",
+    ),
+    tolerance: float = typer.Option(
+        0.25, "--tolerance", min=0.0, help="Allowed relative slowdown per load"
+    ),
+    engine: Engine = typer.Option(
+        Engine.DUCKDB,
+        "--engine",
+        "-e",
+        help="Local engine: duckdb, sqlite",
+    ),
+    dialect: Dialect | None = typer.Option(
+        None,
+        "--dialect",
+        "-d",
+        help=(
+            "SQL dialect to generate before transpiling to the engine "
+            "(default: duckdb on duckdb, postgres on sqlite)"
+        ),
+    ),
+    patterns: list[LoadPattern] = typer.Option(
+        list(LoadPattern),
+        "--pattern",
+        "-p",
+        help="Load pattern to run (repeatable): default, consolidate, fanout",
+    ),
+    rows: int = typer.Option(
+        1000, "--rows", min=1, help="Keys per staging table in the first batch"
+    ),
+    batches: int = typer.Option(3, "--batches", min=1, help="Consecutive batches"),
+    change_rate: float = typer.Option(
+        0.1,
+        "--change-rate",
+        min=0.0,
+        max=1.0,
+        help="Share of keys re-delivered with new values per later batch",
+    ),
+    seed: int = typer.Option(0, "--seed", help="Seed picking the changed keys"),
+) -> None:
+    """Time generated loads over synthetic batches and check row counts."""
+    if not spec_path.exists():
+        typer.echo(typer.style(f"Error: spec file not found: {spec_path}", fg="red"))
+        raise typer.Exit(code=1)
+
+    result = validate_spec(spec_path)
+
+    if not result.is_valid:
+        typer.echo(typer.style("Validation errors:", fg="red"))
+        typer.echo(format_errors(result.errors))
+        raise typer.Exit(code=1)
+
+    if result.spec is None:
+        typer.echo(typer.style("Error: failed to load spec", fg="red"))
+        raise typer.Exit(code=1)
+
+    if dialect is None:
+        dialect = Dialect.DUCKDB if engine == Engine.DUCKDB else Dialect.POSTGRES
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        def connect(name: str) -> Callable[[], Connection]:
+            database = Path(directory) / f"{name}.{engine.value}"
+            if engine == Engine.DUCKDB:
+                return duckdb_connector(database)
+            return sqlite_connector(database)
+
+        try:
+            report = run_benchmark(
+                result.spec,
+                connect,
+                engine=engine.value,
+                dialect=dialect.value,
+                rows=rows,
+                batches=batches,
+                change_rate=change_rate,
+                patterns=[pattern.value for pattern in patterns],
+                seed=seed,
+            )
+        except (ImportError, ValueError, SqlglotError) as e:
+            typer.echo(typer.style(f"Error: {e}", fg="red"))
+            raise typer.Exit(code=1) from e
+
+    if not report.built:
+        # Nothing was timed: a baseline would only hide the failure
+        for load in report.loads:
+            if load.error is not None:
+                typer.echo(typer.style(f"Error: {load.pattern} {load.error}", fg="red"))
+        raise typer.Exit(code=1)
+
+    for pattern, files in report.summary().items():
+        for file, totals in files.items():
+            typer.echo(
+                f"{pattern} {file} {totals['seconds']:.3f}s "
+                f"{totals['rows_per_second']:.0f} rows/s"
+            )
+    for load in report.loads:
+        if load.error is not None:
+            typer.echo(typer.style(f"Error: {load.pattern} {load.error}", fg="red"))
+    for check in report.checks:
+        if not check.ok:
+            typer.echo(
+                typer.style(
+                    f"Wrong row count: {check.pattern} {check.table} after batch "
+                    f"{check.batch}: {check.actual}, expected {check.expected}",
+                    fg="red",
+                )
+            )
+
+    regressions = []
+    if baseline is not None:
+        regressions = compare_baseline(
+            report, json.loads(baseline.read_text()), tolerance
+        )
+        for regression in regressions:
+            typer.echo(typer.style(f"Regression: {regression}", fg="red"))
+
+    output_path = output if output is not None else spec_path.parent / "bench.json"
+    output_path.write_text(json.dumps(report.to_dict(), indent=2) + "\n")
+    typer.echo(f"Baseline written to {output_path}")
+
+    if not report.ok or regressions:
+        raise typer.Exit(code=1)
+
+
+@dab_app.command(name="synth")
+def dab_synth(
+    spec_path: Path = typer.Argument(..., help="Path to YAML spec file"),
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output directory (default: synth/ relative to spec)",
+    ),
+    file_format: SourceFormat = typer.Option(
+        SourceFormat.PARQUET, "--format", "-f", help="File format: parquet, csv"
+    ),
+    dialect: Dialect = typer.Option(
+        Dialect.POSTGRES,
+        "--dialect",
+        "-d",
+        help="SQL dialect the staging column types are written in",
+    ),
+    tables: list[str] | None = typer.Option(
+        None,
+        "--table",
+        "-t",
+        help="Staging table to write (repeatable, default: all)",
+    ),
+    rows: int = typer.Option(1000, "--rows", min=1, help="Rows per staging table"),
+    versions: int = typer.Option(
+        3, "--versions", min=1, help="changed_at versions per key"
+    ),
+    overlap: float = typer.Option(
+        0.5,
+        "--overlap",
+        min=0.0,
+        max=1.0,
+        help="Share of keys every source of an anchor delivers",
+    ),
+    knot_domain: int = typer.Option(
+        KNOT_DOMAIN, "--knot-domain", min=1, help="Distinct values per knot"
+    ),
+    seed: int = typer.Option(0, "--seed", help="Seed of the synthetic values"),
+) -> None:
+    """Write synthetic staging data files matching the spec."""
+    if not spec_path.exists():
+        typer.echo(typer.style(f"Error: spec file not found: {spec_path}", fg="red"))
+        raise typer.Exit(code=1)
+
+    result = validate_spec(spec_path)
+
+    if not result.is_valid:
+        typer.echo(typer.style("Validation errors:", fg="red"))
+        typer.echo(format_errors(result.errors))
+        raise typer.Exit(code=1)
+
+    if result.spec is None:
+        typer.echo(typer.style("Error: failed to load spec", fg="red"))
+        raise typer.Exit(code=1)
+
+    try:
+        written = synthesize(
+            result.spec,
+            output if output is not None else spec_path.parent / "synth",
+            rows=rows,
+            versions=versions,
+            overlap=overlap,
+            knot_domain=knot_domain,
+            file_format=file_format,
+            dialect=dialect.value,
+            seed=seed,
+            tables=tables,
+        )
+    except (ImportError, ValueError) as e:
+        typer.echo(typer.style(f"Error: {e}", fg="red"))
+        raise typer.Exit(code=1) from e
+
+    for table in written:
+        typer.echo(
+            f"{table.table}: {table.rows} rows -> {table.path} "
+            f"({table.seconds:.3f}s, {table.rows_per_second:.0f} rows/s)"
+        )
@@ -5,14 +5,24 @@ from data_architect.generation.ddl import (
     build_anchor_table,
     build_attribute_table,
     build_knot_table,
+    build_nexus_table,
     build_staging_table,
     build_tie_table,
     generate_all_ddl,
 )
+from data_architect.generation.dependencies import (
+    build_asset_dependencies,
+    build_dependency_graph,
+    topological_waves,
+)
 from data_architect.generation.dml import (
     build_anchor_merge,
     build_attribute_merge,
+    build_consolidated_anchor_merge,
+    build_consolidated_attribute_merge,
     build_knot_merge,
+    build_nexus_merge,
+    build_staging_fanout,
     build_tie_merge,
     generate_all_dml,
 )
@@ -21,27 +31,57 @@ from data_architect.generation.formatters import (
     format_raw,
     write_output,
 )
+from data_architect.generation.incremental import (
+    Rendered,
+    changed_entities,
+    render_spec,
+    rerender_spec,
+)
 from data_architect.generation.keyset_sql import (
     build_composite_natural_key_expr,
     build_keyset_expr,
 )
+from data_architect.generation.migrate import generate_migration
+from data_architect.generation.views import (
+    build_difference_function,
+    build_latest_view,
+    build_point_in_time_function,
+    generate_all_views,
+)
 
 __all__ = [
+    "Rendered",
     "build_anchor_merge",
     "build_anchor_table",
+    "build_asset_dependencies",
     "build_attribute_merge",
     "build_attribute_table",
     "build_composite_natural_key_expr",
+    "build_consolidated_anchor_merge",
+    "build_consolidated_attribute_merge",
+    "build_dependency_graph",
+    "build_difference_function",
     "build_keyset_expr",
     "build_knot_merge",
     "build_knot_table",
+    "build_latest_view",
+    "build_nexus_merge",
+    "build_nexus_table",
+    "build_point_in_time_function",
+    "build_staging_fanout",
     "build_staging_table",
     "build_tie_merge",
     "build_tie_table",
+    "changed_entities",
     "format_bruin",
     "format_raw",
     "generate_all_ddl",
     "generate_all_dml",
+    "generate_all_views",
+    "generate_migration",
+    "render_spec",
+    "rerender_spec",
     "resolve_staging_order",
+    "topological_waves",
     "write_output",
 ]
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 
 import sqlglot as sg
 import sqlglot.expressions as sge
+from sqlglot.errors import SqlglotError
 
 from data_architect.generation.keyset_sql import (
     build_composite_natural_key_expr,
@@ -15,8 +16,117 @@ from data_architect.identity.escaping import escape_delimiters
 
 if TYPE_CHECKING:
     from data_architect.models.anchor import Anchor
+    from data_architect.models.spec import Nexus
     from data_architect.models.staging import StagingMapping
 
+# Types of PostgreSQL and SQL Server that other dialects lack, as the
+# DECIMAL they store
+_PORTABLE_TYPES = {"money": "DECIMAL(19, 4)", "smallmoney": "DECIMAL(10, 4)"}
+
+
+def build_column_type(type_: str, dialect: str) -> sge.DataType:
+    """Parse a spec data type for a dialect.
+
+    MONEY and SMALLMONEY become DECIMAL(19, 4) and DECIMAL(10, 4) in
+    dialects without them (DuckDB, Snowflake).
+
+    Args:
+        type_: SQL data type from the spec (e.g., "varchar(42)", "money")
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot DataType node
+
+    Raises:
+        ValueError: If the type cannot be expressed in the dialect
+    """
+    try:
+        return sge.DataType.build(type_, dialect=dialect)
+    except SqlglotError as e:
+        portable = _PORTABLE_TYPES.get(type_.strip().lower())
+        if portable is None:
+            msg = f"Data type {type_!r} is not supported in {dialect}"
+            raise ValueError(msg) from e
+        return sge.DataType.build(portable, dialect=dialect)
+
+
+def timestamp_type(dialect: str) -> str:
+    """Return the timestamp type used for temporal and metadata columns.
+
+    Args:
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        TIMESTAMPTZ for postgres/tsql, TIMESTAMP_NTZ for snowflake
+    """
+    return "TIMESTAMPTZ" if dialect != "snowflake" else "TIMESTAMP_NTZ"
+
+
+def watermark_columns(mapping: StagingMapping) -> tuple[str, str]:
+    """Return the load-control columns holding a mapping's watermarks.
+
+    Timestamp watermark columns are tracked in the *_ts pair, integer ones
+    (batch ids, sequence numbers) in the BIGINT *_id pair, so watermarks are
+    compared natively without string round-trips. Spec validation rejects
+    watermark columns of any other type.
+
+    Args:
+        mapping: StagingMapping with a watermark_column declared in its columns
+
+    Returns:
+        Tuple of (low watermark column, high watermark column)
+    """
+    watermark_type = next(
+        col.type for col in mapping.columns if col.name == mapping.watermark_column
+    )
+    if sge.DataType.build(watermark_type).is_type(*sge.DataType.TEMPORAL_TYPES):
+        return "low_watermark_ts", "high_watermark_ts"
+    return "low_watermark_id", "high_watermark_id"
+
+
+def build_load_control_columns(dialect: str) -> list[sge.ColumnDef]:
+    """Build columns of the load-control table.
+
+    Args:
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        List of ColumnDef nodes for the (target_table, source_table) key,
+        the timestamp and batch id watermark pairs, and advanced_at
+    """
+    ts_type = timestamp_type(dialect)
+
+    key_columns = [
+        sge.ColumnDef(
+            this=sg.to_identifier(name),
+            kind=sge.DataType.build("VARCHAR(255)", dialect=dialect),
+            constraints=[sge.ColumnConstraint(kind=sge.NotNullColumnConstraint())],
+        )
+        for name in ("target_table", "source_table")
+    ]
+    watermark_defs = [
+        sge.ColumnDef(
+            this=sg.to_identifier(name),
+            kind=build_column_type(type_, dialect),
+        )
+        for name, type_ in (
+            ("low_watermark_ts", ts_type),
+            ("high_watermark_ts", ts_type),
+            ("low_watermark_id", "BIGINT"),
+            ("high_watermark_id", "BIGINT"),
+        )
+    ]
+
+    return [
+        *key_columns,
+        *watermark_defs,
+        sge.ColumnDef(
+            this=sg.to_identifier("advanced_at"),
+            kind=sge.DataType.build(ts_type, dialect=dialect),
+            constraints=[sge.ColumnConstraint(kind=sge.NotNullColumnConstraint())],
+        ),
+    ]
+
 
 def build_bitemporal_columns(dialect: str) -> list[sge.ColumnDef]:
     """Build changed_at and recorded_at columns (valid time + transaction time).
@@ -27,18 +137,17 @@ def build_bitemporal_columns(dialect: str) -> list[sge.ColumnDef]:
     Returns:
         List of two ColumnDef nodes for changed_at and recorded_at
     """
-    # Use TIMESTAMPTZ for postgres/tsql, TIMESTAMP_NTZ for snowflake
-    timestamp_type = "TIMESTAMPTZ" if dialect != "snowflake" else "TIMESTAMP_NTZ"
+    ts_type = timestamp_type(dialect)
 
     return [
         sge.ColumnDef(
             this=sg.to_identifier("changed_at"),
-            kind=sge.DataType.build(timestamp_type, dialect=dialect),
+            kind=sge.DataType.build(ts_type, dialect=dialect),
             constraints=[sge.ColumnConstraint(kind=sge.NotNullColumnConstraint())],
         ),
         sge.ColumnDef(
             this=sg.to_identifier("recorded_at"),
-            kind=sge.DataType.build(timestamp_type, dialect=dialect),
+            kind=sge.DataType.build(ts_type, dialect=dialect),
             constraints=[sge.ColumnConstraint(kind=sge.NotNullColumnConstraint())],
         ),
     ]
@@ -55,12 +164,12 @@ def build_metadata_columns(dialect: str) -> list[sge.ColumnDef]:
         metadata_recorded_by, metadata_id
     """
     # metadata_recorded_at is NOT NULL, others are nullable
-    timestamp_type = "TIMESTAMPTZ" if dialect != "snowflake" else "TIMESTAMP_NTZ"
+    ts_type = timestamp_type(dialect)
 
     return [
         sge.ColumnDef(
             this=sg.to_identifier("metadata_recorded_at"),
-            kind=sge.DataType.build(timestamp_type, dialect=dialect),
+            kind=sge.DataType.build(ts_type, dialect=dialect),
             constraints=[sge.ColumnConstraint(kind=sge.NotNullColumnConstraint())],
         ),
         sge.ColumnDef(
@@ -74,13 +183,32 @@ def build_metadata_columns(dialect: str) -> list[sge.ColumnDef]:
     ]
 
 
-def build_keyset_column(
-    anchor: Anchor, mapping: StagingMapping, dialect: str
-) -> sge.ColumnDef:
-    """Build keyset_id computed column for staging table.
+def build_staging_keyset_expr(
+    anchor: Anchor | Nexus, mapping: StagingMapping, dialect: str
+) -> sge.Expression:
+    """Build the keyset identity expression over a staging row.
 
-    Generates a GENERATED ALWAYS AS ... STORED (or AS ... PERSISTED for tsql)
-    column that materializes the keyset identity expression.
+    Args:
+        anchor: Anchor or nexus model instance (for entity descriptor)
+        mapping: StagingMapping model instance (for system, tenant, natural key)
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        Keyset expression referencing the natural key columns
+    """
+    return build_natural_keyset_expr(
+        anchor.descriptor,
+        mapping.system,
+        mapping.tenant,
+        mapping.natural_key_columns,
+        dialect,
+    )
+
+
+def build_natural_keyset_expr(
+    entity: str, system: str, tenant: str, columns: list[str], dialect: str
+) -> sge.Expression:
+    """Build the keyset identity expression over natural key columns.
 
     For single natural key:
         keyset_id = entity@system~tenant|natural_key_value
@@ -91,34 +219,34 @@ def build_keyset_column(
         (with NULL propagation if any component is NULL)
 
     Args:
-        anchor: Anchor model instance (for entity descriptor)
-        mapping: StagingMapping model instance (for system, tenant, natural key)
+        entity: Entity name (anchor descriptor)
+        system: Source system identifier
+        tenant: Tenant identifier
+        columns: Columns composing the natural key
         dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
 
     Returns:
-        ColumnDef node with ComputedColumnConstraint containing keyset expression
+        Keyset expression referencing the natural key columns
     """
     # Determine if single or composite natural key
-    if len(mapping.natural_key_columns) == 1:
+    if len(columns) == 1:
         # Single natural key: use build_keyset_expr directly
         keyset_expr = build_keyset_expr(
-            entity=anchor.descriptor,
-            system=mapping.system,
-            tenant=mapping.tenant,
-            natural_key_col=mapping.natural_key_columns[0],
+            entity=entity,
+            system=system,
+            tenant=tenant,
+            natural_key_col=columns[0],
             dialect=dialect,
         )
     else:
         # Composite natural key: build composite key expr, then wrap in keyset
         # Build the composite natural key expression first
-        composite_nk_expr = build_composite_natural_key_expr(
-            mapping.natural_key_columns, dialect
-        )
+        composite_nk_expr = build_composite_natural_key_expr(columns, dialect)
 
         # Build the keyset prefix: entity@system~tenant|
-        esc_entity = escape_delimiters(anchor.descriptor)
-        esc_system = escape_delimiters(mapping.system)
-        esc_tenant = escape_delimiters(mapping.tenant)
+        esc_entity = escape_delimiters(entity)
+        esc_system = escape_delimiters(system)
+        esc_tenant = escape_delimiters(tenant)
         prefix = f"{esc_entity}@{esc_system}~{esc_tenant}|"
 
         # The composite expression already handles NULL propagation and concatenation
@@ -157,8 +285,7 @@ def build_keyset_column(
 
         # Build NULL check for composite key (any column NULL)
         null_checks = [
-            sge.Is(this=sg.to_identifier(col), expression=sge.Null())
-            for col in mapping.natural_key_columns
+            sge.Is(this=sg.to_identifier(col), expression=sge.Null()) for col in columns
         ]
         any_null: sge.Expression = null_checks[0]
         for check in null_checks[1:]:
@@ -170,13 +297,37 @@ def build_keyset_column(
             default=concat_expr,
         )
 
+    return keyset_expr
+
+
+def build_keyset_column(
+    anchor: Anchor | Nexus, mapping: StagingMapping, dialect: str
+) -> sge.ColumnDef:
+    """Build keyset_id computed column for staging table.
+
+    Generates a GENERATED ALWAYS AS ... STORED (or AS ... PERSISTED for tsql)
+    column that materializes the keyset identity expression. DuckDB has no
+    stored generated columns, so there it is a virtual AS (...) column.
+
+    Args:
+        anchor: Anchor or nexus model instance (for entity descriptor)
+        mapping: StagingMapping model instance (for system, tenant, natural key)
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        ColumnDef node with ComputedColumnConstraint containing keyset expression
+    """
+    keyset_expr = build_staging_keyset_expr(anchor, mapping, dialect)
+
+    # DuckDB only supports virtual generated columns: AS (expr)
+    if dialect == "duckdb":
+        computed = sge.ComputedColumnConstraint(this=sge.Paren(this=keyset_expr))
+    else:
+        computed = sge.ComputedColumnConstraint(this=keyset_expr, persisted=True)
+
     # Build the ColumnDef with ComputedColumnConstraint
     return sge.ColumnDef(
         this=sg.to_identifier("keyset_id"),
         kind=sge.DataType.build("VARCHAR(500)", dialect=dialect),
-        constraints=[
-            sge.ColumnConstraint(
-                kind=sge.ComputedColumnConstraint(this=keyset_expr, persisted=True)
-            )
-        ],
+        constraints=[sge.ColumnConstraint(kind=computed)],
     )
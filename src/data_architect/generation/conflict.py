@@ -1,14 +1,16 @@
-"""Multi-source conflict resolution for anchor staging mappings.
+"""Multi-source conflict resolution for anchor and tie staging mappings.
 
 Provides deterministic ordering for staging mappings when multiple source
 systems feed the same anchor. Priority is explicit (lower number wins),
 with alphabetical tie-breaking for consistency (GEN-08 determinism).
 """
 
-from data_architect.models.staging import StagingMapping
+from data_architect.models.staging import StagingMapping, TieStagingMapping
 
 
-def resolve_staging_order(mappings: list[StagingMapping]) -> list[StagingMapping]:
+def resolve_staging_order[M: (StagingMapping, TieStagingMapping)](
+    mappings: list[M],
+) -> list[M]:
     """Sort staging mappings deterministically for conflict resolution.
 
     Ordering rules:
@@ -17,13 +19,13 @@ def resolve_staging_order(mappings: list[StagingMapping]) -> list[StagingMapping
     3. Alphabetical by tenant name (further tie-breaker).
 
     Args:
-        mappings: List of StagingMapping instances to sort
+        mappings: List of StagingMapping (or TieStagingMapping) instances to sort
 
     Returns:
         Sorted list (highest priority first = lowest priority number first)
 
     Example:
-        >>> from data_architect.models.staging import StagingMapping
+        >>> from data_architect.models.staging import StagingMapping, TieStagingMapping
         >>> mappings = [
         ...     StagingMapping(
         ...         system='SAP', tenant='EU', table='stg_sap',
@@ -43,7 +45,7 @@ def resolve_staging_order(mappings: list[StagingMapping]) -> list[StagingMapping
         'SAP'
     """
 
-    def sort_key(m: StagingMapping) -> tuple[int, str, str]:
+    def sort_key(m: M) -> tuple[int, str, str]:
         priority = m.priority if m.priority is not None else 999999
         return (priority, m.system, m.tenant)
 
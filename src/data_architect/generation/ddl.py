@@ -1,24 +1,39 @@
 """DDL AST builder functions for all Anchor Model entity types."""
 
+from collections.abc import Mapping
+
 import sqlglot as sg
 import sqlglot.expressions as sge
 
 from data_architect.generation.columns import (
     build_bitemporal_columns,
+    build_column_type,
     build_keyset_column,
+    build_load_control_columns,
     build_metadata_columns,
+    build_staging_keyset_expr,
+    timestamp_type,
 )
 from data_architect.generation.naming import (
+    FILE_SERVER,
+    LOAD_CONTROL_TABLE,
     anchor_table_name,
     attribute_table_name,
+    attribute_value_column,
+    capture_instance_name,
+    external_table_name,
+    keymap_sequence_name,
+    keymap_table_name,
+    knot_sequence_name,
     knot_table_name,
+    nexus_table_name,
     staging_table_name,
     tie_table_name,
 )
 from data_architect.models.anchor import Anchor, Attribute
 from data_architect.models.knot import Knot
-from data_architect.models.spec import Spec
-from data_architect.models.staging import StagingMapping
+from data_architect.models.spec import Nexus, Spec
+from data_architect.models.staging import SourceFormat, StagingMapping, StagingSource
 from data_architect.models.tie import Tie
 
 
@@ -36,7 +51,7 @@ def build_anchor_table(anchor: Anchor, dialect: str) -> sge.Create:
         # 1. Identity column (PK)
         sge.ColumnDef(
             this=sg.to_identifier(f"{anchor.mnemonic}_ID"),
-            kind=sge.DataType.build(anchor.identity, dialect=dialect),
+            kind=build_column_type(anchor.identity, dialect),
             constraints=[sge.ColumnConstraint(kind=sge.PrimaryKeyColumnConstraint())],
         ),
         # 2. Metadata columns (always present)
@@ -55,15 +70,183 @@ def build_anchor_table(anchor: Anchor, dialect: str) -> sge.Create:
     )
 
 
+def build_keymap_table(anchor: Anchor, dialect: str) -> sge.Create:
+    """Build CREATE TABLE statement for an anchor's key map.
+
+    The key map assigns each keyset (entity@system~tenant|key) the integer
+    identity the anchor, its attributes and ties join on. The keyset is the
+    primary key, so resolving identities is an index lookup; identities are
+    unique so they map back to their keyset. New identities come from the
+    key map's sequence (see build_sequence).
+
+    Args:
+        anchor: Anchor model instance with an integer identity
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot Create AST node with IF NOT EXISTS
+    """
+    columns = [
+        sge.ColumnDef(
+            this=sg.to_identifier("keyset_id"),
+            kind=sge.DataType.build("VARCHAR(500)", dialect=dialect),
+            constraints=[
+                sge.ColumnConstraint(kind=sge.NotNullColumnConstraint()),
+                sge.ColumnConstraint(kind=sge.PrimaryKeyColumnConstraint()),
+            ],
+        ),
+        sge.ColumnDef(
+            this=sg.to_identifier(f"{anchor.mnemonic}_ID"),
+            kind=build_column_type(anchor.identity, dialect),
+            constraints=[
+                sge.ColumnConstraint(kind=sge.NotNullColumnConstraint()),
+                sge.ColumnConstraint(kind=sge.UniqueColumnConstraint()),
+            ],
+        ),
+        *build_metadata_columns(dialect),
+    ]
+
+    return sge.Create(
+        kind="TABLE",
+        this=sge.Schema(
+            this=sge.Table(this=sg.to_identifier(keymap_table_name(anchor))),
+            expressions=columns,
+        ),
+        exists=True,  # IF NOT EXISTS
+    )
+
+
+def build_sequence(name: str, dialect: str) -> sge.Expression:
+    """Build CREATE SEQUENCE statement for generated identities.
+
+    Key-map and knot-value loads draw new identities from a sequence, so
+    concurrent loads never hand out the same identity.
+
+    Args:
+        name: Sequence name (see keymap_sequence_name, knot_sequence_name)
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot AST node for CREATE SEQUENCE IF NOT EXISTS
+    """
+    if dialect == "tsql":
+        # SQL Server has no CREATE SEQUENCE IF NOT EXISTS
+        return sge.Command(
+            this="IF",
+            expression=(
+                "NOT EXISTS (SELECT 1 FROM sys.sequences "  # noqa: S608 - spec names
+                f"WHERE name = '{name}')\n"
+                f"EXEC('CREATE SEQUENCE {name} AS BIGINT START WITH 1')"
+            ),
+        )
+    return sg.parse_one(
+        f"CREATE SEQUENCE IF NOT EXISTS {name} START WITH 1", dialect=dialect
+    )
+
+
+def build_metadata_id_index(anchor: Anchor, dialect: str) -> sge.Expression:
+    """Build the index on an anchor's metadata_id.
+
+    Tie loads resolving roles from natural keys join anchors on the keyset
+    recorded in metadata_id, so anchors playing such roles get it indexed.
+
+    Args:
+        anchor: Anchor model instance
+        dialect: Target SQL dialect (e.g., "postgres", "tsql", "duckdb")
+
+    Returns:
+        SQLGlot AST node for CREATE INDEX IF NOT EXISTS
+    """
+    table_name = anchor_table_name(anchor)
+    return sg.parse_one(
+        f"CREATE INDEX IF NOT EXISTS {table_name}_metadata_id "
+        f"ON {table_name} (metadata_id)",
+        dialect=dialect,
+    )
+
+
+def keyset_resolved_anchors(spec: Spec) -> set[str]:
+    """Mnemonics of anchors whose IDs tie loads resolve from their keysets.
+
+    Anchors with a key map are left out: tie loads look their keysets up
+    there, by primary key.
+
+    Args:
+        spec: Top-level Spec model instance
+
+    Returns:
+        Anchor mnemonics playing a role with natural key columns
+    """
+    keymapped = {anchor.mnemonic for anchor in spec.anchors if anchor.keymap}
+    return {
+        role.type_
+        for tie in spec.ties
+        for mapping in tie.staging_mappings
+        for role in tie.roles
+        if mapping.natural_key_columns.get(role.role) and role.type_ not in keymapped
+    }
+
+
+def valued_knots(spec: Spec) -> set[str]:
+    """Mnemonics of knots whose values staging delivers.
+
+    Their loads add the staged values a knot lacks, numbered from the
+    knot's sequence, instead of reading IDs from stg_{knot}.
+
+    Args:
+        spec: Top-level Spec model instance
+
+    Returns:
+        Knot mnemonics of attributes some mapping has knot_values for
+    """
+    owners: list[Anchor | Nexus] = [*spec.anchors, *spec.nexuses]
+    return {
+        attr.knot_range
+        for owner in owners
+        for mapping in owner.staging_mappings
+        for attr in owner.attributes
+        if attr.knot_range
+        and mapping.knot_values
+        and {attr.mnemonic, f"{owner.mnemonic}_{attr.mnemonic}"}
+        & mapping.knot_values.keys()
+    }
+
+
+def identity_types(spec: Spec) -> dict[str, str]:
+    """Identity types of a spec's anchors, knots and nexuses.
+
+    FK columns referencing an entity take its identity type, so joins on
+    them compare equal types and can seek the referenced primary key.
+
+    Args:
+        spec: Top-level Spec model instance
+
+    Returns:
+        Identity type per entity mnemonic
+    """
+    entities: list[Knot | Anchor | Nexus] = [*spec.knots, *spec.anchors, *spec.nexuses]
+    return {entity.mnemonic: entity.identity for entity in entities}
+
+
+def _reference_type(mnemonic: str, identities: Mapping[str, str] | None) -> str:
+    """Type of an FK column referencing the entity with the given mnemonic."""
+    return (identities or {}).get(mnemonic, "bigint")  # bigint when unknown
+
+
 def build_attribute_table(
-    anchor: Anchor, attribute: Attribute, dialect: str
+    anchor: Anchor | Nexus,
+    attribute: Attribute,
+    dialect: str,
+    identities: Mapping[str, str] | None = None,
 ) -> sge.Create:
     """Build CREATE TABLE statement for an attribute.
 
     Args:
-        anchor: Parent anchor model instance
+        anchor: Parent anchor or nexus model instance
         attribute: Attribute model instance
         dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        identities: Identity types by mnemonic (see identity_types); knot
+            FKs of unknown knots are bigint
 
     Returns:
         SQLGlot Create AST node with IF NOT EXISTS
@@ -72,7 +255,7 @@ def build_attribute_table(
         # 1. Anchor FK column (NOT NULL)
         sge.ColumnDef(
             this=sg.to_identifier(f"{anchor.mnemonic}_ID"),
-            kind=sge.DataType.build(anchor.identity, dialect=dialect),
+            kind=build_column_type(anchor.identity, dialect),
             constraints=[sge.ColumnConstraint(kind=sge.NotNullColumnConstraint())],
         ),
     ]
@@ -80,23 +263,19 @@ def build_attribute_table(
     # 2. Value column (either dataRange or knotRange FK)
     if attribute.data_range:
         # Direct value column
-        value_col_name = (
-            f"{anchor.mnemonic}_{attribute.mnemonic}_"
-            f"{anchor.descriptor}_{attribute.descriptor}"
-        )
         columns.append(
             sge.ColumnDef(
-                this=sg.to_identifier(value_col_name),
-                kind=sge.DataType.build(attribute.data_range, dialect=dialect),
+                this=sg.to_identifier(attribute_value_column(anchor, attribute)),
+                kind=build_column_type(attribute.data_range, dialect),
             )
         )
     elif attribute.knot_range:
         # FK to knot
-        knot_fk_name = f"{attribute.knot_range}_ID"
+        knot_type = _reference_type(attribute.knot_range, identities)
         columns.append(
             sge.ColumnDef(
-                this=sg.to_identifier(knot_fk_name),
-                kind=sge.DataType.build("bigint", dialect=dialect),
+                this=sg.to_identifier(attribute_value_column(anchor, attribute)),
+                kind=build_column_type(knot_type, dialect),
             )
         )
 
@@ -107,13 +286,20 @@ def build_attribute_table(
     # 4. Metadata columns (always present)
     columns.extend(build_metadata_columns(dialect))
 
+    # 5. Primary key: one row per anchor (static) or per anchor and version
+    # (historized). The unique key lets optimizers eliminate unused attribute
+    # joins in latest views and backs the ON CONFLICT targets of the loads.
+    key_columns = [sg.to_identifier(f"{anchor.mnemonic}_ID")]
+    if attribute.time_range is not None:
+        key_columns.append(sg.to_identifier("changed_at"))
+
     table_name = attribute_table_name(anchor, attribute)
 
     return sge.Create(
         kind="TABLE",
         this=sge.Schema(
             this=sge.Table(this=sg.to_identifier(table_name)),
-            expressions=columns,
+            expressions=[*columns, sge.PrimaryKey(expressions=key_columns)],
         ),
         exists=True,  # IF NOT EXISTS
     )
@@ -133,13 +319,14 @@ def build_knot_table(knot: Knot, dialect: str) -> sge.Create:
         # 1. Identity column (PK)
         sge.ColumnDef(
             this=sg.to_identifier(f"{knot.mnemonic}_ID"),
-            kind=sge.DataType.build(knot.identity, dialect=dialect),
+            kind=build_column_type(knot.identity, dialect),
             constraints=[sge.ColumnConstraint(kind=sge.PrimaryKeyColumnConstraint())],
         ),
-        # 2. Value column
+        # 2. Value column (unique, so loads can resolve IDs by value)
         sge.ColumnDef(
             this=sg.to_identifier(f"{knot.mnemonic}_{knot.descriptor}"),
-            kind=sge.DataType.build(knot.data_range, dialect=dialect),
+            kind=build_column_type(knot.data_range, dialect),
+            constraints=[sge.ColumnConstraint(kind=sge.UniqueColumnConstraint())],
         ),
         # 3. Metadata columns (always present, no bitemporal for knots)
         *build_metadata_columns(dialect),
@@ -157,12 +344,16 @@ def build_knot_table(knot: Knot, dialect: str) -> sge.Create:
     )
 
 
-def build_tie_table(tie: Tie, dialect: str) -> sge.Create:
+def build_tie_table(
+    tie: Tie, dialect: str, identities: Mapping[str, str] | None = None
+) -> sge.Create:
     """Build CREATE TABLE statement for a tie.
 
     Args:
         tie: Tie model instance
         dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        identities: Identity types by mnemonic (see identity_types); roles
+            of unknown entities are bigint
 
     Returns:
         SQLGlot Create AST node with IF NOT EXISTS
@@ -175,7 +366,9 @@ def build_tie_table(tie: Tie, dialect: str) -> sge.Create:
         columns.append(
             sge.ColumnDef(
                 this=sg.to_identifier(role_fk_name),
-                kind=sge.DataType.build("bigint", dialect=dialect),
+                kind=build_column_type(
+                    _reference_type(role.type_, identities), dialect
+                ),
             )
         )
 
@@ -198,25 +391,114 @@ def build_tie_table(tie: Tie, dialect: str) -> sge.Create:
     )
 
 
+def build_nexus_table(
+    nexus: Nexus, dialect: str, identities: Mapping[str, str] | None = None
+) -> sge.Create:
+    """Build CREATE TABLE statement for a nexus.
+
+    A nexus row carries its identity and the IDs of all its roles, so one
+    insert records the entity together with its relationships. Identifier
+    roles are NOT NULL.
+
+    Args:
+        nexus: Nexus model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        identities: Identity types by mnemonic (see identity_types); roles
+            of unknown entities are bigint
+
+    Returns:
+        SQLGlot Create AST node with IF NOT EXISTS
+    """
+    columns = [
+        # 1. Identity column (PK)
+        sge.ColumnDef(
+            this=sg.to_identifier(f"{nexus.mnemonic}_ID"),
+            kind=build_column_type(nexus.identity, dialect),
+            constraints=[sge.ColumnConstraint(kind=sge.PrimaryKeyColumnConstraint())],
+        ),
+    ]
+
+    # 2. Role FK columns (one per role)
+    for role in nexus.roles:
+        columns.append(
+            sge.ColumnDef(
+                this=sg.to_identifier(f"{role.type_}_ID_{role.role}"),
+                kind=build_column_type(
+                    _reference_type(role.type_, identities), dialect
+                ),
+                constraints=[sge.ColumnConstraint(kind=sge.NotNullColumnConstraint())]
+                if role.identifier
+                else [],
+            )
+        )
+
+    # 3. Metadata columns (always present)
+    columns.extend(build_metadata_columns(dialect))
+
+    return sge.Create(
+        kind="TABLE",
+        this=sge.Schema(
+            this=sge.Table(this=sg.to_identifier(nexus_table_name(nexus))),
+            expressions=columns,
+        ),
+        exists=True,  # IF NOT EXISTS
+    )
+
+
+def build_role_indexes(nexus: Nexus, dialect: str) -> list[sge.Expression]:
+    """Build one index per role column of a nexus.
+
+    Lookups from an anchor or knot to the nexuses it plays a role in then
+    seek on the role column instead of scanning the nexus table.
+
+    Args:
+        nexus: Nexus model instance
+        dialect: Target SQL dialect (e.g., "postgres", "tsql", "duckdb")
+
+    Returns:
+        SQLGlot AST nodes for CREATE INDEX IF NOT EXISTS, in role order
+    """
+    table_name = nexus_table_name(nexus)
+    indexes = []
+    for role in nexus.roles:
+        column = f"{role.type_}_ID_{role.role}"
+        indexes.append(
+            sg.parse_one(
+                f"CREATE INDEX IF NOT EXISTS {table_name}_{column} "
+                f"ON {table_name} ({column})",
+                dialect=dialect,
+            )
+        )
+    return indexes
+
+
 def build_staging_table(
     name: str,
     columns: list[tuple[str, str]],
     dialect: str,
-    anchor: Anchor | None = None,
+    anchor: Anchor | Nexus | None = None,
     mapping: StagingMapping | None = None,
 ) -> sge.Create:
     """Build CREATE TABLE statement for a staging table.
 
+    A mapping with a file ``source`` becomes a view over the files instead
+    (see build_staging_view).
+
     Args:
         name: Table name
         columns: List of (column_name, column_type) tuples
         dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
-        anchor: Optional anchor model for keyset column generation
+        anchor: Optional anchor or nexus model for keyset column generation
         mapping: Optional staging mapping for keyset column generation
 
     Returns:
         SQLGlot Create AST node with IF NOT EXISTS
     """
+    if anchor is not None and mapping is not None and mapping.source is not None:
+        return build_staging_view(
+            name, columns, mapping.source, dialect, anchor, mapping
+        )
+
     column_defs = []
 
     # 1. User-defined columns
@@ -224,7 +506,7 @@ def build_staging_table(
         column_defs.append(
             sge.ColumnDef(
                 this=sg.to_identifier(col_name),
-                kind=sge.DataType.build(col_type, dialect=dialect),
+                kind=build_column_type(col_type, dialect),
             )
         )
 
@@ -245,6 +527,312 @@ def build_staging_table(
     )
 
 
+# Dialects reading source files through an external table
+EXTERNAL_TABLE_DIALECTS = ("postgres", "snowflake")
+
+
+def _option_sql(key: str, value: str | int | bool) -> str:
+    """Render a file-format setting as KEY = value."""
+    if isinstance(value, bool):
+        return f"{key} = {'TRUE' if value else 'FALSE'}"
+    return f"{key} = {sge.convert(value).sql()}"
+
+
+def build_external_table(
+    mapping: StagingMapping, columns: list[tuple[str, str]], dialect: str
+) -> list[sge.Expression]:
+    """Build statements defining an external table over a mapping's files.
+
+    Postgres reads a server-side CSV file through a file_fdw foreign table
+    (creating the extension and the dab_files server if needed). Snowflake
+    reads a stage location through an external table whose columns extract
+    the file fields. DuckDB and T-SQL read files directly in the staging view.
+
+    Args:
+        mapping: Staging mapping with a file source
+        columns: List of (column_name, column_type) tuples
+        dialect: Target SQL dialect ("postgres" or "snowflake")
+
+    Returns:
+        Statements to run in order
+
+    Raises:
+        ValueError: If the dialect cannot read the source as declared
+    """
+    source = mapping.source
+    name = external_table_name(mapping)
+    if source is None or dialect not in EXTERNAL_TABLE_DIALECTS:
+        msg = f"{mapping.table}: no external table for a {dialect} file source"
+        raise ValueError(msg)
+
+    if dialect == "postgres":
+        if source.format != SourceFormat.CSV:
+            msg = f"{mapping.table}: file_fdw reads csv sources only"
+            raise ValueError(msg)
+        column_sql = ",\n  ".join(
+            f"{col_name} {build_column_type(col_type, dialect).sql(dialect)}"
+            for col_name, col_type in columns
+        )
+        # file_fdw options are all strings: header 'true', delimiter ';'
+        settings = {"filename": source.path, "format": "csv", **source.options}
+        options = ", ".join(
+            f"{key} {sge.Literal.string(str(value).lower()).sql()}"
+            if isinstance(value, bool)
+            else f"{key} {sge.Literal.string(str(value)).sql()}"
+            for key, value in settings.items()
+        )
+        return [
+            sge.Command(this="CREATE", expression="EXTENSION IF NOT EXISTS file_fdw"),
+            sge.Command(
+                this="CREATE",
+                expression=(
+                    f"SERVER IF NOT EXISTS {FILE_SERVER} FOREIGN DATA WRAPPER file_fdw"
+                ),
+            ),
+            sge.Command(
+                this="CREATE",
+                expression=(
+                    f"FOREIGN TABLE IF NOT EXISTS {name} (\n  {column_sql}\n)\n"
+                    f"SERVER {FILE_SERVER} OPTIONS ({options})"
+                ),
+            ),
+        ]
+
+    # Snowflake: Parquet fields by name, CSV fields by position
+    if not source.path.startswith("@"):
+        msg = f"{mapping.table}: Snowflake sources are stage locations (@stage/path)"
+        raise ValueError(msg)
+    fields = []
+    for position, (col_name, col_type) in enumerate(columns, start=1):
+        type_sql = build_column_type(col_type, dialect).sql(dialect)
+        field = (
+            f'"{col_name}"' if source.format == SourceFormat.PARQUET else f"c{position}"
+        )
+        fields.append(f"{col_name} {type_sql} AS (CAST(VALUE:{field} AS {type_sql}))")
+    file_format = " ".join(
+        _option_sql(key, value)
+        for key, value in {
+            "TYPE": source.format.value.upper(),
+            **source.options,
+        }.items()
+    )
+    field_sql = ",\n  ".join(fields)
+    return [
+        sge.Command(
+            this="CREATE",
+            expression=(
+                f"EXTERNAL TABLE IF NOT EXISTS {name} (\n  {field_sql}\n)\n"
+                f"LOCATION = {source.path}\n"
+                f"FILE_FORMAT = ({file_format})"
+            ),
+        )
+    ]
+
+
+def _source_relation(
+    mapping: StagingMapping,
+    columns: list[tuple[str, str]],
+    source: StagingSource,
+    dialect: str,
+) -> tuple[sge.Expression, sge.Expression]:
+    """Return the relation reading a mapping's files and each row's file name."""
+    if dialect == "duckdb":
+        reader = sge.Anonymous(
+            this=f"read_{source.format.value}",
+            expressions=[
+                sge.Literal.string(source.path),
+                sge.EQ(this=sg.to_identifier("filename"), expression=sge.true()),
+                *(
+                    sge.EQ(this=sg.to_identifier(key), expression=sge.convert(value))
+                    for key, value in source.options.items()
+                ),
+            ],
+        )
+        return reader, sg.column("filename")
+
+    if dialect == "tsql":
+        settings = ", ".join(
+            [
+                f"BULK {sge.convert(source.path).sql()}",
+                _option_sql("FORMAT", source.format.value.upper()),
+                *(_option_sql(key, value) for key, value in source.options.items()),
+            ]
+        )
+        schema = ", ".join(
+            f"{col_name} {build_column_type(col_type, dialect).sql(dialect)}"
+            for col_name, col_type in columns
+        )
+        openrowset = sge.Table(
+            this=sge.Var(this=f"OPENROWSET({settings}) WITH ({schema})"),
+            alias=sge.TableAlias(this=sg.to_identifier("files")),
+        )
+        return openrowset, sge.Literal.string(source.path)
+
+    external = sge.Table(this=sg.to_identifier(external_table_name(mapping)))
+    if dialect == "snowflake":
+        return external, sge.Var(this="METADATA$FILENAME")
+    return external, sge.Literal.string(source.path)
+
+
+def build_staging_view(
+    name: str,
+    columns: list[tuple[str, str]],
+    source: StagingSource,
+    dialect: str,
+    anchor: Anchor | Nexus,
+    mapping: StagingMapping,
+) -> sge.Create:
+    """Build CREATE VIEW statement reading a mapping's source files in place.
+
+    The view exposes the same columns as a staging table: the declared
+    columns cast to their types, the keyset, and metadata columns, with the
+    source file name as metadata_id. Loads then scan the files directly
+    (DuckDB read_parquet/read_csv, T-SQL OPENROWSET, or the external table
+    from build_external_table) instead of a copy of them, and the keyset is
+    computed by the view rather than persisted.
+
+    Args:
+        name: View name
+        columns: List of (column_name, column_type) tuples
+        source: Files to read and their format
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        anchor: Anchor or nexus model for keyset column generation
+        mapping: Staging mapping with a file source
+
+    Returns:
+        SQLGlot Create AST node with OR REPLACE (OR ALTER for tsql)
+    """
+    reader, filename = _source_relation(mapping, columns, source, dialect)
+    # Cast in a subquery so the keyset sees the declared column types
+    typed = (
+        sg.select(
+            *(
+                sge.Cast(
+                    this=sg.column(col_name),
+                    to=build_column_type(col_type, dialect),
+                ).as_(col_name)
+                for col_name, col_type in columns
+            ),
+            filename.as_("source_file"),
+        )
+        .from_(reader)
+        .subquery("source")
+    )
+    select = sg.select(
+        *(sg.column(col_name) for col_name, _ in columns),
+        build_staging_keyset_expr(anchor, mapping, dialect).as_("keyset_id"),
+        sge.Cast(
+            this=sge.CurrentTimestamp(),
+            to=sge.DataType.build(timestamp_type(dialect), dialect=dialect),
+        ).as_("metadata_recorded_at"),
+        sge.Cast(
+            this=sge.Null(), to=sge.DataType.build("VARCHAR(255)", dialect=dialect)
+        ).as_("metadata_recorded_by"),
+        sg.column("source_file").as_("metadata_id"),
+    ).from_(typed)
+
+    return sge.Create(
+        kind="VIEW",
+        this=sge.Table(this=sg.to_identifier(name)),
+        expression=select,
+        replace=True,
+    )
+
+
+def build_load_control_table(dialect: str) -> sge.Create:
+    """Build CREATE TABLE statement for the load-control (watermark) table.
+
+    One row per (target table, staging table) pair tracks the window of
+    staging rows consumed by the latest incremental load.
+
+    Args:
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot Create AST node with IF NOT EXISTS
+    """
+    key_columns = [sg.to_identifier("target_table"), sg.to_identifier("source_table")]
+
+    return sge.Create(
+        kind="TABLE",
+        this=sge.Schema(
+            this=sge.Table(this=sg.to_identifier(LOAD_CONTROL_TABLE)),
+            expressions=[
+                *build_load_control_columns(dialect),
+                sge.PrimaryKey(expressions=key_columns),
+            ],
+        ),
+        exists=True,  # IF NOT EXISTS
+    )
+
+
+# Dialects with a native change feed a staging mapping can consume
+CDC_DIALECTS = ("snowflake", "tsql")
+
+
+def build_cdc_source(mapping: StagingMapping, dialect: str) -> sge.Expression:
+    """Build the statement creating the change feed of a CDC staging mapping.
+
+    Snowflake gets a stream named after the staging table (showing the
+    initial rows, so the first load is a full load). SQL Server gets change
+    capture enabled on the source table with net changes, if not enabled
+    already; CDC must be enabled on the database beforehand.
+
+    Args:
+        mapping: Staging mapping with a cdc source
+        dialect: Target SQL dialect ("snowflake" or "tsql")
+
+    Returns:
+        SQLGlot Command node
+
+    Raises:
+        ValueError: If the dialect has no change feed to consume
+    """
+    if mapping.cdc is None or dialect not in CDC_DIALECTS:
+        msg = f"{mapping.table}: CDC sources require snowflake or tsql"
+        raise ValueError(msg)
+
+    if dialect == "snowflake":
+        return sge.Command(
+            this="CREATE",
+            expression=(
+                f"STREAM IF NOT EXISTS {staging_table_name(mapping)} "
+                f"ON TABLE {mapping.cdc.table} SHOW_INITIAL_ROWS = TRUE"
+            ),
+        )
+
+    schema, _, table = mapping.cdc.table.rpartition(".")
+    instance = capture_instance_name(mapping)
+    return sge.Command(
+        this="IF",
+        expression=(
+            "NOT EXISTS (SELECT 1 FROM cdc.change_tables "  # noqa: S608 - spec names
+            f"WHERE capture_instance = '{instance}')\n"
+            "EXEC sys.sp_cdc_enable_table "
+            f"@source_schema = N'{schema or 'dbo'}', @source_name = N'{table}', "
+            "@role_name = NULL, @supports_net_changes = 1"
+        ),
+    )
+
+
+def render_statements(statements: list[sge.Expression], dialect: str) -> str:
+    """Render DDL statements as one file.
+
+    Args:
+        statements: Statements to run, in order
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        The statement as SQL, or a script of ;-terminated statements
+    """
+    if len(statements) == 1:
+        return statements[0].sql(dialect=dialect, pretty=True)
+    return (
+        ";\n\n".join(stmt.sql(dialect=dialect, pretty=True) for stmt in statements)
+        + ";"
+    )
+
+
 def generate_all_ddl(spec: Spec, dialect: str) -> dict[str, str]:
     """Generate all DDL for a spec in deterministic order.
 
@@ -256,53 +844,124 @@ def generate_all_ddl(spec: Spec, dialect: str) -> dict[str, str]:
         Dictionary mapping filenames to SQL strings
     """
     output: dict[str, str] = {}
+    identities = identity_types(spec)
 
-    # 1. Knots (sorted by mnemonic for determinism)
+    # 1. Knots (sorted by mnemonic for determinism), with the sequence
+    # numbering the values staging delivers
+    valued = valued_knots(spec)
     for knot in sorted(spec.knots, key=lambda k: k.mnemonic):
-        ast = build_knot_table(knot, dialect)
+        statements: list[sge.Expression] = [build_knot_table(knot, dialect)]
+        if knot.mnemonic in valued:
+            statements.insert(0, build_sequence(knot_sequence_name(knot), dialect))
         filename = f"{knot_table_name(knot)}.sql"
-        output[filename] = ast.sql(dialect=dialect, pretty=True)
+        output[filename] = render_statements(statements, dialect)
 
-    # 2. Anchors (sorted by mnemonic)
+    # 2. Anchors (sorted by mnemonic). Snowflake has no secondary indexes
+    # for the keyset joins of tie loads.
+    indexed = keyset_resolved_anchors(spec) if dialect != "snowflake" else set()
     for anchor in sorted(spec.anchors, key=lambda a: a.mnemonic):
         # Anchor table
-        ast = build_anchor_table(anchor, dialect)
+        statements = [build_anchor_table(anchor, dialect)]
+        if anchor.mnemonic in indexed:
+            statements.append(build_metadata_id_index(anchor, dialect))
         filename = f"{anchor_table_name(anchor)}.sql"
-        output[filename] = ast.sql(dialect=dialect, pretty=True)
+        output[filename] = render_statements(statements, dialect)
+
+        # Key map assigning the anchor's identities
+        if anchor.keymap:
+            filename = f"{keymap_table_name(anchor)}.sql"
+            output[filename] = render_statements(
+                [
+                    build_sequence(keymap_sequence_name(anchor), dialect),
+                    build_keymap_table(anchor, dialect),
+                ],
+                dialect,
+            )
 
         # Attribute tables (sorted by mnemonic)
         for attr in sorted(anchor.attributes, key=lambda at: at.mnemonic):
-            ast = build_attribute_table(anchor, attr, dialect)
+            ast = build_attribute_table(anchor, attr, dialect, identities)
             filename = f"{attribute_table_name(anchor, attr)}.sql"
             output[filename] = ast.sql(dialect=dialect, pretty=True)
 
     # 3. Ties (sorted by table name for determinism)
     sorted_ties = sorted(spec.ties, key=lambda t: tie_table_name(t))
     for tie in sorted_ties:
-        ast = build_tie_table(tie, dialect)
+        ast = build_tie_table(tie, dialect, identities)
         filename = f"{tie_table_name(tie)}.sql"
         output[filename] = ast.sql(dialect=dialect, pretty=True)
 
-    # 4. Staging tables (GEN-10: from anchor.staging_mappings)
+    # 4. Nexuses (sorted by mnemonic). Role columns are indexed, except on
+    # Snowflake, which has no secondary indexes.
+    for nexus in sorted(spec.nexuses, key=lambda n: n.mnemonic):
+        statements = [build_nexus_table(nexus, dialect, identities)]
+        if dialect != "snowflake":
+            statements.extend(build_role_indexes(nexus, dialect))
+        filename = f"{nexus_table_name(nexus)}.sql"
+        output[filename] = render_statements(statements, dialect)
+
+        # Attribute tables (sorted by mnemonic)
+        for attr in sorted(nexus.attributes, key=lambda at: at.mnemonic):
+            ast = build_attribute_table(nexus, attr, dialect, identities)
+            filename = f"{attribute_table_name(nexus, attr)}.sql"
+            output[filename] = ast.sql(dialect=dialect, pretty=True)
+
+    # 5. Staging tables (GEN-10: from anchor and nexus staging_mappings)
     staging_tables: dict[
-        str, tuple[str, Anchor, StagingMapping, list[tuple[str, str]]]
+        str, tuple[str, Anchor | Nexus, StagingMapping, list[tuple[str, str]]]
     ] = {}
 
-    for anchor in spec.anchors:
-        if anchor.staging_mappings:
-            for mapping in anchor.staging_mappings:
-                table = staging_table_name(mapping)
-                # Extract columns from mapping model
-                columns = [(col.name, col.type) for col in mapping.columns]
-                staging_tables[table] = (table, anchor, mapping, columns)
+    owners: list[Anchor | Nexus] = [*spec.anchors, *spec.nexuses]
+    for owner in owners:
+        for mapping in owner.staging_mappings:
+            table = staging_table_name(mapping)
+            # Extract columns from mapping model
+            columns = [(col.name, col.type) for col in mapping.columns]
+            staging_tables[table] = (table, owner, mapping, columns)
+
+    # Tie staging tables carry no keyset: tie loads compute one per role.
+    # A table already staging an anchor is not created twice.
+    tie_staging_tables: dict[str, list[tuple[str, str]]] = {}
+    for tie in spec.ties:
+        for tie_mapping in tie.staging_mappings:
+            table = staging_table_name(tie_mapping)
+            if table not in staging_tables:
+                tie_staging_tables[table] = [
+                    (col.name, col.type) for col in tie_mapping.columns
+                ]
 
     # Generate staging DDL in sorted order
     for table in sorted(staging_tables.keys()):
         name, anchor_ref, mapping_ref, columns = staging_tables[table]
+        # Change feeds stand in for the staging table
+        if mapping_ref.cdc is not None:
+            feed = build_cdc_source(mapping_ref, dialect)
+            output[f"{name}.sql"] = feed.sql(dialect=dialect, pretty=True)
+            continue
+        # External table the staging view of a file source reads
+        if mapping_ref.source is not None and dialect in EXTERNAL_TABLE_DIALECTS:
+            statements = build_external_table(mapping_ref, columns, dialect)
+            filename = f"{external_table_name(mapping_ref)}.sql"
+            output[filename] = render_statements(statements, dialect)
         ast = build_staging_table(
             name, columns, dialect, anchor=anchor_ref, mapping=mapping_ref
         )
         filename = f"{name}.sql"
         output[filename] = ast.sql(dialect=dialect, pretty=True)
 
+    for table in sorted(tie_staging_tables):
+        ast = build_staging_table(table, tie_staging_tables[table], dialect)
+        output[f"{table}.sql"] = ast.sql(dialect=dialect, pretty=True)
+
+    # 6. Load-control table (only when some mapping loads incrementally,
+    # including SQL Server CDC windows)
+    if any(
+        mapping.watermark_column or (mapping.cdc is not None and dialect == "tsql")
+        for owner in owners
+        for mapping in owner.staging_mappings
+    ):
+        ast = build_load_control_table(dialect)
+        filename = f"{LOAD_CONTROL_TABLE}.sql"
+        output[filename] = ast.sql(dialect=dialect, pretty=True)
+
     return output
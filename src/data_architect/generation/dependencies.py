@@ -0,0 +1,295 @@
+"""Dependency graph of generated objects for ordered execution.
+
+Nodes are the names of generated tables and views (the stems of the DDL
+files); edges point from an object to the objects it requires. Knots and
+anchors have no dependencies (anchors with a key map require it),
+attributes require their anchor (and knot),
+ties and nexuses require the anchors and knots of their roles (nexus
+attributes require their nexus), and the latest,
+point-in-time and difference perspectives require everything they join.
+Asset dependencies extend the graph to individual generated files for
+orchestrators such as Bruin.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from data_architect.generation.naming import (
+    LOAD_CONTROL_TABLE,
+    anchor_table_name,
+    attribute_table_name,
+    difference_function_name,
+    external_table_name,
+    keymap_table_name,
+    knot_table_name,
+    latest_view_name,
+    materialized_view_name,
+    nexus_table_name,
+    point_in_time_function_name,
+    staging_table_name,
+    tie_table_name,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from data_architect.models.spec import Spec
+
+
+def build_dependency_graph(spec: Spec) -> dict[str, set[str]]:
+    """Build the dependency graph of all objects generated for a spec.
+
+    Args:
+        spec: Top-level Spec model instance
+
+    Returns:
+        Dictionary mapping each object name to the names it depends on
+    """
+    graph: dict[str, set[str]] = {}
+    tables_by_mnemonic: dict[str, str] = {}
+
+    for knot in spec.knots:
+        graph[knot_table_name(knot)] = set()
+        tables_by_mnemonic[knot.mnemonic] = knot_table_name(knot)
+
+    for anchor in spec.anchors:
+        anchor_table = anchor_table_name(anchor)
+        graph[anchor_table] = set()
+        if anchor.keymap:
+            graph[keymap_table_name(anchor)] = set()
+            graph[anchor_table].add(keymap_table_name(anchor))
+        tables_by_mnemonic[anchor.mnemonic] = anchor_table
+
+    for anchor in spec.anchors:
+        anchor_table = anchor_table_name(anchor)
+        perspective_deps = {anchor_table}
+
+        for attr in anchor.attributes:
+            deps = {anchor_table}
+            if attr.knot_range and attr.knot_range in tables_by_mnemonic:
+                deps.add(tables_by_mnemonic[attr.knot_range])
+            attr_table = attribute_table_name(anchor, attr)
+            graph[attr_table] = deps
+            perspective_deps |= deps | {attr_table}
+
+        graph[latest_view_name(anchor)] = set(perspective_deps)
+        if anchor.materialize is not None:
+            graph[materialized_view_name(anchor)] = set(perspective_deps)
+        if any(attr.time_range for attr in anchor.attributes):
+            graph[point_in_time_function_name(anchor)] = set(perspective_deps)
+            graph[difference_function_name(anchor)] = set(perspective_deps)
+
+        for mapping in anchor.staging_mappings:
+            staging = graph.setdefault(staging_table_name(mapping), set())
+            if mapping.source is not None:
+                # File-backed staging views read an external table (on the
+                # dialects that need one)
+                staging.add(external_table_name(mapping))
+                graph[external_table_name(mapping)] = set()
+            if mapping.watermark_column or mapping.cdc is not None:
+                graph.setdefault(LOAD_CONTROL_TABLE, set())
+
+    for tie in spec.ties:
+        graph[tie_table_name(tie)] = {
+            tables_by_mnemonic[role.type_]
+            for role in tie.roles
+            if role.type_ in tables_by_mnemonic
+        }
+        for tie_mapping in tie.staging_mappings:
+            graph.setdefault(staging_table_name(tie_mapping), set())
+
+    for nexus in spec.nexuses:
+        nexus_table = nexus_table_name(nexus)
+        graph[nexus_table] = {
+            tables_by_mnemonic[role.type_]
+            for role in nexus.roles
+            if role.type_ in tables_by_mnemonic
+        }
+        for attr in nexus.attributes:
+            deps = {nexus_table}
+            if attr.knot_range and attr.knot_range in tables_by_mnemonic:
+                deps.add(tables_by_mnemonic[attr.knot_range])
+            graph[attribute_table_name(nexus, attr)] = deps
+        for mapping in nexus.staging_mappings:
+            staging = graph.setdefault(staging_table_name(mapping), set())
+            if mapping.source is not None:
+                staging.add(external_table_name(mapping))
+                graph[external_table_name(mapping)] = set()
+            if mapping.watermark_column:
+                graph.setdefault(LOAD_CONTROL_TABLE, set())
+
+    return graph
+
+
+def topological_waves(graph: Mapping[str, Iterable[str]]) -> list[list[str]]:
+    """Group graph nodes into waves that can each run concurrently.
+
+    Every node lands in the first wave after all of its dependencies.
+    Dependencies that are not nodes of the graph are ignored.
+
+    Args:
+        graph: Dictionary mapping each node to the nodes it depends on
+
+    Returns:
+        List of waves, each a sorted list of node names
+
+    Raises:
+        ValueError: If the graph contains a cycle
+    """
+    remaining = {
+        node: {dep for dep in deps if dep in graph and dep != node}
+        for node, deps in graph.items()
+    }
+    waves: list[list[str]] = []
+
+    while remaining:
+        wave = sorted(node for node, deps in remaining.items() if not deps)
+        if not wave:
+            cycle = ", ".join(sorted(remaining))
+            msg = f"Dependency cycle between: {cycle}"
+            raise ValueError(msg)
+        waves.append(wave)
+        for node in wave:
+            del remaining[node]
+        for deps in remaining.values():
+            deps.difference_update(wave)
+
+    return waves
+
+
+def file_node(filename: str, graph: Mapping[str, Iterable[str]]) -> str:
+    """Resolve the graph node a generated file belongs to.
+
+    DDL files are named after their object; load files append ``_load``
+    (and ``_<system>`` for per-source loads), refresh scripts of
+    materialized objects ``_refresh``. Files that match no node are their
+    own node.
+
+    Args:
+        filename: Generated file name (e.g. "CU_Customer_load_sap.sql")
+        graph: Dependency graph from build_dependency_graph
+
+    Returns:
+        Node name
+    """
+    stem = filename.removesuffix(".sql")
+    if stem in graph:
+        return stem
+    for suffix in ("_load", "_refresh"):
+        base, separator, _ = stem.rpartition(suffix)
+        if separator and base in graph:
+            return base
+    return stem
+
+
+def build_asset_dependencies(
+    spec: Spec, filenames: Iterable[str]
+) -> dict[str, list[str]]:
+    """Map each generated file to the files it must run after.
+
+    Assets are named after their file stem. A DDL asset requires the DDL of
+    the objects its table or view references. A load requires the DDL of
+    its target and of the staging (and load-control) tables it reads, the
+    loads of every object its target depends on, and earlier loads of the
+    same target, which keeps per-source loads in priority order. Fan-out
+    scripts load every table mapped from their staging table.
+
+    Args:
+        spec: Top-level Spec model instance
+        filenames: Generated DDL and DML file names, in generation order
+
+    Returns:
+        Dictionary mapping each asset name to the sorted asset names it
+        depends on
+    """
+    graph = build_dependency_graph(spec)
+
+    # Staging and load-control tables read by the loads of each object, and
+    # the objects loaded by a fan-out script of each staging table. Knots
+    # whose values staging delivers read it too (change feeds add their
+    # knot values in their own script), as do ties and nexuses with staging
+    # mappings.
+    knot_tables = {knot.mnemonic: knot_table_name(knot) for knot in spec.knots}
+    reads: dict[str, set[str]] = {}
+    fanout_targets: dict[str, set[str]] = {}
+    for anchor in spec.anchors:
+        targets = {anchor_table_name(anchor)} | {
+            attribute_table_name(anchor, attr) for attr in anchor.attributes
+        }
+        if anchor.keymap:
+            targets.add(keymap_table_name(anchor))
+        for mapping in anchor.staging_mappings:
+            staging = staging_table_name(mapping)
+            source_tables = {staging}
+            if mapping.watermark_column or mapping.cdc is not None:
+                source_tables.add(LOAD_CONTROL_TABLE)
+            for target in targets:
+                reads.setdefault(target, set()).update(source_tables)
+            fanout_targets.setdefault(staging, set()).update(targets)
+            for attr in anchor.attributes:
+                keys = {attr.mnemonic, f"{anchor.mnemonic}_{attr.mnemonic}"}
+                knot_table = knot_tables.get(attr.knot_range or "")
+                if knot_table is None or not keys & mapping.knot_values.keys():
+                    continue
+                if mapping.cdc is not None:
+                    fanout_targets[staging].add(knot_table)
+                else:
+                    reads.setdefault(knot_table, set()).add(staging)
+
+    for tie in spec.ties:
+        for tie_mapping in tie.staging_mappings:
+            reads.setdefault(tie_table_name(tie), set()).add(
+                staging_table_name(tie_mapping)
+            )
+
+    for nexus in spec.nexuses:
+        targets = {nexus_table_name(nexus)} | {
+            attribute_table_name(nexus, attr) for attr in nexus.attributes
+        }
+        for mapping in nexus.staging_mappings:
+            source_tables = {staging_table_name(mapping)}
+            if mapping.watermark_column:
+                source_tables.add(LOAD_CONTROL_TABLE)
+            for target in targets:
+                reads.setdefault(target, set()).update(source_tables)
+            for attr in nexus.attributes:
+                keys = {attr.mnemonic, f"{nexus.mnemonic}_{attr.mnemonic}"}
+                knot_table = knot_tables.get(attr.knot_range or "")
+                if knot_table is not None and keys & mapping.knot_values.keys():
+                    reads.setdefault(knot_table, set()).add(staging_table_name(mapping))
+
+    ddl_assets: dict[str, str] = {}
+    loads: list[tuple[str, set[str]]] = []
+    for filename in filenames:
+        asset = filename.removesuffix(".sql")
+        node = file_node(filename, graph)
+        if asset == node:
+            ddl_assets[node] = asset
+        else:
+            loads.append((asset, fanout_targets.get(node, {node})))
+
+    loaders: dict[str, list[str]] = {}
+    for asset, targets in loads:
+        for target in targets:
+            loaders.setdefault(target, []).append(asset)
+
+    dependencies: dict[str, set[str]] = {
+        asset: {ddl_assets[dep] for dep in graph.get(node, set()) if dep in ddl_assets}
+        for node, asset in ddl_assets.items()
+    }
+    for asset, targets in loads:
+        required: set[str] = set()
+        for target in targets:
+            if target in ddl_assets:
+                required.add(ddl_assets[target])
+            for dep in graph.get(target, set()) | reads.get(target, set()):
+                if dep in ddl_assets:
+                    required.add(ddl_assets[dep])
+                if dep not in targets:  # loaded earlier by this same script
+                    required.update(loaders.get(dep, []))
+            same_target = loaders[target]
+            required.update(same_target[: same_target.index(asset)])
+        dependencies[asset] = required - {asset}
+
+    return {asset: sorted(deps) for asset, deps in dependencies.items()}
@@ -2,26 +2,46 @@
 
 # ruff: noqa: S608  # SQL strings are parsed by SQLGlot, not executed directly
 
+from typing import Any
+
 import sqlglot as sg
 import sqlglot.expressions as sge
 
+from data_architect.generation.columns import (
+    build_column_type,
+    build_natural_keyset_expr,
+    build_staging_keyset_expr,
+    watermark_columns,
+)
 from data_architect.generation.conflict import resolve_staging_order
 from data_architect.generation.naming import (
+    LOAD_CONTROL_TABLE,
     anchor_table_name,
     attribute_table_name,
+    attribute_value_column,
+    capture_instance_name,
+    keymap_sequence_name,
+    keymap_table_name,
+    knot_sequence_name,
     knot_table_name,
+    materialized_view_name,
+    nexus_table_name,
     staging_table_name,
     tie_table_name,
 )
+from data_architect.generation.views import build_materialized_refresh
 from data_architect.models.anchor import Anchor, Attribute
 from data_architect.models.knot import Knot
-from data_architect.models.spec import Spec
-from data_architect.models.staging import StagingMapping
-from data_architect.models.tie import Tie
+from data_architect.models.spec import Nexus, Spec
+from data_architect.models.staging import StagingMapping, TieStagingMapping
+from data_architect.models.tie import Role, Tie
+
+# Dialects loading with INSERT ... ON CONFLICT instead of MERGE
+_UPSERT_DIALECTS = ("postgres", "duckdb")
 
 
 def _build_metadata_id_expr(
-    anchor: Anchor,  # noqa: ARG001
+    anchor: Anchor | Nexus,  # noqa: ARG001
     mapping: StagingMapping | None,
     dialect: str,  # noqa: ARG001
 ) -> str:
@@ -32,7 +52,7 @@ def _build_metadata_id_expr(
     When no mapping is provided, returns the literal 'architect-generated'.
 
     Args:
-        anchor: Anchor model instance (unused when mapping provided,
+        anchor: Anchor or nexus model instance (unused when mapping provided,
             kept for API compat)
         mapping: Optional staging mapping
         dialect: Target SQL dialect (unused when mapping provided,
@@ -46,6 +66,566 @@ def _build_metadata_id_expr(
     return "source.keyset_id"
 
 
+def _build_source_relation(
+    target_table: str, source_table: str, mapping: StagingMapping | None
+) -> str:
+    """Build the staging relation a load reads from.
+
+    Full loads read the whole staging table. Incremental loads (mapping with a
+    watermark_column) read only the rows inside the window recorded in the
+    load-control table for this target: above the low watermark (or
+    everything, on the first run) and up to the high watermark.
+
+    Args:
+        target_table: Table being loaded (load-control key)
+        source_table: Staging table name (load-control key)
+        mapping: Optional staging mapping
+
+    Returns:
+        Table name or parenthesized SELECT for embedding in f-string SQL
+        templates before ``AS source``.
+    """
+    if mapping is None or mapping.watermark_column is None:
+        return source_table
+
+    low_col, high_col = watermark_columns(mapping)
+    watermark = mapping.watermark_column
+    return f"""(
+    SELECT staged.*
+    FROM {source_table} AS staged
+    INNER JOIN {LOAD_CONTROL_TABLE} AS watermark
+        ON watermark.target_table = '{target_table}'
+        AND watermark.source_table = '{source_table}'
+    WHERE (watermark.{low_col} IS NULL OR staged.{watermark} > watermark.{low_col})
+        AND staged.{watermark} <= watermark.{high_col}
+)"""
+
+
+def _build_dedup_relation(
+    source_relation: str,
+    key_columns: list[str],
+    mapping: StagingMapping | None,
+    dialect: str,
+    *,
+    recorded: bool | None = None,
+) -> str:
+    """Keep one staging row per target key.
+
+    Duplicate keys in a batch make MERGE fail (tsql, snowflake) or hit the
+    same row twice (postgres ON CONFLICT DO UPDATE). Rows are ranked per key
+    with ROW_NUMBER(), latest changed_at first when the staging table declares
+    one outside the key, then by the tiebreak column (highest wins), and only
+    the first row is kept.
+
+    User-provided staging tables (``stg_<table>`` read when no mapping
+    applies) need no column beyond those the load selects, so they are
+    ranked by the key itself and an arbitrary duplicate is kept.
+
+    Args:
+        source_relation: Staging table name or parenthesized SELECT
+        key_columns: Target key columns as named in staging
+        mapping: Optional staging mapping (tiebreak_column, declared columns)
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        recorded: Whether the relation is a generated staging table carrying
+            metadata_recorded_at. Defaults to whether a mapping is given.
+
+    Returns:
+        Parenthesized SELECT for embedding before ``AS source``
+    """
+    if recorded is None:
+        recorded = mapping is not None
+    if not recorded:
+        order_by = [f"staged.{col}" for col in key_columns]
+        return _keep_first_per_key(source_relation, key_columns, order_by, dialect)
+
+    order_by = []
+    declared = {col.name for col in mapping.columns} if mapping else set()
+    if "changed_at" in declared and "changed_at" not in key_columns:
+        order_by.append("staged.changed_at DESC")
+    tiebreak = (mapping.tiebreak_column if mapping else None) or (
+        "metadata_recorded_at"
+    )
+    order_by.append(f"staged.{tiebreak} DESC")
+
+    return _keep_first_per_key(source_relation, key_columns, order_by, dialect)
+
+
+def _keep_first_per_key(
+    relation: str, key_columns: list[str], order_by: list[str], dialect: str
+) -> str:
+    """Keep the first row per key of a relation in the given order.
+
+    Args:
+        relation: Table name or parenthesized SELECT, aliased ``staged``
+        key_columns: Key columns of the relation
+        order_by: ORDER BY items over ``staged`` (first row wins)
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        Parenthesized SELECT for embedding before ``AS source``
+    """
+    rank = (
+        f"ROW_NUMBER() OVER (PARTITION BY "
+        f"{', '.join(f'staged.{col}' for col in key_columns)} "
+        f"ORDER BY {', '.join(order_by)})"
+    )
+
+    if dialect == "snowflake":
+        return f"""(
+    SELECT staged.*
+    FROM {relation} AS staged
+    QUALIFY {rank} = 1
+)"""
+
+    return f"""(
+    SELECT ranked.*
+    FROM (
+        SELECT staged.*, {rank} AS dedup_rank
+        FROM {relation} AS staged
+    ) AS ranked
+    WHERE ranked.dedup_rank = 1
+)"""
+
+
+def _build_keymap_relation(anchor: Anchor, relation: str) -> str:
+    """Give staging rows the identity their keyset has in the anchor's key map.
+
+    Anchors without a key map read identities from staging unchanged. Rows
+    whose keyset has no identity yet (see build_keymap_insert) drop out.
+
+    Args:
+        anchor: Anchor model instance
+        relation: Staging table name or parenthesized SELECT with keyset_id
+
+    Returns:
+        The relation, or a parenthesized SELECT adding ``{mnemonic}_ID``
+    """
+    if not anchor.keymap:
+        return relation
+    identity_col = f"{anchor.mnemonic}_ID"
+    return f"""(
+    SELECT staged.*, keymap.{identity_col} AS {identity_col}
+    FROM {relation} AS staged
+    INNER JOIN {keymap_table_name(anchor)} AS keymap
+        ON keymap.keyset_id = staged.keyset_id
+)"""
+
+
+def _next_identity(sequence: str, order: str, dialect: str) -> str:
+    """Render the next value of a sequence, one per row.
+
+    Args:
+        sequence: Sequence name
+        order: Expression numbering the rows, where the dialect supports it
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQL expression drawing from the sequence
+    """
+    if dialect == "tsql":
+        return f"NEXT VALUE FOR {sequence} OVER (ORDER BY {order})"
+    if dialect == "snowflake":
+        return f"{sequence}.NEXTVAL"
+    return f"NEXTVAL('{sequence}')"
+
+
+def build_keymap_insert(
+    anchor: Anchor, relations: list[str], dialect: str
+) -> sge.Expression:
+    """Build INSERT assigning identities to the keysets an anchor's key map lacks.
+
+    New keysets get identities from the key map's sequence, in one statement
+    per batch, so concurrent loads never assign the same identity. A keyset
+    a concurrent load inserted first keeps that load's identity: the keyset
+    is the primary key, skipped on conflict (held locked on SQL Server).
+    Run before the anchor and attribute loads that read identities from the
+    key map.
+
+    Args:
+        anchor: Anchor model instance with an integer identity
+        relations: Staging table names or parenthesized SELECTs with keyset_id
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot AST node for INSERT ... SELECT
+
+    Raises:
+        ValueError: If the anchor identity is not an integer type
+    """
+    target_table = keymap_table_name(anchor)
+    identity_col = f"{anchor.mnemonic}_ID"
+
+    identity = build_column_type(anchor.identity, dialect)
+    if not identity.is_type(*sge.DataType.INTEGER_TYPES):
+        msg = (
+            f"{target_table}: key maps need an integer anchor identity, "
+            f"not {anchor.identity}"
+        )
+        raise ValueError(msg)
+
+    keysets = "\n    UNION\n    ".join(
+        f"SELECT DISTINCT staged.keyset_id FROM {relation} AS staged "
+        "WHERE staged.keyset_id IS NOT NULL"
+        for relation in relations
+    )
+    next_identity = _next_identity(
+        keymap_sequence_name(anchor), "source.keyset_id", dialect
+    )
+    hint = " WITH (UPDLOCK, HOLDLOCK)" if dialect == "tsql" else ""
+    conflict = (
+        "ON CONFLICT (keyset_id) DO NOTHING" if dialect in _UPSERT_DIALECTS else ""
+    )
+    sql = f"""
+INSERT INTO {target_table} (
+    keyset_id,
+    {identity_col},
+    metadata_recorded_at,
+    metadata_recorded_by,
+    metadata_id
+)
+SELECT
+    source.keyset_id,
+    {next_identity} AS {identity_col},
+    CURRENT_TIMESTAMP AS metadata_recorded_at,
+    'architect' AS metadata_recorded_by,
+    source.keyset_id AS metadata_id
+FROM (
+    {keysets}
+) AS source
+WHERE NOT EXISTS (
+    SELECT 1 FROM {target_table} AS keymap{hint}
+    WHERE keymap.keyset_id = source.keyset_id
+)
+{conflict}
+"""
+
+    return sg.parse_one(sql, dialect=dialect)
+
+
+def build_watermark_advance(
+    target_table: str, mapping: StagingMapping, dialect: str
+) -> sge.Expression:
+    """Build statement advancing the load window of an incremental load.
+
+    The previous high watermark becomes the low watermark and the current
+    maximum of the staging watermark column becomes the high watermark
+    (kept as-is when the staging table is empty). Run in the same
+    transaction as the load so the window and the loaded rows commit
+    together.
+
+    Args:
+        target_table: Table being loaded
+        mapping: Staging mapping with a watermark_column
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot AST node for MERGE or INSERT...ON CONFLICT
+    """
+    source_table = staging_table_name(mapping)
+    low_col, high_col = watermark_columns(mapping)
+    watermark = mapping.watermark_column
+
+    if dialect in _UPSERT_DIALECTS:
+        sql = f"""
+INSERT INTO {LOAD_CONTROL_TABLE} (
+    target_table,
+    source_table,
+    {high_col},
+    advanced_at
+)
+SELECT
+    '{target_table}' AS target_table,
+    '{source_table}' AS source_table,
+    MAX({watermark}) AS {high_col},
+    CURRENT_TIMESTAMP AS advanced_at
+FROM {source_table}
+ON CONFLICT (target_table, source_table) DO UPDATE SET
+    {low_col} = {LOAD_CONTROL_TABLE}.{high_col},
+    {high_col} = COALESCE(EXCLUDED.{high_col}, {LOAD_CONTROL_TABLE}.{high_col}),
+    advanced_at = EXCLUDED.advanced_at
+"""
+    else:
+        sql = f"""
+MERGE INTO {LOAD_CONTROL_TABLE} AS target
+USING (
+    SELECT MAX({watermark}) AS {high_col}
+    FROM {source_table}
+) AS source
+ON target.target_table = '{target_table}'
+   AND target.source_table = '{source_table}'
+WHEN MATCHED THEN
+    UPDATE SET
+        {low_col} = target.{high_col},
+        {high_col} = COALESCE(source.{high_col}, target.{high_col}),
+        advanced_at = CURRENT_TIMESTAMP
+WHEN NOT MATCHED THEN
+    INSERT (
+        target_table,
+        source_table,
+        {high_col},
+        advanced_at
+    )
+    VALUES (
+        '{target_table}',
+        '{source_table}',
+        source.{high_col},
+        CURRENT_TIMESTAMP
+    )
+"""
+
+    return sg.parse_one(sql, dialect=dialect)
+
+
+def _render_script(statements: list[sge.Expression], dialect: str) -> str:
+    """Render several statements as one transactional SQL script.
+
+    Args:
+        statements: Statements to run, in order
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQL script: BEGIN; statements...; COMMIT;
+    """
+    script = [sge.Transaction(), *statements, sge.Commit()]
+    return ";\n\n".join(stmt.sql(dialect=dialect, pretty=True) for stmt in script) + ";"
+
+
+def _render_load(
+    ast: sge.Expression,
+    target_table: str,
+    mappings: list[StagingMapping],
+    dialect: str,
+) -> str:
+    """Render a load statement, wrapping incremental loads in a transaction.
+
+    Args:
+        ast: Load statement
+        target_table: Table being loaded
+        mappings: Staging mappings the load reads from
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQL script: the bare load, or BEGIN; advance...; load; COMMIT; when
+        any mapping has a watermark_column
+    """
+    incremental = [m for m in mappings if m.watermark_column is not None]
+    if not incremental:
+        return ast.sql(dialect=dialect, pretty=True)
+
+    advances = [build_watermark_advance(target_table, m, dialect) for m in incremental]
+    return _render_script([*advances, ast], dialect)
+
+
+def allows_restatements(metadata: dict[str, Any] | None) -> bool:
+    """Check whether a historized attribute or tie accepts restatements.
+
+    Follows the Anchor Modeling ``restatable`` metadata flag: restatements
+    (a new version repeating the value of the previous one) are allowed
+    unless the construct's metadata sets ``restatable`` to false. Values
+    imported from XML arrive as strings, YAML values as booleans.
+
+    Args:
+        metadata: Attribute or tie metadata dict
+
+    Returns:
+        False when restatements must be suppressed, True otherwise
+    """
+    if not metadata or "restatable" not in metadata:
+        return True
+    restatable = metadata["restatable"]
+    if isinstance(restatable, str):
+        return restatable.strip().lower() not in ("false", "0", "no")
+    return bool(restatable)
+
+
+def _is_distinct(left: str, right: str, dialect: str) -> str:
+    """Build a NULL-safe inequality predicate."""
+    if dialect == "tsql":
+        # IS DISTINCT FROM needs SQL Server 2022; EXCEPT compares NULL-safely
+        return f"EXISTS (SELECT {left} EXCEPT SELECT {right})"
+    return f"{left} IS DISTINCT FROM {right}"
+
+
+def _build_restatement_filter(
+    target_table: str,
+    batch_sql: str,
+    partition_columns: list[str],
+    value_columns: list[str],
+    dialect: str,
+) -> str:
+    """Build a staging relation with restatements removed.
+
+    Batch rows are combined with the existing versions of their keys, from
+    the version in effect at the earliest staged changed_at onwards, and
+    ranked once in changed_at order. Consecutive versions with equal values
+    form a run; a batch row survives only if it starts its run and the run
+    holds no existing version. This rejects rows repeating their previous
+    version and late-arriving rows that the next existing version would
+    repeat, which enforces the Anchor Modeling restatement constraint both
+    against the table and within the batch.
+
+    Args:
+        target_table: Historized table being loaded
+        batch_sql: SELECT over staging producing the partition and value
+            columns, changed_at, metadata_id and ``0 AS is_existing``
+        partition_columns: Columns identifying a history (e.g. anchor FK)
+        value_columns: Columns whose repetition is a restatement
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        Parenthesized SELECT for embedding before ``AS source``
+    """
+    columns = [*partition_columns, *value_columns, "changed_at", "metadata_id"]
+    partition = ", ".join(partition_columns)
+    # Both branches of the UNION ALL name their columns in the same order
+    batch_columns = ", ".join(f"batch.{col}" for col in columns)
+    existing_columns = ", ".join(f"existing.{col}" for col in columns)
+    bounds_match = " AND ".join(
+        f"bounds.{col} = existing.{col}" for col in partition_columns
+    )
+    prior_match = " AND ".join(
+        f"prior.{col} = bounds.{col}" for col in partition_columns
+    )
+    order = "ORDER BY changed_at, is_existing DESC"
+    window = f"PARTITION BY {partition} {order}"
+    previous_values = "".join(
+        f",\n                        LAG({col}) OVER ({window}) AS previous_{col}"
+        for col in value_columns
+    )
+    changed = " OR ".join(
+        [
+            "ranked.version_number = 1",
+            *(
+                _is_distinct(f"ranked.{col}", f"ranked.previous_{col}", dialect)
+                for col in value_columns
+            ),
+        ]
+    )
+    selected = ", ".join(f"compared.{col}" for col in columns)
+
+    return f"""(
+    WITH batch AS (
+        {batch_sql}
+    ),
+    bounds AS (
+        SELECT {partition}, MIN(changed_at) AS first_changed_at
+        FROM batch
+        GROUP BY {partition}
+    )
+    SELECT {selected}
+    FROM (
+        SELECT
+            runs.*,
+            MAX(runs.is_existing) OVER (
+                PARTITION BY {partition}, runs.run_number
+            ) AS run_has_existing
+        FROM (
+            SELECT
+                starts.*,
+                SUM(starts.run_start) OVER (
+                    {window} ROWS UNBOUNDED PRECEDING
+                ) AS run_number
+            FROM (
+                SELECT
+                    ranked.*,
+                    CASE WHEN {changed} THEN 1 ELSE 0 END AS run_start
+                FROM (
+                    SELECT
+                        versions.*,
+                        ROW_NUMBER() OVER ({window}) AS version_number{previous_values}
+                    FROM (
+                        SELECT {batch_columns}, batch.is_existing FROM batch
+                        UNION ALL
+                        SELECT {existing_columns}, 1 AS is_existing
+                        FROM {target_table} AS existing
+                        INNER JOIN bounds ON {bounds_match}
+                        WHERE existing.changed_at >= COALESCE(
+                            (
+                                SELECT MAX(prior.changed_at)
+                                FROM {target_table} AS prior
+                                WHERE {prior_match}
+                                    AND prior.changed_at <= bounds.first_changed_at
+                            ),
+                            bounds.first_changed_at
+                        )
+                    ) AS versions
+                ) AS ranked
+            ) AS starts
+        ) AS runs
+    ) AS compared
+    WHERE compared.is_existing = 0
+        AND compared.run_start = 1
+        AND compared.run_has_existing = 0
+)"""
+
+
+def _build_anchor_load(
+    target_table: str,
+    identity_col: str,
+    source_relation: str,
+    metadata_id_sql: str,
+    dialect: str,
+    role_columns: list[str] | None = None,
+) -> sge.Expression:
+    """Build the anchor load statement over a prepared staging relation.
+
+    Args:
+        target_table: Anchor table name
+        identity_col: Anchor identity column
+        source_relation: Staging table name or parenthesized SELECT
+        metadata_id_sql: metadata_id expression over ``source``
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        role_columns: Role columns inserted along with the identity (nexuses)
+
+    Returns:
+        SQLGlot AST node for MERGE or INSERT...ON CONFLICT
+    """
+    columns = [identity_col, *(role_columns or [])]
+    column_list = ",\n    ".join(columns)
+    source_list = ",\n    ".join(f"source.{col}" for col in columns)
+
+    # For PostgreSQL: Use INSERT...ON CONFLICT DO NOTHING
+    # Anchors are identity-only, so no updates needed
+    if dialect in _UPSERT_DIALECTS:
+        sql = f"""
+INSERT INTO {target_table} (
+    {column_list},
+    metadata_recorded_at,
+    metadata_recorded_by,
+    metadata_id
+)
+SELECT
+    {source_list},
+    CURRENT_TIMESTAMP AS metadata_recorded_at,
+    'architect' AS metadata_recorded_by,
+    {metadata_id_sql} AS metadata_id
+FROM {source_relation} AS source
+ON CONFLICT ({identity_col}) DO NOTHING
+"""
+    else:
+        # For SQL Server / Snowflake: Use MERGE with WHEN NOT MATCHED
+        sql = f"""
+MERGE INTO {target_table} AS target
+USING {source_relation} AS source
+ON target.{identity_col} = source.{identity_col}
+WHEN NOT MATCHED THEN
+    INSERT (
+        {column_list},
+        metadata_recorded_at,
+        metadata_recorded_by,
+        metadata_id
+    )
+    VALUES (
+        {source_list},
+        CURRENT_TIMESTAMP,
+        'architect',
+        {metadata_id_sql}
+    )
+"""
+
+    return sg.parse_one(sql, dialect=dialect)
+
+
 def build_anchor_merge(
     anchor: Anchor, dialect: str, mapping: StagingMapping | None = None
 ) -> sge.Expression:
@@ -70,206 +650,865 @@ def build_anchor_merge(
         source_table = staging_table_name(anchor.staging_mappings[0])
     else:
         source_table = f"stg_{target_table}"
+    source_relation = _build_dedup_relation(
+        _build_keymap_relation(
+            anchor, _build_source_relation(target_table, source_table, mapping)
+        ),
+        [identity_col],
+        mapping,
+        dialect,
+        recorded=mapping is not None or bool(anchor.staging_mappings),
+    )
 
     # Build metadata_id expression (keyset if mapping provided, else fallback)
     metadata_id_sql = _build_metadata_id_expr(anchor, mapping, dialect)
 
-    # For PostgreSQL: Use INSERT...ON CONFLICT DO NOTHING
-    # Anchors are identity-only, so no updates needed
-    if dialect == "postgres":
-        sql = f"""
+    return _build_anchor_load(
+        target_table, identity_col, source_relation, metadata_id_sql, dialect
+    )
+
+
+def staging_value_column(
+    anchor: Anchor | Nexus, attribute: Attribute, mapping: StagingMapping | None
+) -> str:
+    """Resolve the staging column holding an attribute's value.
+
+    column_mappings may be keyed by the attribute mnemonic ("NAM") or by the
+    anchor-qualified mnemonic ("CU_NAM"); the plain mnemonic wins if both
+    are present.
+
+    Args:
+        anchor: Parent anchor or nexus model instance
+        attribute: Attribute model instance
+        mapping: Optional staging mapping with column_mappings
+
+    Returns:
+        Mapped staging column, or the target value column name by default
+    """
+    if mapping and mapping.column_mappings:
+        for key in (attribute.mnemonic, f"{anchor.mnemonic}_{attribute.mnemonic}"):
+            if key in mapping.column_mappings:
+                return mapping.column_mappings[key]
+    return attribute_value_column(anchor, attribute)  # Default: same as target
+
+
+def knot_value_column(
+    anchor: Anchor | Nexus, attribute: Attribute, mapping: StagingMapping | None
+) -> str | None:
+    """Resolve the staging column holding a knotted attribute's knot values.
+
+    knot_values is keyed like column_mappings (plain mnemonic first).
+
+    Args:
+        anchor: Parent anchor or nexus model instance
+        attribute: Attribute model instance
+        mapping: Optional staging mapping with knot_values
+
+    Returns:
+        Staging column with knot values, or None when staging holds knot IDs
+    """
+    if attribute.knot_range and mapping and mapping.knot_values:
+        for key in (attribute.mnemonic, f"{anchor.mnemonic}_{attribute.mnemonic}"):
+            if key in mapping.knot_values:
+                return mapping.knot_values[key]
+    return None
+
+
+def _find_knot(
+    anchor: Anchor | Nexus, attribute: Attribute, knots: list[Knot] | None
+) -> Knot:
+    """Look up the knot of a knotted attribute, failing when it is not given."""
+    for knot in knots or []:
+        if knot.mnemonic == attribute.knot_range:
+            return knot
+    table = attribute_table_name(anchor, attribute)
+    msg = f"{table}: knot '{attribute.knot_range}' is needed to resolve knot values"
+    raise ValueError(msg)
+
+
+def _staging_value(
+    anchor: Anchor | Nexus,
+    attribute: Attribute,
+    mapping: StagingMapping | None,
+    source_relation: str,
+    knots: list[Knot] | None,
+) -> tuple[str, str]:
+    """Resolve the relation and column holding an attribute's staged value.
+
+    When the mapping delivers knot values instead of IDs, the relation is
+    inner-joined to the knot table on its (unique) value column, an
+    equi-join engines run as a hash join, and the value column becomes the
+    resolved knot ID. Rows without a value are dropped; the knot load adds
+    values that are missing before the attribute loads run.
+
+    Args:
+        anchor: Parent anchor or nexus model instance
+        attribute: Attribute model instance
+        mapping: Optional staging mapping
+        source_relation: Prepared (deduplicated) staging relation
+        knots: Knots of the spec, needed when knot values are mapped
+
+    Returns:
+        Tuple of (relation, column of ``source`` holding the value)
+    """
+    knot_value_col = knot_value_column(anchor, attribute, mapping)
+    if knot_value_col is None:
+        return source_relation, staging_value_column(anchor, attribute, mapping)
+
+    knot = _find_knot(anchor, attribute, knots)
+    relation = f"""(
+    SELECT
+        staged.*,
+        knot.{knot.mnemonic}_ID AS resolved_knot_id
+    FROM {source_relation} AS staged
+    INNER JOIN {knot_table_name(knot)} AS knot
+        ON knot.{knot.mnemonic}_{knot.descriptor} = staged.{knot_value_col}
+)"""
+    return relation, "resolved_knot_id"
+
+
+def _build_attribute_load(
+    anchor: Anchor | Nexus,
+    attribute: Attribute,
+    source_relation: str,
+    staging_value_col: str,
+    metadata_id_sql: str,
+    dialect: str,
+) -> sge.Expression:
+    """Build the attribute load statement over a prepared staging relation.
+
+    Args:
+        anchor: Parent anchor or nexus model instance
+        attribute: Attribute model instance
+        source_relation: Staging table name or parenthesized SELECT
+        staging_value_col: Column of ``source`` holding the value
+        metadata_id_sql: metadata_id expression over ``source``
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot AST node for MERGE or INSERT...ON CONFLICT
+    """
+    target_table = attribute_table_name(anchor, attribute)
+    anchor_fk = f"{anchor.mnemonic}_ID"
+    value_col = attribute_value_column(anchor, attribute)
+
+    # Historized attributes that forbid restatements read a staging relation
+    # from which repeated values were removed; its columns already carry the
+    # target names and the resolved metadata_id.
+    if attribute.time_range and not allows_restatements(attribute.metadata_):
+        batch_sql = (
+            f"SELECT source.{anchor_fk} AS {anchor_fk}, "
+            f"source.{staging_value_col} AS {value_col}, "
+            "source.changed_at AS changed_at, "
+            f"{metadata_id_sql} AS metadata_id, 0 AS is_existing "
+            f"FROM {source_relation} AS source"
+        )
+        source_relation = _build_restatement_filter(
+            target_table, batch_sql, [anchor_fk], [value_col], dialect
+        )
+        staging_value_col = value_col
+        metadata_id_sql = "source.metadata_id"
+
+    # Check if historized (has time_range)
+    if attribute.time_range:
+        # Historized: Append-only SCD2 pattern
+        # In Anchor Modeling, we never update old rows, we just insert new ones
+        if dialect in _UPSERT_DIALECTS:
+            sql = f"""
 INSERT INTO {target_table} (
-    {identity_col},
+    {anchor_fk},
+    {value_col},
+    changed_at,
+    recorded_at,
     metadata_recorded_at,
     metadata_recorded_by,
     metadata_id
 )
 SELECT
-    source.{identity_col},
+    source.{anchor_fk},
+    source.{staging_value_col} AS {value_col},
+    source.changed_at,
+    CURRENT_TIMESTAMP AS recorded_at,
     CURRENT_TIMESTAMP AS metadata_recorded_at,
     'architect' AS metadata_recorded_by,
     {metadata_id_sql} AS metadata_id
-FROM {source_table} AS source
-ON CONFLICT ({identity_col}) DO NOTHING
+FROM {source_relation} AS source
+ON CONFLICT ({anchor_fk}, changed_at) DO NOTHING
+"""
+        else:
+            sql = f"""
+MERGE INTO {target_table} AS target
+USING {source_relation} AS source
+ON target.{anchor_fk} = source.{anchor_fk}
+   AND target.changed_at = source.changed_at
+WHEN NOT MATCHED THEN
+    INSERT (
+        {anchor_fk},
+        {value_col},
+        changed_at,
+        recorded_at,
+        metadata_recorded_at,
+        metadata_recorded_by,
+        metadata_id
+    )
+    VALUES (
+        source.{anchor_fk},
+        source.{staging_value_col},
+        source.changed_at,
+        CURRENT_TIMESTAMP,
+        CURRENT_TIMESTAMP,
+        'architect',
+        {metadata_id_sql}
+    )
 """
     else:
-        # For SQL Server / Snowflake: Use MERGE with WHEN NOT MATCHED
-        sql = f"""
+        # Static: Simple UPSERT
+        if dialect in _UPSERT_DIALECTS:
+            sql = f"""
+INSERT INTO {target_table} (
+    {anchor_fk},
+    {value_col},
+    metadata_recorded_at,
+    metadata_recorded_by,
+    metadata_id
+)
+SELECT
+    source.{anchor_fk},
+    source.{staging_value_col} AS {value_col},
+    CURRENT_TIMESTAMP AS metadata_recorded_at,
+    'architect' AS metadata_recorded_by,
+    {metadata_id_sql} AS metadata_id
+FROM {source_relation} AS source
+ON CONFLICT ({anchor_fk}) DO UPDATE SET
+    {value_col} = EXCLUDED.{value_col},
+    metadata_recorded_at = EXCLUDED.metadata_recorded_at,
+    metadata_recorded_by = EXCLUDED.metadata_recorded_by,
+    metadata_id = EXCLUDED.metadata_id
+"""
+        else:
+            sql = f"""
 MERGE INTO {target_table} AS target
-USING {source_table} AS source
-ON target.{identity_col} = source.{identity_col}
+USING {source_relation} AS source
+ON target.{anchor_fk} = source.{anchor_fk}
+WHEN MATCHED THEN
+    UPDATE SET
+        {value_col} = source.{staging_value_col},
+        metadata_recorded_at = CURRENT_TIMESTAMP,
+        metadata_recorded_by = 'architect',
+        metadata_id = {metadata_id_sql}
+WHEN NOT MATCHED THEN
+    INSERT (
+        {anchor_fk},
+        {value_col},
+        metadata_recorded_at,
+        metadata_recorded_by,
+        metadata_id
+    )
+    VALUES (
+        source.{anchor_fk},
+        source.{staging_value_col},
+        CURRENT_TIMESTAMP,
+        'architect',
+        {metadata_id_sql}
+    )
+"""
+
+    return sg.parse_one(sql, dialect=dialect)
+
+
+def build_attribute_merge(
+    anchor: Anchor | Nexus,
+    attribute: Attribute,
+    dialect: str,
+    mapping: StagingMapping | None = None,
+    knots: list[Knot] | None = None,
+) -> sge.Expression:
+    """Build MERGE/UPSERT statement for attribute loading.
+
+    Args:
+        anchor: Parent anchor or nexus model instance
+        attribute: Attribute model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        mapping: Optional specific staging mapping. If None, uses first
+            mapping or default.
+        knots: Knots of the spec, needed when the mapping delivers knot
+            values instead of IDs
+
+    Returns:
+        SQLGlot AST node for MERGE or INSERT...ON CONFLICT
+    """
+    target_table = attribute_table_name(anchor, attribute)
+    anchor_fk = f"{anchor.mnemonic}_ID"
+
+    # Get staging table name from mapping parameter, first mapping, or default
+    if mapping is not None:
+        source_table = staging_table_name(mapping)
+    elif anchor.staging_mappings:
+        source_table = staging_table_name(anchor.staging_mappings[0])
+    elif isinstance(anchor, Anchor):
+        source_table = f"stg_{anchor_table_name(anchor)}"
+    else:
+        source_table = f"stg_{nexus_table_name(anchor)}"
+    key_columns = [anchor_fk, "changed_at"] if attribute.time_range else [anchor_fk]
+    source_relation = _build_source_relation(target_table, source_table, mapping)
+    if isinstance(anchor, Anchor):
+        source_relation = _build_keymap_relation(anchor, source_relation)
+    source_relation = _build_dedup_relation(
+        source_relation,
+        key_columns,
+        mapping,
+        dialect,
+        recorded=mapping is not None or bool(anchor.staging_mappings),
+    )
+    source_relation, staging_value_col = _staging_value(
+        anchor, attribute, mapping, source_relation, knots
+    )
+
+    # Build metadata_id expression (keyset if mapping provided, else fallback)
+    metadata_id_sql = _build_metadata_id_expr(anchor, mapping, dialect)
+
+    return _build_attribute_load(
+        anchor, attribute, source_relation, staging_value_col, metadata_id_sql, dialect
+    )
+
+
+def _build_consolidated_source(
+    anchor: Anchor,
+    attribute: Attribute | None,
+    dialect: str,
+    knots: list[Knot] | None = None,
+) -> str:
+    """Build one staging relation over all mappings of a multi-source anchor.
+
+    Each mapping contributes its (incremental, deduplicated) rows renamed to
+    the target columns, with its resolved metadata_id and its position in
+    resolve_staging_order as source_rank. Per key the highest-priority
+    source wins, so the target is probed once instead of once per source.
+
+    Args:
+        anchor: Anchor with staging mappings
+        attribute: Attribute being loaded, or None for the anchor load
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        knots: Knots of the spec, needed when mappings deliver knot values
+
+    Returns:
+        Parenthesized SELECT for embedding before ``AS source``
+    """
+    anchor_fk = f"{anchor.mnemonic}_ID"
+    if attribute is None:
+        target_table = anchor_table_name(anchor)
+        key_columns = [anchor_fk]
+    else:
+        target_table = attribute_table_name(anchor, attribute)
+        key_columns = [anchor_fk, "changed_at"] if attribute.time_range else [anchor_fk]
+
+    branches = []
+    for rank, mapping in enumerate(resolve_staging_order(anchor.staging_mappings)):
+        relation = _build_dedup_relation(
+            _build_keymap_relation(
+                anchor,
+                _build_source_relation(
+                    target_table, staging_table_name(mapping), mapping
+                ),
+            ),
+            key_columns,
+            mapping,
+            dialect,
+        )
+        columns = [f"source.{col} AS {col}" for col in key_columns]
+        if attribute is not None:
+            relation, staging_value_col = _staging_value(
+                anchor, attribute, mapping, relation, knots
+            )
+            value_col = attribute_value_column(anchor, attribute)
+            columns.append(f"source.{staging_value_col} AS {value_col}")
+        columns.append(
+            f"{_build_metadata_id_expr(anchor, mapping, dialect)} AS metadata_id"
+        )
+        columns.append(f"{rank} AS source_rank")
+        branches.append(f"SELECT {', '.join(columns)} FROM {relation} AS source")
+
+    union = "\n    UNION ALL\n    ".join(branches)
+    return _keep_first_per_key(
+        f"(\n    {union}\n)", key_columns, ["staged.source_rank"], dialect
+    )
+
+
+def build_consolidated_anchor_merge(anchor: Anchor, dialect: str) -> sge.Expression:
+    """Build a single MERGE/UPSERT loading an anchor from all its sources.
+
+    Args:
+        anchor: Anchor model instance with staging mappings
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot AST node for MERGE or INSERT...ON CONFLICT
+    """
+    return _build_anchor_load(
+        anchor_table_name(anchor),
+        f"{anchor.mnemonic}_ID",
+        _build_consolidated_source(anchor, None, dialect),
+        "source.metadata_id",
+        dialect,
+    )
+
+
+def build_consolidated_attribute_merge(
+    anchor: Anchor,
+    attribute: Attribute,
+    dialect: str,
+    knots: list[Knot] | None = None,
+) -> sge.Expression:
+    """Build a single MERGE/UPSERT loading an attribute from all anchor sources.
+
+    Args:
+        anchor: Parent anchor model instance with staging mappings
+        attribute: Attribute model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        knots: Knots of the spec, needed when mappings deliver knot values
+
+    Returns:
+        SQLGlot AST node for MERGE or INSERT...ON CONFLICT
+    """
+    return _build_attribute_load(
+        anchor,
+        attribute,
+        _build_consolidated_source(anchor, attribute, dialect, knots),
+        attribute_value_column(anchor, attribute),
+        "source.metadata_id",
+        dialect,
+    )
+
+
+def _fanout_table_name(source_table: str, dialect: str) -> str:
+    """Name of the session-scoped copy of a staging batch."""
+    prefix = "#" if dialect == "tsql" else ""
+    return f"{prefix}tmp_{source_table}"
+
+
+def build_staging_fanout(
+    sources: list[tuple[Anchor, StagingMapping]],
+    dialect: str,
+    knots: list[Knot] | None = None,
+) -> list[sge.Expression]:
+    """Build statements loading every target fed by one staging table.
+
+    The staging batch (the watermark window for incremental mappings) is
+    scanned once into a temporary table, then each anchor and all its
+    attributes are loaded from that copy with their usual semantics: anchors
+    insert new identities, static attributes upsert, historized attributes
+    append (suppressing restatements when configured). Each load still
+    deduplicates per its own key.
+
+    Args:
+        sources: (anchor, mapping) pairs whose mapping reads the same staging
+            table; the first mapping's watermark_column drives the window
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        knots: Knots of the spec, needed when mappings deliver knot values
+
+    Returns:
+        Statements to run in order, including temp table creation and drop.
+        On Snowflake the first (creation) and last (drop) statements are
+        DDL, which must run outside the script's transaction (see
+        _render_fanout_script).
+    """
+    first_anchor, first_mapping = sources[0]
+    source_table = staging_table_name(first_mapping)
+    tmp_table = _fanout_table_name(source_table, dialect)
+    batch_relation = _build_source_relation(
+        anchor_table_name(first_anchor), source_table, first_mapping
+    )
+
+    batch_sql = f"SELECT staged.* FROM {batch_relation} AS staged"
+    if dialect == "snowflake":
+        # DDL commits implicitly on Snowflake: the empty copy is created
+        # (before the transaction) apart from the batch it is filled with
+        statements = [
+            sg.parse_one(
+                f"CREATE OR REPLACE TEMPORARY TABLE {tmp_table} AS {batch_sql} LIMIT 0",
+                dialect=dialect,
+            ),
+            sg.parse_one(f"INSERT INTO {tmp_table} {batch_sql}", dialect=dialect),
+        ]
+    else:
+        if dialect == "tsql":
+            copy_sql = (
+                f"SELECT staged.* INTO {tmp_table} FROM {batch_relation} AS staged"
+            )
+        else:
+            copy_sql = f"CREATE TEMPORARY TABLE {tmp_table} AS {batch_sql}"
+        statements = [
+            sg.parse_one(f"DROP TABLE IF EXISTS {tmp_table}", dialect=dialect),
+            sg.parse_one(copy_sql, dialect=dialect),
+        ]
+
+    for anchor, mapping in sources:
+        identity_col = f"{anchor.mnemonic}_ID"
+        metadata_id_sql = _build_metadata_id_expr(anchor, mapping, dialect)
+        if anchor.keymap:
+            statements.append(build_keymap_insert(anchor, [tmp_table], dialect))
+        batch = _build_keymap_relation(anchor, tmp_table)
+        statements.append(
+            _build_anchor_load(
+                anchor_table_name(anchor),
+                identity_col,
+                _build_dedup_relation(batch, [identity_col], mapping, dialect),
+                metadata_id_sql,
+                dialect,
+            )
+        )
+        for attr in sorted(anchor.attributes, key=lambda at: at.mnemonic):
+            key_columns = (
+                [identity_col, "changed_at"] if attr.time_range else [identity_col]
+            )
+            relation, staging_value_col = _staging_value(
+                anchor,
+                attr,
+                mapping,
+                _build_dedup_relation(batch, key_columns, mapping, dialect),
+                knots,
+            )
+            statements.append(
+                _build_attribute_load(
+                    anchor, attr, relation, staging_value_col, metadata_id_sql, dialect
+                )
+            )
+
+    statements.append(sg.parse_one(f"DROP TABLE {tmp_table}", dialect=dialect))
+    return statements
+
+
+def _render_fanout_script(
+    statements: list[sge.Expression],
+    advances: list[sge.Expression],
+    dialect: str,
+) -> str:
+    """Render a fan-out script with its watermark advances.
+
+    The advances run first in the transaction, before the batch is copied.
+    On Snowflake, where DDL implicitly commits, the temp table is created
+    before the transaction and dropped after it, so the advances and the
+    loads commit together.
+
+    Args:
+        statements: Statements from build_staging_fanout
+        advances: Watermark advances of the script's window
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQL script
+    """
+    if dialect != "snowflake":
+        return _render_script([*advances, *statements], dialect)
+    create, *loads, drop = statements
+    return (
+        ";\n\n".join(
+            [
+                create.sql(dialect=dialect, pretty=True),
+                _render_script([*advances, *loads], dialect).removesuffix(";"),
+                drop.sql(dialect=dialect, pretty=True),
+            ]
+        )
+        + ";"
+    )
+
+
+def _build_change_relation(
+    anchor: Anchor, mapping: StagingMapping, dialect: str, deleted: bool = False
+) -> str:
+    """Build the change set of a CDC mapping as a staging relation.
+
+    Rows carry the captured columns plus keyset_id, metadata_recorded_at and
+    cdc_operation ('I', 'U' or 'D'). Snowflake reads the stream named after
+    the staging table, keeping the after-image of updates. SQL Server reads
+    the net changes inside the time window recorded in the load-control
+    table (see build_cdc_advance), mapped to LSNs.
+
+    Args:
+        anchor: Anchor model instance (for the keyset)
+        mapping: Staging mapping with a cdc source
+        dialect: Target SQL dialect ("snowflake" or "tsql")
+        deleted: Return deleted rows instead of inserted and updated ones
+
+    Returns:
+        Parenthesized SELECT for embedding before ``AS source``
+
+    Raises:
+        ValueError: If the dialect has no change feed to consume
+    """
+    table = staging_table_name(mapping)
+    keyset = build_staging_keyset_expr(anchor, mapping, dialect).sql(dialect=dialect)
+
+    if dialect == "snowflake":
+        action = (
+            "changes.METADATA$ACTION = 'DELETE' AND NOT changes.METADATA$ISUPDATE"
+            if deleted
+            else "changes.METADATA$ACTION = 'INSERT'"
+        )
+        return f"""(
+    SELECT
+        changes.*,
+        {keyset} AS keyset_id,
+        CURRENT_TIMESTAMP AS metadata_recorded_at,
+        CASE
+            WHEN changes.METADATA$ACTION = 'DELETE' THEN 'D'
+            WHEN changes.METADATA$ISUPDATE THEN 'U'
+            ELSE 'I'
+        END AS cdc_operation
+    FROM {table} AS changes
+    WHERE {action}
+)"""
+
+    if dialect != "tsql":
+        msg = f"{table}: CDC sources require snowflake or tsql"
+        raise ValueError(msg)
+
+    instance = capture_instance_name(mapping)
+    operation = "= 1" if deleted else "<> 1"
+    return f"""(
+    SELECT
+        changes.*,
+        {keyset} AS keyset_id,
+        CURRENT_TIMESTAMP AS metadata_recorded_at,
+        CASE changes.__$operation WHEN 1 THEN 'D' WHEN 2 THEN 'I' ELSE 'U' END
+            AS cdc_operation
+    FROM (
+        SELECT low_watermark_ts, high_watermark_ts
+        FROM {LOAD_CONTROL_TABLE}
+        WHERE target_table = '{table}'
+            AND source_table = '{instance}'
+            AND (low_watermark_ts IS NULL OR high_watermark_ts > low_watermark_ts)
+    ) AS watermark
+    CROSS APPLY cdc.fn_cdc_get_net_changes_{instance}(
+        CASE
+            WHEN watermark.low_watermark_ts IS NULL
+            THEN sys.fn_cdc_get_min_lsn('{instance}')
+            ELSE sys.fn_cdc_map_time_to_lsn(
+                'smallest greater than', watermark.low_watermark_ts
+            )
+        END,
+        sys.fn_cdc_map_time_to_lsn(
+            'largest less than or equal', watermark.high_watermark_ts
+        ),
+        'all'
+    ) AS changes
+    WHERE changes.__$operation {operation}
+)"""
+
+
+def build_cdc_advance(mapping: StagingMapping, dialect: str) -> sge.Expression:
+    """Build statement advancing the change window of a SQL Server CDC load.
+
+    The previous high watermark becomes the low watermark and the commit
+    time of the latest captured change becomes the high watermark. Run in
+    the same transaction as the loads so the window and the loaded changes
+    commit together. (Snowflake streams track their own offset.)
+
+    Args:
+        mapping: Staging mapping with a cdc source
+        dialect: Target SQL dialect ("tsql")
+
+    Returns:
+        SQLGlot AST node for MERGE
+    """
+    table = staging_table_name(mapping)
+    instance = capture_instance_name(mapping)
+    sql = f"""
+MERGE INTO {LOAD_CONTROL_TABLE} AS target
+USING (
+    SELECT sys.fn_cdc_map_lsn_to_time(sys.fn_cdc_get_max_lsn()) AS high_watermark_ts
+) AS source
+ON target.target_table = '{table}'
+   AND target.source_table = '{instance}'
+WHEN MATCHED THEN
+    UPDATE SET
+        low_watermark_ts = target.high_watermark_ts,
+        high_watermark_ts = COALESCE(
+            source.high_watermark_ts, target.high_watermark_ts
+        ),
+        advanced_at = CURRENT_TIMESTAMP
 WHEN NOT MATCHED THEN
     INSERT (
-        {identity_col},
-        metadata_recorded_at,
-        metadata_recorded_by,
-        metadata_id
+        target_table,
+        source_table,
+        high_watermark_ts,
+        advanced_at
     )
     VALUES (
-        source.{identity_col},
-        CURRENT_TIMESTAMP,
-        'architect',
-        {metadata_id_sql}
+        '{table}',
+        '{instance}',
+        source.high_watermark_ts,
+        CURRENT_TIMESTAMP
     )
 """
 
     return sg.parse_one(sql, dialect=dialect)
 
 
-def build_attribute_merge(
-    anchor: Anchor,
-    attribute: Attribute,
+def build_cdc_load(
+    sources: list[tuple[Anchor, StagingMapping]],
     dialect: str,
-    mapping: StagingMapping | None = None,
-) -> sge.Expression:
-    """Build MERGE/UPSERT statement for attribute loading.
+    knots: list[Knot] | None = None,
+) -> list[sge.Expression]:
+    """Build statements loading every target fed by one CDC change feed.
+
+    Inserted and updated rows load like a staging batch: anchors insert new
+    identities, static attributes upsert, historized attributes append.
+    Deleted rows remove the static attribute values of their identity;
+    anchors and history are kept. Knot values delivered by the feed are
+    added to their knots first. Render the statements as one transaction
+    so a Snowflake stream offset (or the SQL Server window) advances exactly
+    when the changes are loaded.
 
     Args:
-        anchor: Parent anchor model instance
-        attribute: Attribute model instance
-        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
-        mapping: Optional specific staging mapping. If None, uses first
-            mapping or default.
+        sources: (anchor, mapping) pairs whose mapping reads the same change
+            feed; the first mapping's window is advanced on SQL Server
+        dialect: Target SQL dialect ("snowflake" or "tsql")
+        knots: Knots of the spec, needed when mappings deliver knot values
 
     Returns:
-        SQLGlot AST node for MERGE or INSERT...ON CONFLICT
+        Statements to run in order in one transaction
     """
-    target_table = attribute_table_name(anchor, attribute)
-    anchor_fk = f"{anchor.mnemonic}_ID"
+    statements: list[sge.Expression] = []
+    if dialect == "tsql":
+        statements.append(build_cdc_advance(sources[0][1], dialect))
 
-    # Get staging table name from mapping parameter, first mapping, or default
-    if mapping is not None:
-        source_table = staging_table_name(mapping)
-    elif anchor.staging_mappings:
-        source_table = staging_table_name(anchor.staging_mappings[0])
-    else:
-        source_table = f"stg_{anchor_table_name(anchor)}"
+    knot_values: dict[str, list[tuple[str, str]]] = {}
+    for anchor, mapping in sources:
+        changes = _build_change_relation(anchor, mapping, dialect)
+        for attr in anchor.attributes:
+            column = knot_value_column(anchor, attr, mapping)
+            if column is not None:
+                knot = _find_knot(anchor, attr, knots)
+                knot_values.setdefault(knot.mnemonic, []).append((changes, column))
+    statements.extend(
+        build_knot_value_insert(knot, knot_values[knot.mnemonic], dialect)
+        for knot in sorted(knots or [], key=lambda k: k.mnemonic)
+        if knot.mnemonic in knot_values
+    )
 
-    # Determine value column name
-    if attribute.data_range:
-        value_col = (
-            f"{anchor.mnemonic}_{attribute.mnemonic}_"
-            f"{anchor.descriptor}_{attribute.descriptor}"
+    for anchor, mapping in sources:
+        identity_col = f"{anchor.mnemonic}_ID"
+        changes = _build_change_relation(anchor, mapping, dialect)
+        metadata_id_sql = _build_metadata_id_expr(anchor, mapping, dialect)
+        if anchor.keymap:
+            statements.append(build_keymap_insert(anchor, [changes], dialect))
+        changes = _build_keymap_relation(anchor, changes)
+        statements.append(
+            _build_anchor_load(
+                anchor_table_name(anchor),
+                identity_col,
+                _build_dedup_relation(changes, [identity_col], mapping, dialect),
+                metadata_id_sql,
+                dialect,
+            )
         )
-    else:  # knot_range
-        value_col = f"{attribute.knot_range}_ID"
-
-    # Determine staging source column name
-    # Use column_mappings if available, otherwise default to value_col
-    if (
-        mapping
-        and mapping.column_mappings
-        and attribute.mnemonic in mapping.column_mappings
-    ):
-        staging_value_col = mapping.column_mappings[attribute.mnemonic]
-    else:
-        staging_value_col = value_col  # Default: same name as target
 
-    # Build metadata_id expression (keyset if mapping provided, else fallback)
-    metadata_id_sql = _build_metadata_id_expr(anchor, mapping, dialect)
+        static_tables = []
+        for attr in sorted(anchor.attributes, key=lambda at: at.mnemonic):
+            key_columns = (
+                [identity_col, "changed_at"] if attr.time_range else [identity_col]
+            )
+            relation, staging_value_col = _staging_value(
+                anchor,
+                attr,
+                mapping,
+                _build_dedup_relation(changes, key_columns, mapping, dialect),
+                knots,
+            )
+            statements.append(
+                _build_attribute_load(
+                    anchor, attr, relation, staging_value_col, metadata_id_sql, dialect
+                )
+            )
+            if not attr.time_range:
+                static_tables.append(attribute_table_name(anchor, attr))
 
-    # Check if historized (has time_range)
-    if attribute.time_range:
-        # Historized: Append-only SCD2 pattern
-        # In Anchor Modeling, we never update old rows, we just insert new ones
-        if dialect == "postgres":
-            sql = f"""
-INSERT INTO {target_table} (
-    {anchor_fk},
-    {value_col},
-    changed_at,
-    recorded_at,
-    metadata_recorded_at,
-    metadata_recorded_by,
-    metadata_id
-)
-SELECT
-    source.{anchor_fk},
-    source.{staging_value_col} AS {value_col},
-    source.changed_at,
-    CURRENT_TIMESTAMP AS recorded_at,
-    CURRENT_TIMESTAMP AS metadata_recorded_at,
-    'architect' AS metadata_recorded_by,
-    {metadata_id_sql} AS metadata_id
-FROM {source_table} AS source
-ON CONFLICT ({anchor_fk}, changed_at) DO NOTHING
-"""
-        else:
-            sql = f"""
-MERGE INTO {target_table} AS target
-USING {source_table} AS source
-ON target.{anchor_fk} = source.{anchor_fk}
-   AND target.changed_at = source.changed_at
-WHEN NOT MATCHED THEN
-    INSERT (
-        {anchor_fk},
-        {value_col},
-        changed_at,
-        recorded_at,
-        metadata_recorded_at,
-        metadata_recorded_by,
-        metadata_id
+        deleted = _build_keymap_relation(
+            anchor, _build_change_relation(anchor, mapping, dialect, deleted=True)
+        )
+        statements.extend(
+            sg.parse_one(
+                f"DELETE FROM {table} WHERE {identity_col} IN "
+                f"(SELECT deleted.{identity_col} FROM {deleted} AS deleted)",
+                dialect=dialect,
+            )
+            for table in static_tables
+        )
+
+    return statements
+
+
+def build_knot_value_insert(
+    knot: Knot, sources: list[tuple[str, str]], dialect: str
+) -> sge.Expression:
+    """Build INSERT adding the knot values staging delivers that a knot lacks.
+
+    New values get IDs from the knot's sequence, so the knot identity must
+    be an integer type and concurrent loads never hand out the same ID. A
+    value a concurrent load inserted first keeps that load's ID: the value
+    is unique, skipped on conflict (held locked on SQL Server). Run before
+    the attribute loads that resolve these values to IDs.
+
+    Args:
+        knot: Knot model instance
+        sources: (relation, column) pairs: staging table name or
+            parenthesized SELECT, and its column holding knot values
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot AST node for INSERT ... SELECT
+
+    Raises:
+        ValueError: If the knot identity is not an integer type
+    """
+    target_table = knot_table_name(knot)
+    identity_col = f"{knot.mnemonic}_ID"
+    value_col = f"{knot.mnemonic}_{knot.descriptor}"
+
+    identity = build_column_type(knot.identity, dialect)
+    if not identity.is_type(*sge.DataType.INTEGER_TYPES):
+        msg = (
+            f"{target_table}: knot values can only be added to knots with an "
+            f"integer identity, not {knot.identity}"
+        )
+        raise ValueError(msg)
+
+    # DISTINCT: a single source has no UNION to drop repeated values
+    values = "\n    UNION\n    ".join(
+        f"SELECT DISTINCT staged.{column} AS {value_col} FROM {relation} AS staged "
+        f"WHERE staged.{column} IS NOT NULL"
+        for relation, column in sources
     )
-    VALUES (
-        source.{anchor_fk},
-        source.{staging_value_col},
-        source.changed_at,
-        CURRENT_TIMESTAMP,
-        CURRENT_TIMESTAMP,
-        'architect',
-        {metadata_id_sql}
+    next_identity = _next_identity(
+        knot_sequence_name(knot), f"source.{value_col}", dialect
     )
-"""
-    else:
-        # Static: Simple UPSERT
-        if dialect == "postgres":
-            sql = f"""
+    hint = " WITH (UPDLOCK, HOLDLOCK)" if dialect == "tsql" else ""
+    conflict = (
+        f"ON CONFLICT ({value_col}) DO NOTHING" if dialect in _UPSERT_DIALECTS else ""
+    )
+    sql = f"""
 INSERT INTO {target_table} (
-    {anchor_fk},
+    {identity_col},
     {value_col},
     metadata_recorded_at,
     metadata_recorded_by,
     metadata_id
 )
 SELECT
-    source.{anchor_fk},
-    source.{staging_value_col} AS {value_col},
+    {next_identity} AS {identity_col},
+    source.{value_col},
     CURRENT_TIMESTAMP AS metadata_recorded_at,
     'architect' AS metadata_recorded_by,
-    {metadata_id_sql} AS metadata_id
-FROM {source_table} AS source
-ON CONFLICT ({anchor_fk}) DO UPDATE SET
-    {value_col} = EXCLUDED.{value_col},
-    metadata_recorded_at = CURRENT_TIMESTAMP,
-    metadata_recorded_by = 'architect',
-    metadata_id = EXCLUDED.metadata_id
-"""
-        else:
-            sql = f"""
-MERGE INTO {target_table} AS target
-USING {source_table} AS source
-ON target.{anchor_fk} = source.{anchor_fk}
-WHEN MATCHED THEN
-    UPDATE SET
-        {value_col} = source.{staging_value_col},
-        metadata_recorded_at = CURRENT_TIMESTAMP,
-        metadata_recorded_by = 'architect',
-        metadata_id = {metadata_id_sql}
-WHEN NOT MATCHED THEN
-    INSERT (
-        {anchor_fk},
-        {value_col},
-        metadata_recorded_at,
-        metadata_recorded_by,
-        metadata_id
-    )
-    VALUES (
-        source.{anchor_fk},
-        source.{staging_value_col},
-        CURRENT_TIMESTAMP,
-        'architect',
-        {metadata_id_sql}
-    )
+    'architect-generated' AS metadata_id
+FROM (
+    {values}
+) AS source
+WHERE NOT EXISTS (
+    SELECT 1 FROM {target_table} AS knot{hint}
+    WHERE knot.{value_col} = source.{value_col}
+)
+{conflict}
 """
 
     return sg.parse_one(sql, dialect=dialect)
@@ -291,9 +1530,10 @@ def build_knot_merge(knot: Knot, dialect: str) -> sge.Expression:
 
     # Knots typically have their own staging tables
     source_table = f"stg_{target_table}"
+    source_relation = _build_dedup_relation(source_table, [identity_col], None, dialect)
 
     # Knots are static reference data - INSERT-ignore pattern
-    if dialect == "postgres":
+    if dialect in _UPSERT_DIALECTS:
         sql = f"""
 INSERT INTO {target_table} (
     {identity_col},
@@ -308,13 +1548,13 @@ SELECT
     CURRENT_TIMESTAMP AS metadata_recorded_at,
     'architect' AS metadata_recorded_by,
     'architect-generated' AS metadata_id
-FROM {source_table}
+FROM {source_relation} AS source
 ON CONFLICT ({identity_col}) DO NOTHING
 """
     else:
         sql = f"""
 MERGE INTO {target_table} AS target
-USING {source_table} AS source
+USING {source_relation} AS source
 ON target.{identity_col} = source.{identity_col}
 WHEN NOT MATCHED THEN
     INSERT (
@@ -336,31 +1576,183 @@ WHEN NOT MATCHED THEN
     return sg.parse_one(sql, dialect=dialect)
 
 
-def build_tie_merge(tie: Tie, dialect: str) -> sge.Expression:
+def _find_role_anchor(tie: Tie, role: Role, anchors: list[Anchor] | None) -> Anchor:
+    """Look up the anchor playing a tie role, failing when it is not given."""
+    for anchor in anchors or []:
+        if anchor.mnemonic == role.type_:
+            return anchor
+    table = tie_table_name(tie)
+    msg = f"{table}: anchor '{role.type_}' is needed to resolve role '{role.role}'"
+    raise ValueError(msg)
+
+
+def _build_keyset_lookup(anchor: Anchor) -> str:
+    """Map the keysets of every source of an anchor to its identities.
+
+    An anchor row records the keyset of the source that loaded it first, so
+    sources loading the same identity later are looked up in their staging
+    tables, joined to the anchor so only loaded identities resolve. Change
+    feeds are not read here, as reading them consumes them.
+
+    Args:
+        anchor: Anchor model instance without a key map
+
+    Returns:
+        Parenthesized SELECT of keyset_id and ``{mnemonic}_ID``
+    """
+    identity_col = f"{anchor.mnemonic}_ID"
+    table = anchor_table_name(anchor)
+    lookups = "\n    UNION\n    ".join(
+        [
+            f"SELECT loaded.metadata_id AS keyset_id, loaded.{identity_col} "
+            f"FROM {table} AS loaded",
+            *(
+                f"SELECT staged.keyset_id, loaded.{identity_col} "
+                f"FROM {staging_table_name(mapping)} AS staged "
+                f"INNER JOIN {table} AS loaded "
+                f"ON loaded.{identity_col} = staged.{identity_col}"
+                for mapping in anchor.staging_mappings
+                if mapping.cdc is None
+            ),
+        ]
+    )
+    return f"""(
+    {lookups}
+)"""
+
+
+def _build_tie_source(
+    tie: Tie,
+    mapping: TieStagingMapping,
+    anchors: list[Anchor] | None,
+    dialect: str,
+) -> str:
+    """Resolve the role IDs of a tie staging table from natural keys.
+
+    Each role with natural key columns gets the keyset its anchor was loaded
+    under (entity@system~tenant|key), computed as the anchor's staging
+    mappings do, and joined to the anchor's indexed ``metadata_id`` (or its
+    key map) for its identity. Anchors loaded from several sources record
+    only the first source's keyset, so theirs are looked up across every
+    source (see _build_keyset_lookup). Rows whose anchors are not loaded yet
+    drop out. Roles without natural key columns (knots, pre-resolved anchors)
+    read ``{type}_ID_{role}`` from staging.
+
+    Args:
+        tie: Tie model instance
+        mapping: Tie staging mapping (system, tenant, natural keys per role)
+        anchors: Anchors playing the tie's roles
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        Parenthesized SELECT exposing the role columns, changed_at (when
+        historized) and metadata_recorded_at
+
+    Raises:
+        ValueError: If the anchor of a keyed role is not given
+    """
+    keysets = []
+    joins = []
+    select_list = []
+    for role in tie.roles:
+        column = f"{role.type_}_ID_{role.role}"
+        key_columns = mapping.natural_key_columns.get(role.role)
+        if not key_columns:
+            select_list.append(f"staged.{column} AS {column}")
+            continue
+        anchor = _find_role_anchor(tie, role, anchors)
+        keyset = build_natural_keyset_expr(
+            anchor.descriptor, mapping.system, mapping.tenant, key_columns, dialect
+        ).sql(dialect=dialect)
+        keysets.append(f"{keyset} AS keyset_{role.role}")
+        alias = f"anchor_{role.role}"
+        if anchor.keymap:
+            lookup = f"{keymap_table_name(anchor)} AS {alias} ON {alias}.keyset_id"
+        elif len(anchor.staging_mappings) > 1:
+            lookup = f"{_build_keyset_lookup(anchor)} AS {alias} ON {alias}.keyset_id"
+        else:
+            lookup = f"{anchor_table_name(anchor)} AS {alias} ON {alias}.metadata_id"
+        joins.append(f"INNER JOIN {lookup} = staged.keyset_{role.role}")
+        select_list.append(f"{alias}.{anchor.mnemonic}_ID AS {column}")
+    if tie.time_range:
+        select_list.append("staged.changed_at AS changed_at")
+    select_list.append("staged.metadata_recorded_at AS metadata_recorded_at")
+
+    table = staging_table_name(mapping)
+    return f"""(
+    SELECT {", ".join(select_list)}
+    FROM (
+        SELECT staged.*, {", ".join(keysets)}
+        FROM {table} AS staged
+    ) AS staged
+    {" ".join(joins)}
+)"""
+
+
+def build_tie_merge(
+    tie: Tie,
+    dialect: str,
+    mapping: TieStagingMapping | None = None,
+    anchors: list[Anchor] | None = None,
+) -> sge.Expression:
     """Build MERGE/UPSERT statement for tie loading.
 
+    Without a mapping the tie loads from ``stg_{tie table}`` with every role
+    ID pre-resolved. With one, role IDs are resolved from natural keys in
+    the same statement (see _build_tie_source).
+
     Args:
         tie: Tie model instance
         dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        mapping: Optional tie staging mapping with natural keys per role
+        anchors: Anchors playing the tie's roles (needed with a mapping)
 
     Returns:
         SQLGlot AST node for MERGE or INSERT...ON CONFLICT
     """
     target_table = tie_table_name(tie)
-    source_table = f"stg_{target_table}"
+    if mapping is None:
+        source_table = f"stg_{target_table}"
+    elif mapping.natural_key_columns:
+        source_table = _build_tie_source(tie, mapping, anchors, dialect)
+    else:
+        source_table = staging_table_name(mapping)
 
     # Build role FK columns
     role_columns = [f"{role.type_}_ID_{role.role}" for role in tie.roles]
 
+    # Historized ties that forbid restatements read a staging relation from
+    # which repeated versions were removed. A history is identified by the
+    # identifier roles (all roles when none is marked), the other roles are
+    # the values whose repetition is a restatement.
+    key_columns = [*role_columns, "changed_at"] if tie.time_range else role_columns
+    source_relation = _build_dedup_relation(
+        source_table, key_columns, None, dialect, recorded=mapping is not None
+    )
+    if tie.time_range and not allows_restatements(tie.metadata_):
+        identifier_columns = [
+            f"{role.type_}_ID_{role.role}" for role in tie.roles if role.identifier
+        ] or role_columns
+        value_columns = [col for col in role_columns if col not in identifier_columns]
+        batch_sql = (
+            f"SELECT {', '.join(f'source.{col} AS {col}' for col in role_columns)}, "
+            "source.changed_at AS changed_at, "
+            "'architect-generated' AS metadata_id, 0 AS is_existing "
+            f"FROM {source_relation} AS source"
+        )
+        source_relation = _build_restatement_filter(
+            target_table, batch_sql, identifier_columns, value_columns, dialect
+        )
+
     # Build ON clause for matching (all role FKs)
-    if dialect == "postgres":
+    if dialect in _UPSERT_DIALECTS:
         " AND ".join([f"{col} = EXCLUDED.{col}" for col in role_columns])
     else:
         " AND ".join([f"target.{col} = source.{col}" for col in role_columns])
 
     if tie.time_range:
         # Historized tie: Append-only pattern with bitemporal columns
-        if dialect == "postgres":
+        if dialect in _UPSERT_DIALECTS:
             columns_list = ", ".join(
                 [
                     *role_columns,
@@ -389,7 +1781,7 @@ INSERT INTO {target_table} (
 )
 SELECT
     {select_list}
-FROM {source_table}
+FROM {source_relation} AS source
 ON CONFLICT ({conflict_cols}) DO NOTHING
 """
         else:
@@ -419,7 +1811,7 @@ ON CONFLICT ({conflict_cols}) DO NOTHING
 
             sql = f"""
 MERGE INTO {target_table} AS target
-USING {source_table} AS source
+USING {source_relation} AS source
 ON {role_match}
    AND target.changed_at = source.changed_at
 WHEN NOT MATCHED THEN
@@ -432,7 +1824,7 @@ WHEN NOT MATCHED THEN
 """
     else:
         # Static tie: INSERT-ignore pattern (relationship exists or doesn't)
-        if dialect == "postgres":
+        if dialect in _UPSERT_DIALECTS:
             columns_list = ", ".join(
                 [
                     *role_columns,
@@ -457,7 +1849,7 @@ INSERT INTO {target_table} (
 )
 SELECT
     {select_list}
-FROM {source_table}
+FROM {source_relation} AS source
 ON CONFLICT ({conflict_cols}) DO NOTHING
 """
         else:
@@ -479,7 +1871,7 @@ ON CONFLICT ({conflict_cols}) DO NOTHING
 
             sql = f"""
 MERGE INTO {target_table} AS target
-USING {source_table} AS source
+USING {source_relation} AS source
 ON {role_match}
 WHEN NOT MATCHED THEN
     INSERT (
@@ -493,63 +1885,281 @@ WHEN NOT MATCHED THEN
     return sg.parse_one(sql, dialect=dialect)
 
 
-def generate_all_dml(spec: Spec, dialect: str) -> dict[str, str]:
+def build_nexus_merge(
+    nexus: Nexus, dialect: str, mapping: StagingMapping | None = None
+) -> sge.Expression:
+    """Build MERGE/UPSERT statement for nexus loading.
+
+    The nexus identity and its role IDs are inserted together, in a single
+    pass over staging. Like anchor rows, nexus rows are never updated.
+
+    Args:
+        nexus: Nexus model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        mapping: Optional specific staging mapping. If None, uses first
+            mapping or default.
+
+    Returns:
+        SQLGlot AST node for MERGE or INSERT...ON CONFLICT
+    """
+    target_table = nexus_table_name(nexus)
+    identity_col = f"{nexus.mnemonic}_ID"
+    role_columns = [f"{role.type_}_ID_{role.role}" for role in nexus.roles]
+
+    # Get staging table name from mapping parameter, first mapping, or default
+    if mapping is not None:
+        source_table = staging_table_name(mapping)
+    elif nexus.staging_mappings:
+        source_table = staging_table_name(nexus.staging_mappings[0])
+    else:
+        source_table = f"stg_{target_table}"
+    source_relation = _build_dedup_relation(
+        _build_source_relation(target_table, source_table, mapping),
+        [identity_col],
+        mapping,
+        dialect,
+        recorded=mapping is not None or bool(nexus.staging_mappings),
+    )
+
+    return _build_anchor_load(
+        target_table,
+        identity_col,
+        source_relation,
+        _build_metadata_id_expr(nexus, mapping, dialect),
+        dialect,
+        role_columns,
+    )
+
+
+def generate_all_dml(
+    spec: Spec, dialect: str, consolidate: bool = False, fanout: bool = False
+) -> dict[str, str]:
     """Generate all DML for a spec in deterministic order.
 
     Args:
         spec: Top-level Spec model instance
         dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        consolidate: Load multi-source anchors with one statement per target
+            table (sources ranked by priority) instead of one per source
+        fanout: Load anchors with staging mappings with one script per
+            staging table that scans it once (takes precedence over
+            consolidate for those anchors). Anchors with a CDC mapping are
+            always loaded this way, one transaction per change feed.
+
+    Materialized anchors also get a ``_refresh`` script that brings their
+    latest state up to date after the loads.
+
+    Nexuses load like single- or multi-source anchors, their role IDs
+    inserted with their identity; they are not consolidated or fanned out.
+
+    Anchors with a key map get a ``{anchor}_keymap_load`` script assigning
+    identities to new keysets (fan-out and change-feed scripts assign them
+    inline), and all their loads read identities from the key map.
 
     Returns:
         Dictionary mapping filenames to SQL strings
     """
     output: dict[str, str] = {}
+    fanout_sources: dict[str, list[tuple[Anchor, StagingMapping]]] = {}
+
+    # 1. Knots (sorted by mnemonic for determinism). Knots whose values
+    # staging delivers are loaded from those columns instead of stg_{knot};
+    # change feeds add theirs in their own script.
+    knot_values: dict[str, dict[tuple[str, str], None]] = {}
+    owners: list[Anchor | Nexus] = [*spec.anchors, *spec.nexuses]
+    for owner in owners:
+        for mapping in owner.staging_mappings:
+            if mapping.cdc is not None:
+                continue
+            for attr in owner.attributes:
+                column = knot_value_column(owner, attr, mapping)
+                if column is not None and attr.knot_range is not None:
+                    knot_values.setdefault(attr.knot_range, {})[
+                        (staging_table_name(mapping), column)
+                    ] = None
 
-    # 1. Knots (sorted by mnemonic for determinism)
     for knot in sorted(spec.knots, key=lambda k: k.mnemonic):
-        ast = build_knot_merge(knot, dialect)
+        if knot.mnemonic in knot_values:
+            ast = build_knot_value_insert(
+                knot, list(knot_values[knot.mnemonic]), dialect
+            )
+        else:
+            ast = build_knot_merge(knot, dialect)
         filename = f"{knot_table_name(knot)}_load.sql"
         output[filename] = ast.sql(dialect=dialect, pretty=True)
 
     # 2. Anchors (sorted by mnemonic)
     for anchor in sorted(spec.anchors, key=lambda a: a.mnemonic):
+        # Fan-out: collect per staging table, emitted after the anchor loop.
+        # Change feeds are always consumed by one script per feed.
+        cdc = any(mapping.cdc is not None for mapping in anchor.staging_mappings)
+        if (fanout or cdc) and anchor.staging_mappings:
+            for mapping in resolve_staging_order(anchor.staging_mappings):
+                fanout_sources.setdefault(staging_table_name(mapping), []).append(
+                    (anchor, mapping)
+                )
+            continue
+
+        # Key map: identities for the new keysets of all sources, assigned
+        # before the loads that read them
+        if anchor.keymap and anchor.staging_mappings:
+            keymap_table = keymap_table_name(anchor)
+            keymap_mappings = resolve_staging_order(anchor.staging_mappings)
+            ast = build_keymap_insert(
+                anchor,
+                [
+                    _build_source_relation(
+                        keymap_table, staging_table_name(mapping), mapping
+                    )
+                    for mapping in keymap_mappings
+                ],
+                dialect,
+            )
+            output[f"{keymap_table}_load.sql"] = _render_load(
+                ast, keymap_table, keymap_mappings, dialect
+            )
+
         # Handle multi-source anchors (STG-05)
         if anchor.staging_mappings and len(anchor.staging_mappings) > 1:
-            # Multi-source: Generate one MERGE per source in priority order
             sorted_mappings = resolve_staging_order(anchor.staging_mappings)
+            if consolidate:
+                # Consolidated: one statement per target over all sources
+                ast = build_consolidated_anchor_merge(anchor, dialect)
+                target = anchor_table_name(anchor)
+                filename = f"{target}_load.sql"
+                output[filename] = _render_load(ast, target, sorted_mappings, dialect)
+
+                for attr in sorted(anchor.attributes, key=lambda at: at.mnemonic):
+                    ast = build_consolidated_attribute_merge(
+                        anchor, attr, dialect, spec.knots
+                    )
+                    attr_table = attribute_table_name(anchor, attr)
+                    filename = f"{attr_table}_load.sql"
+                    output[filename] = _render_load(
+                        ast, attr_table, sorted_mappings, dialect
+                    )
+                continue
+
+            # Multi-source: Generate one MERGE per source in priority order
             for mapping in sorted_mappings:
                 # Anchor load for this source
                 ast = build_anchor_merge(anchor, dialect, mapping)
                 system_suffix = mapping.system.lower()
-                filename = f"{anchor_table_name(anchor)}_load_{system_suffix}.sql"
-                output[filename] = ast.sql(dialect=dialect, pretty=True)
+                target = anchor_table_name(anchor)
+                filename = f"{target}_load_{system_suffix}.sql"
+                output[filename] = _render_load(ast, target, [mapping], dialect)
 
                 # Attribute loads for this source (sorted by mnemonic)
                 for attr in sorted(anchor.attributes, key=lambda at: at.mnemonic):
-                    ast = build_attribute_merge(anchor, attr, dialect, mapping)
+                    ast = build_attribute_merge(
+                        anchor, attr, dialect, mapping, spec.knots
+                    )
                     attr_table = attribute_table_name(anchor, attr)
                     filename = f"{attr_table}_load_{system_suffix}.sql"
-                    output[filename] = ast.sql(dialect=dialect, pretty=True)
+                    output[filename] = _render_load(ast, attr_table, [mapping], dialect)
         else:
             # Single-source (0 or 1 mapping): Original behavior
             single_mapping = (
                 anchor.staging_mappings[0] if anchor.staging_mappings else None
             )
             ast = build_anchor_merge(anchor, dialect, single_mapping)
-            filename = f"{anchor_table_name(anchor)}_load.sql"
-            output[filename] = ast.sql(dialect=dialect, pretty=True)
+            target = anchor_table_name(anchor)
+            filename = f"{target}_load.sql"
+            output[filename] = _render_load(
+                ast, target, anchor.staging_mappings, dialect
+            )
 
             # Attribute table loads (sorted by mnemonic)
             for attr in sorted(anchor.attributes, key=lambda at: at.mnemonic):
-                ast = build_attribute_merge(anchor, attr, dialect, single_mapping)
-                filename = f"{attribute_table_name(anchor, attr)}_load.sql"
-                output[filename] = ast.sql(dialect=dialect, pretty=True)
+                ast = build_attribute_merge(
+                    anchor, attr, dialect, single_mapping, spec.knots
+                )
+                attr_table = attribute_table_name(anchor, attr)
+                filename = f"{attr_table}_load.sql"
+                output[filename] = _render_load(
+                    ast, attr_table, anchor.staging_mappings, dialect
+                )
+
+    # Fan-out scripts (sorted by staging table name)
+    for source_table in sorted(fanout_sources):
+        sources = fanout_sources[source_table]
+        first_anchor, first_mapping = sources[0]
+        if first_mapping.cdc is not None:
+            statements = build_cdc_load(sources, dialect, spec.knots)
+            output[f"{source_table}_load.sql"] = _render_script(statements, dialect)
+            continue
+        statements = build_staging_fanout(sources, dialect, spec.knots)
+        advances = []
+        if first_mapping.watermark_column is not None:
+            advances.append(
+                build_watermark_advance(
+                    anchor_table_name(first_anchor), first_mapping, dialect
+                )
+            )
+        output[f"{source_table}_load.sql"] = _render_fanout_script(
+            statements, advances, dialect
+        )
 
-    # 3. Ties (sorted by table name for determinism)
+    # 3. Ties (sorted by table name for determinism). Several staging
+    # mappings load one tie with one statement per source, in priority order.
     sorted_ties = sorted(spec.ties, key=lambda t: tie_table_name(t))
     for tie in sorted_ties:
-        ast = build_tie_merge(tie, dialect)
+        if len(tie.staging_mappings) > 1:
+            for tie_mapping in resolve_staging_order(tie.staging_mappings):
+                ast = build_tie_merge(tie, dialect, tie_mapping, spec.anchors)
+                system_suffix = tie_mapping.system.lower()
+                filename = f"{tie_table_name(tie)}_load_{system_suffix}.sql"
+                output[filename] = ast.sql(dialect=dialect, pretty=True)
+            continue
+        single_tie_mapping = tie.staging_mappings[0] if tie.staging_mappings else None
+        ast = build_tie_merge(tie, dialect, single_tie_mapping, spec.anchors)
         filename = f"{tie_table_name(tie)}_load.sql"
         output[filename] = ast.sql(dialect=dialect, pretty=True)
 
+    # 4. Nexuses (sorted by mnemonic), one statement per source in priority
+    # order when several staging mappings load one nexus
+    for nexus in sorted(spec.nexuses, key=lambda n: n.mnemonic):
+        target = nexus_table_name(nexus)
+        if len(nexus.staging_mappings) > 1:
+            for mapping in resolve_staging_order(nexus.staging_mappings):
+                system_suffix = mapping.system.lower()
+                ast = build_nexus_merge(nexus, dialect, mapping)
+                filename = f"{target}_load_{system_suffix}.sql"
+                output[filename] = _render_load(ast, target, [mapping], dialect)
+
+                for attr in sorted(nexus.attributes, key=lambda at: at.mnemonic):
+                    ast = build_attribute_merge(
+                        nexus, attr, dialect, mapping, spec.knots
+                    )
+                    attr_table = attribute_table_name(nexus, attr)
+                    filename = f"{attr_table}_load_{system_suffix}.sql"
+                    output[filename] = _render_load(ast, attr_table, [mapping], dialect)
+            continue
+
+        single_mapping = nexus.staging_mappings[0] if nexus.staging_mappings else None
+        ast = build_nexus_merge(nexus, dialect, single_mapping)
+        output[f"{target}_load.sql"] = _render_load(
+            ast, target, nexus.staging_mappings, dialect
+        )
+        for attr in sorted(nexus.attributes, key=lambda at: at.mnemonic):
+            ast = build_attribute_merge(
+                nexus, attr, dialect, single_mapping, spec.knots
+            )
+            attr_table = attribute_table_name(nexus, attr)
+            output[f"{attr_table}_load.sql"] = _render_load(
+                ast, attr_table, nexus.staging_mappings, dialect
+            )
+
+    # 5. Materialized latest state refreshes (after the loads they read)
+    for anchor in sorted(spec.anchors, key=lambda a: a.mnemonic):
+        if anchor.materialize is None:
+            continue
+        statements = build_materialized_refresh(anchor, dialect, spec.knots)
+        filename = f"{materialized_view_name(anchor)}_refresh.sql"
+        output[filename] = (
+            _render_script(statements, dialect)
+            if len(statements) > 1
+            else statements[0].sql(dialect=dialect, pretty=True)
+        )
+
     return output
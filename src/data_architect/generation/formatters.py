@@ -22,34 +22,34 @@ def format_raw(sql: str) -> str:
 
 
 def format_bruin(
-    sql: str, entity_name: str, entity_type: str, is_historized: bool
+    sql: str,
+    entity_name: str,
+    depends: list[str] | None = None,
 ) -> str:
     """Format SQL with Bruin YAML frontmatter.
 
+    Assets carry no materialization, so Bruin runs them as written. DDL
+    creates its table once, and every generated load is a complete
+    INSERT ... ON CONFLICT, MERGE or multi-table script doing its own
+    upsert. Materializing one would have Bruin create a table named after
+    the asset and wrap the statement in a merge of its own.
+
     Args:
         sql: SQL string to wrap
         entity_name: Entity name for bruin asset (e.g., "AC_Actor")
-        entity_type: "ddl" or "dml"
-        is_historized: Whether entity has time_range (affects strategy)
+        depends: Entity names of upstream assets (e.g., ["AC_Actor"])
 
     Returns:
         SQL wrapped with Bruin frontmatter
     """
-    # Determine materialization strategy
-    if entity_type == "ddl":
-        strategy = "create+replace"
-    elif is_historized:
-        strategy = "merge"
-    else:
-        strategy = "create+replace"
+    depends_block = "".join(f"    - dab.{name}\n" for name in depends or [])
+    if depends_block:
+        depends_block = "depends:\n" + depends_block
 
     frontmatter = f"""/* @bruin
 name: dab.{entity_name}
 type: sql
-materialization:
-    type: table
-    strategy: {strategy}
-@bruin */
+{depends_block}@bruin */
 
 """
 
@@ -0,0 +1,317 @@
+"""Incremental regeneration of the SQL of an edited spec.
+
+Every generated file belongs to the spec entities (knots, anchors, ties and
+nexuses) whose object it creates or loads. An entity's files depend only on
+the entity and its neighbours: the knots and entities it references, the
+entities referencing it, and the entities sharing one of its staging tables.
+An edit therefore changes the files of the edited entities and their
+neighbours only. Those are rendered from a spec cut down to the entities
+they need; all other files are kept as they were.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+from data_architect.generation.ddl import generate_all_ddl
+from data_architect.generation.dependencies import build_dependency_graph, file_node
+from data_architect.generation.dml import generate_all_dml
+from data_architect.generation.naming import (
+    LOAD_CONTROL_TABLE,
+    anchor_table_name,
+    attribute_table_name,
+    difference_function_name,
+    external_table_name,
+    keymap_table_name,
+    knot_table_name,
+    latest_view_name,
+    materialized_view_name,
+    nexus_table_name,
+    point_in_time_function_name,
+    staging_table_name,
+    tie_table_name,
+)
+from data_architect.generation.views import generate_all_views
+
+if TYPE_CHECKING:
+    from data_architect.models.anchor import Anchor
+    from data_architect.models.knot import Knot
+    from data_architect.models.spec import Nexus, Spec
+    from data_architect.models.tie import Tie
+
+    Entity = Anchor | Knot | Nexus | Tie
+
+_COLLECTIONS = ("knots", "anchors", "ties", "nexuses")
+
+
+@dataclass(frozen=True)
+class Rendered:
+    """SQL generated for a spec, with the options it was generated with.
+
+    Attributes:
+        spec: Spec the files were generated from
+        dialect: SQL dialect
+        consolidate: Whether multi-source anchors load with one statement
+        fanout: Whether staging tables load with one script each
+        ddl: DDL filename -> SQL (tables, then the perspectives reading them)
+        dml: DML filename -> SQL
+    """
+
+    spec: Spec
+    dialect: str
+    consolidate: bool
+    fanout: bool
+    ddl: dict[str, str]
+    dml: dict[str, str]
+
+
+def render_spec(
+    spec: Spec, dialect: str, *, consolidate: bool = False, fanout: bool = False
+) -> Rendered:
+    """Generate all DDL, perspectives and DML of a spec.
+
+    Args:
+        spec: Top-level Spec model instance
+        dialect: SQL dialect
+        consolidate: Load multi-source anchors with one statement per table
+        fanout: Load each staging table with one script that scans it once
+
+    Returns:
+        Rendered files of the spec
+
+    Raises:
+        ValueError: If the spec cannot be generated (see generate_all_dml)
+    """
+    ddl = {**generate_all_ddl(spec, dialect), **generate_all_views(spec, dialect)}
+    dml = generate_all_dml(spec, dialect, consolidate=consolidate, fanout=fanout)
+    return Rendered(spec, dialect, consolidate, fanout, ddl, dml)
+
+
+def _entities(spec: Spec) -> dict[str, Entity]:
+    """Key every entity of a spec by the table it owns."""
+    entities: dict[str, Entity] = {}
+    for knot in spec.knots:
+        entities[knot_table_name(knot)] = knot
+    for anchor in spec.anchors:
+        entities[anchor_table_name(anchor)] = anchor
+    for tie in spec.ties:
+        entities[tie_table_name(tie)] = tie
+    for nexus in spec.nexuses:
+        entities[nexus_table_name(nexus)] = nexus
+    return entities
+
+
+def changed_entities(old: Spec, new: Spec) -> set[str]:
+    """Entities added, removed or redefined between two specs.
+
+    Args:
+        old: Spec before the edit
+        new: Spec after the edit
+
+    Returns:
+        Table names of the changed knots, anchors, ties and nexuses
+    """
+    before, after = _entities(old), _entities(new)
+    return {
+        key for key in before.keys() | after.keys() if before.get(key) != after.get(key)
+    }
+
+
+def _attributed(spec: Spec) -> list[tuple[str, Anchor | Nexus]]:
+    """Anchors and nexuses of a spec, keyed by the table they own."""
+    return [
+        *((anchor_table_name(anchor), anchor) for anchor in spec.anchors),
+        *((nexus_table_name(nexus), nexus) for nexus in spec.nexuses),
+    ]
+
+
+def _references(spec: Spec) -> dict[str, set[str]]:
+    """Map every entity to the entities it needs to be generated.
+
+    These are the knots of its attributes, the entities its roles reference
+    and the entities sharing one of its staging tables.
+    """
+    tables = {
+        **{knot.mnemonic: knot_table_name(knot) for knot in spec.knots},
+        **{anchor.mnemonic: anchor_table_name(anchor) for anchor in spec.anchors},
+        **{nexus.mnemonic: nexus_table_name(nexus) for nexus in spec.nexuses},
+    }
+    references: dict[str, set[str]] = {key: set() for key in _entities(spec)}
+    sharing: dict[str, set[str]] = {}
+
+    for key, owner in _attributed(spec):
+        references[key] |= {
+            tables[attr.knot_range]
+            for attr in owner.attributes
+            if attr.knot_range in tables
+        }
+        for mapping in owner.staging_mappings:
+            sharing.setdefault(staging_table_name(mapping), set()).add(key)
+    for nexus in spec.nexuses:
+        key = nexus_table_name(nexus)
+        references[key] |= {tables[r.type_] for r in nexus.roles if r.type_ in tables}
+    for tie in spec.ties:
+        key = tie_table_name(tie)
+        references[key] |= {tables[r.type_] for r in tie.roles if r.type_ in tables}
+        for tie_mapping in tie.staging_mappings:
+            sharing.setdefault(staging_table_name(tie_mapping), set()).add(key)
+
+    for owners in sharing.values():
+        for key in owners:
+            references[key] |= owners - {key}
+    return references
+
+
+def _owners(spec: Spec) -> dict[str, set[str]]:
+    """Map every object of the dependency graph to the entities owning it."""
+    owners: dict[str, set[str]] = {}
+
+    def _own(node: str, key: str) -> None:
+        owners.setdefault(node, set()).add(key)
+
+    for knot in spec.knots:
+        _own(knot_table_name(knot), knot_table_name(knot))
+    for key, owner in _attributed(spec):
+        _own(key, key)
+        for attr in owner.attributes:
+            _own(attribute_table_name(owner, attr), key)
+        for mapping in owner.staging_mappings:
+            _own(staging_table_name(mapping), key)
+            if mapping.source is not None:
+                _own(external_table_name(mapping), key)
+            if mapping.watermark_column or mapping.cdc is not None:
+                _own(LOAD_CONTROL_TABLE, key)
+    for anchor in spec.anchors:
+        key = anchor_table_name(anchor)
+        _own(keymap_table_name(anchor), key)
+        _own(latest_view_name(anchor), key)
+        _own(materialized_view_name(anchor), key)
+        _own(point_in_time_function_name(anchor), key)
+        _own(difference_function_name(anchor), key)
+    for tie in spec.ties:
+        key = tie_table_name(tie)
+        _own(key, key)
+        for tie_mapping in tie.staging_mappings:
+            _own(staging_table_name(tie_mapping), key)
+    return owners
+
+
+@dataclass(frozen=True)
+class _Ownership:
+    """Resolves the entities owning each generated file of a spec."""
+
+    graph: dict[str, set[str]]
+    owners: dict[str, set[str]]
+
+    @classmethod
+    def of(cls, spec: Spec) -> _Ownership:
+        return cls(build_dependency_graph(spec), _owners(spec))
+
+    def __call__(self, filename: str) -> set[str]:
+        return self.owners.get(file_node(filename, self.graph), set())
+
+
+def _subset(spec: Spec, keys: set[str]) -> Spec:
+    """Cut a spec down to some of its entities, keeping their order."""
+    entities = _entities(spec)
+    kept = {id(entity) for key, entity in entities.items() if key in keys}
+    return spec.model_copy(
+        update={
+            name: [entity for entity in getattr(spec, name) if id(entity) in kept]
+            for name in _COLLECTIONS
+        }
+    )
+
+
+def _merge(
+    old: dict[str, str],
+    fresh: dict[str, str],
+    affected: set[str],
+    old_owners: _Ownership,
+    new_owners: _Ownership,
+) -> dict[str, str] | None:
+    """Replace the files of the affected entities; None if some are unowned."""
+    files: dict[str, str] = {}
+    for filename, sql in old.items():
+        before, after = old_owners(filename), new_owners(filename)
+        if not before:
+            return None
+        # Files also owned by unaffected entities (the load-control table)
+        # are kept, whether or not the affected entities still own them
+        if not before & affected or after - affected:
+            files[filename] = sql
+    for filename, sql in fresh.items():
+        owners = new_owners(filename)
+        if not owners:
+            return None
+        if owners & affected:
+            files[filename] = sql
+    return files
+
+
+def _render_like(previous: Rendered, spec: Spec) -> Rendered:
+    """Render a spec with the options of a previous rendering."""
+    return render_spec(
+        spec,
+        previous.dialect,
+        consolidate=previous.consolidate,
+        fanout=previous.fanout,
+    )
+
+
+def rerender_spec(previous: Rendered, spec: Spec) -> tuple[Rendered, set[str]]:
+    """Regenerate the files of the entities an edit changed.
+
+    Files of the changed entities and of their neighbours are rendered again;
+    all others are taken from the previous rendering. Edits outside the
+    entities (spec metadata) and files no entity owns fall back to
+    rendering the whole spec.
+
+    Args:
+        previous: Rendering of the spec before the edit
+        spec: Spec after the edit
+
+    Returns:
+        Tuple of (rendering of the edited spec, table names of the changed
+        entities)
+
+    Raises:
+        ValueError: If the spec cannot be generated (see generate_all_dml)
+    """
+    changed = changed_entities(previous.spec, spec)
+    empty: dict[str, list[Entity]] = {name: [] for name in _COLLECTIONS}
+    if previous.spec.model_copy(update=empty) != spec.model_copy(update=empty):
+        return _render_like(previous, spec), changed
+    if not changed:
+        return replace(previous, spec=spec), changed
+
+    # Neighbours in either spec: removed references affect their targets too
+    old_refs, new_refs = _references(previous.spec), _references(spec)
+    neighbours: dict[str, set[str]] = {}
+    for refs in (old_refs, new_refs):
+        for key, targets in refs.items():
+            neighbours.setdefault(key, set()).update(targets)
+            for target in targets:
+                neighbours.setdefault(target, set()).add(key)
+    affected = set(changed)
+    for key in changed:
+        affected |= neighbours.get(key, set())
+
+    # The affected entities, their neighbours, and everything those need
+    needed = set(affected)
+    for key in affected:
+        needed |= neighbours.get(key, set())
+    pending = list(needed)
+    while pending:
+        for target in new_refs.get(pending.pop(), set()) - needed:
+            needed.add(target)
+            pending.append(target)
+
+    fresh = _render_like(previous, _subset(spec, needed))
+    old_owners, new_owners = _Ownership.of(previous.spec), _Ownership.of(spec)
+    ddl = _merge(previous.ddl, fresh.ddl, affected, old_owners, new_owners)
+    dml = _merge(previous.dml, fresh.dml, affected, old_owners, new_owners)
+    if ddl is None or dml is None:
+        return _render_like(previous, spec), changed
+    return replace(previous, spec=spec, ddl=ddl, dml=dml), changed
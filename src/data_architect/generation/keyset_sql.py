@@ -11,13 +11,28 @@ import sqlglot.expressions as sge
 
 from data_architect.identity.escaping import escape_delimiters
 
+# Dialects whose REPLACE and || take no implicit casts from non-text types
+_CAST_KEY_DIALECTS = ("postgres", "duckdb")
+
+
+def _key_text(column: str, dialect: str) -> sge.Expression:
+    """Reference a natural key column as text, casting where the dialect needs it.
+
+    SQL Server and Snowflake convert numbers for string functions implicitly
+    (SQL Server keeping NVARCHAR keys intact), so their columns are used as is.
+    """
+    column_expr = sg.to_identifier(column)
+    if dialect not in _CAST_KEY_DIALECTS:
+        return column_expr
+    return sge.Cast(this=column_expr, to=sge.DataType.build("TEXT"))
+
 
 def build_keyset_expr(
     entity: str,
     system: str,
     tenant: str,
     natural_key_col: str,
-    dialect: str,  # noqa: ARG001
+    dialect: str,
 ) -> sge.Expression:
     """Build NULL-safe keyset identity construction SQL expression.
 
@@ -58,7 +73,7 @@ def build_keyset_expr(
 
     # Innermost: REPLACE(nk_col, '@', '@@')
     escaped_nk = sge.Replace(
-        this=nk_col_expr,
+        this=_key_text(natural_key_col, dialect),
         expression=sge.Literal.string("@"),
         replacement=sge.Literal.string("@@"),
     )
@@ -101,7 +116,7 @@ def build_keyset_expr(
 
 def build_composite_natural_key_expr(
     columns: list[str],
-    dialect: str,  # noqa: ARG001
+    dialect: str,
 ) -> sge.Expression:
     """Build composite natural key expression from multiple columns.
 
@@ -142,7 +157,7 @@ def build_composite_natural_key_expr(
     # CONCAT(col1, ':', col2, ':', col3)
     concat_parts: list[sge.Expression] = []
     for i, col in enumerate(columns):
-        concat_parts.append(sg.to_identifier(col))
+        concat_parts.append(_key_text(col, dialect))
         if i < len(columns) - 1:  # Add separator between columns (not after last)
             concat_parts.append(sge.Literal.string(":"))
 
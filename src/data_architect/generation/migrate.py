@@ -0,0 +1,728 @@
+"""Schema migration generation from the difference of two specs.
+
+Objects are matched by table name, so renamed objects show up as new ones.
+New tables are created; widened columns and new nullable staging columns are
+altered in place. Adding a nullable column and lengthening a string are
+metadata-only changes, but larger integer and decimal types rewrite the
+table on PostgreSQL and touch every row on SQL Server, so they take time
+and locks in proportion to its size. Staging keysets are regenerated
+around widened natural key columns.
+Static attributes and ties that become historized gain their bitemporal
+columns, backfilled from metadata_recorded_at. New key maps are seeded with
+the keysets loaded anchors recorded, their sequences continuing after the
+seeded identities; knots newly loaded from staged values likewise number
+them after the IDs they hold. New nexuses are created with their role
+indexes; the roles of an existing nexus cannot change in place.
+Perspectives of changed anchors are recreated; on PostgreSQL their views
+depend on the columns being altered, so they are dropped before any table
+changes. Materialized latest state is rebuilt (and, for snapshot tables,
+refilled) whenever its perspective or materialization changes. Removed
+objects are left untouched. Changes that would lose data or need a table
+rebuild (narrowed or incompatible types, identity changes, historized back
+to static) are rejected. T-SQL scripts run every statement as a batch of
+its own, ended by GO.
+"""
+
+# ruff: noqa: S608  # statements are generated from spec identifiers only
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import sqlglot as sg
+import sqlglot.expressions as sge
+
+from data_architect.generation.columns import (
+    build_column_type,
+    build_keyset_column,
+    timestamp_type,
+)
+from data_architect.generation.ddl import (
+    EXTERNAL_TABLE_DIALECTS,
+    build_anchor_table,
+    build_attribute_table,
+    build_cdc_source,
+    build_external_table,
+    build_keymap_table,
+    build_knot_table,
+    build_load_control_table,
+    build_metadata_id_index,
+    build_nexus_table,
+    build_role_indexes,
+    build_sequence,
+    build_staging_table,
+    build_tie_table,
+    identity_types,
+    keyset_resolved_anchors,
+    valued_knots,
+)
+from data_architect.generation.naming import (
+    LOAD_CONTROL_TABLE,
+    anchor_table_name,
+    attribute_table_name,
+    attribute_value_column,
+    difference_function_name,
+    external_table_name,
+    keymap_sequence_name,
+    keymap_table_name,
+    knot_sequence_name,
+    knot_table_name,
+    latest_view_name,
+    materialized_view_name,
+    nexus_table_name,
+    point_in_time_function_name,
+    staging_table_name,
+    tie_table_name,
+)
+from data_architect.generation.views import (
+    build_materialized_refresh,
+    generate_all_views,
+)
+from data_architect.models.spec import Nexus, Spec
+
+if TYPE_CHECKING:
+    from data_architect.models.anchor import Anchor, Attribute
+    from data_architect.models.staging import StagingColumn, StagingMapping
+
+_INTEGER_RANKS = {
+    sge.DataType.Type.TINYINT: 0,
+    sge.DataType.Type.SMALLINT: 1,
+    sge.DataType.Type.INT: 2,
+    sge.DataType.Type.BIGINT: 3,
+}
+_STRING_TYPES = {sge.DataType.Type.VARCHAR, sge.DataType.Type.NVARCHAR}
+
+
+def _type_length(data_type: sge.DataType, dialect: str) -> float:
+    """Return the declared length of a string type (inf when unbounded)."""
+    if not data_type.expressions:
+        # T-SQL defaults a bare VARCHAR to one character
+        return 1 if dialect == "tsql" else math.inf
+    length = data_type.expressions[0].name
+    return math.inf if length.upper() == "MAX" else int(length)
+
+
+def is_widening(old_type: str, new_type: str, dialect: str) -> bool:
+    """Check whether a column type change keeps every existing value.
+
+    Supported widenings are longer (or unbounded) VARCHAR/NVARCHAR, larger
+    integer types and DECIMAL with at least as many integer and fraction
+    digits. Identical types also count as widening.
+
+    Args:
+        old_type: Column type in the old spec (e.g., "varchar(42)")
+        new_type: Column type in the new spec (e.g., "varchar(100)")
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        True if the column can be altered in place without data loss
+    """
+    old = build_column_type(old_type, dialect)
+    new = build_column_type(new_type, dialect)
+    if old == new:
+        return True
+
+    if old.this in _INTEGER_RANKS and new.this in _INTEGER_RANKS:
+        return _INTEGER_RANKS[new.this] >= _INTEGER_RANKS[old.this]
+
+    if old.this in _STRING_TYPES:
+        if new.this == sge.DataType.Type.TEXT:
+            return True
+        if new.this == old.this:
+            return _type_length(new, dialect) >= _type_length(old, dialect)
+
+    if (
+        old.this == new.this == sge.DataType.Type.DECIMAL
+        and len(old.expressions) == len(new.expressions) == 2
+    ):
+        old_precision, old_scale = (int(p.name) for p in old.expressions)
+        new_precision, new_scale = (int(p.name) for p in new.expressions)
+        return (
+            new_scale >= old_scale
+            and new_precision - new_scale >= old_precision - old_scale
+        )
+
+    return False
+
+
+def _alter_table(table: str, action: sge.Expression) -> sge.Alter:
+    """Build ALTER TABLE with a single action."""
+    return sge.Alter(
+        this=sge.Table(this=sg.to_identifier(table)), kind="TABLE", actions=[action]
+    )
+
+
+def _retype_column(
+    table: str,
+    column: str,
+    old_type: str,
+    new_type: str,
+    dialect: str,
+    errors: list[str],
+) -> list[str]:
+    """Alter a column to a wider type, recording narrowing changes as errors."""
+    if build_column_type(old_type, dialect) == build_column_type(new_type, dialect):
+        return []
+    if not is_widening(old_type, new_type, dialect):
+        errors.append(
+            f"{table}.{column}: cannot change {old_type} to {new_type} in place"
+        )
+        return []
+    alter = _alter_table(
+        table,
+        sge.AlterColumn(
+            this=sg.to_identifier(column),
+            dtype=build_column_type(new_type, dialect),
+        ),
+    )
+    return [alter.sql(dialect=dialect)]
+
+
+def _add_column(table: str, column: str, type_: str, dialect: str) -> str:
+    """Add a nullable column without a default (no table rewrite)."""
+    column_def = sge.ColumnDef(
+        this=sg.to_identifier(column), kind=build_column_type(type_, dialect)
+    )
+    return _alter_table(table, column_def).sql(dialect=dialect)
+
+
+def _drop_primary_key(table: str, dialect: str) -> list[str]:
+    """Drop the unnamed primary key generated by the DDL."""
+    if dialect == "tsql":
+        # One statement, so the variable and its use share a batch
+        return [
+            "DECLARE @pk SYSNAME = (SELECT name FROM sys.key_constraints "
+            f"WHERE type = 'PK' AND parent_object_id = OBJECT_ID('{table}'));\n"
+            f"EXEC('ALTER TABLE {table} DROP CONSTRAINT ' + @pk)"
+        ]
+    if dialect == "snowflake":
+        return [f"ALTER TABLE {table} DROP PRIMARY KEY"]
+    # PostgreSQL names it <table>_pkey, truncated to 63 bytes
+    constraint = f"{table.lower()[: 63 - len('_pkey')]}_pkey"
+    return [f"ALTER TABLE {table} DROP CONSTRAINT {constraint}"]
+
+
+def _historize(table: str, key_columns: list[str] | None, dialect: str) -> list[str]:
+    """Add bitemporal columns to a static table and re-key it per version.
+
+    Existing rows become the first version, valid and recorded since they
+    were loaded (metadata_recorded_at).
+    """
+    ts_type = timestamp_type(dialect)
+    statements = [
+        _add_column(table, "changed_at", ts_type, dialect),
+        _add_column(table, "recorded_at", ts_type, dialect),
+        f"UPDATE {table} SET changed_at = metadata_recorded_at, "
+        "recorded_at = metadata_recorded_at",
+    ]
+    for column in ("changed_at", "recorded_at"):
+        if dialect == "tsql":
+            ts_sql = sge.DataType.build(ts_type, dialect=dialect).sql(dialect=dialect)
+            statements.append(
+                f"ALTER TABLE {table} ALTER COLUMN {column} {ts_sql} NOT NULL"
+            )
+        else:
+            statements.append(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+    if key_columns is not None:
+        statements.extend(_drop_primary_key(table, dialect))
+        statements.append(
+            f"ALTER TABLE {table} ADD PRIMARY KEY ({', '.join(key_columns)})"
+        )
+    return statements
+
+
+def _backfill_keymap(anchor: Anchor) -> str:
+    """Seed a new key map with the identities anchors were loaded under.
+
+    Loaded anchors recorded their keyset in metadata_id; a keyset recorded
+    for several identities keeps the lowest.
+    """
+    table = anchor_table_name(anchor)
+    identity_col = f"{anchor.mnemonic}_ID"
+    return (
+        f"INSERT INTO {keymap_table_name(anchor)} (keyset_id, {identity_col}, "
+        "metadata_recorded_at, metadata_recorded_by, metadata_id) "
+        f"SELECT metadata_id, MIN({identity_col}), CURRENT_TIMESTAMP, "
+        f"'architect', metadata_id FROM {table} "
+        "WHERE metadata_id IS NOT NULL AND metadata_id <> 'architect-generated' "
+        "GROUP BY metadata_id"
+    )
+
+
+def _continue_sequence(sequence: str, table: str, column: str, dialect: str) -> str:
+    """Move a sequence past the identities a table already holds."""
+    highest = f"SELECT COALESCE(MAX({column}), 0) FROM {table}"
+    if dialect == "tsql":
+        return (
+            f"DECLARE @restart VARCHAR(20) = ({highest}) + 1;\n"
+            f"EXEC('ALTER SEQUENCE {sequence} RESTART WITH ' + @restart)"
+        )
+    if dialect == "snowflake":
+        # Snowflake sequences cannot restart: recreate it from a script
+        return (
+            "EXECUTE IMMEDIATE $$\nDECLARE\n  restart INTEGER;\nBEGIN\n"
+            f"  SELECT COALESCE(MAX({column}), 0) + 1 INTO :restart "
+            f"FROM {table};\n"
+            f"  LET statement VARCHAR := 'CREATE OR REPLACE SEQUENCE {sequence} "
+            "START WITH ' || restart;\n"
+            "  EXECUTE IMMEDIATE :statement;\nEND;\n$$"
+        )
+    if dialect == "duckdb":
+        # DuckDB sequences cannot be set: draw the identities already held
+        return f"SELECT NEXTVAL('{sequence}') FROM range(({highest}))"
+    return f"SELECT SETVAL('{sequence}', ({highest}) + 1, false)"
+
+
+def _migrate_attribute(
+    anchor: Anchor | Nexus,
+    old: Attribute,
+    new: Attribute,
+    dialect: str,
+    errors: list[str],
+) -> list[str]:
+    """Migrate an existing attribute table to its new definition."""
+    table = attribute_table_name(anchor, new)
+    if old.knot_range != new.knot_range:
+        errors.append(f"{table}: cannot change knot range in place")
+        return []
+    if old.time_range is not None and new.time_range is None:
+        errors.append(f"{table}: cannot turn a historized attribute static")
+        return []
+
+    statements: list[str] = []
+    if old.data_range and new.data_range:
+        statements += _retype_column(
+            table,
+            attribute_value_column(anchor, new),
+            old.data_range,
+            new.data_range,
+            dialect,
+            errors,
+        )
+    if old.time_range is None and new.time_range is not None:
+        statements += _historize(
+            table, [f"{anchor.mnemonic}_ID", "changed_at"], dialect
+        )
+    return statements
+
+
+def _migrate_staging(
+    owner: Anchor | Nexus,
+    old: StagingMapping,
+    new: StagingMapping,
+    dialect: str,
+    errors: list[str],
+) -> list[str]:
+    """Migrate an existing staging table to its new columns.
+
+    The generated keyset_id column blocks altering the natural key columns
+    it reads, so it is dropped before they are widened and added back after.
+    DuckDB cannot add generated columns to a table, so there natural key
+    columns cannot be widened in place.
+    """
+    table = staging_table_name(new)
+    if old.natural_key_columns != new.natural_key_columns:
+        errors.append(f"{table}: cannot change natural key columns in place")
+        return []
+    old_types = {col.name: col.type for col in old.columns}
+    retyped_keys = [
+        col.name
+        for col in new.columns
+        if col.name in new.natural_key_columns
+        and col.name in old_types
+        and build_column_type(old_types[col.name], dialect)
+        != build_column_type(col.type, dialect)
+    ]
+    if retyped_keys and dialect == "duckdb":
+        errors.append(
+            f"{table}: cannot retype natural key columns in place on duckdb "
+            f"({', '.join(retyped_keys)})"
+        )
+        return []
+    statements = _migrate_columns(table, old.columns, new.columns, dialect, errors)
+    if retyped_keys and statements:
+        keyset = build_keyset_column(owner, new, dialect)
+        statements = [
+            f"ALTER TABLE {table} DROP COLUMN keyset_id",
+            *statements,
+            _alter_table(table, keyset).sql(dialect=dialect),
+        ]
+    return statements
+
+
+def _migrate_columns(
+    table: str,
+    old: list[StagingColumn],
+    new: list[StagingColumn],
+    dialect: str,
+    errors: list[str],
+) -> list[str]:
+    """Add new staging columns and widen retyped ones."""
+    old_columns = {col.name: col.type for col in old}
+    statements: list[str] = []
+    for col in new:
+        if col.name not in old_columns:
+            statements.append(_add_column(table, col.name, col.type, dialect))
+        else:
+            statements += _retype_column(
+                table, col.name, old_columns[col.name], col.type, dialect, errors
+            )
+    return statements
+
+
+def _file_staging(
+    anchor: Anchor | Nexus, mapping: StagingMapping, dialect: str, replace: bool
+) -> dict[str, list[str]]:
+    """Create, or drop and recreate, the staging view of a file source."""
+    table = staging_table_name(mapping)
+    columns = [(col.name, col.type) for col in mapping.columns]
+    view = build_staging_table(table, columns, dialect, anchor=anchor, mapping=mapping)
+    if dialect not in EXTERNAL_TABLE_DIALECTS:
+        return {table: [view.sql(dialect=dialect, pretty=True)]}
+
+    external = external_table_name(mapping)
+    kind = "FOREIGN" if dialect == "postgres" else "EXTERNAL"
+    drops = (
+        [f"DROP VIEW IF EXISTS {table}", f"DROP {kind} TABLE IF EXISTS {external}"]
+        if replace
+        else []
+    )
+    statements = build_external_table(mapping, columns, dialect)
+    return {
+        external: [*drops, *(s.sql(dialect=dialect, pretty=True) for s in statements)],
+        table: [view.sql(dialect=dialect, pretty=True)],
+    }
+
+
+def _attribute_signature(
+    anchor: Anchor, knot_types: dict[str, str]
+) -> list[tuple[object, ...]]:
+    """Describe everything an anchor's perspectives are built from."""
+    return [
+        (
+            attr.mnemonic,
+            attr.descriptor,
+            attr.data_range,
+            attr.knot_range,
+            knot_types.get(attr.knot_range or ""),
+            attr.time_range is not None,
+        )
+        for attr in sorted(anchor.attributes, key=lambda a: a.mnemonic)
+    ]
+
+
+def _render(statements: list[str], dialect: str) -> str:
+    """Render migration statements (or ;-terminated scripts) as one script.
+
+    On SQL Server every statement is a batch of its own (ended by GO), so
+    CREATE OR ALTER comes first in its batch, later statements compile
+    against the columns earlier ones added, and variables are not redeclared.
+    """
+    terminator = ";\nGO" if dialect == "tsql" else ";"
+    return (
+        f"{terminator}\n\n".join(s.removesuffix(";") for s in statements) + terminator
+    )
+
+
+def generate_migration(old: Spec, new: Spec, dialect: str) -> dict[str, str]:
+    """Generate the DDL migrating a database from one spec to another.
+
+    Only objects that change get a file; files are keyed like generated DDL
+    (one per table or perspective) and ordered knots, anchors, attributes,
+    ties, nexuses, staging, load control, then perspectives. Perspectives
+    that must be dropped before the tables change come first, in
+    drop_perspectives.sql.
+
+    Args:
+        old: Spec the database was generated from
+        new: Spec to migrate to
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        Dictionary mapping filenames to SQL scripts
+
+    Raises:
+        ValueError: If some change cannot be migrated in place
+    """
+    output: dict[str, list[str]] = {}
+    errors: list[str] = []
+    identities = identity_types(new)
+
+    def create(table: str, ast: sge.Expression) -> None:
+        output[table] = [ast.sql(dialect=dialect, pretty=True)]
+
+    # 1. Knots. Knots newly loaded from staged values get a sequence
+    # numbering them after the IDs they hold.
+    old_knots = {knot_table_name(k): k for k in old.knots}
+    newly_valued = valued_knots(new) - valued_knots(old)
+    for knot in sorted(new.knots, key=lambda k: k.mnemonic):
+        table = knot_table_name(knot)
+        previous = old_knots.get(table)
+        statements: list[str] = []
+        if previous is None:
+            statements.append(
+                build_knot_table(knot, dialect).sql(dialect=dialect, pretty=True)
+            )
+        elif previous.identity != knot.identity:
+            errors.append(f"{table}: cannot change identity in place")
+        else:
+            statements = _retype_column(
+                table,
+                f"{knot.mnemonic}_{knot.descriptor}",
+                previous.data_range,
+                knot.data_range,
+                dialect,
+                errors,
+            )
+        if knot.mnemonic in newly_valued:
+            sequence = knot_sequence_name(knot)
+            statements.insert(0, build_sequence(sequence, dialect).sql(dialect=dialect))
+            if previous is not None:
+                statements.append(
+                    _continue_sequence(sequence, table, f"{knot.mnemonic}_ID", dialect)
+                )
+        if statements:
+            output[table] = statements
+
+    # 2. Anchors, then attributes
+    old_anchors = {anchor_table_name(a): a for a in old.anchors}
+    old_attributes = {
+        attribute_table_name(a, attr): attr
+        for a in old.anchors
+        for attr in a.attributes
+    }
+    new_anchors = sorted(new.anchors, key=lambda a: a.mnemonic)
+    # Anchors newly joined on their keysets by tie loads get an index
+    indexed = keyset_resolved_anchors(new) if dialect != "snowflake" else set()
+    for anchor in new_anchors:
+        table = anchor_table_name(anchor)
+        previous_anchor = old_anchors.get(table)
+        if previous_anchor is None:
+            create(table, build_anchor_table(anchor, dialect))
+        elif previous_anchor.identity != anchor.identity:
+            errors.append(f"{table}: cannot change identity in place")
+        # A new key map takes over the identities already loaded
+        if anchor.keymap and (previous_anchor is None or not previous_anchor.keymap):
+            keymap = keymap_table_name(anchor)
+            sequence = keymap_sequence_name(anchor)
+            output[keymap] = [
+                build_sequence(sequence, dialect).sql(dialect=dialect),
+                build_keymap_table(anchor, dialect).sql(dialect=dialect, pretty=True),
+            ]
+            if previous_anchor is not None:
+                output[keymap].append(_backfill_keymap(anchor))
+                output[keymap].append(
+                    _continue_sequence(
+                        sequence, keymap, f"{anchor.mnemonic}_ID", dialect
+                    )
+                )
+        if anchor.mnemonic in indexed - keyset_resolved_anchors(old):
+            output.setdefault(table, []).append(
+                build_metadata_id_index(anchor, dialect).sql(dialect=dialect)
+            )
+
+    for anchor in new_anchors:
+        for attr in sorted(anchor.attributes, key=lambda at: at.mnemonic):
+            table = attribute_table_name(anchor, attr)
+            previous_attr = old_attributes.get(table)
+            if previous_attr is None:
+                create(table, build_attribute_table(anchor, attr, dialect, identities))
+            elif statements := _migrate_attribute(
+                anchor, previous_attr, attr, dialect, errors
+            ):
+                output[table] = statements
+
+    # 3. Ties
+    old_ties = {tie_table_name(t): t for t in old.ties}
+    for tie in sorted(new.ties, key=tie_table_name):
+        table = tie_table_name(tie)
+        previous_tie = old_ties.get(table)
+        if previous_tie is None:
+            create(table, build_tie_table(tie, dialect, identities))
+        elif previous_tie.time_range is not None and tie.time_range is None:
+            errors.append(f"{table}: cannot turn a historized tie static")
+        elif previous_tie.time_range is None and tie.time_range is not None:
+            output[table] = _historize(table, None, dialect)
+
+    # 4. Nexuses, then their attributes
+    old_nexuses = {nexus_table_name(n): n for n in old.nexuses}
+    old_nexus_attributes = {
+        attribute_table_name(n, attr): attr
+        for n in old.nexuses
+        for attr in n.attributes
+    }
+    for nexus in sorted(new.nexuses, key=lambda n: n.mnemonic):
+        table = nexus_table_name(nexus)
+        previous_nexus = old_nexuses.get(table)
+        if previous_nexus is None:
+            create(table, build_nexus_table(nexus, dialect, identities))
+            if dialect != "snowflake":
+                output[table] += [
+                    index.sql(dialect=dialect)
+                    for index in build_role_indexes(nexus, dialect)
+                ]
+        elif previous_nexus.identity != nexus.identity:
+            errors.append(f"{table}: cannot change identity in place")
+        elif previous_nexus.roles != nexus.roles:
+            errors.append(f"{table}: cannot change nexus roles in place")
+        for attr in sorted(nexus.attributes, key=lambda at: at.mnemonic):
+            attr_table = attribute_table_name(nexus, attr)
+            previous_attr = old_nexus_attributes.get(attr_table)
+            if previous_attr is None:
+                create(
+                    attr_table, build_attribute_table(nexus, attr, dialect, identities)
+                )
+            elif statements := _migrate_attribute(
+                nexus, previous_attr, attr, dialect, errors
+            ):
+                output[attr_table] = statements
+
+    # 5. Staging tables
+    old_owners: list[Anchor | Nexus] = [*old.anchors, *old.nexuses]
+    new_owners: list[Anchor | Nexus] = [*new.anchors, *new.nexuses]
+    old_staging = {
+        staging_table_name(m): m for o in old_owners for m in o.staging_mappings
+    }
+    new_staging = {
+        staging_table_name(m): (o, m) for o in new_owners for m in o.staging_mappings
+    }
+    for table in sorted(new_staging):
+        owner, mapping = new_staging[table]
+        previous_mapping = old_staging.get(table)
+        if previous_mapping is not None and (previous_mapping.source is None) != (
+            mapping.source is None
+        ):
+            errors.append(
+                f"{table}: cannot switch between a staging table and a file source"
+            )
+        elif mapping.cdc is not None or (
+            previous_mapping is not None and previous_mapping.cdc is not None
+        ):
+            # Change feeds have no columns to alter, only a source to follow
+            if previous_mapping is None:
+                create(table, build_cdc_source(mapping, dialect))
+            elif previous_mapping.cdc != mapping.cdc:
+                errors.append(f"{table}: cannot change a CDC source in place")
+        elif mapping.source is not None:
+            if previous_mapping != mapping:
+                output.update(
+                    _file_staging(owner, mapping, dialect, previous_mapping is not None)
+                )
+        elif previous_mapping is None:
+            columns = [(col.name, col.type) for col in mapping.columns]
+            create(
+                table,
+                build_staging_table(
+                    table, columns, dialect, anchor=owner, mapping=mapping
+                ),
+            )
+        elif statements := _migrate_staging(
+            owner, previous_mapping, mapping, dialect, errors
+        ):
+            output[table] = statements
+
+    # Tie staging tables (those not also staging an anchor)
+    old_tie_staging = {
+        staging_table_name(m): m for t in old.ties for m in t.staging_mappings
+    }
+    new_tie_staging = {
+        staging_table_name(m): m
+        for t in new.ties
+        for m in t.staging_mappings
+        if staging_table_name(m) not in new_staging
+    }
+    for table in sorted(new_tie_staging):
+        tie_mapping = new_tie_staging[table]
+        previous_tie_mapping = old_tie_staging.get(table)
+        if previous_tie_mapping is None:
+            columns = [(col.name, col.type) for col in tie_mapping.columns]
+            create(table, build_staging_table(table, columns, dialect))
+        elif statements := _migrate_columns(
+            table,
+            previous_tie_mapping.columns,
+            tie_mapping.columns,
+            dialect,
+            errors,
+        ):
+            output[table] = statements
+
+    # 6. Load-control table, once some mapping first loads incrementally
+    def watermarked(spec: Spec) -> bool:
+        owners: list[Anchor | Nexus] = [*spec.anchors, *spec.nexuses]
+        return any(
+            m.watermark_column or (m.cdc is not None and dialect == "tsql")
+            for o in owners
+            for m in o.staging_mappings
+        )
+
+    if watermarked(new) and not watermarked(old):
+        create(LOAD_CONTROL_TABLE, build_load_control_table(dialect))
+
+    if errors:
+        msg = "Cannot migrate in place:\n" + "\n".join(f"  - {e}" for e in errors)
+        raise ValueError(msg)
+
+    # 7. Perspectives of anchors whose attributes (or their knots) changed,
+    # and materialized latest state whose perspective or settings changed
+    old_knot_types = {k.mnemonic: k.data_range for k in old.knots}
+    new_knot_types = {k.mnemonic: k.data_range for k in new.knots}
+    early_drops: list[str] = []
+    perspectives: dict[str, str] = {}
+    for anchor in new_anchors:
+        previous_anchor = old_anchors.get(anchor_table_name(anchor))
+        changed = previous_anchor is None or _attribute_signature(
+            previous_anchor, old_knot_types
+        ) != _attribute_signature(anchor, new_knot_types)
+        was_materialized = (
+            previous_anchor is not None and previous_anchor.materialize is not None
+        )
+        rematerialize = anchor.materialize is not None and (
+            changed
+            or previous_anchor is None
+            or previous_anchor.materialize != anchor.materialize
+        )
+        if not changed and not rematerialize:
+            continue
+        materialized = materialized_view_name(anchor)
+        views = generate_all_views(Spec(anchors=[anchor], knots=new.knots), dialect)
+        if not changed:
+            views = {f"{materialized}.sql": views[f"{materialized}.sql"]}
+
+        # PostgreSQL views block ALTER COLUMN on the columns they read, and
+        # neither views nor functions can be replaced with new column types
+        drops: dict[str, str] = {}
+        if dialect == "postgres" and previous_anchor is not None:
+            if was_materialized and changed:
+                early_drops.append(f"DROP MATERIALIZED VIEW IF EXISTS {materialized}")
+            elif was_materialized:
+                drops[materialized] = "MATERIALIZED VIEW"
+            if changed:
+                early_drops.append(f"DROP VIEW IF EXISTS {latest_view_name(anchor)}")
+                drops[point_in_time_function_name(anchor)] = "FUNCTION"
+                drops[difference_function_name(anchor)] = "FUNCTION"
+        elif dialect in ("tsql", "duckdb") and was_materialized:
+            # Snapshot tables are only created if missing
+            drops[materialized] = "TABLE"
+
+        for filename, sql in views.items():
+            name = filename.removesuffix(".sql")
+            statements = [sql]
+            if name in drops:
+                statements.insert(0, f"DROP {drops[name]} IF EXISTS {name}")
+            if name == materialized and dialect in ("tsql", "duckdb"):
+                # Fill the new snapshot; later loads keep refreshing it
+                statements += [
+                    stmt.sql(dialect=dialect, pretty=True)
+                    for stmt in build_materialized_refresh(anchor, dialect, new.knots)
+                ]
+            perspectives[filename] = _render(statements, dialect)
+
+    scripts = (
+        {"drop_perspectives.sql": _render(early_drops, dialect)} if early_drops else {}
+    )
+    scripts.update(
+        {f"{name}.sql": _render(stmts, dialect) for name, stmts in output.items()}
+    )
+    scripts.update(perspectives)
+    return scripts
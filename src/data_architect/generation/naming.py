@@ -2,9 +2,16 @@
 
 from data_architect.models.anchor import Anchor, Attribute
 from data_architect.models.knot import Knot
-from data_architect.models.staging import StagingMapping
+from data_architect.models.spec import Nexus
+from data_architect.models.staging import StagingMapping, TieStagingMapping
 from data_architect.models.tie import Tie
 
+LOAD_CONTROL_TABLE = "dab_load_control"
+"""Table holding per-target watermarks of incremental loads."""
+
+FILE_SERVER = "dab_files"
+"""Postgres file_fdw server reading staging source files."""
+
 
 def anchor_table_name(anchor: Anchor) -> str:
     """Generate anchor table name.
@@ -18,11 +25,23 @@ def anchor_table_name(anchor: Anchor) -> str:
     return f"{anchor.mnemonic}_{anchor.descriptor}"
 
 
-def attribute_table_name(anchor: Anchor, attribute: Attribute) -> str:
+def nexus_table_name(nexus: Nexus) -> str:
+    """Generate nexus table name.
+
+    Args:
+        nexus: Nexus model instance
+
+    Returns:
+        Table name in format: {mnemonic}_{descriptor}
+    """
+    return f"{nexus.mnemonic}_{nexus.descriptor}"
+
+
+def attribute_table_name(anchor: Anchor | Nexus, attribute: Attribute) -> str:
     """Generate attribute table name.
 
     Args:
-        anchor: Parent anchor model instance
+        anchor: Parent anchor or nexus model instance
         attribute: Attribute model instance
 
     Returns:
@@ -35,6 +54,23 @@ def attribute_table_name(anchor: Anchor, attribute: Attribute) -> str:
     )
 
 
+def attribute_value_column(anchor: Anchor | Nexus, attribute: Attribute) -> str:
+    """Generate the value column name of an attribute.
+
+    Args:
+        anchor: Parent anchor or nexus model instance
+        attribute: Attribute model instance
+
+    Returns:
+        Column name in format:
+        {anchor_mnemonic}_{attr_mnemonic}_{anchor_descriptor}_{attr_descriptor}
+        for data attributes, or {knot_mnemonic}_ID for knotted attributes
+    """
+    if attribute.knot_range:
+        return f"{attribute.knot_range}_ID"
+    return attribute_table_name(anchor, attribute)
+
+
 def knot_table_name(knot: Knot) -> str:
     """Generate knot table name.
 
@@ -66,13 +102,124 @@ def tie_table_name(tie: Tie) -> str:
     return f"{types}_{roles}"
 
 
-def staging_table_name(mapping: StagingMapping) -> str:
+def staging_table_name(mapping: StagingMapping | TieStagingMapping) -> str:
     """Extract staging table name from mapping definition.
 
     Args:
-        mapping: Staging mapping model instance
+        mapping: Anchor or tie staging mapping model instance
 
     Returns:
         Table name from mapping.table
     """
     return mapping.table
+
+
+def external_table_name(mapping: StagingMapping) -> str:
+    """Generate name of the external table over a mapping's source files.
+
+    Args:
+        mapping: Staging mapping model instance with a file source
+
+    Returns:
+        Table name in format: {staging_table}_files
+    """
+    return f"{staging_table_name(mapping)}_files"
+
+
+def capture_instance_name(mapping: StagingMapping) -> str:
+    """Generate SQL Server CDC capture instance name of a mapping's source.
+
+    Args:
+        mapping: Staging mapping model instance with a CDC source
+
+    Returns:
+        Capture instance in SQL Server's default format: {schema}_{table}
+        (schema defaults to dbo)
+    """
+    table = mapping.cdc.table if mapping.cdc is not None else mapping.table
+    schema, _, name = table.rpartition(".")
+    return f"{schema or 'dbo'}_{name}"
+
+
+def keymap_table_name(anchor: Anchor) -> str:
+    """Generate key-map table name for an anchor.
+
+    Args:
+        anchor: Anchor model instance
+
+    Returns:
+        Table name in format: {mnemonic}_{descriptor}_keymap
+    """
+    return f"{anchor_table_name(anchor)}_keymap"
+
+
+def knot_sequence_name(knot: Knot) -> str:
+    """Generate name of the sequence numbering a knot's staged values.
+
+    Args:
+        knot: Knot model instance
+
+    Returns:
+        Sequence name in format: {mnemonic}_{descriptor}_seq
+    """
+    return f"{knot_table_name(knot)}_seq"
+
+
+def keymap_sequence_name(anchor: Anchor) -> str:
+    """Generate name of the sequence numbering an anchor's key map.
+
+    Args:
+        anchor: Anchor model instance
+
+    Returns:
+        Sequence name in format: {mnemonic}_{descriptor}_keymap_seq
+    """
+    return f"{keymap_table_name(anchor)}_seq"
+
+
+def latest_view_name(anchor: Anchor) -> str:
+    """Generate latest view name for an anchor.
+
+    Args:
+        anchor: Anchor model instance
+
+    Returns:
+        View name in format: l{mnemonic}_{descriptor}
+    """
+    return f"l{anchor_table_name(anchor)}"
+
+
+def materialized_view_name(anchor: Anchor) -> str:
+    """Generate materialized latest-state name for an anchor.
+
+    Args:
+        anchor: Anchor model instance
+
+    Returns:
+        Object name in format: m{mnemonic}_{descriptor}
+    """
+    return f"m{anchor_table_name(anchor)}"
+
+
+def point_in_time_function_name(anchor: Anchor) -> str:
+    """Generate point-in-time function name for an anchor.
+
+    Args:
+        anchor: Anchor model instance
+
+    Returns:
+        Function name in format: p{mnemonic}_{descriptor}
+    """
+    return f"p{anchor_table_name(anchor)}"
+
+
+def difference_function_name(anchor: Anchor) -> str:
+    """Generate difference (interval) function name for an anchor.
+
+    Args:
+        anchor: Anchor model instance
+
+    Returns:
+        Function name in format: d{mnemonic}_{descriptor}
+    """
+    return f"d{anchor_table_name(anchor)}"
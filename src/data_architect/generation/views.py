@@ -0,0 +1,655 @@
+"""View and table function builders for Anchor Model perspectives.
+
+Three perspectives are generated per anchor:
+- latest (l{anchor}): view with the current value of every attribute
+- point-in-time (p{anchor}): function returning the state as of a timepoint
+- difference (d{anchor}): function returning the state at every change
+  within an interval
+
+Point-in-time and difference functions also take a knownpoint that filters
+on recorded_at, giving bitemporal "as known at" access. Anchors can also
+materialize their latest state (m{anchor}) for read-heavy consumers.
+"""
+
+# ruff: noqa: S608  # SQL strings are parsed by SQLGlot, not executed directly
+
+from collections.abc import Callable
+
+import sqlglot as sg
+import sqlglot.expressions as sge
+
+from data_architect.generation.columns import build_column_type, timestamp_type
+from data_architect.generation.ddl import render_statements
+from data_architect.generation.naming import (
+    anchor_table_name,
+    attribute_table_name,
+    attribute_value_column,
+    difference_function_name,
+    knot_table_name,
+    latest_view_name,
+    materialized_view_name,
+    point_in_time_function_name,
+)
+from data_architect.models.anchor import Anchor, Attribute, Materialization
+from data_architect.models.knot import Knot
+from data_architect.models.spec import Spec
+
+# (select expression, output column name, spec data type) of a perspective column
+_Column = tuple[str, str, str]
+
+
+def _type_sql(type_: str, dialect: str) -> str:
+    """Render a spec data type in the target dialect."""
+    return build_column_type(type_, dialect).sql(dialect=dialect)
+
+
+def _latest_attribute_join(anchor: Anchor, attribute: Attribute, dialect: str) -> str:
+    """Build the join that attaches the latest row of one attribute to its anchor.
+
+    Static attributes hold one row per anchor, so a plain LEFT JOIN on the
+    primary key suffices. Historized attributes pick their latest version with
+    the cheapest construct of each dialect: DISTINCT ON (postgres), QUALIFY
+    ROW_NUMBER() (snowflake) or OUTER APPLY TOP 1 (tsql). Every variant yields
+    at most one row per anchor, so optimizers can eliminate the join when none
+    of the attribute's columns are selected.
+
+    Args:
+        anchor: Parent anchor model instance
+        attribute: Attribute model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQL join clause for embedding in the latest view template.
+    """
+    table = attribute_table_name(anchor, attribute)
+    anchor_table = anchor_table_name(anchor)
+    alias = f"{anchor.mnemonic}_{attribute.mnemonic}"
+    anchor_fk = f"{anchor.mnemonic}_ID"
+    value_col = attribute_value_column(anchor, attribute)
+
+    if attribute.time_range is None:
+        return f"""
+LEFT JOIN {table} AS {alias}
+    ON {alias}.{anchor_fk} = {anchor_table}.{anchor_fk}"""
+
+    if dialect == "postgres":
+        return f"""
+LEFT JOIN (
+    SELECT DISTINCT ON ({anchor_fk})
+        {anchor_fk},
+        {value_col},
+        changed_at
+    FROM {table}
+    ORDER BY {anchor_fk}, changed_at DESC
+) AS {alias}
+    ON {alias}.{anchor_fk} = {anchor_table}.{anchor_fk}"""
+
+    if dialect == "tsql":
+        return f"""
+OUTER APPLY (
+    SELECT TOP 1
+        attr.{value_col},
+        attr.changed_at
+    FROM {table} AS attr
+    WHERE attr.{anchor_fk} = {anchor_table}.{anchor_fk}
+    ORDER BY attr.changed_at DESC
+) AS {alias}"""
+
+    return f"""
+LEFT JOIN (
+    SELECT
+        {anchor_fk},
+        {value_col},
+        changed_at
+    FROM {table}
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY {anchor_fk} ORDER BY changed_at DESC
+    ) = 1
+) AS {alias}
+    ON {alias}.{anchor_fk} = {anchor_table}.{anchor_fk}"""
+
+
+def _as_of_attribute_join(
+    anchor: Anchor,
+    attribute: Attribute,
+    dialect: str,
+    outer: str,
+    timepoint: str,
+    knownpoint: str,
+) -> str:
+    """Build the join that attaches the attribute row valid at a timepoint.
+
+    The row picked is the latest one with changed_at <= timepoint among those
+    recorded at or before knownpoint. On postgres and tsql this is a
+    correlated TOP 1/LIMIT 1 probe that seeks the (anchor FK, changed_at)
+    primary key instead of scanning the attribute. Snowflake and DuckDB have
+    no indexes, so they filter then rank once (QUALIFY) for a constant
+    timepoint, or use ASOF JOIN when the timepoint is a column of the outer
+    relation.
+
+    Args:
+        anchor: Parent anchor model instance
+        attribute: Attribute model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        outer: Alias of the relation providing the anchor FK
+        timepoint: SQL expression for the valid-time point
+        knownpoint: SQL expression for the transaction-time point
+
+    Returns:
+        SQL join clause for embedding in a perspective template.
+    """
+    table = attribute_table_name(anchor, attribute)
+    alias = f"{anchor.mnemonic}_{attribute.mnemonic}"
+    anchor_fk = f"{anchor.mnemonic}_ID"
+    value_col = attribute_value_column(anchor, attribute)
+
+    if attribute.time_range is None:
+        return f"""
+LEFT JOIN {table} AS {alias}
+    ON {alias}.{anchor_fk} = {outer}.{anchor_fk}"""
+
+    if dialect in ("postgres", "tsql"):
+        probe = f"""
+    SELECT{" TOP 1" if dialect == "tsql" else ""}
+        attr.{value_col},
+        attr.changed_at
+    FROM {table} AS attr
+    WHERE attr.{anchor_fk} = {outer}.{anchor_fk}
+      AND attr.changed_at <= {timepoint}
+      AND attr.recorded_at <= {knownpoint}
+    ORDER BY attr.changed_at DESC{"" if dialect == "tsql" else " LIMIT 1"}"""
+        if dialect == "tsql":
+            return f"\nOUTER APPLY ({probe}\n) AS {alias}"
+        return f"\nLEFT JOIN LATERAL ({probe}\n) AS {alias} ON TRUE"
+
+    if timepoint.startswith(f"{outer}.") and dialect == "duckdb":
+        return f"""
+ASOF LEFT JOIN (
+    SELECT {anchor_fk}, {value_col}, changed_at
+    FROM {table}
+    WHERE recorded_at <= {knownpoint}
+) AS {alias}
+    ON {alias}.{anchor_fk} = {outer}.{anchor_fk}
+    AND {timepoint} >= {alias}.changed_at"""
+
+    if timepoint.startswith(f"{outer}."):
+        return f"""
+ASOF JOIN (
+    SELECT {anchor_fk}, {value_col}, changed_at
+    FROM {table}
+    WHERE recorded_at <= {knownpoint}
+) AS {alias}
+    MATCH_CONDITION ({timepoint} >= {alias}.changed_at)
+    ON {alias}.{anchor_fk} = {outer}.{anchor_fk}"""
+
+    return f"""
+LEFT JOIN (
+    SELECT {anchor_fk}, {value_col}, changed_at
+    FROM {table}
+    WHERE changed_at <= {timepoint}
+      AND recorded_at <= {knownpoint}
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY {anchor_fk} ORDER BY changed_at DESC
+    ) = 1
+) AS {alias}
+    ON {alias}.{anchor_fk} = {outer}.{anchor_fk}"""
+
+
+def _perspective(
+    anchor: Anchor,
+    dialect: str,
+    knots: list[Knot] | None,
+    outer: str,
+    attribute_join: Callable[[Attribute], str],
+) -> tuple[list[_Column], list[str]]:
+    """Build the columns and joins shared by all perspectives of an anchor.
+
+    Args:
+        anchor: Anchor model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        knots: Optional knots of the spec, used to resolve knot values
+        outer: Alias of the relation providing the anchor FK
+        attribute_join: Builds the join clause for one attribute
+
+    Returns:
+        Tuple of (columns, join clauses)
+    """
+    knot_lookup = {knot.mnemonic: knot for knot in knots or []}
+    anchor_fk = f"{anchor.mnemonic}_ID"
+
+    columns: list[_Column] = [(f"{outer}.{anchor_fk}", anchor_fk, anchor.identity)]
+    joins: list[str] = []
+
+    for attr in sorted(anchor.attributes, key=lambda at: at.mnemonic):
+        alias = f"{anchor.mnemonic}_{attr.mnemonic}"
+        value_col = attribute_value_column(anchor, attr)
+        joins.append(attribute_join(attr))
+
+        if attr.knot_range:
+            knot = knot_lookup.get(attr.knot_range)
+            columns.append(
+                (
+                    f"{alias}.{value_col}",
+                    f"{alias}_{value_col}",
+                    knot.identity if knot is not None else "bigint",
+                )
+            )
+            if knot is not None:
+                knot_alias = f"k{alias}"
+                joins.append(f"""
+LEFT JOIN {knot_table_name(knot)} AS {knot_alias}
+    ON {knot_alias}.{value_col} = {alias}.{value_col}""")
+                columns.append(
+                    (
+                        f"{knot_alias}.{knot.mnemonic}_{knot.descriptor}",
+                        attribute_table_name(anchor, attr),
+                        knot.data_range,
+                    )
+                )
+        elif attr.data_range:
+            columns.append((f"{alias}.{value_col}", value_col, attr.data_range))
+
+        if attr.time_range is not None:
+            columns.append(
+                (f"{alias}.changed_at", f"{alias}_changed_at", timestamp_type(dialect))
+            )
+
+    return columns, joins
+
+
+def _select_list(columns: list[_Column]) -> str:
+    """Render perspective columns as a select list, aliasing only when needed."""
+    items = [
+        expr if expr.rsplit(".", 1)[-1] == name else f"{expr} AS {name}"
+        for expr, name, _ in columns
+    ]
+    return ",\n    ".join(items)
+
+
+def _create_function(
+    name: str,
+    params: list[tuple[str, str, str | None]],
+    columns: list[_Column],
+    body: str,
+    dialect: str,
+) -> sge.Expression:
+    """Wrap a SELECT body in a dialect-specific table function definition.
+
+    DuckDB has no SQL table functions; table macros play their role.
+
+    Args:
+        name: Function name
+        params: List of (name, SQL type, default expression or None)
+        columns: Output columns of the body
+        body: SELECT statement referencing the parameters
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        SQLGlot AST node for CREATE FUNCTION
+    """
+    # Snowflake renders the body as a quoted string literal, where pretty
+    # printing would turn into escaped newlines; keep it on one line there.
+    body_sql = sg.parse_one(body, dialect=dialect).sql(
+        dialect=dialect, pretty=dialect != "snowflake"
+    )
+
+    if dialect == "duckdb":
+        # Table macros: untyped parameters, defaults as name := value
+        param_list = ", ".join(
+            p + (f" := {d}" if d is not None else "") for p, _, d in params
+        )
+        return sge.Command(
+            this="CREATE",
+            expression=f"OR REPLACE MACRO {name}({param_list}) AS TABLE\n{body_sql}",
+        )
+
+    if dialect == "tsql":
+        param_list = ", ".join(
+            f"@{p} {t}" + (f" = {d}" if d is not None else "") for p, t, d in params
+        )
+        sql = f"""
+CREATE OR ALTER FUNCTION {name}({param_list})
+RETURNS TABLE AS
+RETURN {body_sql}
+"""
+        return sg.parse_one(sql, dialect=dialect)
+
+    param_list = ", ".join(
+        f"{p} {t}" + (f" DEFAULT {d}" if d is not None else "") for p, t, d in params
+    )
+    returns = ", ".join(
+        f"{col} {_type_sql(type_, dialect)}" for _, col, type_ in columns
+    )
+    language = " LANGUAGE sql STABLE" if dialect == "postgres" else ""
+    sql = f"""
+CREATE OR REPLACE FUNCTION {name}({param_list})
+RETURNS TABLE ({returns}){language}
+AS $${body_sql}$$
+"""
+    return sg.parse_one(sql, dialect=dialect)
+
+
+def _param(name: str, dialect: str) -> str:
+    """Reference a function parameter (tsql parameters carry an @ prefix)."""
+    return f"@{name}" if dialect == "tsql" else name
+
+
+def _knownpoint_default(dialect: str) -> str:
+    """Default knownpoint: everything recorded so far.
+
+    T-SQL defaults must be constants and DuckDB folds macro defaults when the
+    macro is created, so both use an upper bound instead of the current time.
+    """
+    if dialect == "tsql":
+        return "'9999-12-31'"
+    if dialect == "duckdb":
+        return "CAST('infinity' AS TIMESTAMPTZ)"
+    return "CURRENT_TIMESTAMP"
+
+
+def build_latest_view(
+    anchor: Anchor, dialect: str, knots: list[Knot] | None = None
+) -> sge.Expression:
+    """Build CREATE VIEW statement exposing the latest state of an anchor.
+
+    The view has one row per anchor identity. Each attribute contributes its
+    value column (knotted attributes also their knot FK and resolved knot
+    value), and historized attributes additionally their changed_at.
+
+    Args:
+        anchor: Anchor model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        knots: Optional knots of the spec. Knotted attributes whose knot is
+            given are joined to it to expose the knot value.
+
+    Returns:
+        SQLGlot AST node for CREATE OR REPLACE VIEW (CREATE OR ALTER for tsql)
+    """
+    _, select = _latest_select(anchor, dialect, knots)
+    create = "CREATE OR ALTER VIEW" if dialect == "tsql" else "CREATE OR REPLACE VIEW"
+
+    sql = f"""
+{create} {latest_view_name(anchor)} AS
+{select}
+"""
+
+    return sg.parse_one(sql, dialect=dialect)
+
+
+def _latest_select(
+    anchor: Anchor, dialect: str, knots: list[Knot] | None
+) -> tuple[list[_Column], str]:
+    """Build the columns and SELECT of the latest state of an anchor."""
+    anchor_table = anchor_table_name(anchor)
+    columns, joins = _perspective(
+        anchor,
+        dialect,
+        knots,
+        anchor_table,
+        lambda attr: _latest_attribute_join(anchor, attr, dialect),
+    )
+    select = f"""SELECT
+    {_select_list(columns)}
+FROM {anchor_table}{"".join(joins)}"""
+    return columns, select
+
+
+def build_materialized_latest(
+    anchor: Anchor, dialect: str, knots: list[Knot] | None = None
+) -> list[sge.Expression]:
+    """Build DDL materializing the latest state of an anchor.
+
+    Snowflake gets a dynamic table that refreshes incrementally within the
+    anchor's target lag. Postgres gets a materialized view with a unique
+    index on the identity, which REFRESH ... CONCURRENTLY requires. T-SQL
+    indexed views cannot contain the outer joins of the latest state, so
+    SQL Server (and DuckDB, which has no materialized views) get a snapshot
+    table keyed on the identity instead.
+
+    Args:
+        anchor: Anchor model instance with materialize set
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        knots: Optional knots of the spec, used to resolve knot values
+
+    Returns:
+        Statements to run in order
+
+    Raises:
+        ValueError: If a Snowflake materialization names no warehouse
+    """
+    name = materialized_view_name(anchor)
+    materialize = anchor.materialize or Materialization()
+    anchor_fk = f"{anchor.mnemonic}_ID"
+    columns, select = _latest_select(anchor, dialect, knots)
+
+    if dialect == "snowflake":
+        if materialize.warehouse is None:
+            msg = f"{name}: Snowflake dynamic tables require a warehouse"
+            raise ValueError(msg)
+        sql = f"""
+CREATE OR REPLACE DYNAMIC TABLE {name}
+TARGET_LAG = '{materialize.target_lag}'
+WAREHOUSE = {materialize.warehouse}
+AS
+{select}
+"""
+        return [sg.parse_one(sql, dialect=dialect)]
+
+    if dialect == "postgres":
+        return [
+            sg.parse_one(
+                f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS\n{select}",
+                dialect=dialect,
+            ),
+            sg.parse_one(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {name}_key ON {name} ({anchor_fk})",
+                dialect=dialect,
+            ),
+        ]
+
+    definitions = [
+        f"{column} {_type_sql(type_, dialect)}"
+        + (" NOT NULL" if column == anchor_fk else "")
+        for _, column, type_ in columns
+    ]
+    definitions.append(f"PRIMARY KEY ({anchor_fk})")
+    body = ",\n    ".join(definitions)
+    sql = f"""
+CREATE TABLE IF NOT EXISTS {name} (
+    {body}
+)
+"""
+    return [sg.parse_one(sql, dialect=dialect)]
+
+
+def build_materialized_refresh(
+    anchor: Anchor, dialect: str, knots: list[Knot] | None = None
+) -> list[sge.Expression]:
+    """Build statements refreshing the materialized latest state of an anchor.
+
+    Run after the loads of the anchor and its attributes. Snapshot tables
+    are rebuilt from the latest state; run their statements in one
+    transaction so readers never see an empty table.
+
+    Args:
+        anchor: Anchor model instance with materialize set
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        knots: Optional knots of the spec, used to resolve knot values
+
+    Returns:
+        Statements to run in order
+    """
+    name = materialized_view_name(anchor)
+
+    if dialect == "snowflake":
+        return [sge.Command(this="ALTER", expression=f"DYNAMIC TABLE {name} REFRESH")]
+
+    if dialect == "postgres":
+        return [
+            sge.Command(
+                this="REFRESH", expression=f"MATERIALIZED VIEW CONCURRENTLY {name}"
+            )
+        ]
+
+    columns, select = _latest_select(anchor, dialect, knots)
+    names = ", ".join(column for _, column, _ in columns)
+    return [
+        sg.parse_one(f"DELETE FROM {name}", dialect=dialect),
+        sg.parse_one(f"INSERT INTO {name} ({names})\n{select}", dialect=dialect),
+    ]
+
+
+def build_point_in_time_function(
+    anchor: Anchor, dialect: str, knots: list[Knot] | None = None
+) -> sge.Expression:
+    """Build table function returning the state of an anchor at a timepoint.
+
+    p{anchor}(timepoint, knownpoint) returns one row per anchor identity with
+    the attribute values valid at timepoint, as recorded at knownpoint
+    (defaults to everything recorded so far).
+
+    Args:
+        anchor: Anchor model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        knots: Optional knots of the spec, used to resolve knot values
+
+    Returns:
+        SQLGlot AST node for CREATE FUNCTION
+    """
+    anchor_table = anchor_table_name(anchor)
+    timepoint = _param("timepoint", dialect)
+    knownpoint = _param("knownpoint", dialect)
+    columns, joins = _perspective(
+        anchor,
+        dialect,
+        knots,
+        anchor_table,
+        lambda attr: _as_of_attribute_join(
+            anchor, attr, dialect, anchor_table, timepoint, knownpoint
+        ),
+    )
+
+    body = f"""
+SELECT
+    {_select_list(columns)}
+FROM {anchor_table}{"".join(joins)}
+"""
+
+    ts_type = _type_sql(timestamp_type(dialect), dialect)
+    params = [
+        ("timepoint", ts_type, None),
+        ("knownpoint", ts_type, _knownpoint_default(dialect)),
+    ]
+    return _create_function(
+        point_in_time_function_name(anchor), params, columns, body, dialect
+    )
+
+
+def build_difference_function(
+    anchor: Anchor, dialect: str, knots: list[Knot] | None = None
+) -> sge.Expression:
+    """Build table function returning the state of an anchor at each change.
+
+    d{anchor}(fromtime, totime, knownpoint) returns one row per anchor
+    identity and distinct changed_at within [fromtime, totime] across its
+    historized attributes, with all attribute values valid at that moment
+    (exposed as inspected_at).
+
+    Args:
+        anchor: Anchor model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+        knots: Optional knots of the spec, used to resolve knot values
+
+    Returns:
+        SQLGlot AST node for CREATE FUNCTION
+
+    Raises:
+        ValueError: If the anchor has no historized attributes
+    """
+    historized = [a for a in anchor.attributes if a.time_range is not None]
+    if not historized:
+        msg = f"Anchor '{anchor.mnemonic}' has no historized attributes"
+        raise ValueError(msg)
+
+    anchor_fk = f"{anchor.mnemonic}_ID"
+    fromtime = _param("fromtime", dialect)
+    totime = _param("totime", dialect)
+    knownpoint = _param("knownpoint", dialect)
+    outer = "timepoints"
+
+    change_points = "\n    UNION\n".join(
+        f"""    SELECT {anchor_fk}, changed_at
+    FROM {attribute_table_name(anchor, attr)}
+    WHERE changed_at BETWEEN {fromtime} AND {totime}
+      AND recorded_at <= {knownpoint}"""
+        for attr in sorted(historized, key=lambda at: at.mnemonic)
+    )
+
+    columns, joins = _perspective(
+        anchor,
+        dialect,
+        knots,
+        outer,
+        lambda attr: _as_of_attribute_join(
+            anchor, attr, dialect, outer, f"{outer}.changed_at", knownpoint
+        ),
+    )
+    ts_type = _type_sql(timestamp_type(dialect), dialect)
+    columns.insert(0, (f"{outer}.changed_at", "inspected_at", timestamp_type(dialect)))
+
+    body = f"""
+SELECT
+    {_select_list(columns)}
+FROM (
+{change_points}
+) AS {outer}{"".join(joins)}
+"""
+
+    params = [
+        ("fromtime", ts_type, None),
+        ("totime", ts_type, None),
+        ("knownpoint", ts_type, _knownpoint_default(dialect)),
+    ]
+    return _create_function(
+        difference_function_name(anchor), params, columns, body, dialect
+    )
+
+
+def generate_all_views(spec: Spec, dialect: str) -> dict[str, str]:
+    """Generate perspectives for all anchors in deterministic order.
+
+    Every anchor gets a latest view, materialized too when the anchor asks
+    for it. Anchors with historized attributes also get point-in-time and
+    difference functions.
+
+    Args:
+        spec: Top-level Spec model instance
+        dialect: Target SQL dialect (e.g., "postgres", "snowflake", "tsql")
+
+    Returns:
+        Dictionary mapping filenames to SQL strings
+    """
+    output: dict[str, str] = {}
+
+    for anchor in sorted(spec.anchors, key=lambda a: a.mnemonic):
+        ast = build_latest_view(anchor, dialect, spec.knots)
+        filename = f"{latest_view_name(anchor)}.sql"
+        output[filename] = ast.sql(dialect=dialect, pretty=True)
+
+        if anchor.materialize is not None:
+            statements = build_materialized_latest(anchor, dialect, spec.knots)
+            filename = f"{materialized_view_name(anchor)}.sql"
+            output[filename] = render_statements(statements, dialect)
+
+        if not any(a.time_range is not None for a in anchor.attributes):
+            continue
+
+        ast = build_point_in_time_function(anchor, dialect, spec.knots)
+        filename = f"{point_in_time_function_name(anchor)}.sql"
+        output[filename] = ast.sql(dialect=dialect, pretty=True)
+
+        ast = build_difference_function(anchor, dialect, spec.knots)
+        filename = f"{difference_function_name(anchor)}.sql"
+        output[filename] = ast.sql(dialect=dialect, pretty=True)
+
+    return output
@@ -4,13 +4,20 @@ Provides parsing and formatting of keyset identity strings with the format:
     entity@system~tenant|natural_key
 
 All components support delimiter characters through automatic escaping.
-NULL natural keys produce NULL keysets (KEY-05 null safety).
+NULL natural keys produce NULL keysets (KEY-05 null safety). Key maps assign
+integer anchor identities to keysets (see identity.keymap).
 """
 
 from data_architect.identity.escaping import (
     escape_delimiters,
     unescape_delimiters,
 )
+from data_architect.identity.keymap import (
+    assign_identities,
+    lookup_identities,
+    natural_keyset,
+    staging_keyset,
+)
 from data_architect.identity.keyset import (
     KeysetComponents,
     format_keyset,
@@ -19,8 +26,12 @@ from data_architect.identity.keyset import (
 
 __all__ = [
     "KeysetComponents",
+    "assign_identities",
     "escape_delimiters",
     "format_keyset",
+    "lookup_identities",
+    "natural_keyset",
     "parse_keyset",
+    "staging_keyset",
     "unescape_delimiters",
 ]
@@ -0,0 +1,151 @@
+"""Key maps: integer anchor identities assigned to keyset identities.
+
+Anchors with a key map get a generated table holding one row per keyset
+(entity@system~tenant|natural_key) with the integer identity assigned to it.
+These helpers compute keysets from staging rows the way generated SQL does,
+mirror the bulk assignment of identities to new keysets, and look identities
+up in a loaded database.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Protocol
+
+import sqlglot as sg
+import sqlglot.expressions as sge
+
+from data_architect.generation.naming import keymap_table_name
+from data_architect.identity.keyset import format_keyset
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from data_architect.models.anchor import Anchor
+    from data_architect.models.staging import StagingMapping
+
+
+class QueryCursor(Protocol):
+    """Minimal DB-API cursor used for key lookups."""
+
+    def execute(self, operation: str, /) -> object:
+        """Execute one SQL statement."""
+
+    def fetchall(self) -> Sequence[Sequence[Any]]:
+        """Fetch all result rows."""
+
+
+class QueryConnection(Protocol):
+    """Minimal DB-API connection used for key lookups."""
+
+    def cursor(self) -> QueryCursor:
+        """Open a cursor."""
+
+
+def natural_keyset(
+    entity: str, system: str, tenant: str, values: Sequence[object | None]
+) -> str | None:
+    """Format the keyset of a (possibly composite) natural key.
+
+    Composite key values are joined with ':' before escaping, as the
+    generated keyset columns do.
+
+    Args:
+        entity: Entity type name (anchor descriptor)
+        system: Source system identifier
+        tenant: Tenant identifier
+        values: Natural key column values, in natural key column order
+
+    Returns:
+        Keyset string, or None if any value is None
+
+    Examples:
+        >>> natural_keyset("Order", "ERP", "ACME", ["A7", 2])
+        'Order@ERP~ACME|A7:2'
+    """
+    if any(value is None for value in values):
+        return None
+    return format_keyset(entity, system, tenant, ":".join(str(v) for v in values))
+
+
+def staging_keyset(
+    anchor: Anchor, mapping: StagingMapping, row: Mapping[str, object]
+) -> str | None:
+    """Compute the keyset a staging row is loaded under.
+
+    Args:
+        anchor: Anchor the mapping loads
+        mapping: Staging mapping (system, tenant, natural key columns)
+        row: Staging row keyed by column name
+
+    Returns:
+        Keyset string, or None if a natural key column is NULL or missing
+    """
+    return natural_keyset(
+        anchor.descriptor,
+        mapping.system,
+        mapping.tenant,
+        [row.get(column) for column in mapping.natural_key_columns],
+    )
+
+
+def assign_identities(
+    existing: Mapping[str, int], keysets: Iterable[str | None]
+) -> dict[str, int]:
+    """Assign identities to new keysets like a generated key-map load.
+
+    New keysets get consecutive identities after the highest existing one,
+    in keyset order (code point order; database collations may differ).
+
+    Args:
+        existing: Keysets already in the key map with their identities
+        keysets: Keysets of a batch; None and known keysets are skipped
+
+    Returns:
+        The new keysets with their assigned identities
+    """
+    new = sorted({k for k in keysets if k is not None and k not in existing})
+    start = max(existing.values(), default=0)
+    return {keyset: start + offset for offset, keyset in enumerate(new, start=1)}
+
+
+def build_keymap_lookup(anchor: Anchor, keysets: Iterable[str]) -> sge.Select:
+    """Build the query looking up the identities of keysets.
+
+    Args:
+        anchor: Anchor with a key map
+        keysets: Keysets to look up
+
+    Returns:
+        SELECT of (keyset_id, identity) rows for the keysets that are mapped
+    """
+    literals = [sge.Literal.string(keyset) for keyset in sorted(set(keysets))]
+    return (
+        sg.select("keyset_id", f"{anchor.mnemonic}_ID")
+        .from_(keymap_table_name(anchor))
+        .where(sge.column("keyset_id").isin(*literals))
+    )
+
+
+def lookup_identities(
+    connection: QueryConnection,
+    anchor: Anchor,
+    keysets: Iterable[str],
+    dialect: str,
+) -> dict[str, int]:
+    """Look up the identities a loaded key map assigned to keysets.
+
+    Args:
+        connection: DB-API connection to the loaded database
+        anchor: Anchor with a key map
+        keysets: Keysets to look up
+        dialect: SQL dialect of the connection (e.g., "postgres", "duckdb")
+
+    Returns:
+        Identity per keyset; keysets without one are left out
+    """
+    keysets = list(keysets)
+    if not keysets:
+        return {}
+    cursor = connection.cursor()
+    cursor.execute(build_keymap_lookup(anchor, keysets).sql(dialect=dialect))
+    return {str(keyset): int(identity) for keyset, identity in cursor.fetchall()}
@@ -71,6 +71,19 @@ class Attribute(BaseModel):
         return self
 
 
+class Materialization(BaseModel):
+    """Materialized latest state of an anchor, refreshed after its loads."""
+
+    model_config = FROZEN_CONFIG
+
+    target_lag: str = yaml_ext_field(
+        default="1 hour", description="Snowflake dynamic table target lag"
+    )
+    warehouse: str | None = yaml_ext_field(
+        default=None, description="Snowflake warehouse refreshing the dynamic table"
+    )
+
+
 class Anchor(BaseModel):
     """Anchor represents an entity or event in the domain.
 
@@ -105,6 +118,16 @@ class Anchor(BaseModel):
     staging_mappings: list[StagingMapping] = yaml_ext_field(
         default_factory=list, description="Staging table mappings (Phase 8)"
     )
+    materialize: Materialization | None = yaml_ext_field(
+        default=None, description="Materialize the latest state of the anchor"
+    )
+    keymap: bool = yaml_ext_field(
+        default=False,
+        description=(
+            "Assign integer identities to keysets in a generated key-map table "
+            "instead of reading them from staging"
+        ),
+    )
 
 
 # Import after class definitions to avoid circular import
@@ -7,8 +7,14 @@ from typing import Any
 from pydantic import BaseModel
 
 from data_architect.models.anchor import Anchor, Attribute
-from data_architect.models.common import FROZEN_CONFIG, Identifier, xml_field
+from data_architect.models.common import (
+    FROZEN_CONFIG,
+    Identifier,
+    xml_field,
+    yaml_ext_field,
+)
 from data_architect.models.knot import Knot
+from data_architect.models.staging import StagingMapping
 from data_architect.models.tie import Role, Tie
 
 
@@ -45,6 +51,12 @@ class Nexus(BaseModel):
         default=None, alias="description", description="Textual description"
     )
 
+    # YAML-extension fields
+    staging_mappings: list[StagingMapping] = yaml_ext_field(
+        default_factory=list,
+        description="Staging tables delivering nexus rows with their role IDs",
+    )
+
 
 class Spec(BaseModel):
     """Top-level specification containing all Anchor Model entities.
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from enum import StrEnum
+
 from pydantic import BaseModel
 
 from data_architect.models.common import FROZEN_CONFIG, yaml_ext_field
@@ -19,6 +21,49 @@ class StagingColumn(BaseModel):
     )
 
 
+class SourceFormat(StrEnum):
+    """File formats a staging source can be read from."""
+
+    PARQUET = "parquet"
+    CSV = "csv"
+
+
+class StagingSource(BaseModel):
+    """Source files read in place instead of being copied into staging."""
+
+    model_config = FROZEN_CONFIG
+
+    path: str = yaml_ext_field(
+        description=(
+            "Source files: path or glob (DuckDB, tsql OPENROWSET), server-side "
+            "file (Postgres file_fdw) or stage location (Snowflake @stage/path)"
+        )
+    )
+    format: SourceFormat = yaml_ext_field(
+        default=SourceFormat.PARQUET, description="Source file format"
+    )
+    options: dict[str, str | int | bool] = yaml_ext_field(
+        default_factory=dict,
+        description=(
+            "File-format settings passed to the engine as written "
+            "(e.g. header, delimiter, SKIP_HEADER, FIRSTROW)"
+        ),
+    )
+
+
+class CdcSource(BaseModel):
+    """Change data capture feed of a source table."""
+
+    model_config = FROZEN_CONFIG
+
+    table: str = yaml_ext_field(
+        description=(
+            "Captured source table: the table a Snowflake stream is created on, "
+            "or the schema-qualified table with SQL Server CDC enabled"
+        )
+    )
+
+
 class StagingMapping(BaseModel):
     """Multi-source mapping from a staging table to an anchor."""
 
@@ -37,6 +82,63 @@ class StagingMapping(BaseModel):
         default_factory=dict,
         description="attribute_mnemonic -> staging_column_name",
     )
+    knot_values: dict[str, str] = yaml_ext_field(
+        default_factory=dict,
+        description=(
+            "knotted attribute_mnemonic -> staging column holding knot values "
+            "(not IDs); loads resolve the IDs and add missing values"
+        ),
+    )
     priority: int | None = yaml_ext_field(
         default=None, description="Conflict resolution priority (lower wins)"
     )
+    watermark_column: str | None = yaml_ext_field(
+        default=None,
+        description=(
+            "Monotonic staging column (load timestamp or batch id) that makes "
+            "loads incremental"
+        ),
+    )
+    source: StagingSource | None = yaml_ext_field(
+        default=None,
+        description=(
+            "Source files read in place: the staging table becomes a view "
+            "over them (through an external table on Postgres and Snowflake)"
+        ),
+    )
+    cdc: CdcSource | None = yaml_ext_field(
+        default=None,
+        description=(
+            "Change feed loaded instead of a full staging table: the staging "
+            "table becomes a Snowflake stream or reads SQL Server CDC changes"
+        ),
+    )
+    tiebreak_column: str | None = yaml_ext_field(
+        default=None,
+        description=(
+            "Staging column picking the surviving row among duplicates of a "
+            "key in one batch (highest wins, default metadata_recorded_at)"
+        ),
+    )
+
+
+class TieStagingMapping(BaseModel):
+    """Staging table delivering tie rows keyed by natural keys."""
+
+    model_config = FROZEN_CONFIG
+
+    system: str = yaml_ext_field(description="Source system identifier")
+    tenant: str = yaml_ext_field(description="Tenant identifier")
+    table: str = yaml_ext_field(description="Staging table name")
+    natural_key_columns: dict[str, list[str]] = yaml_ext_field(
+        description=(
+            "role name -> columns composing the natural key of the anchor "
+            "playing it; roles not listed read {type}_ID_{role} from staging"
+        )
+    )
+    columns: list[StagingColumn] = yaml_ext_field(
+        default_factory=list, description="Column definitions"
+    )
+    priority: int | None = yaml_ext_field(
+        default=None, description="Load order among the tie's mappings (lower first)"
+    )
@@ -6,7 +6,8 @@ from typing import Any
 
 from pydantic import BaseModel
 
-from data_architect.models.common import FROZEN_CONFIG, Key, xml_field
+from data_architect.models.common import FROZEN_CONFIG, Key, xml_field, yaml_ext_field
+from data_architect.models.staging import TieStagingMapping  # noqa: TC001
 
 
 class Role(BaseModel):
@@ -70,3 +71,9 @@ class Tie(BaseModel):
     description_: str | None = xml_field(
         default=None, alias="description", description="Textual description"
     )
+
+    # YAML-extension fields
+    staging_mappings: list[TieStagingMapping] = yaml_ext_field(
+        default_factory=list,
+        description="Staging tables whose roles resolve from natural keys",
+    )
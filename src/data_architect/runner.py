@@ -0,0 +1,407 @@
+"""Dependency-ordered execution of generated SQL over DB-API connections.
+
+Generated files are grouped by the object they belong to, objects are run in
+topological waves (see generation.dependencies) and the objects of a wave run
+concurrently on a thread pool, each worker thread holding its own connection.
+Files of one object run sequentially in generation order, which keeps
+per-source loads in priority order.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol
+
+import sqlglot
+import sqlglot.expressions as sge
+from sqlglot.tokens import TokenType
+
+from data_architect.generation.dependencies import file_node, topological_waves
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+    from pathlib import Path
+
+
+class Cursor(Protocol):
+    """Minimal DB-API cursor used by the runner."""
+
+    def execute(self, operation: str, /) -> object:
+        """Execute one SQL statement."""
+
+
+class Connection(Protocol):
+    """Minimal DB-API connection used by the runner."""
+
+    def cursor(self) -> Cursor:
+        """Open a cursor."""
+
+    def commit(self) -> object:
+        """Commit the current transaction."""
+
+    def rollback(self) -> object:
+        """Roll back the current transaction."""
+
+    def close(self) -> object:
+        """Close the connection."""
+
+
+@dataclass(frozen=True)
+class StatementTiming:
+    """Execution time of one statement of a generated file."""
+
+    file: str
+    index: int
+    seconds: float
+    attempt: int
+
+
+@dataclass(frozen=True)
+class NodeResult:
+    """Outcome of running all files of one object."""
+
+    node: str
+    timings: list[StatementTiming] = field(default_factory=list)
+    error: str | None = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Return True if every file of the object ran successfully."""
+        return self.error is None and not self.skipped
+
+
+@dataclass(frozen=True)
+class RunReport:
+    """Results of a run, in execution order."""
+
+    results: list[NodeResult]
+
+    @property
+    def ok(self) -> bool:
+        """Return True if no object failed or was skipped."""
+        return all(result.ok for result in self.results)
+
+    @property
+    def timings(self) -> list[StatementTiming]:
+        """Return all statement timings in execution order."""
+        return [timing for result in self.results for timing in result.timings]
+
+
+def split_statements(sql: str, read: str, write: str) -> list[str]:
+    """Split a generated file into statements for the target engine.
+
+    Args:
+        sql: SQL script as generated
+        read: Dialect the script was generated for
+        write: Dialect of the engine executing it
+
+    Returns:
+        List of statements, transpiled when the dialects differ
+    """
+    statements: list[str] = []
+    if read != write:
+        for expression in sqlglot.parse(sql, read=read):
+            if expression is None:
+                continue
+            # Generated columns (staging keysets) need their expression in
+            # parentheses, which sqlglot drops between dialects
+            for computed in expression.find_all(sge.ComputedColumnConstraint):
+                if not isinstance(computed.this, sge.Paren):
+                    computed.set("this", sge.Paren(this=computed.this))
+            # sqlite reads the ON CONFLICT of INSERT ... SELECT ... FROM x
+            # as a join constraint unless the SELECT has a WHERE clause
+            if (
+                write == "sqlite"
+                and isinstance(expression, sge.Insert)
+                and expression.args.get("conflict") is not None
+                and isinstance(expression.expression, sge.Select)
+                and expression.expression.args.get("where") is None
+            ):
+                expression.expression.where("TRUE", copy=False)
+            statements.append(expression.sql(dialect=write))
+        return [stmt for stmt in statements if stmt]
+
+    # Same engine: split on top-level semicolons and run the SQL verbatim, so
+    # statements sqlglot cannot parse (e.g. DuckDB table macros) still run
+    start = 0
+    for token in sqlglot.Dialect.get_or_raise(read).tokenize(sql):
+        if token.token_type == TokenType.SEMICOLON:
+            statements.append(sql[start : token.start].strip())
+            start = token.end + 1
+    statements.append(sql[start:].strip())
+    return [stmt for stmt in statements if stmt]
+
+
+def sqlite_connector(database: Path | str) -> Callable[[], Connection]:
+    """Build a connection factory for a sqlite database file.
+
+    Connections run in autocommit mode so the BEGIN/COMMIT of generated
+    scripts control transactions, and wait for locks held by other workers.
+
+    Args:
+        database: Path to the sqlite database file
+
+    Returns:
+        Zero-argument callable opening a new connection
+    """
+
+    def connect() -> Connection:
+        return sqlite3.connect(
+            database, timeout=30, isolation_level=None, check_same_thread=False
+        )
+
+    return connect
+
+
+class _SharedConnection:
+    """Cursor of a shared DuckDB instance, released to its connector on close."""
+
+    def __init__(self, connection: Connection, release: Callable[[], None]) -> None:
+        self._connection = connection
+        self._release: Callable[[], None] | None = release
+
+    def cursor(self) -> Cursor:
+        """Open a cursor."""
+        return self._connection.cursor()
+
+    def commit(self) -> object:
+        """Commit the current transaction."""
+        return self._connection.commit()
+
+    def rollback(self) -> object:
+        """Roll back the current transaction."""
+        return self._connection.rollback()
+
+    def close(self) -> object:
+        """Close the cursor, and the instance when no other cursor is open."""
+        result = self._connection.close()
+        if self._release is not None:
+            release, self._release = self._release, None
+            release()
+        return result
+
+
+def duckdb_connector(database: Path | str) -> Callable[[], Connection]:
+    """Build a connection factory for a DuckDB database file.
+
+    Worker connections are cursors of one database instance, the DuckDB way
+    to share a database between threads of a process. The instance is opened
+    with the first connection and closed with the last one, which releases
+    the lock on the database file.
+
+    Args:
+        database: Path to the DuckDB database file
+
+    Returns:
+        Zero-argument callable opening a new connection
+
+    Raises:
+        ImportError: If the optional duckdb package is not installed
+    """
+    try:
+        import duckdb
+    except ImportError as e:
+        msg = "DuckDB support requires the duckdb package (pip install duckdb)"
+        raise ImportError(msg) from e
+
+    lock = threading.Lock()
+    instance: duckdb.DuckDBPyConnection | None = None
+    open_connections = 0
+
+    def release() -> None:
+        nonlocal instance, open_connections
+        with lock:
+            open_connections -= 1
+            if open_connections == 0 and instance is not None:
+                instance.close()
+                instance = None
+
+    def connect() -> Connection:
+        nonlocal instance, open_connections
+        with lock:
+            if instance is None:
+                instance = duckdb.connect(str(database))
+            open_connections += 1
+            return _SharedConnection(instance.cursor(), release)
+
+    return connect
+
+
+def _is_transactional(statements: list[str]) -> bool:
+    """Check whether a generated file runs inside its own transaction."""
+    if not statements:
+        return False
+    keyword = statements[0].split(maxsplit=1)[0].upper()
+    return keyword in ("BEGIN", "START")
+
+
+def _run_node(
+    node: str,
+    files: list[tuple[str, list[str]]],
+    get_connection: Callable[[], Connection],
+    retries: int,
+    retry_delay: float,
+) -> NodeResult:
+    """Run the files of one object, retrying a failed file as a whole.
+
+    Only a failed attempt the rollback undoes is retried: that of a file
+    wrapped in BEGIN/COMMIT, or one whose first statement failed. Statements
+    of other files ran under autocommit and would run a second time.
+    """
+    timings: list[StatementTiming] = []
+    connection = get_connection()
+
+    for filename, statements in files:
+        transactional = _is_transactional(statements)
+        for attempt in range(1, retries + 2):
+            file_timings: list[StatementTiming] = []
+            try:
+                cursor = connection.cursor()
+                for index, statement in enumerate(statements):
+                    started = time.perf_counter()
+                    cursor.execute(statement)
+                    file_timings.append(
+                        StatementTiming(
+                            file=filename,
+                            index=index,
+                            seconds=time.perf_counter() - started,
+                            attempt=attempt,
+                        )
+                    )
+                connection.commit()
+            except Exception as e:  # any driver error is retryable
+                with contextlib.suppress(Exception):  # no transaction open
+                    connection.rollback()
+                if attempt > retries or (file_timings and not transactional):
+                    return NodeResult(
+                        node=node,
+                        timings=timings + file_timings,
+                        error=f"{filename}: {e}",
+                    )
+                time.sleep(retry_delay * attempt)
+            else:
+                timings.extend(file_timings)
+                break
+
+    return NodeResult(node=node, timings=timings)
+
+
+def run_phases(
+    phases: Sequence[Mapping[str, str]],
+    graph: Mapping[str, set[str]],
+    connect: Callable[[], Connection],
+    *,
+    read: str,
+    write: str,
+    jobs: int = 4,
+    retries: int = 0,
+    retry_delay: float = 0.5,
+    fail_fast: bool = True,
+    dependencies: Mapping[str, Iterable[str]] | None = None,
+) -> RunReport:
+    """Run phases of generated files (e.g. DDL, then DML) in dependency order.
+
+    Within a phase, objects run in topological waves; objects of one wave run
+    concurrently on ``jobs`` threads. An object whose dependency failed (in
+    this or an earlier phase) is skipped. With ``fail_fast`` the run stops
+    after the first wave containing a failure.
+
+    The object graph alone does not order files loading several objects,
+    such as fan-out scripts grouped under their staging table. Passing the
+    file-level ``dependencies`` orders each object after the objects owning
+    the files of the same phase its files depend on.
+
+    Args:
+        phases: Ordered list of {filename: sql} dictionaries
+        graph: Dependency graph from build_dependency_graph
+        connect: Factory opening a DB-API connection
+        read: Dialect the files were generated for
+        write: Dialect of the engine executing them
+        jobs: Number of worker threads (and connections)
+        retries: Extra attempts per failed file, for files whose failed
+            attempt the rollback undoes
+        retry_delay: Base delay in seconds between attempts (linear backoff)
+        fail_fast: Stop scheduling after the first failed wave
+        dependencies: Asset dependencies from build_asset_dependencies
+
+    Returns:
+        RunReport with one NodeResult per object executed or skipped
+    """
+    local = threading.local()
+    opened: list[Connection] = []
+    opened_lock = threading.Lock()
+
+    def get_connection() -> Connection:
+        connection: Connection | None = getattr(local, "connection", None)
+        if connection is None:
+            connection = connect()
+            local.connection = connection
+            with opened_lock:
+                opened.append(connection)
+        return connection
+
+    results: list[NodeResult] = []
+    failed: set[str] = set()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+            for files in phases:
+                # Group files per object, keeping generation order within one
+                by_node: dict[str, list[tuple[str, list[str]]]] = {}
+                for filename, sql in files.items():
+                    node = file_node(filename, graph)
+                    statements = split_statements(sql, read, write)
+                    by_node.setdefault(node, []).append((filename, statements))
+
+                phase_graph = {
+                    node: graph.get(node, set()) & set(by_node) for node in by_node
+                }
+                if dependencies is not None:
+                    owners = {
+                        filename.removesuffix(".sql"): file_node(filename, graph)
+                        for filename in files
+                    }
+                    for asset, node in owners.items():
+                        phase_graph[node].update(
+                            owners[dep]
+                            for dep in dependencies.get(asset, ())
+                            if dep in owners and owners[dep] != node
+                        )
+                for wave in topological_waves(phase_graph):
+                    runnable = []
+                    for node in wave:
+                        upstream = graph.get(node, set()) | phase_graph[node]
+                        if node in failed or upstream & failed:
+                            failed.add(node)
+                            results.append(NodeResult(node=node, skipped=True))
+                        else:
+                            runnable.append(node)
+
+                    futures = [
+                        pool.submit(
+                            _run_node,
+                            node,
+                            by_node[node],
+                            get_connection,
+                            retries,
+                            retry_delay,
+                        )
+                        for node in runnable
+                    ]
+                    wave_results = [future.result() for future in futures]
+                    results.extend(wave_results)
+                    failed.update(r.node for r in wave_results if not r.ok)
+
+                    if fail_fast and failed:
+                        return RunReport(results=results)
+    finally:
+        for connection in opened:
+            connection.close()
+
+    return RunReport(results=results)
@@ -0,0 +1,633 @@
+"""Synthetic staging data: files matching a spec's staging tables.
+
+Every staging table of the spec (anchor, nexus and tie mappings) is written
+as one CSV or Parquet file of its declared columns, ready to be loaded into
+staging or read in place through a mapping's ``source``. Natural keys follow
+``natural_key_columns``, values fit each column's type, knot values come from
+a small domain per knot, and mappings declaring ``changed_at`` deliver
+several versions of each key, so historized attributes get a history.
+Knots whose values no mapping stages get a stg_{knot} file of their domain.
+
+A value depends only on its key, version and target attribute, never on the
+staging table holding it: the sources of a multi-source anchor share a
+share of their keys (the overlap) and agree on those keys' values. Tie and
+nexus roles reference keys the anchors' first sources deliver. Text keys
+are K1, K2, ... unless a key column of the entity is too narrow for them;
+then every key of the entity is zero-padded base 36 of that width.
+
+Rows are generated by DuckDB's vectorized engine over ``range()`` and
+streamed to disk by COPY, so memory stays bounded whatever the row count.
+"""
+
+# ruff: noqa: S608  # statements are generated from spec identifiers only
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+import sqlglot.expressions as sge
+
+from data_architect.generation.columns import build_column_type
+from data_architect.generation.dml import knot_value_column, staging_value_column
+from data_architect.generation.naming import knot_table_name, staging_table_name
+from data_architect.models.spec import Nexus
+from data_architect.models.staging import SourceFormat
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from pathlib import Path
+
+    from data_architect.models.anchor import Anchor
+    from data_architect.models.spec import Spec
+    from data_architect.models.staging import StagingMapping, TieStagingMapping
+    from data_architect.models.tie import Tie
+
+KNOT_DOMAIN = 5  # Distinct values per knot in synthetic data
+
+_EPOCH = "2024-01-01"  # changed_at of the first version
+
+_INTEGER_BOUNDS = {
+    sge.DataType.Type.TINYINT: 100,
+    sge.DataType.Type.UTINYINT: 100,
+    sge.DataType.Type.SMALLINT: 30000,
+    sge.DataType.Type.USMALLINT: 30000,
+}
+
+
+def column_kind(type_: str, dialect: str) -> str:
+    """Classify a column type as integer, number, boolean, date, time or text.
+
+    Args:
+        type_: SQL data type
+        dialect: SQL dialect the type is written in
+
+    Returns:
+        The kind of values the column holds
+    """
+    data_type = build_column_type(type_, dialect)
+    if data_type.is_type(*sge.DataType.INTEGER_TYPES):
+        return "integer"
+    if data_type.is_type(*sge.DataType.REAL_TYPES):
+        return "number"
+    if data_type.is_type(sge.DataType.Type.BOOLEAN):
+        return "boolean"
+    if data_type.is_type(sge.DataType.Type.DATE):
+        return "date"
+    if data_type.is_type(*sge.DataType.TEMPORAL_TYPES):
+        return "time"
+    return "text"
+
+
+@dataclass(frozen=True)
+class SyntheticColumn:
+    """What a staging column holds: its role and the entity it belongs to.
+
+    Attributes:
+        name: Staging column name
+        type: Declared SQL data type
+        kind: Kind of values (see column_kind)
+        role: "key", "identity", "timestamp", "value", "knot", "reference"
+            or "other"
+        attribute: Attribute mnemonic of value and knot columns, role name
+            of tie key and reference columns
+        knot: Knot mnemonic of knot columns and knotted values
+        target: Anchor or knot mnemonic a key or reference column points to
+        historized: True if the column's value changes between versions
+    """
+
+    name: str
+    type: str
+    kind: str
+    role: str
+    attribute: str = ""
+    knot: str = ""
+    target: str = ""
+    historized: bool = True
+
+
+def classify_columns(
+    anchor: Anchor | Nexus, mapping: StagingMapping, dialect: str
+) -> list[SyntheticColumn]:
+    """Classify the declared columns of an anchor's or nexus' staging mapping.
+
+    Args:
+        anchor: Anchor or nexus the mapping loads
+        mapping: Staging mapping with declared columns
+        dialect: SQL dialect the column types are written in
+
+    Returns:
+        One SyntheticColumn per declared column, in declaration order
+    """
+    values = {staging_value_column(anchor, a, mapping): a for a in anchor.attributes}
+    knots = {
+        knot_column: attr
+        for attr in anchor.attributes
+        if (knot_column := knot_value_column(anchor, attr, mapping)) is not None
+    }
+    roles = anchor.roles if isinstance(anchor, Nexus) else []
+    references = {f"{role.type_}_ID_{role.role}": role for role in roles}
+    columns = []
+    for column in mapping.columns:
+        kind = column_kind(column.type, dialect)
+        if column.name in mapping.natural_key_columns:
+            columns.append(
+                SyntheticColumn(column.name, column.type, kind, "key", historized=False)
+            )
+        elif column.name == f"{anchor.mnemonic}_ID":
+            columns.append(
+                SyntheticColumn(
+                    column.name, column.type, kind, "identity", historized=False
+                )
+            )
+        elif column.name in ("changed_at", mapping.watermark_column):
+            columns.append(SyntheticColumn(column.name, column.type, kind, "timestamp"))
+        elif column.name in knots:
+            attr = knots[column.name]
+            columns.append(
+                SyntheticColumn(
+                    column.name,
+                    column.type,
+                    kind,
+                    "knot",
+                    attr.mnemonic,
+                    knot=attr.knot_range or "",
+                    historized=attr.time_range is not None,
+                )
+            )
+        elif column.name in values:
+            attr = values[column.name]
+            columns.append(
+                SyntheticColumn(
+                    column.name,
+                    column.type,
+                    kind,
+                    "value",
+                    attr.mnemonic,
+                    knot=attr.knot_range or "",
+                    historized=attr.time_range is not None,
+                )
+            )
+        elif column.name in references:
+            role = references[column.name]
+            columns.append(
+                SyntheticColumn(
+                    column.name,
+                    column.type,
+                    kind,
+                    "reference",
+                    role.role,
+                    target=role.type_,
+                    historized=False,
+                )
+            )
+        else:
+            columns.append(SyntheticColumn(column.name, column.type, kind, "other"))
+    return columns
+
+
+def _tie_columns(
+    tie: Tie, mapping: TieStagingMapping, dialect: str
+) -> list[SyntheticColumn]:
+    """Classify the declared columns of a tie's staging mapping."""
+    keys = {
+        column: role
+        for role in tie.roles
+        for column in mapping.natural_key_columns.get(role.role, [])
+    }
+    references = {f"{role.type_}_ID_{role.role}": role for role in tie.roles}
+    columns = []
+    for column in mapping.columns:
+        kind = column_kind(column.type, dialect)
+        role = keys.get(column.name) or references.get(column.name)
+        if role is not None:
+            columns.append(
+                SyntheticColumn(
+                    column.name,
+                    column.type,
+                    kind,
+                    "key" if column.name in keys else "reference",
+                    role.role,
+                    target=role.type_,
+                    historized=not role.identifier,
+                )
+            )
+        elif column.name == "changed_at":
+            columns.append(SyntheticColumn(column.name, column.type, kind, "timestamp"))
+        else:
+            columns.append(SyntheticColumn(column.name, column.type, kind, "other"))
+    return columns
+
+
+# ============================================================================
+# Column Expressions
+# ============================================================================
+
+
+def _literal(value: str) -> str:
+    return sge.convert(value).sql(dialect="duckdb")
+
+
+def _hash(column: SyntheticColumn, label: str, seed: int) -> str:
+    """Hash a row's key (and version, if historized) with a label and seed."""
+    parts = "k, v" if column.historized else "k"
+    return f"hash({parts}, {_literal(label)}, {seed})"
+
+
+def _text_width(column: SyntheticColumn, dialect: str) -> int | None:
+    """Return the declared length of a text column, None if unbounded."""
+    if column.kind != "text":
+        return None
+    size = [
+        int(p.name)
+        for p in build_column_type(column.type, dialect).expressions
+        if p.name.isdigit()
+    ]
+    return size[0] if size else None
+
+
+def _key_sql(kind: str, index: str, width: int | None = None) -> str:
+    """Render the natural key of the key with the given index.
+
+    Text keys are zero-padded base 36 when a width is given.
+    """
+    if kind in ("integer", "number"):
+        return f"{index} + 1"
+    if width is not None:
+        return f"to_base(CAST({index} AS BIGINT), 36, {width})"
+    return f"'K' || ({index} + 1)"
+
+
+def _identity_sql(kind: str, index: str) -> str:
+    """Render the staged identity of the key with the given index."""
+    if kind in ("integer", "number"):
+        return f"{index} + 1"
+    return f"CAST({index} + 1 AS VARCHAR)"
+
+
+def _knot_sql(kind: str, descriptor: str, index: str) -> str:
+    """Render the value with the given index in a knot's domain."""
+    if kind in ("integer", "number"):
+        return f"{index} + 1"
+    return f"{_literal(f'{descriptor}-')} || ({index} + 1)"
+
+
+def _timestamp_sql(kind: str) -> str:
+    """Render changed_at: one day per version, one second per key."""
+    if kind in ("integer", "number"):
+        return "v + 1"
+    if kind == "date":
+        return f"DATE '{_EPOCH}' + CAST(v AS INTEGER)"
+    moment = (
+        f"TIMESTAMP '{_EPOCH}' + to_days(CAST(v AS INTEGER)) "
+        "+ to_seconds(CAST(k % 86400 AS BIGINT))"
+    )
+    return moment if kind == "time" else f"CAST({moment} AS VARCHAR)"
+
+
+def _value_sql(column: SyntheticColumn, hashed: str, dialect: str) -> str:
+    """Render a value fitting the column's type from a hash."""
+    data_type = build_column_type(column.type, dialect)
+    size = [int(p.name) for p in data_type.expressions if p.name.isdigit()]
+    if column.kind == "integer":
+        bound = _INTEGER_BOUNDS.get(data_type.this, 1_000_000_000)
+        return f"CAST({hashed} % {bound} AS BIGINT)"
+    if column.kind == "number":
+        scale = min(size[1] if len(size) > 1 else 0 if size else 2, 6)
+        digits = min(size[0] - scale, 6) if size else 6
+        return (
+            f"ROUND(CAST({hashed} % {10 ** (digits + scale)} AS DOUBLE) "
+            f"/ {10**scale}, {scale})"
+        )
+    if column.kind == "boolean":
+        return f"{hashed} % 2 = 0"
+    if column.kind == "date":
+        return f"DATE '{_EPOCH}' + CAST({hashed} % 3650 AS INTEGER)"
+    if column.kind == "time":
+        return (
+            f"TIMESTAMP '{_EPOCH}' + to_seconds(CAST({hashed} % 315360000 AS BIGINT))"
+        )
+    prefix = f"{column.attribute or column.name}-"
+    if size and size[0] < len(prefix) + 6:
+        return f"upper(left(md5(CAST({hashed} AS VARCHAR)), {size[0]}))"
+    return f"{_literal(prefix)} || CAST({hashed} % 1000000 AS VARCHAR)"
+
+
+@dataclass(frozen=True)
+class _Context:
+    """Spec-wide settings every column expression needs."""
+
+    spec: Spec
+    dialect: str
+    seed: int
+    knot_domain: int
+    key_counts: dict[str, int]
+    default_keys: int  # Keys of entities without staging
+    key_widths: dict[str, int]  # Entities with base-36 keys of this width
+
+
+def _column_sql(column: SyntheticColumn, owner: str, context: _Context) -> str:
+    """Render the expression of one staging column over keys k and versions v."""
+    knots = {knot.mnemonic: knot for knot in context.spec.knots}
+    label = f"{owner}_{column.attribute}"
+    if column.role in ("key", "reference") and column.target:
+        # Tie and nexus roles: hash the row into the target's key range
+        hashed = _hash(column, label, context.seed)
+        if column.target in knots:
+            return _identity_sql(column.kind, f"{hashed} % {context.knot_domain}")
+        keys = context.key_counts.get(column.target, context.default_keys)
+        index = f"{hashed} % {keys}"
+        if column.role == "key":
+            return _key_sql(column.kind, index, context.key_widths.get(column.target))
+        return _identity_sql(column.kind, index)
+    if column.role == "key":
+        return _key_sql(column.kind, "k", context.key_widths.get(owner))
+    if column.role == "identity":
+        return _identity_sql(column.kind, "k")
+    if column.role == "timestamp":
+        return _timestamp_sql(column.kind)
+    if column.knot:
+        index = f"{_hash(column, label, context.seed)} % {context.knot_domain}"
+        if column.role == "knot" and column.knot in knots:
+            return _knot_sql(column.kind, knots[column.knot].descriptor, index)
+        return _identity_sql(column.kind, index)  # Staged knot IDs
+    if column.role == "value":
+        return _value_sql(column, _hash(column, label, context.seed), context.dialect)
+    return _value_sql(column, _hash(column, column.name, context.seed), context.dialect)
+
+
+# ============================================================================
+# Table Generation
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class SynthTable:
+    """One synthetic staging file.
+
+    Attributes:
+        table: Staging table name
+        path: File written
+        rows: Rows written
+        keys: Distinct keys among the rows
+        seconds: Time taken to generate and write the file
+    """
+
+    table: str
+    path: Path
+    rows: int
+    keys: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return rows written per second (0 when instantaneous)."""
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class _Plan:
+    """Columns and key layout of one staging table."""
+
+    table: str
+    owner: str
+    columns: list[SyntheticColumn]
+    versions: int
+    keys: int
+    offset: int  # Key index of the first key not shared with other sources
+    shared: int
+
+
+def _plans(
+    spec: Spec, rows: int, versions: int, overlap: float, dialect: str
+) -> list[_Plan]:
+    """Lay out the keys of every staging table the spec declares.
+
+    A staging table declared by several mappings is written once, with the
+    columns of its first mapping.
+    """
+    plans: dict[str, _Plan] = {}
+    entities: list[Anchor | Nexus] = [*spec.anchors, *spec.nexuses]
+    for entity in entities:
+        for source, mapping in enumerate(entity.staging_mappings):
+            if mapping.cdc is not None:
+                continue  # Change feeds are captured, not staged from files
+            columns = classify_columns(entity, mapping, dialect)
+            per_key = versions if "changed_at" in {c.name for c in columns} else 1
+            keys = math.ceil(rows / per_key)
+            shared = round(keys * overlap)
+            plans.setdefault(
+                staging_table_name(mapping),
+                _Plan(
+                    staging_table_name(mapping),
+                    entity.mnemonic,
+                    columns,
+                    per_key,
+                    keys,
+                    source * (keys - shared),
+                    shared,
+                ),
+            )
+    for tie in spec.ties:
+        owner = "_".join(role.type_ for role in tie.roles)
+        for tie_mapping in tie.staging_mappings:
+            columns = _tie_columns(tie, tie_mapping, dialect)
+            per_key = versions if "changed_at" in {c.name for c in columns} else 1
+            plans.setdefault(
+                staging_table_name(tie_mapping),
+                _Plan(
+                    staging_table_name(tie_mapping),
+                    owner,
+                    columns,
+                    per_key,
+                    math.ceil(rows / per_key),
+                    0,
+                    0,
+                ),
+            )
+    return list(plans.values())
+
+
+def _key_widths(plans: list[_Plan], context: _Context) -> dict[str, int]:
+    """Pick the entities whose text keys are too long for their key columns.
+
+    The keys of an entity render alike in every column holding them, so the
+    narrowest key column of an entity decides its format.
+
+    Raises:
+        ValueError: If an entity has more keys than a key or identity column
+            can hold
+    """
+    knots = {knot.mnemonic for knot in context.spec.knots}
+    keys: dict[str, int] = {}
+    for plan in plans:
+        keys[plan.owner] = max(keys.get(plan.owner, 0), plan.offset + plan.keys)
+    widths: dict[str, int] = {}
+    for plan in plans:
+        for column in plan.columns:
+            width = _text_width(column, context.dialect)
+            entity = column.target or plan.owner
+            if (
+                width is None
+                or column.role not in ("key", "identity", "reference")
+                or entity in knots
+            ):
+                continue
+            count = keys.get(entity, context.default_keys)
+            if column.role != "key" or len(f"K{count}") <= width:
+                fits = len(str(count)) <= width
+            else:
+                fits = 36**width >= count
+                widths[entity] = min(width, widths.get(entity, width))
+            if not fits:
+                msg = (
+                    f"{count} keys of {entity} do not fit "
+                    f"{plan.table}.{column.name} {column.type}"
+                )
+                raise ValueError(msg)
+    return widths
+
+
+def _table_query(plan: _Plan, rows: int, context: _Context) -> str:
+    """Build the query generating a staging table's rows."""
+    slot = f"i // {plan.versions}"
+    key = (
+        f"CASE WHEN {slot} < {plan.shared} THEN {slot} ELSE {slot} + {plan.offset} END"
+        if plan.offset
+        else slot
+    )
+    select = ", ".join(
+        f"{_column_sql(column, plan.owner, context)} AS "
+        f"{sge.to_identifier(column.name, quoted=True).sql(dialect='duckdb')}"
+        for column in plan.columns
+    )
+    return (
+        f"SELECT {select} FROM (SELECT {key} AS k, i % {plan.versions} AS v "
+        f"FROM range({rows}) AS t(i)) AS s"
+    )
+
+
+def _knot_queries(context: _Context) -> dict[str, str]:
+    """Build the queries of stg_{knot} tables for knots without staged values.
+
+    Loads of knots whose values no mapping stages read their whole domain
+    from stg_{knot}, a table the generated DDL does not declare: its file
+    holds the domain with a metadata_recorded_at, ready to become the table.
+    """
+    spec = context.spec
+    knot_valued = {
+        attr.knot_range
+        for anchor in spec.anchors
+        for mapping in anchor.staging_mappings
+        for attr in anchor.attributes
+        if knot_value_column(anchor, attr, mapping) is not None
+    }
+    queries = {}
+    for knot in spec.knots:
+        if knot.mnemonic in knot_valued:
+            continue
+        table = knot_table_name(knot)
+        identity = _identity_sql(column_kind(knot.identity, context.dialect), "i")
+        value = _knot_sql(
+            column_kind(knot.data_range, context.dialect), knot.descriptor, "i"
+        )
+        queries[f"stg_{table}"] = (
+            f'SELECT {identity} AS "{knot.mnemonic}_ID", {value} AS "{table}", '
+            f"TIMESTAMP '{_EPOCH}' AS metadata_recorded_at "
+            f"FROM range({context.knot_domain}) AS t(i)"
+        )
+    return queries
+
+
+def synthesize(
+    spec: Spec,
+    directory: Path,
+    *,
+    rows: int = 1000,
+    versions: int = 3,
+    overlap: float = 0.5,
+    knot_domain: int = KNOT_DOMAIN,
+    file_format: SourceFormat = SourceFormat.PARQUET,
+    dialect: str = "postgres",
+    seed: int = 0,
+    tables: Collection[str] | None = None,
+    memory_limit: str = "1GB",
+) -> list[SynthTable]:
+    """Write a synthetic file per staging table of a spec.
+
+    Args:
+        spec: Validated spec whose staging mappings declare columns
+        directory: Directory receiving a {table}.parquet or {table}.csv file
+            per staging table
+        rows: Rows per staging table
+        versions: changed_at versions per key of mappings declaring changed_at
+        overlap: Share of a multi-source anchor's keys every source delivers
+        knot_domain: Distinct values per knot
+        file_format: Parquet or CSV (with a header row)
+        dialect: SQL dialect the staging column types are written in
+        seed: Seed of the synthetic values
+        tables: Staging tables to write (default: all)
+        memory_limit: DuckDB memory limit while generating
+
+    Returns:
+        One SynthTable per file written: staging tables in spec order, then
+        the stg_{knot} tables of knots without staged values
+
+    Raises:
+        ImportError: If the optional duckdb package is not installed
+        ValueError: If tables names a table the spec does not stage, or the
+            spec's entities have more keys than their key columns can hold
+    """
+    try:
+        import duckdb
+    except ImportError as e:
+        msg = "Synthetic data requires the duckdb package (pip install duckdb)"
+        raise ImportError(msg) from e
+
+    plans = _plans(spec, rows, versions, overlap, dialect)
+    context = _Context(
+        spec,
+        dialect,
+        seed,
+        knot_domain,
+        # Roles reference the keys of an entity's first source
+        {plan.owner: plan.keys for plan in reversed(plans) if plan.offset == 0},
+        rows,
+        {},
+    )
+    context = replace(context, key_widths=_key_widths(plans, context))
+    queries = {
+        plan.table: (_table_query(plan, rows, context), rows, plan.keys)
+        for plan in plans
+    }
+    queries.update(
+        (table, (query, knot_domain, knot_domain))
+        for table, query in _knot_queries(context).items()
+    )
+    if tables is not None:
+        unknown = sorted(set(tables) - set(queries))
+        if unknown:
+            msg = f"unknown staging tables: {', '.join(unknown)}"
+            raise ValueError(msg)
+        queries = {table: queries[table] for table in queries if table in tables}
+
+    options = "FORMAT parquet" if file_format == SourceFormat.PARQUET else "HEADER"
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    connection = duckdb.connect()
+    try:
+        # Unordered output lets COPY stream without buffering for order
+        connection.execute("SET preserve_insertion_order = false")
+        connection.execute(f"SET memory_limit = {_literal(memory_limit)}")
+        for table, (query, table_rows, keys) in queries.items():
+            path = directory / f"{table}.{file_format.value}"
+            started = time.perf_counter()
+            connection.execute(f"COPY ({query}) TO {_literal(str(path))} ({options})")
+            written.append(
+                SynthTable(table, path, table_rows, keys, time.perf_counter() - started)
+            )
+    finally:
+        connection.close()
+    return written
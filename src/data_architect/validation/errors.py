@@ -2,19 +2,28 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 from data_architect.models.spec import Spec
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 
 @dataclass(frozen=True)
 class ValidationError:
-    """A validation error with line number context."""
+    """A validation error with line number context.
+
+    file is set for specs split across files with include, naming the file
+    the field path and line refer to.
+    """
 
     field_path: str
     message: str
     line: int | None = None
     severity: str = "error"
+    file: str | None = None
 
 
 @dataclass(frozen=True)
@@ -23,6 +32,7 @@ class ValidationResult:
 
     spec: Spec | None
     errors: list[ValidationError]
+    files: list[Path] = field(default_factory=list)  # Root first, then includes
 
     @property
     def is_valid(self) -> bool:
@@ -41,8 +51,9 @@ def format_errors(errors: list[ValidationError]) -> str:
     """
     lines = []
     for error in errors:
+        prefix = f"{error.file}: " if error.file is not None else ""
         if error.line is not None:
-            lines.append(f"Line {error.line}: {error.message}")
+            lines.append(f"{prefix}Line {error.line}: {error.message}")
         else:
-            lines.append(f"{error.field_path}: {error.message}")
+            lines.append(f"{prefix}{error.field_path}: {error.message}")
     return "\n".join(lines)
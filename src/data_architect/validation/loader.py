@@ -1,12 +1,27 @@
-"""YAML loading with line number tracking."""
+"""YAML loading with line number tracking.
+
+A spec may be split across files: the ``include`` key of a spec file lists
+further spec files, as paths or globs relative to the including file. Each
+file is parsed and validated on its own, in parallel worker processes when
+there is enough uncached YAML to outweigh their startup, and cached by
+content hash, so an edit re-parses only the edited file. The validated
+files are then merged (root first, then included files in the order they
+are reached) and the referential checks run once over the merged spec.
+"""
 
 from __future__ import annotations
 
+import glob
+import hashlib
+import io
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-if TYPE_CHECKING:
-    from pathlib import Path
-
 from pydantic import ValidationError as PydanticValidationError
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap, CommentedSeq
@@ -15,6 +30,38 @@ from data_architect.models.spec import Spec
 from data_architect.validation.errors import ValidationError, ValidationResult
 from data_architect.validation.referential import check_referential_integrity
 
+if TYPE_CHECKING:
+    from typing import IO
+
+_INCLUDE = "include"
+
+# Uncached YAML below this size parses faster in-process than in a pool
+_PARALLEL_MIN_BYTES = 256 * 1024
+
+_CACHE_SIZE = 256  # Parsed files kept, least recently used evicted first
+
+_ENTITY_PATH = re.compile(r"^(anchors?|knots?|ties?|nexus(?:es)?)\[(\d+)\]")
+
+# YAML key of an entity list -> Spec field (aliases and field names)
+_COLLECTIONS = {
+    "anchor": "anchors",
+    "anchors": "anchors",
+    "knot": "knots",
+    "knots": "knots",
+    "tie": "ties",
+    "ties": "ties",
+    "nexus": "nexuses",
+    "nexuses": "nexuses",
+}
+
+# Spec field -> singular entity path prefix of referential errors
+_ENTITY_PREFIXES = {
+    "anchors": "anchor",
+    "knots": "knot",
+    "ties": "tie",
+    "nexuses": "nexus",
+}
+
 
 def load_yaml_with_lines(yaml_path: Path) -> tuple[dict[str, Any], dict[str, int]]:
     """Load YAML and capture line numbers for all fields.
@@ -26,11 +73,16 @@ def load_yaml_with_lines(yaml_path: Path) -> tuple[dict[str, Any], dict[str, int
         Tuple of (parsed data, field_path -> line_number mapping)
         Line numbers are 1-based for user display.
     """
+    with yaml_path.open("r") as f:
+        return _load_yaml(f)
+
+
+def _load_yaml(stream: IO[str]) -> tuple[dict[str, Any], dict[str, int]]:
+    """Load YAML from a stream and capture line numbers for all fields."""
     yaml = YAML()
     yaml.preserve_quotes = True
 
-    with yaml_path.open("r") as f:
-        data = yaml.load(f)
+    data = yaml.load(stream)
 
     line_map: dict[str, int] = {}
 
@@ -70,27 +122,54 @@ def load_yaml_with_lines(yaml_path: Path) -> tuple[dict[str, Any], dict[str, int
     return data, line_map
 
 
-def load_spec(yaml_path: Path) -> ValidationResult:
-    """Load YAML spec file into Spec model with validation.
+# ============================================================================
+# Per-file Parsing
+# ============================================================================
 
-    Args:
-        yaml_path: Path to YAML spec file
 
-    Returns:
-        ValidationResult with spec or errors
+@dataclass(frozen=True)
+class _ParsedFile:
+    """One spec file parsed and validated on its own.
+
+    Depends only on the file's content, so it is cached by content hash.
     """
+
+    spec: Spec | None
+    line_map: dict[str, int]
+    includes: list[str]
+    errors: list[ValidationError]
+
+
+def _parse_file(text: str) -> _ParsedFile:
+    """Parse and validate the content of one spec file."""
     try:
-        raw_data, line_map = load_yaml_with_lines(yaml_path)
+        raw_data, line_map = _load_yaml(io.StringIO(text))
     except Exception as e:
-        return ValidationResult(
-            spec=None,
-            errors=[ValidationError(field_path="", message=f"YAML parse error: {e}")],
+        return _ParsedFile(
+            None,
+            {},
+            [],
+            [ValidationError(field_path="", message=f"YAML parse error: {e}")],
         )
 
+    includes: list[str] = []
+    if isinstance(raw_data, dict) and _INCLUDE in raw_data:
+        include = raw_data.pop(_INCLUDE)
+        if isinstance(include, str):
+            includes = [include]
+        elif isinstance(include, list) and all(isinstance(p, str) for p in include):
+            includes = list(include)
+        else:
+            message = "include must be a path or a list of paths"
+            error = ValidationError(
+                field_path=_INCLUDE, message=message, line=line_map.get(_INCLUDE)
+            )
+            return _ParsedFile(None, line_map, [], [error])
+
     # Try to validate with Pydantic
     try:
         spec = Spec.model_validate(raw_data)
-        return ValidationResult(spec=spec, errors=[])
+        return _ParsedFile(spec, line_map, includes, [])
     except PydanticValidationError as e:
         # Map Pydantic errors to ValidationError with line numbers
         errors = []
@@ -106,28 +185,183 @@ def load_spec(yaml_path: Path) -> ValidationResult:
                 ValidationError(field_path=field_path, message=message, line=line)
             )
 
-        return ValidationResult(spec=None, errors=errors)
+        return _ParsedFile(None, line_map, includes, errors)
+
+
+_cache: OrderedDict[str, _ParsedFile] = OrderedDict()
+
+
+def _parse_files(texts: dict[Path, str], jobs: int | None) -> dict[Path, _ParsedFile]:
+    """Parse spec files, reusing cached results for unchanged content."""
+    digests = {
+        path: hashlib.sha256(text.encode()).hexdigest() for path, text in texts.items()
+    }
+    parsed = {digest: _cache[digest] for digest in digests.values() if digest in _cache}
+    uncached = {
+        digest: texts[path] for path, digest in digests.items() if digest not in parsed
+    }
+    size = sum(len(text) for text in uncached.values())
+    if len(uncached) > 1 and jobs != 1 and size >= _PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(_parse_file, uncached.values())
+            parsed.update(zip(uncached, results, strict=True))
+    else:
+        parsed.update((digest, _parse_file(text)) for digest, text in uncached.items())
+
+    for digest in digests.values():
+        _cache[digest] = parsed[digest]
+        _cache.move_to_end(digest)
+    while len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return {path: parsed[digest] for path, digest in digests.items()}
+
+
+def _resolve_include(including: Path, pattern: str) -> list[Path]:
+    """Return the files an include pattern matches, sorted."""
+    matches = glob.glob(str(including.parent / pattern), recursive=True)
+    return sorted(Path(match).resolve() for match in matches if Path(match).is_file())
+
+
+# ============================================================================
+# Spec Loading
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class _LoadedSpec:
+    """A spec merged from its files, with what the referential pass needs."""
+
+    result: ValidationResult
+    line_map: dict[str, int]
+    sources: dict[str, tuple[str, str]] | None
+
+
+def _load(yaml_path: Path, jobs: int | None) -> _LoadedSpec:
+    """Load a spec file and the files it includes, level by level."""
+    root = yaml_path.resolve()
+    files: dict[Path, _ParsedFile] = {}
+    include_errors: dict[Path, list[ValidationError]] = {}
+    level = [root]
+    while level:
+        texts = {}
+        for path in level:
+            try:
+                texts[path] = path.read_text()
+            except OSError as e:
+                error = ValidationError(field_path="", message=f"YAML parse error: {e}")
+                files[path] = _ParsedFile(None, {}, [], [error])
+        files.update(_parse_files(texts, jobs))
+
+        reached: list[Path] = []
+        for path in level:
+            parsed = files[path]
+            for k, pattern in enumerate(parsed.includes):
+                matches = _resolve_include(path, pattern)
+                if not matches:
+                    field_path = f"{_INCLUDE}[{k}]"
+                    lines = parsed.line_map
+                    line = lines.get(field_path, lines.get(_INCLUDE))
+                    include_errors.setdefault(path, []).append(
+                        ValidationError(
+                            field_path=field_path,
+                            message=f"Include '{pattern}' matches no files",
+                            line=line,
+                        )
+                    )
+                reached += [m for m in matches if m not in files and m not in reached]
+        level = reached
+
+    paths = list(files)
+    if len(paths) == 1 and not include_errors:
+        parsed = files[root]
+        return _LoadedSpec(
+            ValidationResult(spec=parsed.spec, errors=parsed.errors, files=paths),
+            parsed.line_map,
+            None,
+        )
+
+    def _name(path: Path) -> str:
+        return os.path.relpath(path, root.parent)
+
+    errors = [
+        replace(error, file=_name(path))
+        for path, parsed in files.items()
+        for error in [*parsed.errors, *include_errors.get(path, [])]
+    ]
+    specs = {path: p.spec for path, p in files.items() if p.spec is not None}
+    if errors or len(specs) < len(files):
+        return _LoadedSpec(ValidationResult(None, errors, paths), {}, None)
+
+    # Merge the files, shifting each file's entity indices past earlier files
+    collections: dict[str, list[Any]] = {name: [] for name in _ENTITY_PREFIXES}
+    line_map: dict[str, int] = {}
+    sources: dict[str, tuple[str, str]] = {}
+    for path, file_spec in specs.items():
+        offsets = {name: len(items) for name, items in collections.items()}
+        for field_path, line in files[path].line_map.items():
+            line_map[_shift(field_path, offsets)] = line
+        for name, prefix in _ENTITY_PREFIXES.items():
+            entities = getattr(file_spec, name)
+            for j in range(len(entities)):
+                sources[f"{prefix}[{offsets[name] + j}]"] = (
+                    _name(path),
+                    f"{prefix}[{j}]",
+                )
+            collections[name] += entities
+
+    spec = specs[root].model_copy(update=collections)
+    return _LoadedSpec(ValidationResult(spec, [], paths), line_map, sources)
+
+
+def _shift(field_path: str, offsets: dict[str, int]) -> str:
+    """Shift the entity index of a field path by its collection's offset."""
+    match = _ENTITY_PATH.match(field_path)
+    if match is None:
+        return field_path
+    index = int(match[2]) + offsets[_COLLECTIONS[match[1]]]
+    return f"{match[1]}[{index}]{field_path[match.end() :]}"
+
+
+def load_spec(yaml_path: Path, jobs: int | None = None) -> ValidationResult:
+    """Load YAML spec file into Spec model with validation.
+
+    Files listed under ``include`` (paths or globs relative to the including
+    file) are loaded too and merged into one spec.
+
+    Args:
+        yaml_path: Path to YAML spec file
+        jobs: Worker processes parsing files in parallel (default: one per
+            CPU; 1 parses in-process)
+
+    Returns:
+        ValidationResult with spec or errors
+    """
+    return _load(yaml_path, jobs).result
 
 
-def validate_spec(yaml_path: Path) -> ValidationResult:
+def validate_spec(yaml_path: Path, jobs: int | None = None) -> ValidationResult:
     """Full validation pipeline: load + referential integrity checks.
 
     Args:
         yaml_path: Path to YAML spec file
+        jobs: Worker processes parsing files in parallel (default: one per
+            CPU; 1 parses in-process)
 
     Returns:
         ValidationResult with all errors (structural + referential)
     """
     # First load the spec
-    result = load_spec(yaml_path)
+    loaded = _load(yaml_path, jobs)
+    result = loaded.result
 
     # If loading failed, return those errors
     if not result.is_valid or result.spec is None:
         return result
 
-    # Run referential integrity checks
-    _, line_map = load_yaml_with_lines(yaml_path)
-    ref_errors = check_referential_integrity(result.spec, line_map)
+    # Run referential integrity checks over all files at once
+    ref_errors = check_referential_integrity(
+        result.spec, loaded.line_map, loaded.sources
+    )
 
     # Merge errors
-    return ValidationResult(spec=result.spec, errors=result.errors + ref_errors)
+    return replace(result, errors=result.errors + ref_errors)
@@ -2,15 +2,35 @@
 
 from __future__ import annotations
 
+import re
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+import sqlglot.expressions as sge
+from sqlglot.errors import SqlglotError
+
 from data_architect.models.spec import Spec
 from data_architect.validation.errors import ValidationError
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from data_architect.models.staging import StagingMapping
+
+_ENTITY_PATH = re.compile(r"^(\w+\[\d+\])(.*)$")
+
 
 def check_referential_integrity(
-    spec: Spec, line_map: dict[str, int]
+    spec: Spec,
+    line_map: dict[str, int],
+    sources: Mapping[str, tuple[str, str]] | None = None,
 ) -> list[ValidationError]:
     """Check referential integrity of the spec.
 
+    A spec merged from several files is checked as a whole, so references
+    and uniqueness hold across files. Errors are then located in the file
+    of the entity they concern.
+
     Validates:
     - Attribute knotRange references exist
     - Tie role type references exist
@@ -20,16 +40,31 @@ def check_referential_integrity(
     - Tie has >= 2 anchor roles
     - Nexus has >= 1 non-knot role
     - No duplicate tie compositions
+    - Staging mapping watermark columns are declared in the mapping's columns
+      with an integer or temporal type
+    - Staging mappings reading a CDC source declare no file source or watermark
+    - Staging mapping knot values map knotted attributes of their anchor
+    - Tie staging mapping natural keys name anchor roles of their tie
+    - Key-mapped anchors have staging mappings that do not deliver IDs
+    - Nexus staging mappings declare their watermark and read no CDC source
 
     Args:
         spec: Validated Spec model
         line_map: Field path to line number mapping
+        sources: Entity path of a merged spec (e.g. "anchor[3]") -> (file,
+            entity path within that file); None for single-file specs
 
     Returns:
         List of validation errors
     """
     errors: list[ValidationError] = []
 
+    def _entity(kind: str, name: str, path: str) -> str:
+        """Describe an entity, with its file when the spec spans files."""
+        if sources is not None and path in sources:
+            return f"{kind} '{name}' ({sources[path][0]})"
+        return f"{kind} '{name}'"
+
     # Build lookup sets
     anchor_mnemonics = {a.mnemonic for a in spec.anchors}
     knot_mnemonics = {k.mnemonic for k in spec.knots}
@@ -37,25 +72,23 @@ def check_referential_integrity(
     all_mnemonics = anchor_mnemonics | knot_mnemonics | nexus_mnemonics
 
     # Check global mnemonic uniqueness (sorted for deterministic ordering)
-    mnemonic_to_entities: dict[str, list[tuple[str, str]]] = {}
-    for anchor in sorted(spec.anchors, key=lambda a: a.descriptor):
+    mnemonic_to_entities: dict[str, list[str]] = {}
+    for i, anchor in sorted(enumerate(spec.anchors), key=lambda a: a[1].descriptor):
         mnemonic_to_entities.setdefault(anchor.mnemonic, []).append(
-            ("Anchor", anchor.descriptor)
+            _entity("Anchor", anchor.descriptor, f"anchor[{i}]")
         )
-    for knot in sorted(spec.knots, key=lambda k: k.descriptor):
+    for i, knot in sorted(enumerate(spec.knots), key=lambda k: k[1].descriptor):
         mnemonic_to_entities.setdefault(knot.mnemonic, []).append(
-            ("Knot", knot.descriptor)
+            _entity("Knot", knot.descriptor, f"knot[{i}]")
         )
-    for nexus in sorted(spec.nexuses, key=lambda n: n.descriptor):
+    for i, nexus in sorted(enumerate(spec.nexuses), key=lambda n: n[1].descriptor):
         mnemonic_to_entities.setdefault(nexus.mnemonic, []).append(
-            ("Nexus", nexus.descriptor)
+            _entity("Nexus", nexus.descriptor, f"nexus[{i}]")
         )
 
     for mnemonic, entities in mnemonic_to_entities.items():
         if len(entities) > 1:
-            entity_names = " and ".join(
-                [f"{e_type} '{e_name}'" for e_type, e_name in entities]
-            )
+            entity_names = " and ".join(entities)
             errors.append(
                 ValidationError(
                     field_path=f"mnemonic.{mnemonic}",
@@ -98,6 +131,83 @@ def check_referential_integrity(
                     )
                 )
 
+    # Check staging mapping watermark columns are declared (their type decides
+    # how the watermark is tracked)
+    for i, anchor in enumerate(spec.anchors):
+        for k, mapping in enumerate(anchor.staging_mappings):
+            errors.extend(
+                _check_watermark_column(
+                    mapping,
+                    f"anchor[{i}].staging_mappings[{k}].watermark_column",
+                    line_map,
+                )
+            )
+            if mapping.cdc is not None and (
+                mapping.source is not None or mapping.watermark_column
+            ):
+                field_path = f"anchor[{i}].staging_mappings[{k}].cdc"
+                errors.append(
+                    ValidationError(
+                        field_path=field_path,
+                        message=(
+                            f"Staging table '{mapping.table}' reads a CDC source "
+                            f"and cannot also declare a file source or a "
+                            f"watermark column"
+                        ),
+                        line=line_map.get(field_path),
+                    )
+                )
+            knotted = {
+                key
+                for attr in anchor.attributes
+                if attr.knot_range
+                for key in (attr.mnemonic, f"{anchor.mnemonic}_{attr.mnemonic}")
+            }
+            for key in sorted(mapping.knot_values.keys() - knotted):
+                field_path = f"anchor[{i}].staging_mappings[{k}].knot_values"
+                errors.append(
+                    ValidationError(
+                        field_path=field_path,
+                        message=(
+                            f"Knot value mapping '{key}' of staging table "
+                            f"'{mapping.table}' does not name a knotted attribute "
+                            f"of anchor '{anchor.descriptor}'"
+                        ),
+                        line=line_map.get(field_path),
+                    )
+                )
+
+    # Check key-mapped anchors have keysets to map, delivered without IDs
+    for i, anchor in enumerate(spec.anchors):
+        if not anchor.keymap:
+            continue
+        field_path = f"anchor[{i}].keymap"
+        if not anchor.staging_mappings:
+            errors.append(
+                ValidationError(
+                    field_path=field_path,
+                    message=(
+                        f"Anchor '{anchor.descriptor}' has a key map but no "
+                        "staging mappings to take keysets from"
+                    ),
+                    line=line_map.get(field_path),
+                )
+            )
+        identity_col = f"{anchor.mnemonic}_ID"
+        for mapping in anchor.staging_mappings:
+            if any(col.name == identity_col for col in mapping.columns):
+                errors.append(
+                    ValidationError(
+                        field_path=field_path,
+                        message=(
+                            f"Staging table '{mapping.table}' declares "
+                            f"'{identity_col}', which the key map of anchor "
+                            f"'{anchor.descriptor}' assigns"
+                        ),
+                        line=line_map.get(field_path),
+                    )
+                )
+
     # Check nexus attribute mnemonic uniqueness and knotRange references
     for i, nexus in enumerate(spec.nexuses):
         attr_mnemonics = {}
@@ -132,6 +242,29 @@ def check_referential_integrity(
                     )
                 )
 
+        # Nexuses load from staging tables; change feeds are consumed by
+        # anchor loads only
+        for k, mapping in enumerate(nexus.staging_mappings):
+            errors.extend(
+                _check_watermark_column(
+                    mapping,
+                    f"nexus[{i}].staging_mappings[{k}].watermark_column",
+                    line_map,
+                )
+            )
+            if mapping.cdc is not None:
+                field_path = f"nexus[{i}].staging_mappings[{k}].cdc"
+                errors.append(
+                    ValidationError(
+                        field_path=field_path,
+                        message=(
+                            f"Staging table '{mapping.table}' of nexus "
+                            f"'{nexus.descriptor}' cannot read a CDC source"
+                        ),
+                        line=line_map.get(field_path),
+                    )
+                )
+
         # Check nexus has at least one non-knot role
         non_knot_roles = [r for r in nexus.roles if r.type_ not in knot_mnemonics]
         if not non_knot_roles:
@@ -177,6 +310,24 @@ def check_referential_integrity(
                     )
                 )
 
+        # Natural keys resolve anchor identities only
+        anchor_role_names = {r.role for r in anchor_roles}
+        for k, tie_mapping in enumerate(tie.staging_mappings):
+            unknown = tie_mapping.natural_key_columns.keys() - anchor_role_names
+            for role_name in sorted(unknown):
+                field_path = f"tie[{i}].staging_mappings[{k}].natural_key_columns"
+                errors.append(
+                    ValidationError(
+                        field_path=field_path,
+                        message=(
+                            f"Natural key of staging table '{tie_mapping.table}' "
+                            f"names '{role_name}', which is not an anchor role "
+                            "of the tie"
+                        ),
+                        line=line_map.get(field_path),
+                    )
+                )
+
         # Track composition for duplicate detection
         # (sorted for deterministic comparison)
         composition = tuple(sorted(r.type_ for r in tie.roles))
@@ -207,4 +358,66 @@ def check_referential_integrity(
                     )
                 )
 
+    if sources is not None:
+        errors = [_locate(error, sources) for error in errors]
     return errors
+
+
+def _locate(
+    error: ValidationError, sources: Mapping[str, tuple[str, str]]
+) -> ValidationError:
+    """Point an error on a merged spec's entity at the file defining it."""
+    match = _ENTITY_PATH.match(error.field_path)
+    if match is None or match[1] not in sources:
+        return error
+    file, path = sources[match[1]]
+    return replace(error, field_path=f"{path}{match[2]}", file=file)
+
+
+def _check_watermark_column(
+    mapping: StagingMapping, field_path: str, line_map: dict[str, int]
+) -> list[ValidationError]:
+    """Check a mapping's watermark column is declared and can be tracked.
+
+    Watermarks are kept in the load-control table's timestamp or BIGINT
+    pair (see generation.columns.watermark_columns), so only temporal and
+    integer columns can serve as watermarks.
+
+    Args:
+        mapping: Staging mapping of an anchor or nexus
+        field_path: Field path of the mapping's watermark_column
+        line_map: Field path to line number mapping
+
+    Returns:
+        List of validation errors (empty if the watermark is valid or unset)
+    """
+    if not mapping.watermark_column:
+        return []
+    watermark_type = next(
+        (col.type for col in mapping.columns if col.name == mapping.watermark_column),
+        None,
+    )
+    if watermark_type is None:
+        message = (
+            f"Watermark column '{mapping.watermark_column}' is not declared in "
+            f"columns of staging table '{mapping.table}'"
+        )
+    else:
+        try:
+            trackable = sge.DataType.build(watermark_type).is_type(
+                *sge.DataType.INTEGER_TYPES, *sge.DataType.TEMPORAL_TYPES
+            )
+        except SqlglotError:
+            trackable = False
+        if trackable:
+            return []
+        message = (
+            f"Watermark column '{mapping.watermark_column}' of staging table "
+            f"'{mapping.table}' has type '{watermark_type}'; watermarks must be "
+            f"integer or temporal (date, datetime, timestamp)"
+        )
+    return [
+        ValidationError(
+            field_path=field_path, message=message, line=line_map.get(field_path)
+        )
+    ]
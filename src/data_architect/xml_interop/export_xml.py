@@ -23,7 +23,7 @@ def check_yaml_extensions(spec: Spec) -> list[str]:
 
     YAML extensions are fields that exist in the YAML Pydantic models but
     cannot be represented in Anchor Modeler XML format. These include:
-    - staging_mappings on anchors (Phase 8 feature)
+    - staging_mappings on anchors (Phase 8 feature) and nexuses
     - staging_column on attributes (Phase 8 feature)
 
     Args:
@@ -53,8 +53,15 @@ def check_yaml_extensions(spec: Spec) -> list[str]:
                     f"staging_column '{attr.staging_column}'"
                 )
 
-    # Check nexus attributes for staging_column
+    # Check nexuses for staging_mappings and their attributes for staging_column
     for nexus in spec.nexuses:
+        if nexus.staging_mappings:
+            count = len(nexus.staging_mappings)
+            plural = "s" if count > 1 else ""
+            extensions.append(
+                f"Nexus '{nexus.mnemonic}' has {count} staging mapping{plural}"
+            )
+
         for attr in nexus.attributes:
             if attr.staging_column:
                 attr_name = f"{nexus.mnemonic}.{attr.mnemonic}"
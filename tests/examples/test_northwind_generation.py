@@ -5,12 +5,20 @@ including DDL/DML generation, determinism, idempotency, multi-dialect support,
 keyset identity, and multi-source handling.
 """
 
+from contextlib import closing
 from pathlib import Path
 
 import pytest
 import sqlglot
 
-from data_architect.generation import generate_all_ddl, generate_all_dml
+from data_architect.generation import (
+    generate_all_ddl,
+    generate_all_dml,
+    generate_all_views,
+)
+from data_architect.generation.dependencies import build_dependency_graph
+from data_architect.generation.naming import attribute_table_name, tie_table_name
+from data_architect.runner import duckdb_connector, run_phases
 from data_architect.validation.loader import validate_spec
 
 # Resolve spec path relative to project root
@@ -230,17 +238,121 @@ def test_northwind_dml_references_keyset_id(spec):
     assert "keyset_id" in sql_lower, "Anchor DML missing reference to keyset_id"
 
 
-def test_northwind_multi_dialect_compiles(spec):
-    """generate_all_ddl() succeeds for postgres and tsql dialects."""
-    # Note: Snowflake doesn't support 'money' type used in spec, so only test postgres/tsql
-    dialects = ["postgres", "tsql"]
+@pytest.mark.parametrize("dialect", ["postgres", "tsql", "snowflake"])
+def test_northwind_multi_dialect_compiles(spec, dialect):
+    """DDL, perspectives and DML generate for every dialect."""
+    ddl_dict = {**generate_all_ddl(spec, dialect), **generate_all_views(spec, dialect)}
+    dml_dict = generate_all_dml(spec, dialect)
 
-    for dialect in dialects:
-        try:
-            ddl_dict = generate_all_ddl(spec, dialect)
-            assert ddl_dict, f"DDL dict empty for {dialect}"
-        except Exception as e:
-            pytest.fail(f"Generation failed for {dialect}: {e}")
+    assert ddl_dict, f"DDL dict empty for {dialect}"
+    assert dml_dict, f"DML dict empty for {dialect}"
+
+
+def test_northwind_loads_on_duckdb(spec, tmp_path):
+    """The Northwind DDL and DML run on DuckDB, integer natural keys included."""
+    duckdb = pytest.importorskip("duckdb")
+    database = str(tmp_path / "northwind.duckdb")
+    graph = build_dependency_graph(spec)
+
+    ddl = run_phases(
+        [{**generate_all_ddl(spec, "duckdb"), **generate_all_views(spec, "duckdb")}],
+        graph,
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+    assert ddl.ok, [r.error for r in ddl.results if r.error]
+
+    with closing(duckdb.connect(database)) as connection:
+        # Knot values are staged by the user, not generated
+        for knot in spec.knots:
+            connection.execute(
+                f"CREATE TABLE stg_{knot.mnemonic}_{knot.descriptor} ("
+                f"{knot.mnemonic}_ID INT, "
+                f"{knot.mnemonic}_{knot.descriptor} {knot.data_range}, "
+                "metadata_recorded_at TIMESTAMP)"
+            )
+        connection.execute(
+            "INSERT INTO stg_CAT_Category VALUES (1, 'Beverages', NOW())"
+        )
+        # So is the tie; its table declares no key for the conflict target
+        connection.execute(
+            "CREATE TABLE stg_OR_PR_for_contains (OR_ID_for INT, PR_ID_contains INT, "
+            "metadata_recorded_at TIMESTAMP)"
+        )
+        connection.execute(
+            "CREATE UNIQUE INDEX tie_key ON OR_PR_for_contains (OR_ID_for, PR_ID_contains)"
+        )
+        for table, columns, rows in (
+            (
+                "stg_northwind_customers",
+                "CustomerID, CU_ID, CompanyName, ContactName, Country, changed_at",
+                [("ALFKI", "ALFKI", "Alfreds", "Maria", "Germany", "2024-01-01")],
+            ),
+            (
+                "stg_northwind_products",
+                "ProductID, ProductName, UnitPrice, UnitsInStock, CategoryID, "
+                "changed_at",
+                [
+                    (1, "Chai", 18, 39, 1, "2024-01-01"),
+                    (2, "Chang", 19, 17, 1, "2024-01-01"),
+                ],
+            ),
+            (
+                "stg_sap_materials",
+                "MaterialID, MaterialName, StandardPrice, AvailableStock, "
+                "ProductCategory, changed_at",
+                [(1, "Chai", 18, 39, 1, "2024-01-01")],
+            ),
+            (
+                "stg_northwind_suppliers",
+                "SupplierID, CompanyName, ContactName, changed_at",
+                [(1, "Exotic Liquids", "Charlotte", "2024-01-01")],
+            ),
+        ):
+            placeholders = ", ".join("?" for _ in columns.split(","))
+            insert = f"INSERT INTO {table} ({columns}, metadata_recorded_at) "
+            connection.executemany(
+                insert + f"VALUES ({placeholders}, NOW())",
+                rows,
+            )
+
+    dml = run_phases(
+        [generate_all_dml(spec, "duckdb")],
+        graph,
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+
+    assert dml.ok, [r.error for r in dml.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT keyset_id FROM PR_Product_keymap ORDER BY keyset_id"
+        ).fetchall() == [
+            ("Product@northwind~default|1",),
+            ("Product@northwind~default|2",),
+            ("Product@sap~default|1",),
+        ]
+        assert connection.execute("SELECT metadata_id FROM SU_Supplier").fetchall() == [
+            ("Supplier@northwind~default|1",)
+        ]
+
+
+@pytest.mark.parametrize(
+    ("dialect", "expected"),
+    [
+        ("postgres", "MONEY"),
+        ("tsql", "MONEY"),
+        ("snowflake", "DECIMAL(19, 4)"),
+        ("duckdb", "DECIMAL(19, 4)"),
+    ],
+)
+def test_northwind_money_maps_to_decimal_without_money_type(spec, dialect, expected):
+    """money is kept where the dialect has it, else stored as DECIMAL(19, 4)."""
+    ddl_dict = generate_all_ddl(spec, dialect)
+
+    assert expected in ddl_dict["PR_PRC_Product_UnitPrice.sql"]
 
 
 def test_northwind_dml_contains_keyset_pattern(spec):
@@ -289,3 +401,33 @@ def test_northwind_multi_source_priority_ordering(spec):
     has_sap = any("sap" in f for f in product_files)
     assert has_northwind, "Product DML missing northwind file"
     assert has_sap, "Product DML missing sap file"
+
+
+def test_northwind_foreign_keys_match_referenced_identities(spec):
+    """Tie roles and knot FKs have the identity type of what they reference."""
+    ddl_dict = generate_all_ddl(spec, "postgres")
+    identities = {
+        entity.mnemonic: sqlglot.exp.DataType.build(entity.identity)
+        for entity in [*spec.anchors, *spec.knots]
+    }
+
+    def column_types(filename: str) -> dict[str, sqlglot.exp.DataType]:
+        create = sqlglot.parse_one(ddl_dict[filename], dialect="postgres")
+        return {
+            column.name: column.kind
+            for column in create.find_all(sqlglot.exp.ColumnDef)
+        }
+
+    checked = 0
+    for tie in spec.ties:
+        types = column_types(f"{tie_table_name(tie)}.sql")
+        for role in tie.roles:
+            assert types[f"{role.type_}_ID_{role.role}"] == identities[role.type_]
+            checked += 1
+    for anchor in spec.anchors:
+        for attr in anchor.attributes:
+            if attr.knot_range:
+                types = column_types(f"{attribute_table_name(anchor, attr)}.sql")
+                assert types[f"{attr.knot_range}_ID"] == identities[attr.knot_range]
+                checked += 1
+    assert checked == 4  # OR_PR_for_contains roles, category and shipper knots
@@ -0,0 +1,325 @@
+"""Tests for static analysis of generated SQL."""
+
+import json
+
+from typer.testing import CliRunner
+
+from data_architect.analyzer import AnalysisReport, Finding, Severity, analyze_spec
+from data_architect.cli import app
+from data_architect.models.anchor import Anchor, Attribute
+from data_architect.models.knot import Knot
+from data_architect.models.spec import Spec
+from data_architect.models.staging import (
+    StagingColumn,
+    StagingMapping,
+    TieStagingMapping,
+)
+from data_architect.models.tie import Role, Tie
+
+runner = CliRunner()
+
+
+def _anchor(
+    columns: list[StagingColumn] | None = None,
+    watermark_column: str | None = None,
+    keymap: bool = False,
+) -> Anchor:
+    return Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        keymap=keymap,
+        attributes=[
+            Attribute(mnemonic="NAM", descriptor="Name", data_range="varchar(40)"),
+            Attribute(mnemonic="SEG", descriptor="Segment", knot_range="SEG"),
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                columns=columns or [],
+                knot_values={"SEG": "segment"},
+                watermark_column=watermark_column,
+            )
+        ],
+    )
+
+
+def _spec(
+    columns: list[StagingColumn] | None = None,
+    watermark_column: str | None = None,
+    keymap: bool = False,
+) -> Spec:
+    knot = Knot(
+        mnemonic="SEG", descriptor="Segment", identity="int", data_range="varchar(20)"
+    )
+    return Spec(anchors=[_anchor(columns, watermark_column, keymap)], knots=[knot])
+
+
+def _rules(report: AnalysisReport) -> dict[str, list[Finding]]:
+    rules: dict[str, list[Finding]] = {}
+    for finding in report.findings:
+        rules.setdefault(finding.rule, []).append(finding)
+    return rules
+
+
+# ============================================================================
+# Implicit Conversion Tests
+# ============================================================================
+
+
+def test_matching_staging_types_convert_nothing():
+    """Declared staging types equal to their targets raise no finding."""
+    report = analyze_spec(
+        _spec(
+            columns=[
+                StagingColumn(name="CU_ID", type="bigint"),
+                StagingColumn(name="CU_NAM_Customer_Name", type="varchar(40)"),
+                StagingColumn(name="segment", type="varchar(20)"),
+            ]
+        ),
+        "postgres",
+    )
+
+    assert "implicit-conversion" not in _rules(report)
+
+
+def test_staging_type_mismatches_are_flagged():
+    """Narrower inserts are info, lossy inserts and joins are warnings."""
+    report = analyze_spec(
+        _spec(
+            columns=[
+                StagingColumn(name="CU_ID", type="int"),
+                StagingColumn(name="CU_NAM_Customer_Name", type="text"),
+                StagingColumn(name="segment", type="int"),
+            ]
+        ),
+        "postgres",
+    )
+
+    findings = {f.location: f for f in _rules(report)["implicit-conversion"]}
+    assert findings["stg_customers.CU_ID"].severity == Severity.INFO
+    assert "lossless" in findings["stg_customers.CU_ID"].message
+    assert findings["stg_customers.CU_NAM_Customer_Name"].severity == (Severity.WARNING)
+    assert findings["stg_customers.segment"].severity == Severity.WARNING
+    assert "joined with SEG_Segment.SEG_Segment" in (
+        findings["stg_customers.segment"].message
+    )
+
+
+def test_keymap_anchor_identity_is_not_compared():
+    """Key-map anchors assign identities, so staged IDs are not loaded."""
+    report = analyze_spec(
+        _spec(columns=[StagingColumn(name="CU_ID", type="varchar(10)")], keymap=True),
+        "postgres",
+    )
+
+    assert "implicit-conversion" not in _rules(report)
+
+
+def test_tie_role_ids_are_compared_with_identities():
+    """Staged tie role IDs of another type are converted on insert."""
+    tie = Tie(
+        roles=[
+            Role(role="has", type_="CU", identifier=True),
+            Role(role="in", type_="SEG", identifier=True),
+        ],
+        staging_mappings=[
+            TieStagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_segments",
+                natural_key_columns={"has": ["customer_id"]},
+                columns=[
+                    StagingColumn(name="CU_ID_has", type="varchar(10)"),
+                    StagingColumn(name="SEG_ID_in", type="varchar(10)"),
+                ],
+            )
+        ],
+    )
+    spec = _spec().model_copy(update={"ties": [tie]})
+
+    findings = _rules(analyze_spec(spec, "postgres"))["implicit-conversion"]
+
+    assert [f.location for f in findings] == ["stg_segments.SEG_ID_in"]
+
+
+# ============================================================================
+# Statement Rule Tests
+# ============================================================================
+
+
+def test_tie_upsert_without_unique_key_is_an_error():
+    """Ties have no primary key, so ON CONFLICT on their roles cannot run."""
+    tie = Tie(
+        roles=[
+            Role(role="has", type_="CU", identifier=True),
+            Role(role="in", type_="SEG", identifier=True),
+        ]
+    )
+    spec = _spec().model_copy(update={"ties": [tie]})
+
+    postgres = _rules(analyze_spec(spec, "postgres"))["missing-unique-key"]
+    tsql = _rules(analyze_spec(spec, "tsql"))["missing-unique-key"]
+
+    assert [(f.location, f.severity) for f in postgres] == [
+        ("CU_SEG_has_in_load.sql", Severity.ERROR)
+    ]
+    assert "ON CONFLICT target CU_SEG_has_in" in postgres[0].message
+    assert [(f.location, f.severity) for f in tsql] == [
+        ("CU_SEG_has_in_load.sql", Severity.WARNING)
+    ]
+
+
+def test_generated_loads_have_unique_keys_and_sargable_predicates():
+    """Anchor, attribute and knot loads match on keys with bare columns."""
+    for dialect in ("postgres", "tsql", "snowflake", "duckdb"):
+        for keymap in (False, True):
+            rules = _rules(analyze_spec(_spec(keymap=keymap), dialect))
+            assert "missing-unique-key" not in rules, dialect
+            assert "non-sargable-predicate" not in rules, dialect
+
+
+def test_full_staging_scans_are_reported_per_load():
+    """Unwatermarked loads scan staging; fan-out shares one scan."""
+    findings = _rules(analyze_spec(_spec(), "postgres"))["staging-full-scan"]
+    fanout = _rules(analyze_spec(_spec(), "postgres", fanout=True))
+
+    assert {f.location for f in findings} == {
+        "CU_Customer_load.sql",
+        "CU_NAM_Customer_Name_load.sql",
+        "CU_SEG_Customer_Segment_load.sql",
+        "SEG_Segment_load.sql",
+    }
+    assert {f.severity for f in findings} == {Severity.WARNING}
+    assert "--fan-out" in findings[0].message
+    assert {f.location for f in fanout["staging-full-scan"]} == {
+        "SEG_Segment_load.sql",
+        "stg_customers_load.sql",
+    }
+
+
+def test_watermarked_loads_leave_only_knot_scans():
+    """Watermarked loads are incremental; knot value loads still scan."""
+    report = analyze_spec(
+        _spec(
+            columns=[StagingColumn(name="changed_at", type="timestamp")],
+            watermark_column="changed_at",
+        ),
+        "postgres",
+    )
+
+    findings = _rules(report)["staging-full-scan"]
+    assert [(f.location, f.severity) for f in findings] == [
+        ("SEG_Segment_load.sql", Severity.INFO)
+    ]
+
+
+# ============================================================================
+# Report Tests
+# ============================================================================
+
+
+def test_report_counts_and_thresholds():
+    """Reports count findings per severity and fail at a threshold."""
+    report = AnalysisReport(
+        dialect="postgres",
+        files=1,
+        statements=2,
+        findings=[Finding("r", Severity.WARNING, "a.sql", "m", statement=0)],
+    )
+
+    assert report.counts() == {"error": 0, "warning": 1, "info": 0}
+    assert not report.fails(Severity.ERROR)
+    assert report.fails(Severity.WARNING)
+    assert report.fails(Severity.INFO)
+    assert report.to_dict()["findings"] == [
+        {
+            "rule": "r",
+            "severity": "warning",
+            "location": "a.sql",
+            "statement": 0,
+            "message": "m",
+        }
+    ]
+
+
+def test_findings_are_sorted_by_severity():
+    """Errors come first in the report."""
+    tie = Tie(
+        roles=[
+            Role(role="has", type_="CU", identifier=True),
+            Role(role="in", type_="SEG", identifier=True),
+        ]
+    )
+    report = analyze_spec(_spec().model_copy(update={"ties": [tie]}), "postgres")
+
+    severities = [f.severity for f in report.findings]
+    assert severities[0] == Severity.ERROR
+    assert severities == sorted(severities, key=[*Severity].index)
+
+
+# ============================================================================
+# CLI Tests
+# ============================================================================
+
+_TIE_SPEC = """
+anchor:
+  - mnemonic: CU
+    descriptor: Customer
+    identity: bigint
+  - mnemonic: OR
+    descriptor: Order
+    identity: bigint
+tie:
+  - role:
+      - role: placed
+        type: OR
+        identifier: true
+      - role: by
+        type: CU
+        identifier: true
+"""
+
+
+def test_dab_analyze_prints_json_report(tmp_path):
+    """architect dab analyze prints the report and fails on errors."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_TIE_SPEC)
+
+    result = runner.invoke(app, ["dab", "analyze", str(spec_path)])
+
+    assert result.exit_code == 1
+    report = json.loads(result.output)
+    assert report["dialect"] == "postgres"
+    assert report["counts"]["error"] == 1
+    assert report["findings"][0]["rule"] == "missing-unique-key"
+
+
+def test_dab_analyze_writes_report_file(tmp_path):
+    """architect dab analyze --output writes JSON and honours --fail-on."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_TIE_SPEC)
+    output = tmp_path / "report.json"
+
+    result = runner.invoke(
+        app, ["dab", "analyze", str(spec_path), "-d", "tsql", "-o", str(output)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "1 warning" in result.output
+    assert json.loads(output.read_text())["dialect"] == "tsql"
+
+    result = runner.invoke(
+        app,
+        ["dab", "analyze", str(spec_path), "-d", "tsql", "--fail-on", "warning"],
+    )
+    assert result.exit_code == 1
+
+
+def test_dab_analyze_missing_spec(tmp_path):
+    """architect dab analyze with a missing spec exits with an error."""
+    result = runner.invoke(app, ["dab", "analyze", str(tmp_path / "missing.yaml")])
+    assert result.exit_code == 1
+    assert "spec file not found" in result.output
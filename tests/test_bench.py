@@ -0,0 +1,360 @@
+"""Tests for the load benchmark harness."""
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from data_architect.bench import (
+    BenchReport,
+    LoadTiming,
+    RowCountCheck,
+    compare_baseline,
+    run_benchmark,
+)
+from data_architect.cli import app
+from data_architect.models.anchor import Anchor, Attribute, Materialization
+from data_architect.models.knot import Knot
+from data_architect.models.spec import Spec
+from data_architect.models.staging import StagingColumn, StagingMapping
+from data_architect.runner import duckdb_connector, sqlite_connector
+
+runner = CliRunner()
+
+
+def _spec(
+    keymap: bool = False,
+    watermark_column: str | None = None,
+    materialize: Materialization | None = None,
+    staged_knots: bool = True,
+) -> Spec:
+    """Two overlapping sources of a customer with every attribute kind."""
+    columns = [
+        StagingColumn(name="customer_id", type="varchar(20)"),
+        StagingColumn(name="CU_NAM_Customer_Name", type="varchar(40)"),
+        StagingColumn(name="CU_COU_Customer_Country", type="varchar(2)"),
+        StagingColumn(name="segment", type="varchar(20)"),
+        StagingColumn(name="GEN_ID", type="int"),
+        StagingColumn(name="changed_at", type="timestamp"),
+    ]
+    if not keymap:
+        columns.append(StagingColumn(name="CU_ID", type="bigint"))
+    if not staged_knots:
+        columns.append(StagingColumn(name="SEG_ID", type="int"))
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        keymap=keymap,
+        materialize=materialize,
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(40)",
+                time_range="datetime",
+            ),
+            Attribute(mnemonic="COU", descriptor="Country", data_range="varchar(2)"),
+            Attribute(mnemonic="SEG", descriptor="Segment", knot_range="SEG"),
+            Attribute(mnemonic="GEN", descriptor="Gender", knot_range="GEN"),
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system=system,
+                tenant="ACME",
+                table=f"stg_{system}",
+                natural_key_columns=["customer_id"],
+                columns=columns,
+                knot_values={"SEG": "segment"} if staged_knots else {},
+                priority=priority,
+                watermark_column=watermark_column,
+            )
+            for priority, system in enumerate(["erp", "crm"])
+        ],
+    )
+    knots = [
+        Knot(mnemonic="SEG", descriptor="Segment", identity="int", data_range="text"),
+        Knot(mnemonic="GEN", descriptor="Gender", identity="int", data_range="text"),
+    ]
+    return Spec(anchors=[anchor], knots=knots)
+
+
+def _run(tmp_path: Path, spec: Spec, **kwargs: object) -> BenchReport:
+    pytest.importorskip("duckdb")
+    return run_benchmark(
+        spec,
+        lambda name: duckdb_connector(tmp_path / f"{name}.duckdb"),
+        engine="duckdb",
+        dialect="duckdb",
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+# ============================================================================
+# Harness Tests
+# ============================================================================
+
+
+def test_benchmark_loads_every_pattern_correctly(tmp_path):
+    """All patterns load the row counts the batches imply."""
+    report = _run(tmp_path, _spec(), rows=40, batches=3, change_rate=0.25)
+
+    assert report.ok, [load.error for load in report.loads if load.error]
+    counts = {
+        check.table: check.actual
+        for check in report.checks
+        if check.pattern == "fanout" and check.batch == 2
+    }
+    # Both sources share identities; each batch re-delivers 10 names
+    assert counts["CU_Customer"] == 40
+    assert counts["CU_NAM_Customer_Name"] == 60
+    assert counts["GEN_Gender"] == 5
+    assert {load.pattern for load in report.loads} == {
+        "default",
+        "consolidate",
+        "fanout",
+    }
+
+
+def test_benchmark_times_each_load_per_batch(tmp_path):
+    """Timings cover every file and batch, with the rows staged for them."""
+    report = _run(tmp_path, _spec(), rows=20, batches=2, patterns=["default"])
+
+    loads = {(load.file, load.batch): load for load in report.loads}
+    first = loads[("CU_Customer_load_erp.sql", 0)]
+    later = loads[("CU_Customer_load_erp.sql", 1)]
+    assert first.staged_rows == 20
+    assert later.staged_rows == 2
+    assert first.seconds > 0
+    assert first.rows_per_second == first.staged_rows / first.seconds
+    assert loads[("SEG_Segment_load.sql", 0)].staged_rows == 40  # Both sources
+
+
+def test_benchmark_keymap_identities_per_source(tmp_path):
+    """Key-mapped sources yield one identity per source keyset."""
+    report = _run(
+        tmp_path, _spec(keymap=True), rows=10, batches=2, patterns=["default"]
+    )
+
+    assert report.ok
+    last = {c.table: c.actual for c in report.checks if c.batch == 1}
+    assert last["CU_Customer"] == 20
+
+
+def test_benchmark_watermarked_loads(tmp_path):
+    """Watermarked loads pick up each batch incrementally."""
+    report = _run(
+        tmp_path,
+        _spec(watermark_column="changed_at"),
+        rows=10,
+        batches=3,
+        change_rate=0.5,
+        patterns=["default"],
+    )
+
+    assert report.ok
+    assert {c.table: c.actual for c in report.checks if c.batch == 2}[
+        "CU_NAM_Customer_Name"
+    ] == 20
+
+
+def test_benchmark_transpiles_to_sqlite(tmp_path):
+    """Postgres loads, keysets included, run on sqlite."""
+    # sqlite has no sequences to draw knot value IDs from
+    report = run_benchmark(
+        _spec(staged_knots=False),
+        lambda name: sqlite_connector(tmp_path / f"{name}.db"),
+        engine="sqlite",
+        dialect="postgres",
+        rows=5,
+    )
+
+    assert report.built
+    assert report.ok, [load.error for load in report.loads if load.error]
+
+
+def test_benchmark_reports_failed_ddl(tmp_path):
+    """DDL the engine cannot run is reported instead of raised."""
+    report = run_benchmark(
+        _spec(materialize=Materialization(), staged_knots=False),
+        lambda name: sqlite_connector(tmp_path / f"{name}.db"),
+        engine="sqlite",
+        dialect="postgres",
+        rows=5,
+        patterns=["default"],
+    )
+
+    assert not report.ok
+    assert not report.built
+    assert [load.file for load in report.loads] == ["(ddl)"]
+    assert "mCU_Customer.sql" in str(report.loads[0].error)
+    assert report.checks == []
+
+
+# ============================================================================
+# Baseline Tests
+# ============================================================================
+
+
+def _report(seconds: float, actual: int) -> BenchReport:
+    return BenchReport(
+        engine="duckdb",
+        dialect="duckdb",
+        rows=10,
+        batches=1,
+        change_rate=0.1,
+        loads=[LoadTiming("default", 0, "CU_Customer_load.sql", seconds, 10)],
+        checks=[RowCountCheck("default", 0, "CU_Customer", 10, actual)],
+    )
+
+
+def test_compare_baseline_flags_slowdowns_and_wrong_counts():
+    """Slower loads beyond the tolerance and broken counts regress."""
+    baseline = _report(0.1, 10).to_dict()
+
+    assert compare_baseline(_report(0.12, 10), baseline) == []
+    assert compare_baseline(_report(0.2, 10), baseline) == [
+        "default/CU_Customer_load.sql: 0.200s, was 0.100s"
+    ]
+    assert compare_baseline(_report(0.1, 9), baseline) == [
+        "default/CU_Customer (batch 0): 9 rows, expected 10"
+    ]
+    # Noise on very fast loads is ignored
+    assert compare_baseline(_report(0.004, 10), _report(0.001, 10).to_dict()) == []
+
+
+def test_report_summary_aggregates_batches():
+    """The summary totals seconds and staged rows per file."""
+    report = _report(0.5, 10)
+    report.loads.append(LoadTiming("default", 1, "CU_Customer_load.sql", 0.5, 2))
+
+    assert report.summary() == {
+        "default": {
+            "CU_Customer_load.sql": {
+                "seconds": 1.0,
+                "staged_rows": 12,
+                "rows_per_second": 12.0,
+            }
+        }
+    }
+    assert report.to_dict()["ok"] is True
+
+
+# ============================================================================
+# CLI Tests
+# ============================================================================
+
+_SPEC = """
+anchor:
+  - mnemonic: PR
+    descriptor: Product
+    identity: int
+    attribute:
+      - mnemonic: NAM
+        descriptor: Name
+        dataRange: varchar(40)
+    staging_mappings:
+      - system: erp
+        tenant: default
+        table: stg_products
+        natural_key_columns:
+          - ProductID
+        column_mappings:
+          NAM: ProductName
+        columns:
+          - name: ProductID
+            type: varchar(10)
+          - name: PR_ID
+            type: int
+          - name: ProductName
+            type: varchar(40)
+"""
+
+
+def test_dab_bench_writes_baseline(tmp_path):
+    """architect dab bench writes a baseline and compares against one."""
+    pytest.importorskip("duckdb")
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_SPEC)
+
+    result = runner.invoke(
+        app, ["dab", "bench", str(spec_path), "--rows", "20", "-p", "default"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "default PR_Product_load.sql" in result.output
+    baseline = json.loads((tmp_path / "bench.json").read_text())
+    assert baseline["ok"] is True
+    assert {c["table"] for c in baseline["checks"]} == {
+        "PR_Product",
+        "PR_NAM_Product_Name",
+    }
+
+    result = runner.invoke(
+        app,
+        [
+            "dab",
+            "bench",
+            str(spec_path),
+            "--rows",
+            "20",
+            "-p",
+            "default",
+            "--baseline",
+            str(tmp_path / "bench.json"),
+            "--tolerance",
+            "1000",
+            "-o",
+            str(tmp_path / "next.json"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "next.json").exists()
+
+
+def test_dab_bench_on_sqlite(tmp_path):
+    """architect dab bench runs the postgres loads on sqlite."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_SPEC)
+
+    result = runner.invoke(
+        app, ["dab", "bench", str(spec_path), "--engine", "sqlite", "--rows", "5"]
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads((tmp_path / "bench.json").read_text())["ok"] is True
+
+
+def test_dab_bench_failed_ddl_writes_no_baseline(tmp_path):
+    """architect dab bench exits 1 without a baseline when the DDL fails."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(
+        _SPEC.replace("    identity: int\n", "    identity: int\n    materialize: {}\n")
+    )
+
+    result = runner.invoke(
+        app, ["dab", "bench", str(spec_path), "--engine", "sqlite", "--rows", "5"]
+    )
+    assert result.exit_code == 1
+    assert "Error: default mPR_Product.sql" in result.output
+    assert "Baseline written" not in result.output
+    assert not (tmp_path / "bench.json").exists()
+
+
+def test_dab_bench_unsupported_type(tmp_path):
+    """architect dab bench reports types the dialect cannot parse."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_SPEC.replace("dataRange: varchar(40)", "dataRange: 'int('"))
+
+    result = runner.invoke(
+        app, ["dab", "bench", str(spec_path), "--engine", "sqlite", "--rows", "5"]
+    )
+    assert result.exit_code == 1
+    assert "Error: Data type 'int(' is not supported" in result.output
+    assert not (tmp_path / "bench.json").exists()
+
+
+def test_dab_bench_missing_spec(tmp_path):
+    """architect dab bench with a missing spec exits with an error."""
+    result = runner.invoke(app, ["dab", "bench", str(tmp_path / "missing.yaml")])
+    assert result.exit_code == 1
+    assert "spec file not found" in result.output
@@ -1,5 +1,6 @@
 """CLI integration tests using Typer CliRunner."""
 
+import pytest
 from typer.testing import CliRunner
 
 from data_architect.cli import app
@@ -243,6 +244,34 @@ def test_dab_generate_with_invalid_spec(tmp_path):
     assert "Validation errors:" in result.output
 
 
+def test_dab_generate_rejects_unreadable_file_source(tmp_path):
+    """architect dab generate reports a source the dialect cannot read."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(
+        """
+anchor:
+  - mnemonic: CU
+    descriptor: Customer
+    identity: bigint
+    staging_mappings:
+      - system: ERP
+        tenant: ACME
+        table: stg_customers
+        natural_key_columns: [customer_id]
+        columns:
+          - name: customer_id
+            type: varchar(20)
+        source:
+          path: /data/customers.parquet
+          format: parquet
+"""
+    )
+
+    result = runner.invoke(app, ["dab", "generate", str(spec_path)])
+    assert result.exit_code == 1
+    assert "file_fdw reads csv sources only" in result.output
+
+
 def test_dab_generate_missing_spec(tmp_path):
     """architect dab generate with nonexistent file shows error."""
     spec_path = tmp_path / "nonexistent.yaml"
@@ -292,7 +321,13 @@ def test_dab_generate_format_bruin(tmp_path):
     assert "@bruin */" in content
     assert "name: dab." in content
     assert "type: sql" in content
-    assert "strategy:" in content
+
+    # Loads are named after their file and depend on upstream assets
+    content = (output_dir / "dml" / "AC_NAM_Actor_Name_load.sql").read_text()
+    assert "name: dab.AC_NAM_Actor_Name_load" in content
+    assert "materialization:" not in content
+    assert "    - dab.AC_Actor_load\n" in content
+    assert "    - dab.AC_NAM_Actor_Name\n" in content
 
 
 def test_dab_generate_dialect_postgres(tmp_path):
@@ -438,6 +473,80 @@ anchor:
         )
 
 
+def test_dab_generate_consolidate_one_load_per_target(tmp_path):
+    """--consolidate loads a multi-source anchor with one file per target."""
+    spec_content = """
+anchor:
+  - mnemonic: AC
+    descriptor: Actor
+    identity: int
+    staging_mappings:
+      - system: ERP
+        tenant: ACME
+        table: stg_erp_actors
+        natural_key_columns: [AC_ID]
+        priority: 1
+      - system: CRM
+        tenant: ACME
+        table: stg_crm_actors
+        natural_key_columns: [AC_ID]
+        priority: 2
+"""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(spec_content)
+
+    result = runner.invoke(app, ["dab", "generate", str(spec_path), "--consolidate"])
+    assert result.exit_code == 0
+
+    dml_files = sorted(f.name for f in (tmp_path / "output" / "dml").glob("*.sql"))
+    assert dml_files == ["AC_Actor_load.sql"]
+    content = (tmp_path / "output" / "dml" / "AC_Actor_load.sql").read_text()
+    assert "stg_erp_actors" in content
+    assert "stg_crm_actors" in content
+
+
+def test_dab_generate_watch_rewrites_changed_files(tmp_path, monkeypatch):
+    """architect dab generate --watch rewrites only what each edit changes."""
+    from pathlib import Path
+
+    spec_path = tmp_path / "spec.yaml"
+    spec = Path("tests/fixtures/valid_spec.yaml").read_text()
+    spec_path.write_text(spec)
+    output_dir = tmp_path / "output"
+
+    wider = spec.replace(
+        "datetime\n        dataRange: varchar(42)",
+        "datetime\n        dataRange: varchar(100)",
+    )
+    edits = [
+        lambda: None,  # Nothing changed yet
+        lambda: spec_path.write_text(wider),
+        lambda: spec_path.write_text("knot:\n  - mnemonic: GEN\n    bad_field: 1"),
+        lambda: spec_path.write_text(wider[: wider.index("tie:")]),
+    ]
+
+    def _sleep(seconds: float) -> None:
+        if not edits:
+            raise KeyboardInterrupt
+        edits.pop(0)()
+
+    monkeypatch.setattr("data_architect.cli.time.sleep", _sleep)
+    tie_file = output_dir / "ddl" / "AC_PN_subset_of.sql"
+    result = runner.invoke(app, ["dab", "generate", str(spec_path), "--watch"])
+
+    assert result.exit_code == 0, result.output
+    assert "Watching 1 spec file(s)" in result.output
+    assert "Changed entities: AC_Actor" in result.output
+    assert "wrote ddl/AC_NAM_Actor_Name.sql" in result.output
+    assert "wrote ddl/PN_Person.sql" not in result.output
+    assert "VARCHAR(100)" in (output_dir / "ddl" / "AC_NAM_Actor_Name.sql").read_text()
+    assert "Validation errors:" in result.output
+    assert "removed ddl/AC_PN_subset_of.sql" in result.output
+    assert not tie_file.exists()
+    assert result.output.count(" ms (validate ") == 2
+    assert result.output.endswith("Stopped watching\n")
+
+
 def test_dab_generate_help():
     """architect dab generate --help shows all options."""
     result = runner.invoke(app, ["dab", "generate", "--help"])
@@ -445,5 +554,120 @@ def test_dab_generate_help():
     assert "--format" in result.output
     assert "--dialect" in result.output
     assert "--output-dir" in result.output
+    assert "--consolidate" in result.output
+    assert "--watch" in result.output
     assert "raw" in result.output
     assert "bruin" in result.output
+
+
+_KNOT_SPEC = """
+knot:
+  - mnemonic: GEN
+    descriptor: Gender
+    identity: int
+    dataRange: varchar(42)
+"""
+
+
+def test_dab_run_missing_spec(tmp_path):
+    """architect dab run with a missing spec exits with an error."""
+    result = runner.invoke(app, ["dab", "run", str(tmp_path / "missing.yaml")])
+    assert result.exit_code == 1
+    assert "spec file not found" in result.output
+
+
+def test_dab_run_loads_duckdb(tmp_path):
+    """architect dab run creates and loads tables in a DuckDB file."""
+    duckdb = pytest.importorskip("duckdb")
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_KNOT_SPEC)
+    database = tmp_path / "dab.duckdb"
+    with duckdb.connect(str(database)) as connection:
+        connection.execute(
+            "CREATE TABLE stg_GEN_Gender AS SELECT 1 AS GEN_ID, 'F' AS GEN_Gender, "
+            "CURRENT_TIMESTAMP AS metadata_recorded_at"
+        )
+
+    result = runner.invoke(
+        app, ["dab", "run", str(spec_path), "--database", str(database)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "GEN_Gender.sql[0]" in result.output
+    assert "GEN_Gender_load.sql[0]" in result.output
+    assert "✓ Ran 2 objects" in result.output
+
+    with duckdb.connect(str(database)) as connection:
+        rows = connection.execute("SELECT GEN_ID, GEN_Gender FROM GEN_Gender")
+        assert rows.fetchall() == [(1, "F")]
+
+
+def test_dab_run_reports_failures(tmp_path):
+    """architect dab run exits 1 and names the failing file."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_KNOT_SPEC)
+
+    result = runner.invoke(app, ["dab", "run", str(spec_path), "--engine", "sqlite"])
+    assert result.exit_code == 1
+    assert "Error: GEN_Gender_load.sql" in result.output
+    assert (tmp_path / "dab.db").exists()
+
+
+def test_dab_run_help():
+    """architect dab run --help shows all options."""
+    result = runner.invoke(app, ["dab", "run", "--help"])
+    assert result.exit_code == 0
+    assert "--jobs" in result.output
+    assert "--retries" in result.output
+    assert "--fail-fast" in result.output
+    assert "--engine" in result.output
+
+
+def test_dab_migrate_writes_script(tmp_path):
+    """architect dab migrate writes the ALTER script for a widened knot."""
+    old_path = tmp_path / "old.yaml"
+    old_path.write_text(_KNOT_SPEC)
+    new_path = tmp_path / "new.yaml"
+    new_path.write_text(_KNOT_SPEC.replace("varchar(42)", "varchar(100)"))
+
+    result = runner.invoke(app, ["dab", "migrate", str(old_path), str(new_path)])
+    assert result.exit_code == 0, result.output
+    assert "Migrated 1 objects" in result.output
+
+    script = (tmp_path / "output" / "migrate.sql").read_text()
+    assert script.startswith("-- GEN_Gender.sql\n")
+    assert "ALTER COLUMN GEN_Gender SET DATA TYPE VARCHAR(100);" in script
+
+
+def test_dab_migrate_no_changes(tmp_path):
+    """architect dab migrate reports identical specs without writing."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_KNOT_SPEC)
+
+    result = runner.invoke(app, ["dab", "migrate", str(spec_path), str(spec_path)])
+    assert result.exit_code == 0
+    assert "No schema changes" in result.output
+    assert not (tmp_path / "output").exists()
+
+
+def test_dab_migrate_rejects_narrowing(tmp_path):
+    """architect dab migrate exits 1 on changes that cannot run in place."""
+    old_path = tmp_path / "old.yaml"
+    old_path.write_text(_KNOT_SPEC)
+    new_path = tmp_path / "new.yaml"
+    new_path.write_text(_KNOT_SPEC.replace("varchar(42)", "varchar(5)"))
+
+    result = runner.invoke(app, ["dab", "migrate", str(old_path), str(new_path)])
+    assert result.exit_code == 1
+    assert "Cannot migrate in place" in result.output
+
+
+def test_dab_migrate_missing_spec(tmp_path):
+    """architect dab migrate with a missing spec exits with an error."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_KNOT_SPEC)
+
+    result = runner.invoke(
+        app, ["dab", "migrate", str(spec_path), str(tmp_path / "missing.yaml")]
+    )
+    assert result.exit_code == 1
+    assert "spec file not found" in result.output
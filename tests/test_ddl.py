@@ -2,17 +2,24 @@
 
 from pathlib import Path
 
+import pytest
 import sqlglot.expressions as sge
 
 from data_architect.generation.columns import (
     build_bitemporal_columns,
+    build_column_type,
     build_keyset_column,
     build_metadata_columns,
+    watermark_columns,
 )
 from data_architect.generation.ddl import (
     build_anchor_table,
     build_attribute_table,
     build_knot_table,
+    build_load_control_table,
+    build_nexus_table,
+    build_role_indexes,
+    build_sequence,
     build_staging_table,
     build_tie_table,
     generate_all_ddl,
@@ -26,7 +33,7 @@ from data_architect.generation.naming import (
 )
 from data_architect.models.anchor import Anchor, Attribute
 from data_architect.models.knot import Knot
-from data_architect.models.spec import Spec
+from data_architect.models.spec import Nexus, Spec
 from data_architect.models.tie import Role, Tie
 from data_architect.validation.loader import load_spec
 
@@ -91,6 +98,25 @@ def test_bitemporal_columns_snowflake_types() -> None:
         assert "TIMESTAMP" in sql.upper()
 
 
+@pytest.mark.parametrize(
+    ("dialect", "expected"),
+    [
+        ("postgres", "MONEY"),
+        ("duckdb", "DECIMAL(19, 4)"),
+        ("snowflake", "DECIMAL(19, 4)"),
+    ],
+)
+def test_build_column_type_maps_money(dialect: str, expected: str) -> None:
+    """money is kept where the dialect has it, else becomes DECIMAL(19, 4)."""
+    assert build_column_type("money", dialect).sql(dialect=dialect) == expected
+
+
+def test_build_column_type_rejects_unparseable_type() -> None:
+    """Types a dialect cannot express raise ValueError, not a parser error."""
+    with pytest.raises(ValueError, match="'varchar\\(' is not supported in duckdb"):
+        build_column_type("varchar(", "duckdb")
+
+
 # --- Naming Convention Tests ---
 
 
@@ -266,6 +292,31 @@ def test_build_attribute_table_static_no_bitemporal() -> None:
     assert sql.count("recorded_at") == 1  # Only in metadata_recorded_at
 
 
+def test_build_attribute_table_static_pk_on_anchor_fk() -> None:
+    """Verify static attribute is keyed by the anchor FK alone."""
+    anchor = Anchor(mnemonic="CU", descriptor="Customer", identity="bigint")
+    attribute = Attribute(mnemonic="COU", descriptor="Country", data_range="char(2)")
+    create_stmt = build_attribute_table(anchor, attribute, "postgres")
+
+    sql = create_stmt.sql(dialect="postgres")
+    assert "PRIMARY KEY (CU_ID)" in sql
+
+
+def test_build_attribute_table_historized_pk_includes_changed_at() -> None:
+    """Verify historized attribute is keyed by anchor FK and changed_at."""
+    anchor = Anchor(mnemonic="CU", descriptor="Customer", identity="bigint")
+    attribute = Attribute(
+        mnemonic="NAM",
+        descriptor="Name",
+        data_range="varchar(100)",
+        time_range="datetime",
+    )
+
+    for dialect in ["postgres", "tsql", "snowflake"]:
+        sql = build_attribute_table(anchor, attribute, dialect).sql(dialect=dialect)
+        assert "PRIMARY KEY (CU_ID, changed_at)" in sql
+
+
 # --- Knot DDL Tests ---
 
 
@@ -282,6 +333,16 @@ def test_build_knot_table_has_identity_and_value() -> None:
     assert "GEN_Gender" in sql
 
 
+def test_build_knot_table_value_is_unique() -> None:
+    """Knot values are unique, so loads can resolve IDs by value."""
+    knot = Knot(
+        mnemonic="GEN", descriptor="Gender", identity="int", data_range="varchar(42)"
+    )
+    sql = build_knot_table(knot, "postgres").sql(dialect="postgres")
+
+    assert "GEN_Gender VARCHAR(42) UNIQUE" in sql
+
+
 def test_build_knot_table_has_metadata() -> None:
     """Verify knot table includes metadata columns."""
     knot = Knot(
@@ -349,6 +410,56 @@ def test_build_tie_table_static_no_bitemporal() -> None:
     assert sql.count("recorded_at") == 1  # Only in metadata_recorded_at
 
 
+def test_foreign_keys_take_referenced_identity_types() -> None:
+    """Role and knot FK columns match the identity they reference."""
+    spec = Spec(
+        anchors=[
+            Anchor(mnemonic="CU", descriptor="Customer", identity="varchar(5)"),
+            Anchor(
+                mnemonic="OR",
+                descriptor="Order",
+                identity="int",
+                attributes=[
+                    Attribute(mnemonic="STA", descriptor="Status", knot_range="STA")
+                ],
+            ),
+        ],
+        knots=[
+            Knot(
+                mnemonic="STA",
+                descriptor="Status",
+                identity="smallint",
+                data_range="varchar(10)",
+            )
+        ],
+        ties=[
+            Tie(
+                roles=[
+                    Role(role="placed", type_="OR", identifier=True),
+                    Role(role="by", type_="CU", identifier=True),
+                ]
+            )
+        ],
+        nexuses=[
+            Nexus(
+                mnemonic="EV",
+                descriptor="Event",
+                identity="bigint",
+                roles=[Role(role="host", type_="CU", identifier=True)],
+            )
+        ],
+    )
+    ddl = generate_all_ddl(spec, "postgres")
+
+    assert "CU_ID_by VARCHAR(5)" in ddl["CU_OR_by_placed.sql"]
+    assert "OR_ID_placed INT," in ddl["CU_OR_by_placed.sql"]
+    assert "STA_ID SMALLINT" in ddl["OR_STA_Order_Status.sql"]
+    assert "CU_ID_host VARCHAR(5) NOT NULL" in ddl["EV_Event.sql"]
+    # Without identities (or for unknown entities), FK columns are BIGINT
+    tie_sql = build_tie_table(spec.ties[0], "postgres").sql(dialect="postgres")
+    assert "CU_ID_by BIGINT" in tie_sql
+
+
 # --- Staging DDL Tests ---
 
 
@@ -555,6 +666,24 @@ def test_build_keyset_column_multi_dialect() -> None:
             assert "PERSISTED" in sql or "persisted" in sql.lower()
 
 
+def test_build_keyset_column_duckdb_is_virtual() -> None:
+    """DuckDB has no stored generated columns, so the keyset is virtual."""
+    from data_architect.models.staging import StagingMapping
+
+    anchor = Anchor(mnemonic="CU", descriptor="Customer", identity="bigint")
+    mapping = StagingMapping(
+        system="ERP",
+        tenant="ACME",
+        table="stg_customers",
+        natural_key_columns=["CustomerID"],
+    )
+
+    sql = build_keyset_column(anchor, mapping, "duckdb").sql(dialect="duckdb")
+
+    assert sql.startswith("keyset_id TEXT AS (CASE WHEN CustomerID IS NULL")
+    assert "STORED" not in sql
+
+
 def test_build_staging_table_with_keyset_column() -> None:
     """Verify keyset_id column when anchor+mapping provided."""
     from data_architect.models.staging import StagingColumn, StagingMapping
@@ -623,3 +752,423 @@ def test_generate_all_ddl_staging_has_keyset_column() -> None:
         "GENERATED ALWAYS AS" in staging_sql
         or "generated always as" in staging_sql.lower()
     )
+
+
+# ============================================================================
+# Load-Control Table Tests
+# ============================================================================
+
+
+def _incremental_anchor(watermark_type: str = "timestamp") -> Anchor:
+    """Anchor with a staging mapping that loads incrementally."""
+    from data_architect.models.staging import StagingColumn, StagingMapping
+
+    return Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                columns=[
+                    StagingColumn(name="customer_id", type="bigint"),
+                    StagingColumn(name="loaded_at", type=watermark_type),
+                ],
+                watermark_column="loaded_at",
+            )
+        ],
+    )
+
+
+def test_build_load_control_table_keyed_by_target_and_source() -> None:
+    """Load-control table has one row per (target, staging) pair."""
+    sql = build_load_control_table("postgres").sql(dialect="postgres")
+
+    assert "CREATE TABLE IF NOT EXISTS dab_load_control" in sql
+    assert "PRIMARY KEY (target_table, source_table)" in sql
+    assert "low_watermark_ts TIMESTAMPTZ" in sql
+    assert "high_watermark_id BIGINT" in sql
+
+
+def test_generate_all_ddl_includes_load_control_for_incremental_mapping() -> None:
+    """The load-control table is generated only when a mapping is incremental."""
+    with_watermark = generate_all_ddl(Spec(anchors=[_incremental_anchor()]), "tsql")
+    without = generate_all_ddl(
+        Spec(anchors=[Anchor(mnemonic="CU", descriptor="Customer", identity="int")]),
+        "tsql",
+    )
+
+    assert "dab_load_control.sql" in with_watermark
+    assert "dab_load_control.sql" not in without
+
+
+def test_watermark_columns_follow_watermark_type() -> None:
+    """Timestamp watermarks use the *_ts pair, batch ids the *_id pair."""
+    ts_mapping = _incremental_anchor("timestamp").staging_mappings[0]
+    id_mapping = _incremental_anchor("bigint").staging_mappings[0]
+
+    assert watermark_columns(ts_mapping) == ("low_watermark_ts", "high_watermark_ts")
+    assert watermark_columns(id_mapping) == ("low_watermark_id", "high_watermark_id")
+
+
+# ============================================================================
+# File-Backed Staging Tests
+# ============================================================================
+
+
+def _file_anchor(
+    path: str = "landing/customers/*.csv",
+    file_format: str = "csv",
+    options: dict[str, str | int | bool] | None = None,
+) -> Anchor:
+    """Anchor whose staging mapping reads source files in place."""
+    from data_architect.models.staging import (
+        StagingColumn,
+        StagingMapping,
+        StagingSource,
+    )
+
+    return Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                columns=[
+                    StagingColumn(name="customer_id", type="varchar(20)"),
+                    StagingColumn(name="CU_ID", type="bigint"),
+                ],
+                source=StagingSource(
+                    path=path, format=file_format, options=options or {}
+                ),
+            )
+        ],
+    )
+
+
+def test_build_staging_table_duckdb_file_source_is_view() -> None:
+    """On DuckDB a file source becomes a view over read_csv."""
+    ddl = generate_all_ddl(
+        Spec(anchors=[_file_anchor(options={"header": True})]), "duckdb"
+    )
+    sql = ddl["stg_customers.sql"]
+
+    assert "stg_customers_files.sql" not in ddl
+    assert sql.startswith("CREATE OR REPLACE VIEW stg_customers AS")
+    assert "CAST(customer_id AS TEXT) AS customer_id" in sql
+    assert "END AS keyset_id" in sql
+    assert "filename AS source_file" in sql
+    assert "source_file AS metadata_id" in sql
+    assert (
+        "FROM READ_CSV('landing/customers/*.csv', filename = TRUE, header = TRUE)"
+        in sql
+    )
+
+
+def test_build_staging_table_postgres_file_source_uses_file_fdw() -> None:
+    """Postgres reads a CSV file through a file_fdw foreign table."""
+    anchor = _file_anchor("/data/customers.csv", options={"header": True})
+    ddl = generate_all_ddl(Spec(anchors=[anchor]), "postgres")
+    statements = ddl["stg_customers_files.sql"].split(";\n\n")
+
+    assert statements[0] == "CREATE EXTENSION IF NOT EXISTS file_fdw"
+    assert statements[1] == (
+        "CREATE SERVER IF NOT EXISTS dab_files FOREIGN DATA WRAPPER file_fdw"
+    )
+    assert statements[2] == (
+        "CREATE FOREIGN TABLE IF NOT EXISTS stg_customers_files (\n"
+        "  customer_id VARCHAR(20),\n"
+        "  CU_ID BIGINT\n"
+        ")\n"
+        "SERVER dab_files OPTIONS "
+        "(filename '/data/customers.csv', format 'csv', header 'true');"
+    )
+    view = ddl["stg_customers.sql"]
+    assert view.startswith("CREATE OR REPLACE VIEW stg_customers AS")
+    assert "FROM stg_customers_files" in view
+    assert "GENERATED" not in view
+
+
+def test_build_staging_table_snowflake_file_source_uses_external_table() -> None:
+    """Snowflake reads a stage location through an external table."""
+    anchor = _file_anchor("@landing/customers/", options={"SKIP_HEADER": 1})
+    ddl = generate_all_ddl(Spec(anchors=[anchor]), "snowflake")
+
+    assert ddl["stg_customers_files.sql"] == (
+        "CREATE EXTERNAL TABLE IF NOT EXISTS stg_customers_files (\n"
+        "  customer_id VARCHAR(20) AS (CAST(VALUE:c1 AS VARCHAR(20))),\n"
+        "  CU_ID BIGINT AS (CAST(VALUE:c2 AS BIGINT))\n"
+        ")\n"
+        "LOCATION = @landing/customers/\n"
+        "FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = 1)"
+    )
+    assert "METADATA$FILENAME AS source_file" in ddl["stg_customers.sql"]
+
+
+def test_build_staging_table_snowflake_parquet_fields_by_name() -> None:
+    """Parquet fields are extracted by column name."""
+    anchor = _file_anchor("@landing/customers/", "parquet")
+    sql = generate_all_ddl(Spec(anchors=[anchor]), "snowflake")[
+        "stg_customers_files.sql"
+    ]
+
+    assert 'CU_ID BIGINT AS (CAST(VALUE:"CU_ID" AS BIGINT))' in sql
+    assert "FILE_FORMAT = (TYPE = 'PARQUET')" in sql
+
+
+def test_build_staging_table_tsql_file_source_uses_openrowset() -> None:
+    """T-SQL reads the files with OPENROWSET in the staging view."""
+    anchor = _file_anchor(options={"DATA_SOURCE": "lake", "FIRSTROW": 2})
+    ddl = generate_all_ddl(Spec(anchors=[anchor]), "tsql")
+    sql = ddl["stg_customers.sql"]
+
+    assert "stg_customers_files.sql" not in ddl
+    assert sql.startswith("CREATE OR ALTER VIEW stg_customers AS")
+    assert (
+        "FROM OPENROWSET(BULK 'landing/customers/*.csv', FORMAT = 'CSV', "
+        "DATA_SOURCE = 'lake', FIRSTROW = 2) "
+        "WITH (customer_id VARCHAR(20), CU_ID BIGINT) AS files"
+    ) in sql
+
+
+def test_build_external_table_rejects_unreadable_sources() -> None:
+    """Sources the dialect's external table cannot read raise a ValueError."""
+    with pytest.raises(ValueError, match="file_fdw reads csv sources only"):
+        generate_all_ddl(
+            Spec(anchors=[_file_anchor("/data/c.parquet", "parquet")]), "postgres"
+        )
+    with pytest.raises(ValueError, match="stage locations"):
+        generate_all_ddl(Spec(anchors=[_file_anchor()]), "snowflake")
+
+
+# ============================================================================
+# CDC Source Tests
+# ============================================================================
+
+
+def _cdc_anchor() -> Anchor:
+    """Anchor whose staging mapping reads a captured source table."""
+    from data_architect.models.staging import CdcSource, StagingMapping
+
+    return Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                cdc=CdcSource(table="sales.customers"),
+            )
+        ],
+    )
+
+
+def test_generate_all_ddl_snowflake_cdc_creates_stream() -> None:
+    """On Snowflake the staging table is a stream on the source table."""
+    ddl = generate_all_ddl(Spec(anchors=[_cdc_anchor()]), "snowflake")
+
+    assert ddl["stg_customers.sql"] == (
+        "CREATE STREAM IF NOT EXISTS stg_customers ON TABLE sales.customers "
+        "SHOW_INITIAL_ROWS = TRUE"
+    )
+    assert "dab_load_control.sql" not in ddl
+
+
+def test_generate_all_ddl_tsql_cdc_enables_capture() -> None:
+    """On SQL Server capture is enabled and the load window is tracked."""
+    ddl = generate_all_ddl(Spec(anchors=[_cdc_anchor()]), "tsql")
+    sql = ddl["stg_customers.sql"]
+
+    assert "capture_instance = 'sales_customers'" in sql
+    assert "EXEC sys.sp_cdc_enable_table @source_schema = N'sales'" in sql
+    assert "@source_name = N'customers'" in sql
+    assert "dab_load_control.sql" in ddl
+
+
+def test_generate_all_ddl_cdc_rejects_other_dialects() -> None:
+    """Dialects without a change feed raise a ValueError."""
+    with pytest.raises(ValueError, match="CDC sources require snowflake or tsql"):
+        generate_all_ddl(Spec(anchors=[_cdc_anchor()]), "postgres")
+
+
+# ============================================================================
+# Tie Staging Tests
+# ============================================================================
+
+
+def _keyed_tie_spec() -> Spec:
+    """Tie staging orders by customer number."""
+    from data_architect.models.staging import (
+        StagingColumn,
+        StagingMapping,
+        TieStagingMapping,
+    )
+
+    customer = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+            )
+        ],
+    )
+    order = Anchor(mnemonic="OR", descriptor="Order", identity="bigint")
+    tie = Tie(
+        roles=[Role(type_="CU", role="customer"), Role(type_="OR", role="order")],
+        staging_mappings=[
+            TieStagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_orders",
+                natural_key_columns={"customer": ["customer_id"]},
+                columns=[
+                    StagingColumn(name="customer_id", type="varchar(20)"),
+                    StagingColumn(name="OR_ID_order", type="bigint"),
+                ],
+            )
+        ],
+    )
+    return Spec(anchors=[customer, order], ties=[tie])
+
+
+def test_generate_all_ddl_indexes_keyset_resolved_anchors() -> None:
+    """Anchors joined on their keysets by tie loads index metadata_id."""
+    ddl = generate_all_ddl(_keyed_tie_spec(), "postgres")
+
+    assert ddl["CU_Customer.sql"].endswith(
+        ";\n\nCREATE INDEX IF NOT EXISTS CU_Customer_metadata_id "
+        "ON CU_Customer(metadata_id);"
+    )
+    assert "INDEX" not in ddl["OR_Order.sql"]
+    assert (
+        "INDEX"
+        not in generate_all_ddl(_keyed_tie_spec(), "snowflake")["CU_Customer.sql"]
+    )
+
+
+def test_generate_all_ddl_creates_tie_staging_without_keyset() -> None:
+    """Tie staging tables hold their declared columns and metadata only."""
+    sql = generate_all_ddl(_keyed_tie_spec(), "postgres")["stg_orders.sql"]
+
+    assert sql.startswith("CREATE TABLE IF NOT EXISTS stg_orders")
+    assert "OR_ID_order BIGINT" in sql
+    assert "keyset_id" not in sql
+
+
+# ============================================================================
+# Key Map Tests
+# ============================================================================
+
+
+def test_generate_all_ddl_creates_keymap_tables() -> None:
+    """Key-mapped anchors get a key map keyed by keyset."""
+    spec = _keyed_tie_spec()
+    customer = spec.anchors[0].model_copy(update={"keymap": True})
+    spec = spec.model_copy(update={"anchors": [customer, spec.anchors[1]]})
+
+    ddl = generate_all_ddl(spec, "postgres")
+
+    assert ddl["CU_Customer_keymap.sql"].startswith(
+        "CREATE SEQUENCE IF NOT EXISTS CU_Customer_keymap_seq START WITH 1;\n\n"
+        "CREATE TABLE IF NOT EXISTS CU_Customer_keymap (\n"
+        "  keyset_id VARCHAR(500) NOT NULL PRIMARY KEY,\n"
+        "  CU_ID BIGINT NOT NULL UNIQUE,"
+    )
+    # Tie loads look the keyset up in the key map, not in metadata_id
+    assert "INDEX" not in ddl["CU_Customer.sql"]
+    assert "OR_Order_keymap.sql" not in ddl
+
+
+def test_build_sequence_is_idempotent_on_tsql() -> None:
+    """SQL Server creates a sequence only if it is missing."""
+    sql = build_sequence("CU_Customer_keymap_seq", "tsql").sql(dialect="tsql")
+
+    assert sql == (
+        "IF NOT EXISTS (SELECT 1 FROM sys.sequences "
+        "WHERE name = 'CU_Customer_keymap_seq')\n"
+        "EXEC('CREATE SEQUENCE CU_Customer_keymap_seq AS BIGINT START WITH 1')"
+    )
+
+
+# ============================================================================
+# Nexus Tests
+# ============================================================================
+
+
+def _nexus() -> Nexus:
+    return Nexus(
+        mnemonic="EV",
+        descriptor="Event",
+        identity="bigint",
+        attributes=[
+            Attribute(mnemonic="NAM", descriptor="Name", data_range="varchar(40)")
+        ],
+        roles=[
+            Role(type_="CU", role="host", identifier=True),
+            Role(type_="VE", role="at"),
+        ],
+    )
+
+
+def test_nexus_table_has_identity_and_role_columns() -> None:
+    """Nexus rows carry their identity and a column per role."""
+    sql = build_nexus_table(_nexus(), "postgres").sql(dialect="postgres")
+
+    assert sql.startswith(
+        "CREATE TABLE IF NOT EXISTS EV_Event (EV_ID BIGINT PRIMARY KEY, "
+        "CU_ID_host BIGINT NOT NULL, VE_ID_at BIGINT, metadata_recorded_at"
+    )
+
+
+def test_role_indexes_cover_each_role_column() -> None:
+    """Every role column gets an index for lookups from its anchor."""
+    indexes = [
+        i.sql(dialect="postgres") for i in build_role_indexes(_nexus(), "postgres")
+    ]
+
+    assert indexes == [
+        "CREATE INDEX IF NOT EXISTS EV_Event_CU_ID_host ON EV_Event(CU_ID_host)",
+        "CREATE INDEX IF NOT EXISTS EV_Event_VE_ID_at ON EV_Event(VE_ID_at)",
+    ]
+    # T-SQL checks sys.indexes instead of IF NOT EXISTS
+    tsql = build_role_indexes(_nexus(), "tsql")[0].sql(dialect="tsql")
+    assert "name = 'EV_Event_CU_ID_host'" in tsql
+
+
+def test_generate_all_ddl_includes_nexuses() -> None:
+    """Nexus, role indexes and nexus attributes are generated."""
+    from data_architect.models.staging import StagingColumn, StagingMapping
+
+    mapping = StagingMapping(
+        system="ERP",
+        tenant="ACME",
+        table="stg_events",
+        natural_key_columns=["event_id"],
+        columns=[StagingColumn(name="event_id", type="varchar(20)")],
+    )
+    spec = Spec(nexuses=[_nexus().model_copy(update={"staging_mappings": [mapping]})])
+
+    ddl = generate_all_ddl(spec, "duckdb")
+    assert "CREATE INDEX IF NOT EXISTS EV_Event_VE_ID_at" in ddl["EV_Event.sql"]
+    assert ddl["EV_NAM_Event_Name.sql"].startswith(
+        "CREATE TABLE IF NOT EXISTS EV_NAM_Event_Name"
+    )
+    assert "Event@ERP~ACME|" in ddl["stg_events.sql"]
+
+    # Snowflake has no secondary indexes
+    assert "INDEX" not in generate_all_ddl(spec, "snowflake")["EV_Event.sql"]
@@ -0,0 +1,381 @@
+"""Tests for the dependency graph of generated objects."""
+
+import pytest
+
+from data_architect.generation.ddl import generate_all_ddl
+from data_architect.generation.dependencies import (
+    build_asset_dependencies,
+    build_dependency_graph,
+    file_node,
+    topological_waves,
+)
+from data_architect.generation.dml import generate_all_dml
+from data_architect.generation.naming import LOAD_CONTROL_TABLE
+from data_architect.generation.views import generate_all_views
+from data_architect.models.anchor import Anchor, Attribute, Materialization
+from data_architect.models.knot import Knot
+from data_architect.models.spec import Spec
+from data_architect.models.staging import (
+    StagingColumn,
+    StagingMapping,
+    StagingSource,
+)
+from data_architect.models.tie import Role, Tie
+
+
+def _spec() -> Spec:
+    customer = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(40)",
+                time_range="datetime",
+            ),
+            Attribute(mnemonic="GEN", descriptor="Gender", knot_range="GEN"),
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+            )
+        ],
+    )
+    order = Anchor(mnemonic="OR", descriptor="Order", identity="bigint")
+    gender = Knot(
+        mnemonic="GEN", descriptor="Gender", identity="int", data_range="varchar(10)"
+    )
+    tie = Tie(roles=[Role(type_="CU", role="customer"), Role(type_="OR", role="order")])
+    return Spec(anchors=[customer, order], knots=[gender], ties=[tie])
+
+
+# ============================================================================
+# Dependency Graph Tests
+# ============================================================================
+
+
+def test_graph_roots_have_no_dependencies():
+    """Knots, anchors and staging tables depend on nothing."""
+    graph = build_dependency_graph(_spec())
+    assert graph["GEN_Gender"] == set()
+    assert graph["CU_Customer"] == set()
+    assert graph["OR_Order"] == set()
+    assert graph["stg_customers"] == set()
+
+
+def test_graph_attributes_depend_on_anchor_and_knot():
+    """Attributes require their anchor and, when knotted, their knot."""
+    graph = build_dependency_graph(_spec())
+    assert graph["CU_NAM_Customer_Name"] == {"CU_Customer"}
+    assert graph["CU_GEN_Customer_Gender"] == {"CU_Customer", "GEN_Gender"}
+
+
+def test_graph_tie_depends_on_role_anchors():
+    """A tie requires the anchors of its roles."""
+    graph = build_dependency_graph(_spec())
+    assert graph["CU_OR_customer_order"] == {"CU_Customer", "OR_Order"}
+
+
+def test_graph_perspectives_depend_on_attributes():
+    """Latest, point-in-time and difference perspectives require all joins."""
+    graph = build_dependency_graph(_spec())
+    expected = {
+        "CU_Customer",
+        "CU_NAM_Customer_Name",
+        "CU_GEN_Customer_Gender",
+        "GEN_Gender",
+    }
+    assert graph["lCU_Customer"] == expected
+    assert graph["pCU_Customer"] == expected
+    assert graph["dCU_Customer"] == expected
+    assert "pOR_Order" not in graph
+
+
+def test_graph_includes_load_control_for_watermarks():
+    """The load control table is a node only when a mapping has a watermark."""
+    assert LOAD_CONTROL_TABLE not in build_dependency_graph(_spec())
+
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                watermark_column="changed_at",
+            )
+        ],
+    )
+    graph = build_dependency_graph(Spec(anchors=[anchor]))
+    assert graph[LOAD_CONTROL_TABLE] == set()
+
+
+def test_graph_file_staging_reads_external_table():
+    """A file-backed staging view depends on its external table."""
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                source=StagingSource(path="/data/customers.csv", format="csv"),
+            )
+        ],
+    )
+    graph = build_dependency_graph(Spec(anchors=[anchor]))
+    assert graph["stg_customers"] == {"stg_customers_files"}
+    assert graph["stg_customers_files"] == set()
+
+
+# ============================================================================
+# Topological Wave Tests
+# ============================================================================
+
+
+def test_waves_order_dependencies_first():
+    """Each object lands in the first wave after its dependencies."""
+    waves = topological_waves(build_dependency_graph(_spec()))
+    assert waves[0] == ["CU_Customer", "GEN_Gender", "OR_Order", "stg_customers"]
+    assert waves[1] == [
+        "CU_GEN_Customer_Gender",
+        "CU_NAM_Customer_Name",
+        "CU_OR_customer_order",
+        "lOR_Order",
+    ]
+    assert waves[2] == ["dCU_Customer", "lCU_Customer", "pCU_Customer"]
+
+
+def test_waves_ignore_unknown_dependencies():
+    """Dependencies outside the graph do not block a node."""
+    assert topological_waves({"a": {"missing"}, "b": {"a"}}) == [["a"], ["b"]]
+
+
+def test_waves_detect_cycles():
+    """A cycle raises a ValueError naming the nodes involved."""
+    with pytest.raises(ValueError, match="Dependency cycle between: a, b"):
+        topological_waves({"a": {"b"}, "b": {"a"}, "c": set()})
+
+
+# ============================================================================
+# File Node Tests
+# ============================================================================
+
+
+def test_file_node_resolves_ddl_and_load_files():
+    """DDL, load and per-source load files map to their object."""
+    graph = build_dependency_graph(_spec())
+    assert file_node("CU_Customer.sql", graph) == "CU_Customer"
+    assert file_node("CU_Customer_load.sql", graph) == "CU_Customer"
+    assert file_node("CU_Customer_load_erp.sql", graph) == "CU_Customer"
+    assert file_node("stg_customers_load.sql", graph) == "stg_customers"
+
+
+def test_file_node_resolves_refresh_scripts():
+    """Refresh scripts of materialized anchors run after the loads they read."""
+    anchor = _spec().anchors[0].model_copy(update={"materialize": Materialization()})
+    spec = Spec(anchors=[anchor], knots=_spec().knots)
+    graph = build_dependency_graph(spec)
+
+    assert file_node("mCU_Customer_refresh.sql", graph) == "mCU_Customer"
+    depends = build_asset_dependencies(spec, _files(spec))
+    assert "CU_NAM_Customer_Name_load" in depends["mCU_Customer_refresh"]
+
+
+def test_file_node_falls_back_to_stem():
+    """A file matching no object is its own node."""
+    assert file_node("extra.sql", {}) == "extra"
+
+
+# ============================================================================
+# Asset Dependency Tests
+# ============================================================================
+
+
+def _files(spec: Spec, **kwargs) -> list[str]:
+    return [
+        *generate_all_ddl(spec, "postgres"),
+        *generate_all_views(spec, "postgres"),
+        *generate_all_dml(spec, "postgres", **kwargs),
+    ]
+
+
+def _multi_source_spec() -> Spec:
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(mnemonic="NAM", descriptor="Name", data_range="varchar(40)")
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_erp",
+                natural_key_columns=["id"],
+                priority=1,
+            ),
+            StagingMapping(
+                system="CRM",
+                tenant="ACME",
+                table="stg_crm",
+                natural_key_columns=["id"],
+                priority=2,
+                columns=[StagingColumn(name="changed_at", type="timestamp")],
+                watermark_column="changed_at",
+            ),
+        ],
+    )
+    return Spec(anchors=[anchor])
+
+
+def test_asset_dependencies_ddl_follow_graph():
+    """DDL assets depend on the DDL of the objects they reference."""
+    spec = _spec()
+    depends = build_asset_dependencies(spec, _files(spec))
+    assert depends["CU_Customer"] == []
+    assert depends["CU_GEN_Customer_Gender"] == ["CU_Customer", "GEN_Gender"]
+    assert "CU_NAM_Customer_Name" in depends["lCU_Customer"]
+
+
+def test_asset_dependencies_loads_follow_ddl_and_upstream_loads():
+    """A load requires its DDL, staging DDL and the loads of its dependencies."""
+    spec = _spec()
+    depends = build_asset_dependencies(spec, _files(spec))
+    assert depends["CU_GEN_Customer_Gender_load"] == [
+        "CU_Customer",
+        "CU_Customer_load",
+        "CU_GEN_Customer_Gender",
+        "GEN_Gender",
+        "GEN_Gender_load",
+        "stg_customers",
+    ]
+    assert depends["CU_OR_customer_order_load"] == [
+        "CU_Customer",
+        "CU_Customer_load",
+        "CU_OR_customer_order",
+        "OR_Order",
+        "OR_Order_load",
+    ]
+
+
+def test_asset_dependencies_chain_per_source_loads():
+    """Per-source loads of one table run in priority order."""
+    spec = _multi_source_spec()
+    depends = build_asset_dependencies(spec, _files(spec))
+    assert "CU_Customer_load_erp" in depends["CU_Customer_load_crm"]
+    assert LOAD_CONTROL_TABLE in depends["CU_Customer_load_crm"]
+    assert {"CU_Customer_load_erp", "CU_Customer_load_crm"} <= set(
+        depends["CU_NAM_Customer_Name_load_erp"]
+    )
+
+
+def test_asset_dependencies_fanout_scripts():
+    """A fan-out script follows the DDL of every table it loads."""
+    spec = _multi_source_spec()
+    depends = build_asset_dependencies(spec, _files(spec, fanout=True))
+    assert depends["stg_crm_load"] == [
+        "CU_Customer",
+        "CU_NAM_Customer_Name",
+        LOAD_CONTROL_TABLE,
+        "stg_crm",
+        "stg_erp",
+    ]
+    assert "stg_crm_load" in depends["stg_erp_load"]
+
+
+def test_asset_dependencies_knot_reads_staged_values():
+    """A knot loaded from staged values follows the staging DDL."""
+    spec = _spec()
+    mapping = (
+        spec.anchors[0]
+        .staging_mappings[0]
+        .model_copy(update={"knot_values": {"GEN": "gender"}})
+    )
+    anchor = spec.anchors[0].model_copy(update={"staging_mappings": [mapping]})
+    spec = spec.model_copy(update={"anchors": [anchor, *spec.anchors[1:]]})
+
+    depends = build_asset_dependencies(spec, _files(spec))
+    assert depends["GEN_Gender_load"] == ["GEN_Gender", "stg_customers"]
+    assert "GEN_Gender_load" in depends["CU_GEN_Customer_Gender_load"]
+
+
+def test_asset_dependencies_are_acyclic():
+    """Asset lineage orders into waves for every generation mode."""
+    spec = _multi_source_spec()
+    for kwargs in ({}, {"consolidate": True}, {"fanout": True}):
+        assert topological_waves(build_asset_dependencies(spec, _files(spec, **kwargs)))
+
+
+def test_asset_dependencies_tie_reads_its_staging():
+    """A tie with a staging mapping loads after its staging DDL."""
+    from data_architect.models.staging import TieStagingMapping
+
+    spec = _spec()
+    mapping = TieStagingMapping(
+        system="ERP",
+        tenant="ACME",
+        table="stg_orders",
+        natural_key_columns={"customer": ["customer_id"]},
+    )
+    tie = spec.ties[0].model_copy(update={"staging_mappings": [mapping]})
+    spec = spec.model_copy(update={"ties": [tie]})
+
+    assert build_dependency_graph(spec)["stg_orders"] == set()
+    depends = build_asset_dependencies(spec, _files(spec))
+    assert "stg_orders" in depends["CU_OR_customer_order_load"]
+    assert "CU_Customer_load" in depends["CU_OR_customer_order_load"]
+
+
+def test_keymap_runs_before_anchor_loads():
+    """Anchors require their key map; its load reads staging first."""
+    spec = _spec()
+    anchor = spec.anchors[0].model_copy(update={"keymap": True})
+    spec = spec.model_copy(update={"anchors": [anchor, *spec.anchors[1:]]})
+
+    assert build_dependency_graph(spec)["CU_Customer"] == {"CU_Customer_keymap"}
+    depends = build_asset_dependencies(spec, _files(spec))
+    assert depends["CU_Customer_keymap_load"] == ["CU_Customer_keymap", "stg_customers"]
+    assert "CU_Customer_keymap_load" in depends["CU_Customer_load"]
+
+
+def test_nexus_depends_on_role_tables_and_staging():
+    """Nexuses follow their role anchors; their loads read their staging."""
+    from data_architect.models.spec import Nexus
+
+    spec = _spec()
+    nexus = Nexus(
+        mnemonic="EV",
+        descriptor="Event",
+        identity="bigint",
+        attributes=[Attribute(mnemonic="GEN", descriptor="Gender", knot_range="GEN")],
+        roles=[Role(type_="CU", role="host"), Role(type_="GEN", role="for")],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_events",
+                natural_key_columns=["event_id"],
+            )
+        ],
+    )
+    spec = spec.model_copy(update={"nexuses": [nexus]})
+
+    graph = build_dependency_graph(spec)
+    assert graph["EV_Event"] == {"CU_Customer", "GEN_Gender"}
+    assert graph["EV_GEN_Event_Gender"] == {"EV_Event", "GEN_Gender"}
+    depends = build_asset_dependencies(spec, _files(spec))
+    assert {"CU_Customer_load", "stg_events"} <= set(depends["EV_Event_load"])
+    assert "EV_Event_load" in depends["EV_GEN_Event_Gender_load"]
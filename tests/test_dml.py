@@ -1,19 +1,29 @@
 """Tests for DML/MERGE generation."""
 
+import pytest
 import sqlglot
 import sqlglot.expressions as sge
 
 from data_architect.generation.dml import (
+    allows_restatements,
     build_anchor_merge,
     build_attribute_merge,
+    build_cdc_load,
+    build_consolidated_anchor_merge,
+    build_consolidated_attribute_merge,
+    build_keymap_insert,
     build_knot_merge,
+    build_knot_value_insert,
+    build_nexus_merge,
+    build_staging_fanout,
     build_tie_merge,
+    build_watermark_advance,
     generate_all_dml,
 )
 from data_architect.generation.naming import staging_table_name
 from data_architect.models.anchor import Anchor, Attribute
 from data_architect.models.knot import Knot
-from data_architect.models.spec import Spec
+from data_architect.models.spec import Nexus, Spec
 from data_architect.models.tie import Role, Tie
 
 # ============================================================================
@@ -218,6 +228,107 @@ def test_build_knot_merge_has_value_column():
     assert "GE_Gender" in sql
 
 
+def _category_knot(identity: str = "int") -> Knot:
+    return Knot(
+        mnemonic="CAT", descriptor="Category", identity=identity, data_range="text"
+    )
+
+
+def _knot_value_anchor() -> Anchor:
+    """Anchor whose staging delivers category names rather than knot IDs."""
+    from data_architect.models.staging import StagingMapping
+
+    return Anchor(
+        mnemonic="PR",
+        descriptor="Product",
+        identity="bigint",
+        attributes=[Attribute(mnemonic="CAT", descriptor="Category", knot_range="CAT")],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_products",
+                natural_key_columns=["product_id"],
+                knot_values={"CAT": "category"},
+            )
+        ],
+    )
+
+
+def test_build_knot_value_insert_adds_missing_values():
+    """Missing staged values get IDs from the knot's sequence."""
+    sql = build_knot_value_insert(
+        _category_knot(), [("stg_a", "category"), ("stg_b", "cat")], "tsql"
+    ).sql(dialect="tsql")
+
+    assert sql.startswith("INSERT INTO CAT_Category (CAT_ID, CAT_Category, ")
+    assert (
+        "NEXT VALUE FOR CAT_Category_seq OVER (ORDER BY source.CAT_Category) AS CAT_ID"
+    ) in sql
+    assert "MAX(" not in sql
+    assert "FROM stg_a AS staged WHERE NOT staged.category IS NULL UNION" in sql
+    assert "FROM stg_b AS staged" in sql
+    assert (
+        "FROM CAT_Category AS knot WITH (UPDLOCK, HOLDLOCK) "
+        "WHERE knot.CAT_Category = source.CAT_Category"
+    ) in sql
+
+
+def test_build_knot_value_insert_single_source_adds_each_value_once():
+    """Without a UNION, repeated values of one source are made distinct."""
+    sql = build_knot_value_insert(
+        _category_knot(), [("stg_a", "category")], "postgres"
+    ).sql(dialect="postgres")
+
+    assert "NEXTVAL('CAT_Category_seq') AS CAT_ID" in sql
+    assert "SELECT DISTINCT staged.category AS CAT_Category FROM stg_a" in sql
+    assert sql.endswith("ON CONFLICT(CAT_Category) DO NOTHING")
+
+
+def test_build_knot_value_insert_requires_integer_identity():
+    """IDs can only be generated for integer knot identities."""
+    with pytest.raises(ValueError, match="integer identity, not char"):
+        build_knot_value_insert(_category_knot("char(3)"), [("s", "c")], "postgres")
+
+
+def test_build_attribute_merge_resolves_knot_values():
+    """Knot IDs are resolved with an equi-join on the knot value."""
+    anchor = _knot_value_anchor()
+    sql = build_attribute_merge(
+        anchor,
+        anchor.attributes[0],
+        "postgres",
+        anchor.staging_mappings[0],
+        [_category_knot()],
+    ).sql(dialect="postgres")
+
+    assert "source.resolved_knot_id AS CAT_ID" in sql
+    assert (
+        "INNER JOIN CAT_Category AS knot ON knot.CAT_Category = staged.category"
+    ) in sql
+
+
+def test_build_attribute_merge_knot_values_need_the_knot():
+    """Resolving knot values without the knot model is an error."""
+    anchor = _knot_value_anchor()
+    with pytest.raises(ValueError, match="knot 'CAT' is needed"):
+        build_attribute_merge(
+            anchor, anchor.attributes[0], "postgres", anchor.staging_mappings[0]
+        )
+
+
+def test_generate_all_dml_loads_knot_from_staged_values():
+    """A knot with staged values is loaded from staging, not stg_{knot}."""
+    spec = Spec(anchors=[_knot_value_anchor()], knots=[_category_knot()])
+
+    result = generate_all_dml(spec, "snowflake")
+
+    knot_sql = result["CAT_Category_load.sql"]
+    assert "FROM stg_products AS staged" in knot_sql
+    assert "stg_CAT_Category" not in knot_sql
+    assert "resolved_knot_id" in result["PR_CAT_Product_Category_load.sql"]
+
+
 # ============================================================================
 # Tie MERGE Tests
 # ============================================================================
@@ -276,6 +387,128 @@ def test_build_tie_merge_static_insert_ignore():
     assert "INSERT" in sql.upper()
 
 
+def _keyed_tie_spec() -> Spec:
+    """Tie staging orders by customer number and composite order key."""
+    from data_architect.models.staging import StagingMapping, TieStagingMapping
+
+    customer = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+            )
+        ],
+    )
+    order = Anchor(mnemonic="OR", descriptor="Order", identity="bigint")
+    tie = Tie(
+        roles=[
+            Role(type_="CU", role="customer"),
+            Role(type_="OR", role="order"),
+            Role(type_="CHA", role="channel"),
+        ],
+        staging_mappings=[
+            TieStagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_orders",
+                natural_key_columns={
+                    "customer": ["customer_id"],
+                    "order": ["order_no", "line"],
+                },
+            )
+        ],
+    )
+    return Spec(anchors=[customer, order], ties=[tie])
+
+
+def test_build_tie_merge_resolves_roles_from_natural_keys():
+    """Keyed roles join their anchor's recorded keyset in one statement."""
+    spec = _keyed_tie_spec()
+    tie = spec.ties[0]
+
+    sql = build_tie_merge(tie, "postgres", tie.staging_mappings[0], spec.anchors)
+    sql = sql.sql(dialect="postgres")
+
+    assert "FROM stg_orders AS staged" in sql
+    assert "'Customer@ERP~ACME|' || REPLACE(" in sql
+    assert "ELSE CAST(order_no AS TEXT) || ':' || CAST(line AS TEXT) END" in sql
+    assert (
+        "INNER JOIN CU_Customer AS anchor_customer "
+        "ON anchor_customer.metadata_id = staged.keyset_customer"
+    ) in sql
+    assert "anchor_order.OR_ID AS OR_ID_order" in sql
+    # Roles without natural keys still read resolved IDs from staging
+    assert "staged.CHA_ID_channel AS CHA_ID_channel" in sql
+    assert "stg_CHA_CU_OR" not in sql
+
+
+def test_build_tie_merge_resolves_multi_source_roles_across_sources():
+    """Anchors of several sources look keysets up in each of their sources."""
+    spec = _keyed_tie_spec()
+    customer = spec.anchors[0]
+    crm = customer.staging_mappings[0].model_copy(
+        update={"system": "CRM", "table": "stg_crm_customers"}
+    )
+    anchors = [
+        customer.model_copy(
+            update={"staging_mappings": [*customer.staging_mappings, crm]}
+        ),
+        spec.anchors[1],
+    ]
+    tie = spec.ties[0]
+
+    sql = build_tie_merge(tie, "postgres", tie.staging_mappings[0], anchors)
+    sql = sql.sql(dialect="postgres")
+
+    assert (
+        "SELECT loaded.metadata_id AS keyset_id, loaded.CU_ID "
+        "FROM CU_Customer AS loaded UNION "
+    ) in sql
+    assert (
+        "SELECT staged.keyset_id, loaded.CU_ID FROM stg_crm_customers AS staged "
+        "INNER JOIN CU_Customer AS loaded ON loaded.CU_ID = staged.CU_ID"
+    ) in sql
+    assert (
+        ") AS anchor_customer ON anchor_customer.keyset_id = staged.keyset_customer"
+    ) in sql
+    # Single-source anchors still join their recorded keyset
+    assert "anchor_order.metadata_id = staged.keyset_order" in sql
+
+
+def test_build_tie_merge_natural_keys_need_the_anchor():
+    """Resolving a keyed role without its anchor raises a ValueError."""
+    spec = _keyed_tie_spec()
+    tie = spec.ties[0]
+
+    with pytest.raises(ValueError, match="anchor 'OR' is needed to resolve role"):
+        build_tie_merge(tie, "tsql", tie.staging_mappings[0], spec.anchors[:1])
+
+
+def test_generate_all_dml_tie_load_per_staging_mapping():
+    """Several tie staging mappings load in priority order, one file each."""
+    spec = _keyed_tie_spec()
+    tie = spec.ties[0]
+    crm = tie.staging_mappings[0].model_copy(
+        update={"system": "CRM", "table": "stg_crm_orders", "priority": 1}
+    )
+    tie = tie.model_copy(update={"staging_mappings": [*tie.staging_mappings, crm]})
+    spec = spec.model_copy(update={"ties": [tie]})
+
+    result = generate_all_dml(spec, "snowflake")
+    tie_files = [name for name in result if name.startswith("CHA_CU_OR")]
+
+    assert tie_files == [
+        "CHA_CU_OR_channel_customer_order_load_crm.sql",
+        "CHA_CU_OR_channel_customer_order_load_erp.sql",
+    ]
+    assert "'Customer@CRM~ACME|'" in result[tie_files[0]]
+
+
 # ============================================================================
 # Integration Tests
 # ============================================================================
@@ -833,3 +1066,808 @@ def test_dml_keyset_reference_is_shorter():
     # Should NOT have inline computation artifacts
     assert "CONCAT" not in sql.upper()
     assert "Customer@Northwind~ACME" not in sql
+
+
+# ============================================================================
+# Watermark-Based Incremental Load Tests
+# ============================================================================
+
+
+def _incremental_anchor() -> Anchor:
+    """Anchor whose staging mapping loads incrementally on loaded_at."""
+    from data_architect.models.staging import StagingColumn, StagingMapping
+
+    mapping = StagingMapping(
+        system="ERP",
+        tenant="ACME",
+        table="stg_customers",
+        natural_key_columns=["customer_id"],
+        columns=[
+            StagingColumn(name="customer_id", type="bigint"),
+            StagingColumn(name="loaded_at", type="timestamp"),
+        ],
+        watermark_column="loaded_at",
+    )
+    return Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(100)",
+                time_range="datetime",
+            )
+        ],
+        staging_mappings=[mapping],
+    )
+
+
+def test_incremental_load_reads_only_watermark_window():
+    """Incremental loads filter staging rows to the load-control window."""
+    anchor = _incremental_anchor()
+    mapping = anchor.staging_mappings[0]
+
+    for dialect in ["postgres", "tsql", "snowflake"]:
+        sql = build_anchor_merge(anchor, dialect, mapping).sql(dialect=dialect)
+
+        assert "INNER JOIN dab_load_control AS watermark" in sql
+        assert "watermark.target_table = 'CU_Customer'" in sql
+        assert "staged.loaded_at > watermark.low_watermark_ts" in sql
+        assert "staged.loaded_at <= watermark.high_watermark_ts" in sql
+
+
+def test_full_load_reads_whole_staging_table():
+    """Mappings without watermark_column keep reading the whole table."""
+    from data_architect.models.staging import StagingMapping
+
+    mapping = StagingMapping(
+        system="ERP",
+        tenant="ACME",
+        table="stg_customers",
+        natural_key_columns=["customer_id"],
+    )
+    anchor = Anchor(mnemonic="CU", descriptor="Customer", identity="bigint")
+
+    sql = build_anchor_merge(anchor, "postgres", mapping).sql(dialect="postgres")
+
+    assert "dab_load_control" not in sql
+    assert "FROM stg_customers AS staged" in sql
+
+
+def test_build_watermark_advance_shifts_window():
+    """Advancing moves the high watermark to low and takes the staging max."""
+    mapping = _incremental_anchor().staging_mappings[0]
+
+    pg = build_watermark_advance("CU_Customer", mapping, "postgres").sql(
+        dialect="postgres"
+    )
+    assert "MAX(loaded_at) AS high_watermark_ts" in pg
+    assert "ON CONFLICT(target_table, source_table) DO UPDATE" in pg
+    assert "low_watermark_ts = dab_load_control.high_watermark_ts" in pg
+
+    sf = build_watermark_advance("CU_Customer", mapping, "snowflake").sql(
+        dialect="snowflake"
+    )
+    assert "MERGE INTO dab_load_control AS target" in sf
+    assert "low_watermark_ts = target.high_watermark_ts" in sf
+    assert "COALESCE(source.high_watermark_ts, target.high_watermark_ts)" in sf
+
+
+def test_generate_all_dml_incremental_load_is_one_transaction():
+    """Advance and load are emitted together between BEGIN and COMMIT."""
+    spec = Spec(anchors=[_incremental_anchor()])
+
+    for dialect in ["postgres", "tsql", "snowflake"]:
+        script = generate_all_dml(spec, dialect)["CU_NAM_Customer_Name_load.sql"]
+        statements = sqlglot.parse(script, dialect=dialect)
+
+        assert isinstance(statements[0], sge.Transaction)
+        assert "dab_load_control" in statements[1].sql(dialect=dialect)
+        assert "CU_NAM_Customer_Name" in statements[2].sql(dialect=dialect)
+        assert isinstance(statements[-1], sge.Commit)
+
+
+# ============================================================================
+# Restatement Suppression Tests
+# ============================================================================
+
+
+def _non_restatable_attribute() -> Attribute:
+    """Historized attribute that forbids restatements (XML string metadata)."""
+    return Attribute(
+        mnemonic="NAM",
+        descriptor="Name",
+        data_range="varchar(100)",
+        time_range="datetime",
+        metadata={"restatable": "false"},
+    )
+
+
+def test_allows_restatements_reads_metadata_flag():
+    """Restatements are allowed unless metadata sets restatable to false."""
+    assert allows_restatements(None)
+    assert allows_restatements({"idempotent": "false"})
+    assert allows_restatements({"restatable": "true"})
+    assert not allows_restatements({"restatable": "false"})
+    assert not allows_restatements({"restatable": False})
+
+
+def test_build_attribute_merge_suppresses_restatements():
+    """Non-restatable attributes compare batch rows with neighbouring versions."""
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[_non_restatable_attribute()],
+    )
+
+    sql = build_attribute_merge(anchor, anchor.attributes[0], "postgres").sql(
+        dialect="postgres"
+    )
+
+    assert "LAG(CU_NAM_Customer_Name) OVER (PARTITION BY CU_ID" in sql
+    # The batch is read once; existing versions start at the one in effect
+    assert sql.count("FROM stg_CU_Customer") == 1
+    assert "MIN(changed_at) AS first_changed_at" in sql
+    assert "prior.changed_at <= bounds.first_changed_at" in sql
+    assert (
+        "ranked.CU_NAM_Customer_Name IS DISTINCT FROM "
+        "ranked.previous_CU_NAM_Customer_Name"
+    ) in sql
+    assert "MAX(runs.is_existing) OVER (PARTITION BY CU_ID, runs.run_number)" in sql
+    assert "compared.run_has_existing = 0" in sql
+    assert "ON CONFLICT(CU_ID, changed_at) DO NOTHING" in sql
+
+
+def test_build_attribute_merge_restatable_by_default():
+    """Historized attributes without the flag keep inserting every version."""
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(100)",
+                time_range="datetime",
+            )
+        ],
+    )
+
+    sql = build_attribute_merge(anchor, anchor.attributes[0], "postgres").sql(
+        dialect="postgres"
+    )
+
+    assert "LAG(" not in sql
+
+
+def test_build_attribute_merge_suppression_keeps_keyset_metadata():
+    """The keyset metadata_id is carried through the restatement filter."""
+    from data_architect.models.staging import StagingMapping
+
+    mapping = StagingMapping(
+        system="ERP",
+        tenant="ACME",
+        table="stg_customers",
+        natural_key_columns=["customer_id"],
+    )
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[_non_restatable_attribute()],
+        staging_mappings=[mapping],
+    )
+
+    sql = build_attribute_merge(anchor, anchor.attributes[0], "snowflake", mapping)
+    rendered = sql.sql(dialect="snowflake")
+
+    assert "source.keyset_id AS metadata_id" in rendered
+    assert "FROM stg_customers AS staged" in rendered
+
+
+def test_build_attribute_merge_suppression_tsql_null_safe_compare():
+    """T-SQL compares NULL-safely with EXCEPT instead of IS DISTINCT FROM."""
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[_non_restatable_attribute()],
+    )
+
+    sql = build_attribute_merge(anchor, anchor.attributes[0], "tsql").sql(
+        dialect="tsql"
+    )
+
+    assert "IS DISTINCT FROM" not in sql
+    assert "EXCEPT" in sql
+
+
+def test_build_tie_merge_suppresses_restatements_per_identifier_role():
+    """Non-restatable ties compare non-identifier roles per identifier role."""
+    tie = Tie(
+        roles=[
+            Role(role="at", type_="CU", identifier=True),
+            Role(role="of", type_="PR", identifier=False),
+        ],
+        time_range="datetime",
+        metadata={"restatable": False},
+    )
+
+    sql = build_tie_merge(tie, "postgres").sql(dialect="postgres")
+
+    assert "LAG(PR_ID_of) OVER (PARTITION BY CU_ID_at" in sql
+    assert "FROM CU_PR_at_of AS existing" in sql
+    assert "ON CONFLICT(CU_ID_at, PR_ID_of, changed_at) DO NOTHING" in sql
+
+
+def test_build_tie_merge_restatements_with_non_leading_identifier_role():
+    """Batch and existing versions line up when the identifier is not first."""
+    tie = Tie(
+        roles=[
+            Role(role="at", type_="ST", identifier=False),
+            Role(role="of", type_="PR", identifier=True),
+        ],
+        time_range="datetime",
+        metadata={"restatable": False},
+    )
+
+    sql = build_tie_merge(tie, "postgres").sql(dialect="postgres")
+
+    assert (
+        "SELECT batch.PR_ID_of, batch.ST_ID_at, batch.changed_at, "
+        "batch.metadata_id, batch.is_existing FROM batch UNION ALL "
+        "SELECT existing.PR_ID_of, existing.ST_ID_at, existing.changed_at, "
+        "existing.metadata_id, 1 AS is_existing"
+    ) in sql
+
+
+# ============================================================================
+# In-Batch Deduplication Tests
+# ============================================================================
+
+
+def test_build_anchor_merge_dedups_batch_per_identity():
+    """Anchor loads keep one staging row per identity."""
+    anchor = Anchor(mnemonic="CU", descriptor="Customer", identity="bigint")
+
+    sql = build_anchor_merge(anchor, "tsql").sql(dialect="tsql")
+
+    assert (
+        "ROW_NUMBER() OVER (PARTITION BY staged.CU_ID "
+        "ORDER BY staged.CU_ID) AS dedup_rank"
+    ) in sql
+    assert "ranked.dedup_rank = 1" in sql
+
+
+def test_build_knot_and_tie_merges_dedup_without_metadata_columns():
+    """User staging tables of knots and ties need no metadata_recorded_at."""
+    knot = Knot(
+        mnemonic="GEN", descriptor="Gender", identity="int", data_range="varchar(10)"
+    )
+    tie = Tie(
+        roles=[
+            Role(role="of", type_="PR", identifier=True),
+            Role(role="at", type_="ST", identifier=False),
+        ]
+    )
+
+    knot_sql = build_knot_merge(knot, "snowflake").sql(dialect="snowflake")
+    tie_sql = build_tie_merge(tie, "snowflake").sql(dialect="snowflake")
+
+    assert "metadata_recorded_at DESC" not in knot_sql
+    assert "ORDER BY staged.GEN_ID) = 1" in knot_sql
+    assert "metadata_recorded_at DESC" not in tie_sql
+
+
+def test_build_attribute_merge_dedups_per_key_and_changed_at():
+    """Historized attribute loads keep one row per (FK, changed_at)."""
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(100)",
+                time_range="datetime",
+            )
+        ],
+    )
+
+    sql = build_attribute_merge(anchor, anchor.attributes[0], "postgres").sql(
+        dialect="postgres"
+    )
+
+    assert "PARTITION BY staged.CU_ID, staged.changed_at" in sql
+
+
+def test_build_attribute_merge_dedup_uses_tiebreak_and_changed_at():
+    """Static loads prefer the latest changed_at, then the tiebreak column."""
+    from data_architect.models.staging import StagingColumn, StagingMapping
+
+    mapping = StagingMapping(
+        system="ERP",
+        tenant="ACME",
+        table="stg_customers",
+        natural_key_columns=["customer_id"],
+        columns=[
+            StagingColumn(name="customer_id", type="bigint"),
+            StagingColumn(name="changed_at", type="timestamp"),
+            StagingColumn(name="batch_seq", type="bigint"),
+        ],
+        tiebreak_column="batch_seq",
+    )
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[Attribute(mnemonic="NAM", descriptor="Name", data_range="text")],
+        staging_mappings=[mapping],
+    )
+
+    sql = build_attribute_merge(anchor, anchor.attributes[0], "snowflake", mapping)
+    rendered = sql.sql(dialect="snowflake")
+
+    assert (
+        "QUALIFY ROW_NUMBER() OVER (PARTITION BY staged.CU_ID "
+        "ORDER BY staged.changed_at DESC, staged.batch_seq DESC) = 1"
+    ) in rendered
+
+
+def test_build_tie_merge_dedups_per_role_key():
+    """Tie loads keep one staging row per role combination."""
+    tie = Tie(
+        roles=[
+            Role(role="at", type_="CU"),
+            Role(role="of", type_="PR"),
+        ]
+    )
+
+    sql = build_tie_merge(tie, "postgres").sql(dialect="postgres")
+
+    assert "PARTITION BY staged.CU_ID_at, staged.PR_ID_of" in sql
+
+
+# ============================================================================
+# Consolidated Multi-Source Load Tests
+# ============================================================================
+
+
+def _multi_source_anchor() -> Anchor:
+    """Anchor fed by two systems; SAP listed first but Northwind has priority."""
+    from data_architect.models.staging import StagingMapping
+
+    return Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(100)",
+                time_range="datetime",
+            )
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="SAP",
+                tenant="EU",
+                table="stg_sap_customers",
+                natural_key_columns=["KUNNR"],
+                column_mappings={"NAM": "NAME1"},
+                priority=2,
+            ),
+            StagingMapping(
+                system="Northwind",
+                tenant="US",
+                table="stg_nw_customers",
+                natural_key_columns=["CustomerID"],
+                priority=1,
+            ),
+        ],
+    )
+
+
+def test_build_consolidated_anchor_merge_unions_sources_by_priority():
+    """All sources feed one MERGE; the priority order decides source_rank."""
+    sql = build_consolidated_anchor_merge(_multi_source_anchor(), "tsql").sql(
+        dialect="tsql"
+    )
+
+    assert sql.count("MERGE INTO CU_Customer") == 1
+    assert "UNION ALL" in sql
+    assert sql.index("stg_nw_customers") < sql.index("stg_sap_customers")
+    assert "0 AS source_rank" in sql
+    assert "1 AS source_rank" in sql
+    assert "PARTITION BY staged.CU_ID ORDER BY staged.source_rank" in sql
+
+
+def test_build_consolidated_attribute_merge_maps_columns_per_source():
+    """Each source branch renames its own staging column to the target."""
+    sql = build_consolidated_attribute_merge(
+        _multi_source_anchor(), _multi_source_anchor().attributes[0], "postgres"
+    ).sql(dialect="postgres")
+
+    assert "source.NAME1 AS CU_NAM_Customer_Name" in sql
+    assert "source.CU_NAM_Customer_Name AS CU_NAM_Customer_Name" in sql
+    assert "source.keyset_id AS metadata_id" in sql
+    assert "ON CONFLICT(CU_ID, changed_at) DO NOTHING" in sql
+
+
+def test_generate_all_dml_consolidate_one_file_per_target():
+    """Consolidated mode replaces per-source files with one per target."""
+    spec = Spec(anchors=[_multi_source_anchor()])
+
+    per_source = generate_all_dml(spec, "postgres")
+    consolidated = generate_all_dml(spec, "postgres", consolidate=True)
+
+    assert "CU_Customer_load_sap.sql" in per_source
+    assert list(consolidated.keys()) == [
+        "CU_Customer_load.sql",
+        "CU_NAM_Customer_Name_load.sql",
+    ]
+
+
+# ============================================================================
+# Single-Scan Fan-Out Tests
+# ============================================================================
+
+
+def _fanout_anchor() -> Anchor:
+    """Anchor with a static and a historized attribute from one staging table."""
+    from data_architect.models.staging import StagingMapping
+
+    return Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(mnemonic="COU", descriptor="Country", data_range="text"),
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="text",
+                time_range="datetime",
+            ),
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                column_mappings={"CU_COU": "country", "NAM": "company_name"},
+            )
+        ],
+    )
+
+
+def test_build_staging_fanout_scans_staging_once():
+    """Staging is copied once; every target loads from the copy."""
+    anchor = _fanout_anchor()
+    statements = build_staging_fanout(
+        [(anchor, anchor.staging_mappings[0])], "postgres"
+    )
+    sqls = [stmt.sql(dialect="postgres") for stmt in statements]
+
+    assert sqls[0] == "DROP TABLE IF EXISTS tmp_stg_customers"
+    assert sqls[1].startswith("CREATE TEMPORARY TABLE tmp_stg_customers AS")
+    assert sqls[-1] == "DROP TABLE tmp_stg_customers"
+    loads = sqls[2:-1]
+    assert len(loads) == 3
+    assert sum("FROM stg_customers" in sql for sql in sqls) == 1
+    assert all("FROM tmp_stg_customers AS staged" in sql for sql in loads)
+
+
+def test_build_staging_fanout_keeps_attribute_semantics():
+    """Static attributes upsert, historized attributes append."""
+    anchor = _fanout_anchor()
+    statements = build_staging_fanout([(anchor, anchor.staging_mappings[0])], "tsql")
+    country, name = (stmt.sql(dialect="tsql") for stmt in statements[3:5])
+
+    assert "WHEN MATCHED THEN UPDATE SET" in country
+    assert "source.country" in country
+    assert "WHEN MATCHED" not in name
+    assert "target.changed_at = source.changed_at" in name
+    assert "source.company_name" in name
+
+
+def test_build_staging_fanout_tsql_uses_session_temp_table():
+    """T-SQL copies the batch with SELECT ... INTO a #temp table."""
+    anchor = _fanout_anchor()
+    statements = build_staging_fanout([(anchor, anchor.staging_mappings[0])], "tsql")
+
+    assert statements[1].sql(dialect="tsql") == (
+        "SELECT staged.* INTO #tmp_stg_customers FROM stg_customers AS staged"
+    )
+
+
+def test_generate_all_dml_fanout_one_script_per_staging_table():
+    """Fan-out replaces per-target files with one transactional script."""
+    spec = Spec(anchors=[_fanout_anchor()])
+
+    result = generate_all_dml(spec, "postgres", fanout=True)
+
+    assert list(result.keys()) == ["stg_customers_load.sql"]
+    statements = sqlglot.parse(result["stg_customers_load.sql"], dialect="postgres")
+    assert isinstance(statements[0], sge.Transaction)
+    assert isinstance(statements[-1], sge.Commit)
+
+
+def test_generate_all_dml_fanout_snowflake_keeps_ddl_out_of_transaction():
+    """Snowflake creates and drops the copy outside the transaction."""
+    from data_architect.models.staging import StagingColumn
+
+    anchor = _fanout_anchor()
+    mapping = anchor.staging_mappings[0].model_copy(
+        update={
+            "watermark_column": "changed_at",
+            "columns": [StagingColumn(name="changed_at", type="timestamp")],
+        }
+    )
+    spec = Spec(anchors=[anchor.model_copy(update={"staging_mappings": [mapping]})])
+
+    result = generate_all_dml(spec, "snowflake", fanout=True)
+
+    statements = sqlglot.parse(result["stg_customers_load.sql"], dialect="snowflake")
+    create, begin, advance, copy, *loads, commit, drop = statements
+    assert isinstance(create, sge.Create)
+    assert create.sql(dialect="snowflake").endswith("LIMIT 0")
+    assert isinstance(begin, sge.Transaction)
+    assert "dab_load_control" in advance.sql(dialect="snowflake")
+    assert isinstance(copy, sge.Insert)
+    assert len(loads) == 3
+    assert not any(isinstance(stmt, (sge.Create, sge.Drop)) for stmt in loads)
+    assert isinstance(commit, sge.Commit)
+    assert drop.sql(dialect="snowflake") == "DROP TABLE tmp_stg_customers"
+
+
+def test_build_attribute_merge_column_mapping_anchor_qualified_key():
+    """column_mappings keyed by anchor-qualified mnemonic are resolved."""
+    anchor = _fanout_anchor()
+
+    sql = build_attribute_merge(
+        anchor, anchor.attributes[0], "postgres", anchor.staging_mappings[0]
+    ).sql(dialect="postgres")
+
+    assert "source.country AS CU_COU_Customer_Country" in sql
+
+
+# ============================================================================
+# CDC Load Tests
+# ============================================================================
+
+
+def _cdc_anchor() -> Anchor:
+    """Anchor loading a captured source table through its change feed."""
+    from data_architect.models.staging import CdcSource
+
+    anchor = _fanout_anchor()
+    mapping = anchor.staging_mappings[0].model_copy(
+        update={"cdc": CdcSource(table="sales.customers")}
+    )
+    return anchor.model_copy(update={"staging_mappings": [mapping]})
+
+
+def test_generate_all_dml_cdc_one_transaction_per_feed():
+    """Every load of a change feed commits together, without fanout=True."""
+    spec = Spec(anchors=[_cdc_anchor()])
+
+    result = generate_all_dml(spec, "snowflake")
+
+    assert list(result.keys()) == ["stg_customers_load.sql"]
+    statements = sqlglot.parse(result["stg_customers_load.sql"], dialect="snowflake")
+    assert isinstance(statements[0], sge.Transaction)
+    assert isinstance(statements[-1], sge.Commit)
+
+
+def test_build_cdc_load_snowflake_reads_stream_changes():
+    """Inserts and update after-images load; deletes clear static values."""
+    anchor = _cdc_anchor()
+    statements = build_cdc_load([(anchor, anchor.staging_mappings[0])], "snowflake")
+    sqls = [stmt.sql(dialect="snowflake") for stmt in statements]
+
+    assert len(sqls) == 4
+    assert all("FROM stg_customers AS changes" in sql for sql in sqls)
+    assert all("tmp_" not in sql for sql in sqls)
+    assert "changes.METADATA$ACTION = 'INSERT'" in sqls[0]
+    assert "END AS keyset_id" in sqls[0]
+    assert sqls[3].startswith("DELETE FROM CU_COU_Customer_Country WHERE CU_ID IN")
+    assert "NOT changes.METADATA$ISUPDATE" in sqls[3]
+
+
+def test_build_cdc_load_tsql_advances_lsn_window():
+    """SQL Server reads net changes inside the window it advances first."""
+    anchor = _cdc_anchor()
+    statements = build_cdc_load([(anchor, anchor.staging_mappings[0])], "tsql")
+    sqls = [stmt.sql(dialect="tsql") for stmt in statements]
+
+    assert sqls[0].startswith("MERGE INTO dab_load_control AS target")
+    assert "sys.fn_cdc_get_max_lsn()" in sqls[0]
+    assert "low_watermark_ts = target.high_watermark_ts" in sqls[0]
+    assert "CROSS APPLY cdc.fn_cdc_get_net_changes_sales_customers(" in sqls[1]
+    assert "changes.__$operation <> 1" in sqls[1]
+    assert "changes.__$operation = 1" in sqls[-1]
+    assert not any("DELETE FROM CU_NAM" in sql for sql in sqls)
+
+
+# ============================================================================
+# Key Map Tests
+# ============================================================================
+
+
+def _keymap_anchor() -> Anchor:
+    """Customer whose identities come from a key map."""
+    return _fanout_anchor().model_copy(update={"keymap": True})
+
+
+def test_build_keymap_insert_numbers_new_keysets():
+    """New keysets get identities from the key map's sequence."""
+    sql = build_keymap_insert(_keymap_anchor(), ["stg_a", "stg_b"], "tsql")
+    sql = sql.sql(dialect="tsql")
+
+    assert sql.startswith("INSERT INTO CU_Customer_keymap (keyset_id, CU_ID,")
+    assert (
+        "NEXT VALUE FOR CU_Customer_keymap_seq OVER (ORDER BY source.keyset_id) "
+        "AS CU_ID"
+    ) in sql
+    assert "MAX(" not in sql
+    assert "FROM stg_a AS staged" in sql
+    assert "UNION SELECT DISTINCT staged.keyset_id FROM stg_b AS staged" in sql
+    assert (
+        "FROM CU_Customer_keymap AS keymap WITH (UPDLOCK, HOLDLOCK) "
+        "WHERE keymap.keyset_id = source.keyset_id"
+    ) in sql
+
+
+@pytest.mark.parametrize(
+    ("dialect", "identity"),
+    [
+        ("postgres", "NEXTVAL('CU_Customer_keymap_seq') AS CU_ID"),
+        ("duckdb", "NEXTVAL('CU_Customer_keymap_seq') AS CU_ID"),
+        ("snowflake", "CU_Customer_keymap_seq.NEXTVAL AS CU_ID"),
+    ],
+)
+def test_build_keymap_insert_draws_from_sequence(dialect, identity):
+    """Each dialect draws new identities from its sequence."""
+    sql = build_keymap_insert(_keymap_anchor(), ["stg_a"], dialect)
+    sql = sql.sql(dialect=dialect)
+
+    assert identity in sql
+    assert sql.endswith(
+        "ON CONFLICT(keyset_id) DO NOTHING"
+        if dialect != "snowflake"
+        else "WHERE keymap.keyset_id = source.keyset_id)"
+    )
+
+
+def test_build_keymap_insert_requires_integer_identity():
+    """Identities can only be numbered for integer anchors."""
+    anchor = _keymap_anchor().model_copy(update={"identity": "varchar(5)"})
+
+    with pytest.raises(ValueError, match="integer anchor identity, not varchar"):
+        build_keymap_insert(anchor, ["stg_customers"], "postgres")
+
+
+def test_generate_all_dml_keymap_loads_read_integer_identities():
+    """The key map loads first; anchor and attribute loads join it."""
+    spec = Spec(anchors=[_keymap_anchor()])
+
+    result = generate_all_dml(spec, "postgres")
+
+    assert next(iter(result)) == "CU_Customer_keymap_load.sql"
+    for name in ("CU_Customer_load.sql", "CU_NAM_Customer_Name_load.sql"):
+        assert "keymap.CU_ID AS CU_ID" in result[name]
+        assert "ON keymap.keyset_id = staged.keyset_id" in result[name]
+
+
+def test_build_staging_fanout_assigns_keymap_identities_inline():
+    """Fan-out scripts fill the key map from the batch before loading it."""
+    anchor = _keymap_anchor()
+    statements = build_staging_fanout([(anchor, anchor.staging_mappings[0])], "duckdb")
+    sqls = [stmt.sql(dialect="duckdb") for stmt in statements]
+
+    assert sqls[2].startswith("INSERT INTO CU_Customer_keymap")
+    assert "FROM tmp_stg_customers AS staged" in sqls[2]
+    assert "INNER JOIN CU_Customer_keymap AS keymap" in sqls[3]
+
+
+def test_build_tie_merge_resolves_keymapped_roles_from_key_map():
+    """Keyed roles of key-mapped anchors look their keyset up in the key map."""
+    spec = _keyed_tie_spec()
+    anchors = [spec.anchors[0].model_copy(update={"keymap": True}), spec.anchors[1]]
+    tie = spec.ties[0]
+
+    sql = build_tie_merge(tie, "postgres", tie.staging_mappings[0], anchors)
+    sql = sql.sql(dialect="postgres")
+
+    assert (
+        "INNER JOIN CU_Customer_keymap AS anchor_customer "
+        "ON anchor_customer.keyset_id = staged.keyset_customer"
+    ) in sql
+    assert "anchor_order.metadata_id = staged.keyset_order" in sql
+
+
+# ============================================================================
+# Nexus Tests
+# ============================================================================
+
+
+def _nexus() -> Nexus:
+    from data_architect.models.staging import StagingMapping
+
+    return Nexus(
+        mnemonic="EV",
+        descriptor="Event",
+        identity="bigint",
+        attributes=[
+            Attribute(mnemonic="NAM", descriptor="Name", data_range="varchar(40)")
+        ],
+        roles=[
+            Role(type_="CU", role="host", identifier=True),
+            Role(type_="VE", role="at"),
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_events",
+                natural_key_columns=["event_id"],
+            )
+        ],
+    )
+
+
+def test_nexus_merge_inserts_identity_with_roles_postgres():
+    """One pass over staging inserts the nexus and all its role IDs."""
+    sql = build_nexus_merge(_nexus(), "postgres", _nexus().staging_mappings[0]).sql(
+        dialect="postgres"
+    )
+
+    assert sql.startswith(
+        "INSERT INTO EV_Event (EV_ID, CU_ID_host, VE_ID_at, metadata_recorded_at, "
+        "metadata_recorded_by, metadata_id) SELECT source.EV_ID, source.CU_ID_host, "
+        "source.VE_ID_at, CURRENT_TIMESTAMP AS metadata_recorded_at"
+    )
+    assert "source.keyset_id AS metadata_id" in sql
+    assert "PARTITION BY staged.EV_ID" in sql
+    assert sql.endswith("ON CONFLICT(EV_ID) DO NOTHING")
+
+
+def test_nexus_merge_uses_merge_on_identity_tsql():
+    """MERGE dialects insert unmatched nexus identities with their roles."""
+    sql = build_nexus_merge(_nexus(), "tsql").sql(dialect="tsql")
+
+    assert sql.startswith("MERGE INTO EV_Event AS target USING")
+    assert "ON target.EV_ID = source.EV_ID WHEN NOT MATCHED THEN INSERT" in sql
+    assert "VALUES (source.EV_ID, source.CU_ID_host, source.VE_ID_at," in sql
+    assert "WHEN MATCHED" not in sql
+
+
+def test_generate_all_dml_loads_nexus_and_attributes():
+    """Nexuses get a load per table, per source when several stage them."""
+    nexus = _nexus()
+    spec = Spec(nexuses=[nexus])
+
+    dml = generate_all_dml(spec, "duckdb")
+    assert {"EV_Event_load.sql", "EV_NAM_Event_Name_load.sql"} <= set(dml)
+    assert "FROM stg_events AS staged" in dml["EV_NAM_Event_Name_load.sql"]
+
+    crm = nexus.staging_mappings[0].model_copy(
+        update={"system": "CRM", "table": "stg_crm_events", "priority": 2}
+    )
+    multi = nexus.model_copy(
+        update={"staging_mappings": [*nexus.staging_mappings, crm]}
+    )
+    dml = generate_all_dml(Spec(nexuses=[multi]), "duckdb")
+    assert {
+        "EV_Event_load_erp.sql",
+        "EV_Event_load_crm.sql",
+        "EV_NAM_Event_Name_load_crm.sql",
+    } <= set(dml)
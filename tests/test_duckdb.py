@@ -0,0 +1,977 @@
+"""End-to-end tests running generated DuckDB SQL in-process."""
+
+from contextlib import closing
+from datetime import date, datetime
+
+import pytest
+
+from data_architect.generation.ddl import generate_all_ddl
+from data_architect.generation.dependencies import (
+    build_asset_dependencies,
+    build_dependency_graph,
+)
+from data_architect.generation.dml import generate_all_dml
+from data_architect.generation.migrate import generate_migration
+from data_architect.generation.views import generate_all_views
+from data_architect.models.anchor import Anchor, Attribute, Materialization
+from data_architect.models.knot import Knot
+from data_architect.models.spec import Nexus, Spec
+from data_architect.models.staging import (
+    StagingColumn,
+    StagingMapping,
+    StagingSource,
+    TieStagingMapping,
+)
+from data_architect.models.tie import Role, Tie
+from data_architect.runner import (
+    RunReport,
+    duckdb_connector,
+    run_phases,
+    split_statements,
+)
+
+duckdb = pytest.importorskip("duckdb")
+
+_ROWS = """
+SELECT * FROM (VALUES
+    ('c1', 1, 'Ann', 'SE', TIMESTAMP '2024-01-01'),
+    ('c2', 2, 'Bob', 'NO', TIMESTAMP '2024-01-02'),
+    ('c1', 1, 'Anna', 'SE', TIMESTAMP '2024-03-01')
+) AS t(customer_id, CU_ID, CU_NAM_Customer_Name, CU_COU_Customer_Country, changed_at)
+"""
+
+
+def _spec(
+    path: str, file_format: str, materialize: Materialization | None = None
+) -> Spec:
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(40)",
+                time_range="datetime",
+            ),
+            Attribute(mnemonic="COU", descriptor="Country", data_range="varchar(2)"),
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                columns=[
+                    StagingColumn(name="customer_id", type="varchar(20)"),
+                    StagingColumn(name="CU_ID", type="bigint"),
+                    StagingColumn(name="CU_NAM_Customer_Name", type="varchar(40)"),
+                    StagingColumn(name="CU_COU_Customer_Country", type="varchar(2)"),
+                    StagingColumn(name="changed_at", type="timestamp"),
+                ],
+                source=StagingSource(path=path, format=file_format),
+            )
+        ],
+        materialize=materialize,
+    )
+    return Spec(anchors=[anchor])
+
+
+def _load(
+    tmp_path, file_format: str, materialize: Materialization | None = None
+) -> tuple[RunReport, str]:
+    """Write source files, then run all generated DuckDB SQL over them."""
+    database = str(tmp_path / "dab.duckdb")
+    (tmp_path / "landing").mkdir()
+    with closing(duckdb.connect(database)) as connection:
+        connection.execute(
+            f"COPY ({_ROWS}) TO '{tmp_path}/landing/part-0.{file_format}' "
+            f"(FORMAT {file_format})"
+        )
+
+    spec = _spec(f"{tmp_path}/landing/*.{file_format}", file_format, materialize)
+    phases = [
+        {
+            **generate_all_ddl(spec, "duckdb"),
+            **generate_all_views(spec, "duckdb"),
+        },
+        generate_all_dml(spec, "duckdb"),
+    ]
+    report = run_phases(
+        phases,
+        build_dependency_graph(spec),
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+    return report, database
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "csv"])
+def test_duckdb_loads_from_source_files(tmp_path, file_format):
+    """Loads read the source files through the staging view, zero-copy."""
+    report, database = _load(tmp_path, file_format)
+
+    assert report.ok, [r.error for r in report.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT table_type FROM information_schema.tables "
+            "WHERE table_name = 'stg_customers'"
+        ).fetchall() == [("VIEW",)]
+        assert connection.execute(
+            "SELECT CU_ID, metadata_id FROM CU_Customer ORDER BY CU_ID"
+        ).fetchall() == [(1, "Customer@ERP~ACME|c1"), (2, "Customer@ERP~ACME|c2")]
+        assert connection.execute(
+            "SELECT CU_ID, CU_NAM_Customer_Name, CU_COU_Customer_Country "
+            "FROM lCU_Customer ORDER BY CU_ID"
+        ).fetchall() == [(1, "Anna", "SE"), (2, "Bob", "NO")]
+
+
+def test_duckdb_perspective_macros(tmp_path):
+    """Point-in-time and difference macros answer temporal questions."""
+    report, database = _load(tmp_path, "parquet")
+
+    assert report.ok
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT CU_ID, CU_NAM_Customer_Name "
+            "FROM pCU_Customer(TIMESTAMPTZ '2024-02-01 00:00:00+00') ORDER BY CU_ID"
+        ).fetchall() == [(1, "Ann"), (2, "Bob")]
+        assert connection.execute(
+            "SELECT CU_ID, CU_NAM_Customer_Name FROM dCU_Customer("
+            "TIMESTAMPTZ '2024-01-01 12:00:00+00', "
+            "TIMESTAMPTZ '2024-12-31 00:00:00+00') ORDER BY CU_ID, inspected_at"
+        ).fetchall() == [(1, "Anna"), (2, "Bob")]
+
+
+def test_duckdb_reload_is_idempotent(tmp_path):
+    """Running the loads again over the same files adds no rows."""
+    report, database = _load(tmp_path, "csv")
+    spec = _spec(f"{tmp_path}/landing/*.csv", "csv")
+
+    rerun = run_phases(
+        [generate_all_dml(spec, "duckdb")],
+        build_dependency_graph(spec),
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+
+    assert report.ok
+    assert rerun.ok
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT COUNT(*) FROM CU_NAM_Customer_Name"
+        ).fetchone() == (3,)
+
+
+def test_duckdb_materialized_latest_state_refreshes_after_loads(tmp_path):
+    """The snapshot table holds the latest state once the loads ran."""
+    report, database = _load(tmp_path, "parquet", Materialization())
+
+    assert report.ok, [r.error for r in report.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT CU_ID, CU_NAM_Customer_Name, CU_COU_Customer_Country "
+            "FROM mCU_Customer ORDER BY CU_ID"
+        ).fetchall() == [(1, "Anna", "SE"), (2, "Bob", "NO")]
+
+
+def test_duckdb_migration_rebuilds_materialized_latest_state(tmp_path):
+    """A new attribute reaches the snapshot table, which keeps its rows."""
+    report, database = _load(tmp_path, "parquet", Materialization())
+    old = _spec(f"{tmp_path}/landing/*.parquet", "parquet", Materialization())
+    anchor = old.anchors[0]
+    weight = Attribute(mnemonic="WGT", descriptor="Weight", data_range="int")
+    new = old.model_copy(
+        update={
+            "anchors": [
+                anchor.model_copy(update={"attributes": [*anchor.attributes, weight]})
+            ]
+        }
+    )
+
+    files = generate_migration(old, new, "duckdb")
+
+    assert report.ok
+    assert files["mCU_Customer.sql"].startswith("DROP TABLE IF EXISTS mCU_Customer;")
+    with closing(duckdb.connect(database)) as connection:
+        for sql in files.values():
+            for statement in split_statements(sql, "duckdb", "duckdb"):
+                connection.execute(statement)
+        assert connection.execute(
+            "SELECT CU_ID, CU_NAM_Customer_Name, CU_WGT_Customer_Weight "
+            "FROM mCU_Customer ORDER BY CU_ID"
+        ).fetchall() == [(1, "Anna", None), (2, "Bob", None)]
+
+
+def test_duckdb_connector_releases_database_after_run(tmp_path):
+    """The shared instance is closed with the run's last connection."""
+    database = str(tmp_path / "dab.duckdb")
+    connect = duckdb_connector(database)
+    report = run_phases(
+        [{"GEN_Gender.sql": "CREATE TABLE GEN_Gender (GEN_ID INT)"}],
+        {"GEN_Gender": set()},
+        connect,
+        read="duckdb",
+        write="duckdb",
+    )
+
+    assert report.ok
+    # An instance still open would refuse a different configuration
+    with closing(duckdb.connect(database, read_only=True)) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM GEN_Gender").fetchone() == (0,)
+
+
+def test_duckdb_loads_knot_from_user_staging_table(tmp_path):
+    """Knot loads read user staging tables holding only the knot columns."""
+    spec = Spec(
+        knots=[
+            Knot(
+                mnemonic="CAT",
+                descriptor="Category",
+                identity="int",
+                data_range="varchar(20)",
+            )
+        ]
+    )
+    database = str(tmp_path / "dab.duckdb")
+    graph = build_dependency_graph(spec)
+    report = run_phases(
+        [generate_all_ddl(spec, "duckdb")],
+        graph,
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+    assert report.ok
+    with closing(duckdb.connect(database)) as connection:
+        connection.execute(
+            "CREATE TABLE stg_CAT_Category (CAT_ID INT, CAT_Category VARCHAR(20))"
+        )
+        connection.execute(
+            "INSERT INTO stg_CAT_Category VALUES "
+            "(1, 'Beverages'), (2, 'Snacks'), (2, 'Snacks')"
+        )
+
+    report = run_phases(
+        [generate_all_dml(spec, "duckdb")],
+        graph,
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+
+    assert report.ok, [r.error for r in report.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT CAT_ID, CAT_Category FROM CAT_Category ORDER BY CAT_ID"
+        ).fetchall() == [(1, "Beverages"), (2, "Snacks")]
+
+
+def test_duckdb_resolves_staged_knot_values(tmp_path):
+    """Staged knot values get knot IDs once, new values are added on later runs."""
+    anchor = Anchor(
+        mnemonic="PR",
+        descriptor="Product",
+        identity="bigint",
+        attributes=[Attribute(mnemonic="CAT", descriptor="Category", knot_range="CAT")],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_products",
+                natural_key_columns=["product_id"],
+                columns=[
+                    StagingColumn(name="product_id", type="varchar(20)"),
+                    StagingColumn(name="PR_ID", type="bigint"),
+                    StagingColumn(name="category", type="varchar(20)"),
+                    StagingColumn(name="changed_at", type="timestamp"),
+                ],
+                knot_values={"CAT": "category"},
+            )
+        ],
+    )
+    spec = Spec(
+        anchors=[anchor],
+        knots=[
+            Knot(
+                mnemonic="CAT",
+                descriptor="Category",
+                identity="int",
+                data_range="varchar(20)",
+            )
+        ],
+    )
+    database = str(tmp_path / "dab.duckdb")
+    graph = build_dependency_graph(spec)
+    dml = generate_all_dml(spec, "duckdb")
+
+    def run(phases, rows=None):
+        if rows:
+            with closing(duckdb.connect(database)) as connection:
+                connection.executemany(
+                    "INSERT INTO stg_products (product_id, PR_ID, category, "
+                    "changed_at, metadata_recorded_at) VALUES (?, ?, ?, ?, NOW())",
+                    rows,
+                )
+        report = run_phases(
+            phases, graph, duckdb_connector(database), read="duckdb", write="duckdb"
+        )
+        assert report.ok, [r.error for r in report.results if r.error]
+
+    jan = datetime(2024, 1, 1)
+    run([generate_all_ddl(spec, "duckdb")])
+    # A value staged twice by the one source is added once
+    run(
+        [dml],
+        [
+            ("p1", 1, "Beverages", jan),
+            ("p2", 2, "Snacks", jan),
+            ("p5", 5, "Snacks", jan),
+        ],
+    )
+    run([dml], [("p3", 3, None, jan), ("p4", 4, "Dairy", jan)])
+
+    with closing(duckdb.connect(database)) as connection:
+        categories = dict(
+            connection.execute(
+                "SELECT CAT_Category, CAT_ID FROM CAT_Category"
+            ).fetchall()
+        )
+        assert {categories["Beverages"], categories["Snacks"]} == {1, 2}
+        assert categories["Dairy"] == 3
+        assert connection.execute(
+            "SELECT attr.PR_ID, knot.CAT_Category FROM PR_CAT_Product_Category AS attr "
+            "INNER JOIN CAT_Category AS knot ON knot.CAT_ID = attr.CAT_ID "
+            "ORDER BY attr.PR_ID"
+        ).fetchall() == [(1, "Beverages"), (2, "Snacks"), (4, "Dairy"), (5, "Snacks")]
+
+
+def test_duckdb_resolves_tie_roles_from_natural_keys(tmp_path):
+    """Tie rows get anchor IDs through the keysets the anchors were loaded with."""
+    anchors = [
+        Anchor(
+            mnemonic=mnemonic,
+            descriptor=descriptor,
+            identity="bigint",
+            staging_mappings=[
+                StagingMapping(
+                    system="ERP",
+                    tenant="ACME",
+                    table=f"stg_{descriptor.lower()}s",
+                    natural_key_columns=["nk"],
+                    columns=[
+                        StagingColumn(name="nk", type="varchar(20)"),
+                        StagingColumn(name=f"{mnemonic}_ID", type="bigint"),
+                    ],
+                )
+            ],
+        )
+        for mnemonic, descriptor in (("CU", "Customer"), ("OR", "Order"))
+    ]
+    tie = Tie(
+        roles=[Role(type_="CU", role="customer"), Role(type_="OR", role="order")],
+        staging_mappings=[
+            TieStagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_placed",
+                natural_key_columns={
+                    "customer": ["customer_id"],
+                    "order": ["order_no"],
+                },
+                columns=[
+                    StagingColumn(name="customer_id", type="varchar(20)"),
+                    StagingColumn(name="order_no", type="varchar(20)"),
+                ],
+            )
+        ],
+    )
+    spec = Spec(anchors=anchors, ties=[tie])
+    database = str(tmp_path / "dab.duckdb")
+    graph = build_dependency_graph(spec)
+
+    ddl = run_phases(
+        [generate_all_ddl(spec, "duckdb")],
+        graph,
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+    assert ddl.ok, [r.error for r in ddl.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        # Tie tables declare no key; the load's conflict target needs one
+        connection.execute(
+            "CREATE UNIQUE INDEX tie_key "
+            "ON CU_OR_customer_order (CU_ID_customer, OR_ID_order)"
+        )
+        for table, columns, rows in (
+            ("stg_customers", "nk, CU_ID", [("c1", 10), ("c2", 20)]),
+            ("stg_orders", "nk, OR_ID", [("o1", 100), ("o2", 200)]),
+            (
+                "stg_placed",
+                "customer_id, order_no",
+                [("c1", "o1"), ("c2", "o2"), ("c9", "o1")],
+            ),
+        ):
+            insert = f"INSERT INTO {table} ({columns}, metadata_recorded_at) "
+            connection.executemany(insert + "VALUES (?, ?, NOW())", rows)
+
+    report = run_phases(
+        [generate_all_dml(spec, "duckdb")],
+        graph,
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+
+    assert report.ok, [r.error for r in report.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT CU_ID_customer, OR_ID_order FROM CU_OR_customer_order "
+            "ORDER BY CU_ID_customer"
+        ).fetchall() == [(10, 100), (20, 200)]
+
+
+def test_duckdb_resolves_tie_roles_of_anchors_first_loaded_by_another_source(
+    tmp_path,
+):
+    """Tie keysets resolve against every source of a multi-source anchor."""
+    customer = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        staging_mappings=[
+            StagingMapping(
+                system=system,
+                tenant="ACME",
+                table=f"stg_{system.lower()}",
+                natural_key_columns=["nk"],
+                columns=[
+                    StagingColumn(name="nk", type="varchar(20)"),
+                    StagingColumn(name="CU_ID", type="bigint"),
+                ],
+            )
+            for system in ("CRM", "ERP")
+        ],
+    )
+    tie = Tie(
+        roles=[Role(type_="CU", role="customer"), Role(type_="CU", role="referrer")],
+        staging_mappings=[
+            TieStagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_referrals",
+                natural_key_columns={
+                    "customer": ["customer_id"],
+                    "referrer": ["referrer_id"],
+                },
+                columns=[
+                    StagingColumn(name="customer_id", type="varchar(20)"),
+                    StagingColumn(name="referrer_id", type="varchar(20)"),
+                ],
+            )
+        ],
+    )
+    spec = Spec(anchors=[customer], ties=[tie])
+    database = str(tmp_path / "dab.duckdb")
+    graph = build_dependency_graph(spec)
+
+    ddl = run_phases(
+        [generate_all_ddl(spec, "duckdb")],
+        graph,
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+    assert ddl.ok, [r.error for r in ddl.results if r.error]
+
+    with closing(duckdb.connect(database)) as connection:
+        # Tie tables declare no key; the load's conflict target needs one
+        connection.execute(
+            "CREATE UNIQUE INDEX tie_key "
+            "ON CU_CU_customer_referrer (CU_ID_customer, CU_ID_referrer)"
+        )
+
+    # The CRM loads both customers first; the ERP stages them later
+    for batch in (
+        [("stg_crm", "nk, CU_ID", [("k1", 10), ("k2", 20)])],
+        [
+            ("stg_erp", "nk, CU_ID", [("e1", 10), ("e2", 20)]),
+            ("stg_referrals", "customer_id, referrer_id", [("e1", "e2"), ("e1", "e9")]),
+        ],
+    ):
+        with closing(duckdb.connect(database)) as connection:
+            for table, columns, rows in batch:
+                insert = f"INSERT INTO {table} ({columns}, metadata_recorded_at) "
+                connection.executemany(insert + "VALUES (?, ?, NOW())", rows)
+        report = run_phases(
+            [generate_all_dml(spec, "duckdb")],
+            graph,
+            duckdb_connector(database),
+            read="duckdb",
+            write="duckdb",
+        )
+        assert report.ok, [r.error for r in report.results if r.error]
+
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT metadata_id FROM CU_Customer ORDER BY CU_ID"
+        ).fetchall() == [("Customer@CRM~ACME|k1",), ("Customer@CRM~ACME|k2",)]
+        assert connection.execute(
+            "SELECT CU_ID_customer, CU_ID_referrer FROM CU_CU_customer_referrer"
+        ).fetchall() == [(10, 20)]
+
+
+def test_duckdb_keymap_assigns_stable_identities(tmp_path):
+    """Key maps number new keysets from their sequence once and reuse them."""
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        keymap=True,
+        attributes=[
+            Attribute(mnemonic="NAM", descriptor="Name", data_range="varchar(40)")
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                columns=[
+                    StagingColumn(name="customer_id", type="varchar(20)"),
+                    StagingColumn(name="CU_NAM_Customer_Name", type="varchar(40)"),
+                ],
+            )
+        ],
+    )
+    spec = Spec(anchors=[anchor])
+    database = str(tmp_path / "dab.duckdb")
+    graph = build_dependency_graph(spec)
+    dml = generate_all_dml(spec, "duckdb")
+
+    def run(phases, rows=None):
+        if rows:
+            with closing(duckdb.connect(database)) as connection:
+                connection.executemany(
+                    "INSERT INTO stg_customers (customer_id, CU_NAM_Customer_Name, "
+                    "metadata_recorded_at) VALUES (?, ?, NOW())",
+                    rows,
+                )
+        report = run_phases(
+            phases, graph, duckdb_connector(database), read="duckdb", write="duckdb"
+        )
+        assert report.ok, [r.error for r in report.results if r.error]
+
+    run([generate_all_ddl(spec, "duckdb")])
+    run([dml], [("c2", "Bob"), ("c1", "Ann")])
+    run([dml], [("c1", "Ann"), ("c3", "Cid")])
+
+    with closing(duckdb.connect(database)) as connection:
+        identities = dict(
+            connection.execute(
+                "SELECT keyset_id, CU_ID FROM CU_Customer_keymap"
+            ).fetchall()
+        )
+        assert {identities[f"Customer@ERP~ACME|c{i}"] for i in (1, 2)} == {1, 2}
+        assert identities["Customer@ERP~ACME|c3"] == 3
+        assert connection.execute(
+            "SELECT keymap.keyset_id, name.CU_NAM_Customer_Name "
+            "FROM CU_NAM_Customer_Name AS name "
+            "INNER JOIN CU_Customer_keymap AS keymap ON keymap.CU_ID = name.CU_ID "
+            "ORDER BY keymap.keyset_id"
+        ).fetchall() == [
+            ("Customer@ERP~ACME|c1", "Ann"),
+            ("Customer@ERP~ACME|c2", "Bob"),
+            ("Customer@ERP~ACME|c3", "Cid"),
+        ]
+        assert connection.execute("SELECT COUNT(*) FROM CU_Customer").fetchone() == (3,)
+
+
+def test_duckdb_seeded_keymap_numbers_after_loaded_identities(tmp_path):
+    """A key map added to loaded anchors hands out identities after theirs."""
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                columns=[StagingColumn(name="customer_id", type="varchar(20)")],
+            )
+        ],
+    )
+    old = Spec(anchors=[anchor])
+    new = Spec(anchors=[anchor.model_copy(update={"keymap": True})])
+    database = str(tmp_path / "dab.duckdb")
+
+    with closing(duckdb.connect(database)) as connection:
+        for sql in generate_all_ddl(old, "duckdb").values():
+            for statement in split_statements(sql, "duckdb", "duckdb"):
+                connection.execute(statement)
+        connection.execute(
+            "INSERT INTO CU_Customer VALUES "
+            "(5, NOW(), 'architect', 'Customer@ERP~ACME|c1'), "
+            "(9, NOW(), 'architect', 'Customer@ERP~ACME|c2')"
+        )
+        for sql in generate_migration(old, new, "duckdb").values():
+            for statement in split_statements(sql, "duckdb", "duckdb"):
+                connection.execute(statement)
+        connection.execute(
+            "INSERT INTO stg_customers (customer_id, metadata_recorded_at) "
+            "VALUES ('c1', NOW()), ('c3', NOW())"
+        )
+        keymap_load = generate_all_dml(new, "duckdb")["CU_Customer_keymap_load.sql"]
+        connection.execute(keymap_load)
+
+        assert connection.execute(
+            "SELECT keyset_id, CU_ID FROM CU_Customer_keymap ORDER BY CU_ID"
+        ).fetchall() == [
+            ("Customer@ERP~ACME|c1", 5),
+            ("Customer@ERP~ACME|c2", 9),
+            ("Customer@ERP~ACME|c3", 10),
+        ]
+
+
+def test_duckdb_suppresses_late_arriving_restatements(tmp_path):
+    """Late versions repeating a neighbouring version are not loaded."""
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(40)",
+                time_range="datetime",
+                metadata={"restatable": False},
+            )
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                columns=[
+                    StagingColumn(name="customer_id", type="varchar(20)"),
+                    StagingColumn(name="CU_ID", type="bigint"),
+                    StagingColumn(name="CU_NAM_Customer_Name", type="varchar(40)"),
+                    StagingColumn(name="changed_at", type="timestamp"),
+                ],
+            )
+        ],
+    )
+    spec = Spec(anchors=[anchor])
+    database = str(tmp_path / "dab.duckdb")
+    graph = build_dependency_graph(spec)
+    dml = generate_all_dml(spec, "duckdb")
+
+    def run(phases, rows=None):
+        if rows:
+            with closing(duckdb.connect(database)) as connection:
+                connection.executemany(
+                    "INSERT INTO stg_customers (customer_id, CU_ID, "
+                    "CU_NAM_Customer_Name, changed_at, metadata_recorded_at) "
+                    "VALUES (?, ?, ?, ?, NOW())",
+                    rows,
+                )
+        report = run_phases(
+            phases, graph, duckdb_connector(database), read="duckdb", write="duckdb"
+        )
+        assert report.ok, [r.error for r in report.results if r.error]
+
+    run([generate_all_ddl(spec, "duckdb")])
+    run(
+        [dml],
+        [
+            ("c1", 1, "Ann", datetime(2024, 1, 1)),
+            ("c1", 1, "Anna", datetime(2024, 3, 1)),
+        ],
+    )
+    run(
+        [dml],
+        [
+            ("c1", 1, "Ann", datetime(2024, 2, 1)),  # Repeats January
+            ("c1", 1, "Anna", datetime(2024, 2, 15)),  # March would repeat it
+            ("c1", 1, "Annie", datetime(2024, 4, 1)),
+            ("c1", 1, "Annie", datetime(2024, 5, 1)),  # Repeats April
+            ("c1", 1, "Anna", datetime(2024, 6, 1)),
+        ],
+    )
+
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT CU_NAM_Customer_Name, CAST(changed_at AS DATE) "
+            "FROM CU_NAM_Customer_Name ORDER BY changed_at"
+        ).fetchall() == [
+            ("Ann", date(2024, 1, 1)),
+            ("Anna", date(2024, 3, 1)),
+            ("Annie", date(2024, 4, 1)),
+            ("Anna", date(2024, 6, 1)),
+        ]
+
+
+def test_duckdb_suppresses_tie_restatements_of_non_leading_identifier(tmp_path):
+    """Reloading an unchanged tie version adds nothing, whatever the role order."""
+    tie = Tie(
+        roles=[
+            Role(type_="ST", role="at"),
+            Role(type_="PR", role="of", identifier=True),
+        ],
+        time_range="datetime",
+        metadata={"restatable": False},
+    )
+    spec = Spec(
+        anchors=[
+            Anchor(mnemonic="ST", descriptor="Stage", identity="bigint"),
+            Anchor(mnemonic="PR", descriptor="Program", identity="bigint"),
+        ],
+        ties=[tie],
+    )
+    database = str(tmp_path / "dab.duckdb")
+    graph = build_dependency_graph(spec)
+    dml = {
+        name: sql
+        for name, sql in generate_all_dml(spec, "duckdb").items()
+        if name.startswith("PR_ST_")
+    }
+
+    ddl = run_phases(
+        [generate_all_ddl(spec, "duckdb")],
+        graph,
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+    assert ddl.ok, [r.error for r in ddl.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        connection.execute(
+            "CREATE TABLE stg_PR_ST_of_at (ST_ID_at BIGINT, PR_ID_of BIGINT, "
+            "changed_at TIMESTAMP, metadata_recorded_at TIMESTAMP)"
+        )
+        # Tie tables declare no key; the load's conflict target needs one
+        connection.execute(
+            "CREATE UNIQUE INDEX tie_key ON PR_ST_of_at (ST_ID_at, PR_ID_of, changed_at)"
+        )
+
+    for changed_at in (datetime(2024, 1, 1), datetime(2024, 2, 1)):
+        with closing(duckdb.connect(database)) as connection:
+            connection.execute("DELETE FROM stg_PR_ST_of_at")
+            connection.execute(
+                "INSERT INTO stg_PR_ST_of_at VALUES (10, 100, ?, NOW())", [changed_at]
+            )
+        report = run_phases(
+            [dml], graph, duckdb_connector(database), read="duckdb", write="duckdb"
+        )
+        assert report.ok, [r.error for r in report.results if r.error]
+
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT ST_ID_at, PR_ID_of, CAST(changed_at AS DATE) FROM PR_ST_of_at"
+        ).fetchall() == [(10, 100, date(2024, 1, 1))]
+
+
+def test_duckdb_loads_nexus_with_roles_in_one_pass(tmp_path):
+    """Nexus rows land with their role IDs; attributes load alongside."""
+    nexus = Nexus(
+        mnemonic="EV",
+        descriptor="Event",
+        identity="bigint",
+        attributes=[
+            Attribute(mnemonic="NAM", descriptor="Name", data_range="varchar(40)")
+        ],
+        roles=[
+            Role(type_="ST", role="at", identifier=True),
+            Role(type_="PR", role="of"),
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_events",
+                natural_key_columns=["event_id"],
+                columns=[
+                    StagingColumn(name="event_id", type="varchar(20)"),
+                    StagingColumn(name="EV_ID", type="bigint"),
+                    StagingColumn(name="ST_ID_at", type="bigint"),
+                    StagingColumn(name="PR_ID_of", type="bigint"),
+                    StagingColumn(name="EV_NAM_Event_Name", type="varchar(40)"),
+                ],
+            )
+        ],
+    )
+    spec = Spec(
+        anchors=[
+            Anchor(mnemonic="ST", descriptor="Stage", identity="bigint"),
+            Anchor(mnemonic="PR", descriptor="Program", identity="bigint"),
+        ],
+        nexuses=[nexus],
+    )
+    database = str(tmp_path / "dab.duckdb")
+    graph = build_dependency_graph(spec)
+
+    ddl = run_phases(
+        [generate_all_ddl(spec, "duckdb")],
+        graph,
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+    assert ddl.ok, [r.error for r in ddl.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        connection.executemany(
+            "INSERT INTO stg_events (event_id, EV_ID, ST_ID_at, PR_ID_of, "
+            "EV_NAM_Event_Name, metadata_recorded_at) VALUES (?, ?, ?, ?, ?, NOW())",
+            [("e1", 1, 10, 100, "Gala"), ("e2", 2, 20, None, "Fair")],
+        )
+
+    dml = {
+        name: sql
+        for name, sql in generate_all_dml(spec, "duckdb").items()
+        if name.startswith("EV_")
+    }
+    report = run_phases(
+        [dml], graph, duckdb_connector(database), read="duckdb", write="duckdb"
+    )
+
+    assert report.ok, [r.error for r in report.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT EV_ID, ST_ID_at, PR_ID_of, metadata_id FROM EV_Event ORDER BY EV_ID"
+        ).fetchall() == [
+            (1, 10, 100, "Event@ERP~ACME|e1"),
+            (2, 20, None, "Event@ERP~ACME|e2"),
+        ]
+        assert connection.execute(
+            "SELECT EV_ID, EV_NAM_Event_Name FROM EV_NAM_Event_Name ORDER BY EV_ID"
+        ).fetchall() == [(1, "Gala"), (2, "Fair")]
+        assert connection.execute(
+            "SELECT index_name FROM duckdb_indexes() "
+            "WHERE table_name = 'EV_Event' ORDER BY index_name"
+        ).fetchall() == [("EV_Event_PR_ID_of",), ("EV_Event_ST_ID_at",)]
+
+
+def test_duckdb_orders_fanout_scripts_after_knot_and_before_tie_loads(tmp_path):
+    """Fan-out scripts run after the knot loads and before the tie loads."""
+    anchors = [
+        Anchor(
+            mnemonic="PR",
+            descriptor="Product",
+            identity="bigint",
+            attributes=[
+                Attribute(mnemonic="CAT", descriptor="Category", knot_range="CAT")
+            ],
+            staging_mappings=[
+                StagingMapping(
+                    system="ERP",
+                    tenant="ACME",
+                    table="stg_products",
+                    natural_key_columns=["nk"],
+                    columns=[
+                        StagingColumn(name="nk", type="varchar(20)"),
+                        StagingColumn(name="PR_ID", type="bigint"),
+                        StagingColumn(name="category", type="varchar(20)"),
+                    ],
+                    knot_values={"CAT": "category"},
+                )
+            ],
+        ),
+        Anchor(
+            mnemonic="SU",
+            descriptor="Supplier",
+            identity="bigint",
+            staging_mappings=[
+                StagingMapping(
+                    system="ERP",
+                    tenant="ACME",
+                    table="stg_suppliers",
+                    natural_key_columns=["nk"],
+                    columns=[
+                        StagingColumn(name="nk", type="varchar(20)"),
+                        StagingColumn(name="SU_ID", type="bigint"),
+                    ],
+                )
+            ],
+        ),
+    ]
+    tie = Tie(
+        roles=[Role(type_="PR", role="product"), Role(type_="SU", role="supplier")],
+        staging_mappings=[
+            TieStagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_supplies",
+                natural_key_columns={
+                    "product": ["product_id"],
+                    "supplier": ["supplier_id"],
+                },
+                columns=[
+                    StagingColumn(name="product_id", type="varchar(20)"),
+                    StagingColumn(name="supplier_id", type="varchar(20)"),
+                ],
+            )
+        ],
+    )
+    knot = Knot(
+        mnemonic="CAT", descriptor="Category", identity="int", data_range="varchar(20)"
+    )
+    spec = Spec(anchors=anchors, knots=[knot], ties=[tie])
+    database = str(tmp_path / "dab.duckdb")
+    ddl = generate_all_ddl(spec, "duckdb")
+    dml = generate_all_dml(spec, "duckdb", fanout=True)
+    assert "stg_products_load.sql" in dml
+
+    def run(phases):
+        return run_phases(
+            phases,
+            build_dependency_graph(spec),
+            duckdb_connector(database),
+            read="duckdb",
+            write="duckdb",
+            jobs=4,
+            dependencies=build_asset_dependencies(spec, [*ddl, *dml]),
+        )
+
+    assert run([ddl]).ok
+    with closing(duckdb.connect(database)) as connection:
+        connection.execute(
+            "CREATE UNIQUE INDEX tie_key "
+            "ON PR_SU_product_supplier (PR_ID_product, SU_ID_supplier)"
+        )
+        for table, columns, rows in (
+            (
+                "stg_products",
+                "nk, PR_ID, category",
+                [("p1", 1, "Tea"), ("p2", 2, "Jam")],
+            ),
+            ("stg_suppliers", "nk, SU_ID", [("s1", 10)]),
+            ("stg_supplies", "product_id, supplier_id", [("p1", "s1"), ("p2", "s1")]),
+        ):
+            insert = f"INSERT INTO {table} ({columns}, metadata_recorded_at) "
+            placeholders = "?, " * len(rows[0])
+            connection.executemany(insert + f"VALUES ({placeholders}NOW())", rows)
+
+    report = run([dml])
+
+    assert report.ok, [r.error for r in report.results if r.error]
+    order = [r.node for r in report.results]
+    assert order.index("CAT_Category") < order.index("stg_products")
+    assert order.index("stg_products") < order.index("PR_SU_product_supplier")
+    with closing(duckdb.connect(database)) as connection:
+        assert connection.execute(
+            "SELECT attr.PR_ID, knot.CAT_Category FROM PR_CAT_Product_Category AS attr "
+            "INNER JOIN CAT_Category AS knot ON knot.CAT_ID = attr.CAT_ID "
+            "ORDER BY attr.PR_ID"
+        ).fetchall() == [(1, "Tea"), (2, "Jam")]
+        assert connection.execute(
+            "SELECT PR_ID_product, SU_ID_supplier FROM PR_SU_product_supplier "
+            "ORDER BY PR_ID_product"
+        ).fetchall() == [(1, 10), (2, 10)]
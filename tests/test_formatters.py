@@ -28,7 +28,7 @@ def test_format_raw_preserves_existing_newline() -> None:
 def test_format_bruin_has_frontmatter() -> None:
     """Bruin format should include frontmatter delimiters."""
     sql = "SELECT 1"
-    result = format_bruin(sql, "AC_Actor", "ddl", False)
+    result = format_bruin(sql, "AC_Actor")
     assert "/* @bruin" in result
     assert "@bruin */" in result
 
@@ -36,33 +36,41 @@ def test_format_bruin_has_frontmatter() -> None:
 def test_format_bruin_entity_name() -> None:
     """Bruin frontmatter should include entity name in asset name."""
     sql = "SELECT 1"
-    result = format_bruin(sql, "AC_Actor", "ddl", False)
+    result = format_bruin(sql, "AC_Actor")
     assert "name: dab.AC_Actor" in result
 
 
-def test_format_bruin_historized_uses_merge() -> None:
-    """DML with historized entity should use merge strategy."""
-    sql = "MERGE INTO foo"
-    result = format_bruin(sql, "AC_NAM", "dml", is_historized=True)
-    assert "strategy: merge" in result
+def test_format_bruin_dml_runs_as_written() -> None:
+    """Loads do their own upserts, so Bruin must not materialize them."""
+    for sql in (
+        "INSERT INTO foo SELECT 1 ON CONFLICT DO NOTHING",
+        "MERGE INTO foo USING bar ON 1 = 1",
+        "BEGIN; COMMIT;",
+    ):
+        result = format_bruin(sql, "AC_NAM_load")
+        assert "materialization:" not in result
+        assert "strategy:" not in result
+        assert "columns:" not in result
+        assert result.endswith(sql)
 
 
-def test_format_bruin_static_uses_create_replace() -> None:
-    """DML with static entity should use create+replace strategy."""
-    sql = "INSERT INTO foo"
-    result = format_bruin(sql, "AC_NAM", "dml", is_historized=False)
-    assert "strategy: create+replace" in result
+def test_format_bruin_ddl_has_no_materialization() -> None:
+    """DDL files should run as written, never as create+replace."""
+    result = format_bruin("CREATE TABLE foo", "AC_Actor")
+    assert "materialization:" not in result
+
 
+def test_format_bruin_emits_depends() -> None:
+    """Upstream assets should be listed under depends."""
+    sql = "INSERT INTO foo"
+    result = format_bruin(sql, "AC_NAM_Actor_Name_load", depends=["AC_Actor_load"])
+    assert "depends:\n    - dab.AC_Actor_load\n@bruin */" in result
 
-def test_format_bruin_ddl_uses_create_replace() -> None:
-    """DDL files should always use create+replace strategy."""
-    sql = "CREATE TABLE foo"
-    result = format_bruin(sql, "AC_Actor", "ddl", is_historized=False)
-    assert "strategy: create+replace" in result
 
-    # Even if is_historized=True, DDL should still use create+replace
-    result_hist = format_bruin(sql, "AC_Actor", "ddl", is_historized=True)
-    assert "strategy: create+replace" in result_hist
+def test_format_bruin_omits_empty_depends() -> None:
+    """Assets without upstream assets should have no depends key."""
+    result = format_bruin("CREATE TABLE foo", "AC_Actor", depends=[])
+    assert "depends:" not in result
 
 
 def test_write_output_creates_files(tmp_path: Path) -> None:
@@ -124,7 +132,7 @@ def test_write_output_with_bruin_formatter(tmp_path: Path) -> None:
     files = {"AC_Actor.sql": "CREATE TABLE AC_Actor"}
 
     def bruin_formatter(sql: str) -> str:
-        return format_bruin(sql, "AC_Actor", "ddl", False)
+        return format_bruin(sql, "AC_Actor")
 
     write_output(files, tmp_path, bruin_formatter, "ddl")
 
@@ -0,0 +1,204 @@
+"""Tests for incremental regeneration of edited specs."""
+
+import pytest
+
+from data_architect.generation.incremental import (
+    Rendered,
+    changed_entities,
+    render_spec,
+    rerender_spec,
+)
+from data_architect.models.anchor import Anchor, Attribute
+from data_architect.models.knot import Knot
+from data_architect.models.spec import Spec
+from data_architect.models.staging import (
+    StagingColumn,
+    StagingMapping,
+    TieStagingMapping,
+)
+from data_architect.models.tie import Role, Tie
+
+
+def _mapping(table: str, key: str, watermark: bool = False) -> StagingMapping:
+    columns = [StagingColumn(name=key, type="varchar(20)")]
+    if watermark:
+        columns.append(StagingColumn(name="changed_at", type="timestamp"))
+    return StagingMapping(
+        system="ERP",
+        tenant="ACME",
+        table=table,
+        natural_key_columns=[key],
+        columns=columns,
+        watermark_column="changed_at" if watermark else None,
+    )
+
+
+def _spec(
+    name_range: str = "varchar(42)",
+    gender_range: str = "varchar(10)",
+    person_table: str = "stg_persons",
+    actor_watermark: bool = False,
+    store_watermark: bool = False,
+    tie: bool = True,
+    metadata: dict[str, str] | None = None,
+) -> Spec:
+    """An actor tied to a person, a gender knot and an unrelated store."""
+    actor = Anchor(
+        mnemonic="AC",
+        descriptor="Actor",
+        identity="int",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range=name_range,
+                time_range="datetime",
+            ),
+            Attribute(mnemonic="GEN", descriptor="Gender", knot_range="GEN"),
+        ],
+        staging_mappings=[_mapping("stg_actors", "actor_id", actor_watermark)],
+    )
+    person = Anchor(
+        mnemonic="PN",
+        descriptor="Person",
+        identity="int",
+        attributes=[
+            Attribute(mnemonic="NAM", descriptor="Name", data_range="varchar(42)")
+        ],
+        staging_mappings=[_mapping(person_table, "person_id")],
+    )
+    store = Anchor(
+        mnemonic="ST",
+        descriptor="Store",
+        identity="int",
+        attributes=[
+            Attribute(mnemonic="NAM", descriptor="Name", data_range="varchar(42)")
+        ],
+        staging_mappings=[_mapping("stg_stores", "store_id", store_watermark)],
+    )
+    gender = Knot(
+        mnemonic="GEN", descriptor="Gender", identity="int", data_range=gender_range
+    )
+    ties = [
+        Tie(
+            roles=[Role(type_="AC", role="subset"), Role(type_="PN", role="of")],
+            staging_mappings=[
+                TieStagingMapping(
+                    system="ERP",
+                    tenant="ACME",
+                    table="stg_casting",
+                    natural_key_columns={
+                        "subset": ["actor_id"],
+                        "of": ["person_id"],
+                    },
+                )
+            ],
+        )
+    ]
+    return Spec(
+        anchors=[actor, person, store],
+        knots=[gender],
+        ties=ties if tie else [],
+        metadata_=metadata,
+    )
+
+
+def _assert_matches_full_render(previous: Rendered, spec: Spec) -> Rendered:
+    rendered, _ = rerender_spec(previous, spec)
+    full = render_spec(
+        spec,
+        previous.dialect,
+        consolidate=previous.consolidate,
+        fanout=previous.fanout,
+    )
+    assert rendered.ddl == full.ddl
+    assert rendered.dml == full.dml
+    return rendered
+
+
+def test_changed_entities_added_removed_and_redefined():
+    """Entities are matched by table name and compared by definition."""
+    old = _spec()
+    new = _spec(name_range="varchar(100)", tie=False)
+
+    assert changed_entities(old, old) == set()
+    assert changed_entities(old, new) == {"AC_Actor", "AC_PN_subset_of"}
+
+
+@pytest.mark.parametrize("dialect", ["postgres", "tsql", "snowflake"])
+@pytest.mark.parametrize(
+    "edit",
+    [
+        {"name_range": "varchar(100)"},
+        {"gender_range": "varchar(20)"},
+        {"tie": False},
+        {"person_table": "stg_actors"},
+        {"actor_watermark": True},
+        {"store_watermark": True},
+    ],
+)
+def test_rerender_matches_full_render(dialect, edit):
+    """Every edit yields the files a full render of the edited spec does."""
+    previous = render_spec(_spec(), dialect)
+    edited = _assert_matches_full_render(previous, _spec(**edit))
+
+    # And back again
+    _assert_matches_full_render(edited, _spec())
+
+
+@pytest.mark.parametrize(("consolidate", "fanout"), [(True, False), (False, True)])
+def test_rerender_keeps_load_options(consolidate, fanout):
+    """Consolidated and fan-out loads are regenerated the same way."""
+    previous = render_spec(
+        _spec(person_table="stg_actors"),
+        "postgres",
+        consolidate=consolidate,
+        fanout=fanout,
+    )
+    rendered = _assert_matches_full_render(
+        previous, _spec(person_table="stg_actors", gender_range="text")
+    )
+    assert (rendered.consolidate, rendered.fanout) == (consolidate, fanout)
+    if fanout:
+        assert "stg_actors_load.sql" in rendered.dml
+
+
+def test_rerender_keeps_files_of_unaffected_entities():
+    """Files of entities an edit does not reach are reused as they were."""
+    previous = render_spec(_spec(), "postgres")
+    rendered, changed = rerender_spec(previous, _spec(name_range="varchar(100)"))
+
+    assert changed == {"AC_Actor"}
+    assert rendered.ddl["ST_Store.sql"] is previous.ddl["ST_Store.sql"]
+    assert (
+        rendered.dml["ST_NAM_Store_Name_load.sql"]
+        is (previous.dml["ST_NAM_Store_Name_load.sql"])
+    )
+    assert (
+        rendered.ddl["AC_NAM_Actor_Name.sql"] != previous.ddl["AC_NAM_Actor_Name.sql"]
+    )
+
+
+def test_rerender_load_control_shared_by_unaffected_entity():
+    """The load-control table stays while any mapping still needs it."""
+    both = render_spec(_spec(actor_watermark=True, store_watermark=True), "postgres")
+
+    rendered = _assert_matches_full_render(both, _spec(store_watermark=True))
+    assert "dab_load_control.sql" in rendered.ddl
+    rendered = _assert_matches_full_render(rendered, _spec())
+    assert "dab_load_control.sql" not in rendered.ddl
+
+
+def test_rerender_unchanged_and_metadata_edits():
+    """No edit reuses every file; edits outside the entities render all."""
+    previous = render_spec(_spec(), "postgres")
+
+    rendered, changed = rerender_spec(previous, _spec())
+    assert changed == set()
+    assert rendered.ddl is previous.ddl
+
+    rendered, changed = rerender_spec(previous, _spec(metadata={"owner": "dwh"}))
+    assert changed == set()
+    assert rendered.spec.metadata_ == {"owner": "dwh"}
+    assert rendered.ddl == previous.ddl
+    assert rendered.ddl is not previous.ddl
@@ -0,0 +1,121 @@
+"""Tests for key maps assigning integer identities to keysets."""
+
+from contextlib import closing
+
+import pytest
+
+from data_architect.generation.ddl import build_keymap_table
+from data_architect.generation.keyset_sql import build_composite_natural_key_expr
+from data_architect.identity import (
+    assign_identities,
+    lookup_identities,
+    natural_keyset,
+    staging_keyset,
+)
+from data_architect.identity.keymap import build_keymap_lookup
+from data_architect.models.anchor import Anchor
+from data_architect.models.staging import StagingMapping
+
+
+def _anchor() -> Anchor:
+    return Anchor(
+        mnemonic="OR",
+        descriptor="Order",
+        identity="bigint",
+        keymap=True,
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_orders",
+                natural_key_columns=["order_no", "line"],
+            )
+        ],
+    )
+
+
+# ============================================================================
+# Keyset Tests
+# ============================================================================
+
+
+def test_natural_keyset_joins_composite_keys_before_escaping():
+    """Composite values join with ':' and the result is escaped once."""
+    assert natural_keyset("Order", "ERP", "ACME", ["A|7", 2]) == "Order@ERP~ACME|A||7:2"
+    assert natural_keyset("Order", "ERP", "ACME", ["A7", None]) is None
+
+
+def test_staging_keyset_reads_natural_key_columns():
+    """A staging row is keyed like the generated keyset column."""
+    anchor = _anchor()
+    mapping = anchor.staging_mappings[0]
+
+    assert (
+        staging_keyset(anchor, mapping, {"order_no": "A7", "line": "2", "x": 1})
+        == "Order@ERP~ACME|A7:2"
+    )
+    assert staging_keyset(anchor, mapping, {"order_no": "A7"}) is None
+
+
+def test_natural_keyset_matches_generated_sql():
+    """Python and SQL compute the same composite natural key."""
+    duckdb = pytest.importorskip("duckdb")
+    expr = build_composite_natural_key_expr(["order_no", "line"], "duckdb")
+    query = "SELECT " + expr.sql(dialect="duckdb")
+
+    with closing(duckdb.connect()) as connection:
+        (composite,) = connection.execute(
+            query + " FROM (SELECT 'A@7' AS order_no, '2' AS line)"
+        ).fetchone()
+
+    assert natural_keyset("Order", "ERP", "ACME", ["A@7", "2"]) == (
+        f"Order@ERP~ACME|{composite.replace('@', '@@')}"
+    )
+
+
+# ============================================================================
+# Identity Assignment Tests
+# ============================================================================
+
+
+def test_assign_identities_continues_after_highest():
+    """New keysets are numbered in keyset order after the existing ones."""
+    existing = {"Order@ERP~ACME|A1": 1, "Order@ERP~ACME|A3": 5}
+
+    assert assign_identities(
+        existing,
+        ["Order@ERP~ACME|B2", None, "Order@ERP~ACME|A1", "Order@ERP~ACME|B1"],
+    ) == {"Order@ERP~ACME|B1": 6, "Order@ERP~ACME|B2": 7}
+    assert assign_identities({}, ["k"]) == {"k": 1}
+
+
+# ============================================================================
+# Lookup Tests
+# ============================================================================
+
+
+def test_build_keymap_lookup_selects_mapped_keysets():
+    """The lookup reads the key map by its primary key."""
+    sql = build_keymap_lookup(_anchor(), ["b", "a", "b"]).sql(dialect="postgres")
+
+    assert sql == (
+        "SELECT keyset_id, OR_ID FROM OR_Order_keymap WHERE keyset_id IN ('a', 'b')"
+    )
+
+
+def test_lookup_identities_reads_loaded_key_map():
+    """Identities come back per keyset; unmapped keysets are left out."""
+    duckdb = pytest.importorskip("duckdb")
+    anchor = _anchor()
+
+    with closing(duckdb.connect()) as connection:
+        connection.execute(build_keymap_table(anchor, "duckdb").sql(dialect="duckdb"))
+        connection.execute(
+            "INSERT INTO OR_Order_keymap (keyset_id, OR_ID, metadata_recorded_at) "
+            "VALUES ('Order@ERP~ACME|A7:2', 3, NOW())"
+        )
+
+        assert lookup_identities(
+            connection, anchor, ["Order@ERP~ACME|A7:2", "missing"], "duckdb"
+        ) == {"Order@ERP~ACME|A7:2": 3}
+        assert lookup_identities(connection, anchor, [], "duckdb") == {}
@@ -0,0 +1,511 @@
+"""Tests for schema migration generation from spec diffs."""
+
+import re
+
+import pytest
+import sqlglot
+import sqlglot.expressions as sge
+
+from data_architect.generation.migrate import generate_migration, is_widening
+from data_architect.models.anchor import Anchor, Attribute, Materialization
+from data_architect.models.knot import Knot
+from data_architect.models.spec import Spec
+from data_architect.models.staging import (
+    CdcSource,
+    StagingColumn,
+    StagingMapping,
+    StagingSource,
+    TieStagingMapping,
+)
+from data_architect.models.tie import Role, Tie
+
+
+def _spec(
+    name_range: str = "varchar(42)",
+    height_time_range: str | None = None,
+    gender_range: str = "varchar(10)",
+    staging_columns: list[StagingColumn] | None = None,
+    extra_attributes: list[Attribute] | None = None,
+    tie_time_range: str | None = None,
+    source: StagingSource | None = None,
+    cdc: CdcSource | None = None,
+) -> Spec:
+    actor = Anchor(
+        mnemonic="AC",
+        descriptor="Actor",
+        identity="int",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range=name_range,
+                time_range="datetime",
+            ),
+            Attribute(
+                mnemonic="HGT",
+                descriptor="Height",
+                data_range="smallint",
+                time_range=height_time_range,
+            ),
+            Attribute(mnemonic="GEN", descriptor="Gender", knot_range="GEN"),
+            *(extra_attributes or []),
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system="ERP",
+                tenant="ACME",
+                table="stg_actors",
+                natural_key_columns=["actor_id"],
+                columns=staging_columns
+                or [StagingColumn(name="actor_id", type="varchar(20)")],
+                source=source,
+                cdc=cdc,
+            )
+        ],
+    )
+    person = Anchor(mnemonic="PN", descriptor="Person", identity="int")
+    gender = Knot(
+        mnemonic="GEN", descriptor="Gender", identity="int", data_range=gender_range
+    )
+    tie = Tie(
+        roles=[Role(type_="AC", role="subset"), Role(type_="PN", role="of")],
+        time_range=tie_time_range,
+    )
+    return Spec(anchors=[actor, person], knots=[gender], ties=[tie])
+
+
+# ============================================================================
+# Type Widening Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    ("old_type", "new_type", "expected"),
+    [
+        ("varchar(42)", "varchar(100)", True),
+        ("varchar(42)", "VARCHAR(42)", True),
+        ("varchar(42)", "varchar(10)", False),
+        ("varchar(42)", "text", True),
+        ("varchar(42)", "varchar", True),
+        ("smallint", "bigint", True),
+        ("bigint", "int", False),
+        ("decimal(10,2)", "decimal(12,2)", True),
+        ("decimal(10,2)", "decimal(10,3)", False),
+        ("varchar(42)", "int", False),
+    ],
+)
+def test_is_widening(old_type, new_type, expected):
+    """Only changes that keep every existing value are widenings."""
+    assert is_widening(old_type, new_type, "postgres") is expected
+
+
+def test_is_widening_tsql_bare_varchar():
+    """A bare VARCHAR is one character in T-SQL, so it narrows."""
+    assert not is_widening("varchar(42)", "varchar", "tsql")
+    assert is_widening("varchar(42)", "varchar(max)", "tsql")
+
+
+# ============================================================================
+# Migration Tests
+# ============================================================================
+
+
+def test_migration_unchanged_spec_is_empty():
+    """Identical specs need no statements at all."""
+    assert generate_migration(_spec(), _spec(), "postgres") == {}
+
+
+def test_migration_widens_attribute_in_place():
+    """A widened dataRange alters only the attribute table and its views."""
+    files = generate_migration(_spec(), _spec(name_range="varchar(100)"), "postgres")
+
+    assert files["AC_NAM_Actor_Name.sql"] == (
+        "ALTER TABLE AC_NAM_Actor_Name "
+        "ALTER COLUMN AC_NAM_Actor_Name SET DATA TYPE VARCHAR(100);"
+    )
+    # The view reading the column is dropped before the column is altered
+    assert list(files) == [
+        "drop_perspectives.sql",
+        "AC_NAM_Actor_Name.sql",
+        "lAC_Actor.sql",
+        "pAC_Actor.sql",
+        "dAC_Actor.sql",
+    ]
+    assert files["drop_perspectives.sql"] == "DROP VIEW IF EXISTS lAC_Actor;"
+    assert files["lAC_Actor.sql"].startswith("CREATE OR REPLACE VIEW lAC_Actor")
+    assert files["pAC_Actor.sql"].startswith("DROP FUNCTION IF EXISTS pAC_Actor;")
+
+
+def test_migration_drops_materialized_latest_before_altering():
+    """A materialized view reading an altered column is dropped up front."""
+    old, new = _spec(), _spec(name_range="varchar(100)")
+    for spec in (old, new):
+        spec.anchors[0] = spec.anchors[0].model_copy(
+            update={"materialize": Materialization()}
+        )
+    files = generate_migration(old, new, "postgres")
+
+    assert list(files)[:2] == ["drop_perspectives.sql", "AC_NAM_Actor_Name.sql"]
+    assert files["drop_perspectives.sql"] == (
+        "DROP MATERIALIZED VIEW IF EXISTS mAC_Actor;\n\nDROP VIEW IF EXISTS lAC_Actor;"
+    )
+    assert files["mAC_Actor.sql"].startswith("CREATE MATERIALIZED VIEW")
+    assert ";;" not in files["mAC_Actor.sql"]
+    assert files["mAC_Actor.sql"].count(";") == 2
+
+
+@pytest.mark.parametrize(
+    ("dialect", "expected"),
+    [
+        ("tsql", "ALTER TABLE GEN_Gender ALTER COLUMN GEN_Gender VARCHAR(20);\nGO"),
+        (
+            "snowflake",
+            "ALTER TABLE GEN_Gender ALTER COLUMN GEN_Gender SET DATA TYPE VARCHAR(20);",
+        ),
+    ],
+)
+def test_migration_widens_knot_per_dialect(dialect, expected):
+    """Knot value widening uses each dialect's ALTER COLUMN syntax."""
+    files = generate_migration(_spec(), _spec(gender_range="varchar(20)"), dialect)
+
+    assert files["GEN_Gender.sql"] == expected
+    # Perspectives of anchors using the knot are recreated without drops
+    assert files["lAC_Actor.sql"].startswith("CREATE OR")
+
+
+def _materialized(spec: Spec, materialize: Materialization | None) -> Spec:
+    """Set the materialization of the actor anchor."""
+    anchors = [
+        spec.anchors[0].model_copy(update={"materialize": materialize}),
+        *spec.anchors[1:],
+    ]
+    return spec.model_copy(update={"anchors": anchors})
+
+
+@pytest.mark.parametrize("dialect", ["tsql", "duckdb"])
+def test_migration_rebuilds_snapshot_of_changed_perspective(dialect):
+    """Snapshot tables are dropped, recreated and refilled, not skipped."""
+    old = _materialized(_spec(), Materialization())
+    new = _materialized(_spec(name_range="varchar(100)"), Materialization())
+    files = generate_migration(old, new, dialect)
+
+    separator = ";\nGO\n\n" if dialect == "tsql" else ";\n\n"
+    statements = files["mAC_Actor.sql"].split(separator)
+    assert statements[0] == "DROP TABLE IF EXISTS mAC_Actor"
+    assert "mAC_Actor" in statements[1]
+    assert statements[-1].startswith("INSERT INTO mAC_Actor")
+
+
+def test_migration_materializes_anchor_with_unchanged_perspective():
+    """Newly materialized anchors get their latest state, nothing else."""
+    files = generate_migration(
+        _spec(), _materialized(_spec(), Materialization()), "postgres"
+    )
+
+    assert list(files) == ["mAC_Actor.sql"]
+    assert files["mAC_Actor.sql"].startswith("CREATE MATERIALIZED VIEW")
+
+
+def test_migration_replaces_materialization_with_new_settings():
+    """Changed settings drop the old materialization before creating it."""
+    old = _materialized(_spec(), Materialization(warehouse="etl"))
+    new = _materialized(_spec(), Materialization(target_lag="5 minutes"))
+
+    files = generate_migration(old, new, "postgres")
+    assert list(files) == ["mAC_Actor.sql"]
+    assert files["mAC_Actor.sql"].startswith(
+        "DROP MATERIALIZED VIEW IF EXISTS mAC_Actor;\n\nCREATE MATERIALIZED VIEW"
+    )
+
+    new = _materialized(_spec(), Materialization(warehouse="etl", target_lag="5 m"))
+    files = generate_migration(old, new, "snowflake")
+    assert "TARGET_LAG='5 m'" in files["mAC_Actor.sql"]
+    assert files["mAC_Actor.sql"].startswith("CREATE OR REPLACE DYNAMIC TABLE")
+
+
+def test_migration_creates_new_objects_only():
+    """New attributes get CREATE TABLE; existing tables are not touched."""
+    weight = Attribute(mnemonic="WGT", descriptor="Weight", data_range="int")
+    files = generate_migration(_spec(), _spec(extra_attributes=[weight]), "postgres")
+
+    assert files["AC_WGT_Actor_Weight.sql"].startswith(
+        "CREATE TABLE IF NOT EXISTS AC_WGT_Actor_Weight"
+    )
+    assert not any(name.startswith(("AC_NAM", "AC_HGT", "GEN")) for name in files)
+
+
+def test_migration_historizes_static_attribute():
+    """A static attribute becoming historized is re-keyed with a backfill."""
+    files = generate_migration(_spec(), _spec(height_time_range="datetime"), "postgres")
+    statements = files["AC_HGT_Actor_Height.sql"].split(";\n\n")
+
+    assert statements[0] == (
+        "ALTER TABLE AC_HGT_Actor_Height ADD COLUMN changed_at TIMESTAMPTZ"
+    )
+    assert statements[2] == (
+        "UPDATE AC_HGT_Actor_Height SET changed_at = metadata_recorded_at, "
+        "recorded_at = metadata_recorded_at"
+    )
+    assert "ALTER COLUMN changed_at SET NOT NULL" in statements[3]
+    assert statements[5] == (
+        "ALTER TABLE AC_HGT_Actor_Height DROP CONSTRAINT ac_hgt_actor_height_pkey"
+    )
+    assert statements[6] == (
+        "ALTER TABLE AC_HGT_Actor_Height ADD PRIMARY KEY (AC_ID, changed_at);"
+    )
+
+
+def test_migration_tsql_runs_each_statement_in_its_own_batch():
+    """T-SQL scripts end every statement with GO, as SQL Server requires."""
+
+    def weight(time_range: str | None) -> list[Attribute]:
+        return [
+            Attribute(
+                mnemonic="WGT",
+                descriptor="Weight",
+                data_range="int",
+                time_range=time_range,
+            )
+        ]
+
+    old = _spec(extra_attributes=weight(None))
+    new = _spec(
+        name_range="varchar(100)",
+        height_time_range="datetime",
+        extra_attributes=weight("datetime"),
+    )
+    files = generate_migration(old, new, "tsql")
+    script = "\n\n".join(f"-- {name}\n{sql}" for name, sql in files.items())
+
+    assert script.endswith(";\nGO")
+    batches = [
+        [e for e in sqlglot.parse(batch, read="tsql") if e is not None]
+        for batch in re.split(r"^GO$", script, flags=re.MULTILINE)
+    ]
+    batches = [batch for batch in batches if batch]
+    for batch in batches:
+        # One statement per batch, or a variable with the EXEC using it
+        kinds = [type(e) for e in batch]
+        assert kinds in ([kinds[0]], [sge.Declare, sge.Command]), batch
+    # Columns are added, backfilled and re-keyed in separate batches
+    updates = [b[0] for b in batches if isinstance(b[0], sge.Update)]
+    assert len(updates) == 2
+    assert sum(isinstance(b[0], sge.Declare) for b in batches) == 2
+    # CREATE OR ALTER VIEW and FUNCTION each start a batch
+    assert sum(isinstance(b[0], sge.Create) for b in batches) == 3
+
+
+def test_migration_rebuilds_keyset_around_widened_natural_key():
+    """Generated keysets are dropped and re-added around natural key widening."""
+    columns = [StagingColumn(name="actor_id", type="varchar(40)")]
+    files = generate_migration(_spec(), _spec(staging_columns=columns), "postgres")
+
+    assert files["stg_actors.sql"].split(";\n\n") == [
+        "ALTER TABLE stg_actors DROP COLUMN keyset_id",
+        "ALTER TABLE stg_actors ALTER COLUMN actor_id SET DATA TYPE VARCHAR(40)",
+        "ALTER TABLE stg_actors ADD COLUMN keyset_id VARCHAR(500) GENERATED ALWAYS "
+        "AS (CASE WHEN actor_id IS NULL THEN NULL ELSE 'Actor@ERP~ACME|' || "
+        "REPLACE(REPLACE(REPLACE(CAST(actor_id AS TEXT), '@', '@@'), '~', '~~'), "
+        "'|', '||') END) STORED;",
+    ]
+    # DuckDB cannot add the generated column back
+    old, new = (
+        _spec(staging_columns=[StagingColumn(name="actor_id", type=type_)])
+        for type_ in ("int", "bigint")
+    )
+    with pytest.raises(ValueError, match="stg_actors: cannot retype natural key"):
+        generate_migration(old, new, "duckdb")
+
+
+def test_migration_historizes_tie_without_primary_key():
+    """A tie becoming historized gains bitemporal columns only."""
+    files = generate_migration(_spec(), _spec(tie_time_range="datetime"), "snowflake")
+    script = files["AC_PN_subset_of.sql"]
+
+    assert "ADD changed_at TIMESTAMPNTZ" in script
+    assert "PRIMARY KEY" not in script
+
+
+def test_migration_adds_staging_columns():
+    """New staging columns are added as nullable columns."""
+    columns = [
+        StagingColumn(name="actor_id", type="varchar(20)"),
+        StagingColumn(name="height", type="smallint"),
+    ]
+    files = generate_migration(_spec(), _spec(staging_columns=columns), "postgres")
+
+    assert files == {
+        "stg_actors.sql": "ALTER TABLE stg_actors ADD COLUMN height SMALLINT;"
+    }
+
+
+def test_migration_rejects_lossy_changes():
+    """Narrowing and un-historizing changes are reported together."""
+    old = _spec(height_time_range="datetime")
+    new = _spec(name_range="varchar(10)")
+
+    with pytest.raises(ValueError, match="Cannot migrate in place") as excinfo:
+        generate_migration(old, new, "postgres")
+    message = str(excinfo.value)
+    assert "AC_NAM_Actor_Name.AC_NAM_Actor_Name: cannot change" in message
+    assert "AC_HGT_Actor_Height: cannot turn a historized attribute static" in message
+
+
+def test_migration_recreates_changed_file_staging():
+    """A changed file source drops and recreates its view and external table."""
+    old = _spec(source=StagingSource(path="/data/actors.csv", format="csv"))
+    new = _spec(
+        source=StagingSource(
+            path="/data/actors.csv", format="csv", options={"header": True}
+        )
+    )
+    files = generate_migration(old, new, "postgres")
+
+    assert list(files) == ["stg_actors_files.sql", "stg_actors.sql"]
+    statements = files["stg_actors_files.sql"].split(";\n\n")
+    assert statements[0] == "DROP VIEW IF EXISTS stg_actors"
+    assert statements[1] == "DROP FOREIGN TABLE IF EXISTS stg_actors_files"
+    assert "header 'true'" in statements[-1]
+    assert files["stg_actors.sql"].startswith("CREATE OR REPLACE VIEW stg_actors")
+
+
+def test_migration_rejects_switching_to_file_source():
+    """A staging table cannot become a file-backed view in place."""
+    new = _spec(source=StagingSource(path="@landing/actors/"))
+
+    with pytest.raises(ValueError, match="stg_actors: cannot switch"):
+        generate_migration(_spec(), new, "snowflake")
+
+
+def test_migration_creates_cdc_source_with_load_control():
+    """A new change feed is enabled along with its load-window table."""
+    new = _spec()
+    mappings = new.anchors[0].staging_mappings
+    mappings.append(
+        mappings[0].model_copy(
+            update={"table": "stg_actor_changes", "cdc": CdcSource(table="actors")}
+        )
+    )
+
+    files = generate_migration(_spec(), new, "tsql")
+
+    assert "sys.sp_cdc_enable_table" in files["stg_actor_changes.sql"]
+    assert "dab_load_control.sql" in files
+
+
+def test_migration_rejects_changing_cdc_source():
+    """A change feed cannot be repointed or dropped in place."""
+    old = _spec(cdc=CdcSource(table="dbo.actors"))
+
+    with pytest.raises(ValueError, match="stg_actors: cannot change a CDC source"):
+        generate_migration(old, _spec(cdc=CdcSource(table="dbo.cast")), "snowflake")
+    with pytest.raises(ValueError, match="stg_actors: cannot change a CDC source"):
+        generate_migration(old, _spec(), "snowflake")
+
+
+def test_migration_adds_tie_staging_and_keyset_index():
+    """A new tie staging mapping creates its table and indexes keysets."""
+    new = _spec()
+    mapping = TieStagingMapping(
+        system="ERP",
+        tenant="ACME",
+        table="stg_casting",
+        natural_key_columns={"subset": ["actor_id"]},
+        columns=[StagingColumn(name="actor_id", type="varchar(20)")],
+    )
+    tie = new.ties[0].model_copy(update={"staging_mappings": [mapping]})
+    new = new.model_copy(update={"ties": [tie]})
+
+    files = generate_migration(_spec(), new, "postgres")
+
+    assert files["AC_Actor.sql"] == (
+        "CREATE INDEX IF NOT EXISTS AC_Actor_metadata_id ON AC_Actor(metadata_id);"
+    )
+    assert files["stg_casting.sql"].startswith("CREATE TABLE IF NOT EXISTS stg_casting")
+    assert "PN_Person.sql" not in files
+
+
+def test_migration_seeds_new_keymap_from_loaded_anchors():
+    """A key map added to a loaded anchor keeps the identities it has."""
+    new = _spec()
+    new = new.model_copy(
+        update={
+            "anchors": [
+                new.anchors[0].model_copy(update={"keymap": True}),
+                *new.anchors[1:],
+            ]
+        }
+    )
+
+    files = generate_migration(_spec(), new, "postgres")
+    statements = files["AC_Actor_keymap.sql"].split(";\n\n")
+
+    assert (
+        statements[0]
+        == "CREATE SEQUENCE IF NOT EXISTS AC_Actor_keymap_seq START WITH 1"
+    )
+    assert statements[1].startswith("CREATE TABLE IF NOT EXISTS AC_Actor_keymap")
+    assert statements[2] == (
+        "INSERT INTO AC_Actor_keymap (keyset_id, AC_ID, metadata_recorded_at, "
+        "metadata_recorded_by, metadata_id) SELECT metadata_id, MIN(AC_ID), "
+        "CURRENT_TIMESTAMP, 'architect', metadata_id FROM AC_Actor "
+        "WHERE metadata_id IS NOT NULL AND metadata_id <> 'architect-generated' "
+        "GROUP BY metadata_id"
+    )
+    # New keysets are numbered after the seeded identities
+    assert statements[3] == (
+        "SELECT SETVAL('AC_Actor_keymap_seq', "
+        "(SELECT COALESCE(MAX(AC_ID), 0) FROM AC_Actor_keymap) + 1, false);"
+    )
+
+
+def test_migration_continues_new_knot_sequence_after_loaded_values():
+    """A knot newly given staged values numbers them after its loaded IDs."""
+    new = _spec()
+    mapping = (
+        new.anchors[0]
+        .staging_mappings[0]
+        .model_copy(update={"knot_values": {"GEN": "gender"}})
+    )
+    new = new.model_copy(
+        update={
+            "anchors": [
+                new.anchors[0].model_copy(update={"staging_mappings": [mapping]}),
+                *new.anchors[1:],
+            ]
+        }
+    )
+
+    files = generate_migration(_spec(), new, "postgres")
+
+    assert files["GEN_Gender.sql"].split(";\n\n") == [
+        "CREATE SEQUENCE IF NOT EXISTS GEN_Gender_seq START WITH 1",
+        "SELECT SETVAL('GEN_Gender_seq', "
+        "(SELECT COALESCE(MAX(GEN_ID), 0) FROM GEN_Gender) + 1, false);",
+    ]
+
+
+def test_migration_creates_nexus_with_role_indexes():
+    """A new nexus is created with its indexes; its roles are then fixed."""
+    from data_architect.models.spec import Nexus
+
+    nexus = Nexus(
+        mnemonic="EV",
+        descriptor="Event",
+        identity="int",
+        attributes=[Attribute(mnemonic="DAT", descriptor="Date", data_range="date")],
+        roles=[Role(type_="AC", role="by")],
+    )
+    new = _spec().model_copy(update={"nexuses": [nexus]})
+
+    files = generate_migration(_spec(), new, "postgres")
+    statements = files["EV_Event.sql"].split(";\n\n")
+    assert statements[0].startswith("CREATE TABLE IF NOT EXISTS EV_Event")
+    assert statements[1] == (
+        "CREATE INDEX IF NOT EXISTS EV_Event_AC_ID_by ON EV_Event(AC_ID_by);"
+    )
+    assert "EV_DAT_Event_Date.sql" in files
+
+    moved = nexus.model_copy(update={"roles": [Role(type_="PN", role="by")]})
+    with pytest.raises(ValueError, match="EV_Event: cannot change nexus roles"):
+        generate_migration(new, new.model_copy(update={"nexuses": [moved]}), "tsql")
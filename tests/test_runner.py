@@ -0,0 +1,309 @@
+"""Tests for the dependency-ordered SQL runner."""
+
+import sqlite3
+import threading
+from contextlib import closing
+
+import pytest
+
+from data_architect.runner import (
+    RunReport,
+    run_phases,
+    split_statements,
+    sqlite_connector,
+)
+
+# Hand-written sqlite SQL keeps these tests independent of generator output
+_DDL = {
+    "GEN_Gender.sql": "CREATE TABLE GEN_Gender (GEN_ID INT PRIMARY KEY, GEN_Gender TEXT)",
+    "CU_Customer.sql": "CREATE TABLE CU_Customer (CU_ID INT PRIMARY KEY)",
+    "CU_GEN_Customer_Gender.sql": (
+        "CREATE TABLE CU_GEN_Customer_Gender ("
+        "CU_ID INT REFERENCES CU_Customer (CU_ID), "
+        "GEN_ID INT REFERENCES GEN_Gender (GEN_ID))"
+    ),
+}
+_DML = {
+    "GEN_Gender_load.sql": "INSERT INTO GEN_Gender VALUES (1, 'F'), (2, 'M')",
+    "CU_Customer_load.sql": "INSERT INTO CU_Customer VALUES (10), (11)",
+    "CU_GEN_Customer_Gender_load.sql": (
+        "INSERT INTO CU_GEN_Customer_Gender "
+        "SELECT CU_ID, 1 FROM CU_Customer WHERE CU_ID = 10"
+    ),
+}
+_GRAPH = {
+    "GEN_Gender": set(),
+    "CU_Customer": set(),
+    "CU_GEN_Customer_Gender": {"CU_Customer", "GEN_Gender"},
+}
+
+
+def _count(database, table: str) -> int:
+    with closing(sqlite3.connect(database)) as connection:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: S608
+
+
+def _run(database, phases, graph=_GRAPH, **kwargs) -> RunReport:
+    return run_phases(
+        phases,
+        graph,
+        sqlite_connector(database),
+        read="sqlite",
+        write="sqlite",
+        **kwargs,
+    )
+
+
+# ============================================================================
+# Statement Splitting Tests
+# ============================================================================
+
+
+def test_split_statements_splits_scripts():
+    """A generated script splits into its statements, dropping empties."""
+    statements = split_statements(
+        "BEGIN;\n\nINSERT INTO t VALUES (1);\n\nCOMMIT;", "postgres", "sqlite"
+    )
+    assert len(statements) == 3
+    assert statements[1] == "INSERT INTO t VALUES (1)"
+
+
+def test_split_statements_transpiles():
+    """Statements are rewritten for the executing engine."""
+    (statement,) = split_statements(
+        "SELECT CAST(x AS TIMESTAMPTZ) FROM t", "postgres", "duckdb"
+    )
+    assert "TIMESTAMPTZ" in statement
+
+
+def test_split_statements_same_dialect_keeps_sql_verbatim():
+    """Without transpiling, statements sqlglot cannot parse still split."""
+    statements = split_statements(
+        "CREATE MACRO m(x := 1) AS TABLE SELECT ';' AS s;\nSELECT 1;",
+        "duckdb",
+        "duckdb",
+    )
+    assert statements == ["CREATE MACRO m(x := 1) AS TABLE SELECT ';' AS s", "SELECT 1"]
+
+
+# ============================================================================
+# Run Tests
+# ============================================================================
+
+
+def test_run_executes_phases_in_dependency_order(tmp_path):
+    """DDL then DML run to completion with dependencies satisfied."""
+    database = tmp_path / "dab.db"
+    report = _run(database, [_DDL, _DML])
+
+    assert report.ok
+    assert _count(database, "GEN_Gender") == 2
+    assert _count(database, "CU_GEN_Customer_Gender") == 1
+    nodes = [result.node for result in report.results]
+    assert nodes.index("CU_GEN_Customer_Gender") > nodes.index("CU_Customer")
+    assert nodes.index("CU_GEN_Customer_Gender") > nodes.index("GEN_Gender")
+
+
+def test_run_records_statement_timings(tmp_path):
+    """Every executed statement has a timing entry."""
+    report = _run(tmp_path / "dab.db", [_DDL, _DML])
+
+    files = [timing.file for timing in report.timings]
+    assert sorted(files) == sorted([*_DDL, *_DML])
+    assert all(timing.seconds >= 0 for timing in report.timings)
+    assert all(timing.attempt == 1 for timing in report.timings)
+
+
+def test_run_wave_executes_concurrently(tmp_path):
+    """Independent objects of one wave run on separate worker threads."""
+    threads: set[int] = set()
+    barrier = threading.Barrier(2, timeout=5)
+    connect = sqlite_connector(tmp_path / "dab.db")
+
+    class _Connection:
+        def __init__(self):
+            self._connection = connect()
+
+        def cursor(self):
+            threads.add(threading.get_ident())
+            barrier.wait()  # both workers must be active at once
+            return self._connection.cursor()
+
+        def commit(self):
+            return self._connection.commit()
+
+        def rollback(self):
+            return self._connection.rollback()
+
+        def close(self):
+            return self._connection.close()
+
+    phase = {k: v for k, v in _DDL.items() if k != "CU_GEN_Customer_Gender.sql"}
+    report = run_phases(
+        [phase], _GRAPH, _Connection, read="sqlite", write="sqlite", jobs=2
+    )
+
+    assert report.ok
+    assert len(threads) == 2
+
+
+def test_run_retries_failed_file(tmp_path):
+    """A failing file is retried after a rollback and succeeds later."""
+    database = tmp_path / "dab.db"
+    attempts: list[int] = []
+    connect = sqlite_connector(database)
+
+    class _FlakyCursor:
+        def __init__(self, cursor):
+            self._cursor = cursor
+
+        def execute(self, operation):
+            attempts.append(1)
+            if len(attempts) == 1:
+                msg = "database is locked"
+                raise sqlite3.OperationalError(msg)
+            return self._cursor.execute(operation)
+
+    class _Connection:
+        def __init__(self):
+            self._connection = connect()
+
+        def cursor(self):
+            return _FlakyCursor(self._connection.cursor())
+
+        def commit(self):
+            return self._connection.commit()
+
+        def rollback(self):
+            return self._connection.rollback()
+
+        def close(self):
+            return self._connection.close()
+
+    report = run_phases(
+        [{"GEN_Gender.sql": _DDL["GEN_Gender.sql"]}],
+        _GRAPH,
+        _Connection,
+        read="sqlite",
+        write="sqlite",
+        retries=1,
+        retry_delay=0,
+    )
+
+    assert report.ok
+    assert report.timings[0].attempt == 2
+    assert _count(database, "GEN_Gender") == 0
+
+
+def test_run_reports_error_after_retries(tmp_path):
+    """A file failing every attempt surfaces its error."""
+    report = _run(
+        tmp_path / "dab.db",
+        [{"GEN_Gender.sql": "SELECT * FROM missing_table"}],
+        retries=1,
+        retry_delay=0,
+    )
+
+    assert not report.ok
+    (result,) = report.results
+    assert result.error is not None
+    assert result.error.startswith("GEN_Gender.sql: ")
+
+
+@pytest.mark.parametrize(
+    ("script", "retried"),
+    [
+        (
+            "INSERT INTO GEN_Gender VALUES (1); INSERT INTO GEN_Gender VALUES (2)",
+            False,
+        ),
+        (
+            "BEGIN; INSERT INTO GEN_Gender VALUES (1); "
+            "INSERT INTO GEN_Gender VALUES (2); COMMIT",
+            True,
+        ),
+    ],
+)
+def test_run_retries_only_files_the_rollback_undoes(tmp_path, script, retried):
+    """Autocommitted statements of a failed file are not run a second time."""
+    database = tmp_path / "dab.db"
+    # No key: a statement run twice would add a duplicate row
+    _run(database, [{"GEN_Gender.sql": "CREATE TABLE GEN_Gender (GEN_ID INT)"}])
+    connect = sqlite_connector(database)
+    failures: list[str] = []
+
+    class _FlakyCursor:
+        def __init__(self, cursor):
+            self._cursor = cursor
+
+        def execute(self, operation):
+            if "(2)" in operation and not failures:
+                failures.append(operation)
+                msg = "database is locked"
+                raise sqlite3.OperationalError(msg)
+            return self._cursor.execute(operation)
+
+    class _Connection:
+        def __init__(self):
+            self._connection = connect()
+
+        def cursor(self):
+            return _FlakyCursor(self._connection.cursor())
+
+        def commit(self):
+            return self._connection.commit()
+
+        def rollback(self):
+            return self._connection.rollback()
+
+        def close(self):
+            return self._connection.close()
+
+    report = run_phases(
+        [{"GEN_Gender_load.sql": script}],
+        _GRAPH,
+        _Connection,
+        read="sqlite",
+        write="sqlite",
+        retries=1,
+        retry_delay=0,
+    )
+
+    assert report.ok is retried
+    assert _count(database, "GEN_Gender") == (2 if retried else 1)
+
+
+def test_run_skips_dependents_of_failed_objects(tmp_path):
+    """Without fail-fast, dependents of a failure are skipped, others run."""
+    ddl = {**_DDL, "GEN_Gender.sql": "SELECT * FROM missing_table"}
+    report = _run(tmp_path / "dab.db", [ddl, _DML], fail_fast=False)
+
+    by_node = {}
+    for result in report.results:
+        by_node.setdefault(result.node, []).append(result)
+    assert by_node["GEN_Gender"][0].error is not None
+    assert by_node["CU_Customer"][0].ok
+    assert by_node["CU_Customer"][1].ok
+    assert all(r.skipped for r in by_node["CU_GEN_Customer_Gender"])
+    assert by_node["GEN_Gender"][1].skipped
+    assert _count(tmp_path / "dab.db", "CU_Customer") == 2
+
+
+def test_run_fail_fast_stops_after_failed_wave(tmp_path):
+    """With fail-fast, nothing is scheduled after the first failed wave."""
+    ddl = {**_DDL, "GEN_Gender.sql": "SELECT * FROM missing_table"}
+    report = _run(tmp_path / "dab.db", [ddl, _DML])
+
+    assert not report.ok
+    assert sorted(result.node for result in report.results) == [
+        "CU_Customer",
+        "GEN_Gender",
+    ]
+
+
+def test_run_rejects_dependency_cycles(tmp_path):
+    """A cyclic graph is reported before anything runs."""
+    graph = {"CU_Customer": {"GEN_Gender"}, "GEN_Gender": {"CU_Customer"}}
+    phase = {k: _DDL[k] for k in ("CU_Customer.sql", "GEN_Gender.sql")}
+    with pytest.raises(ValueError, match="Dependency cycle"):
+        _run(tmp_path / "dab.db", [phase], graph=graph)
@@ -0,0 +1,442 @@
+"""Tests for synthetic staging data."""
+
+from contextlib import closing
+
+import pytest
+from typer.testing import CliRunner
+
+from data_architect.cli import app
+from data_architect.generation.ddl import generate_all_ddl
+from data_architect.generation.dependencies import build_dependency_graph
+from data_architect.generation.dml import generate_all_dml
+from data_architect.generation.views import generate_all_views
+from data_architect.models.anchor import Anchor, Attribute
+from data_architect.models.knot import Knot
+from data_architect.models.spec import Nexus, Spec
+from data_architect.models.staging import (
+    SourceFormat,
+    StagingColumn,
+    StagingMapping,
+    StagingSource,
+    TieStagingMapping,
+)
+from data_architect.models.tie import Role, Tie
+from data_architect.runner import duckdb_connector, run_phases
+from data_architect.synth import SynthTable, classify_columns, synthesize
+
+duckdb = pytest.importorskip("duckdb")
+
+runner = CliRunner()
+
+
+def _anchor(source_directory: str | None = None) -> Anchor:
+    """Customer staged by two overlapping sources, one historized attribute."""
+    columns = [
+        StagingColumn(name="customer_id", type="varchar(20)"),
+        StagingColumn(name="CU_ID", type="bigint"),
+        StagingColumn(name="CU_NAM_Customer_Name", type="varchar(40)"),
+        StagingColumn(name="CU_COU_Customer_Country", type="varchar(2)"),
+        StagingColumn(name="segment", type="varchar(20)"),
+        StagingColumn(name="GEN_ID", type="int"),
+        StagingColumn(name="changed_at", type="timestamp"),
+    ]
+    return Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(40)",
+                time_range="datetime",
+            ),
+            Attribute(mnemonic="COU", descriptor="Country", data_range="varchar(2)"),
+            Attribute(mnemonic="SEG", descriptor="Segment", knot_range="SEG"),
+            Attribute(mnemonic="GEN", descriptor="Gender", knot_range="GEN"),
+        ],
+        staging_mappings=[
+            StagingMapping(
+                system=system,
+                tenant="ACME",
+                table=f"stg_{system}",
+                natural_key_columns=["customer_id"],
+                columns=columns,
+                knot_values={"SEG": "segment"},
+                priority=priority,
+                source=(
+                    StagingSource(path=f"{source_directory}/stg_{system}.parquet")
+                    if source_directory
+                    else None
+                ),
+            )
+            for priority, system in enumerate(["erp", "crm"])
+        ],
+    )
+
+
+def _spec(source_directory: str | None = None) -> Spec:
+    knots = [
+        Knot(mnemonic="SEG", descriptor="Segment", identity="int", data_range="text"),
+        Knot(mnemonic="GEN", descriptor="Gender", identity="int", data_range="text"),
+    ]
+    return Spec(anchors=[_anchor(source_directory)], knots=knots)
+
+
+def _rows(table: SynthTable, order: str = "") -> list[tuple[object, ...]]:
+    query = f"SELECT * FROM '{table.path}'"  # noqa: S608
+    return duckdb.sql(f"{query} ORDER BY {order}" if order else query).fetchall()
+
+
+# ============================================================================
+# Column Tests
+# ============================================================================
+
+
+def test_columns_are_classified_by_role():
+    """Keys, identities, timestamps, values and knot values are told apart."""
+    columns = classify_columns(_anchor(), _anchor().staging_mappings[0], "postgres")
+
+    assert [(c.name, c.role, c.kind, c.historized) for c in columns] == [
+        ("customer_id", "key", "text", False),
+        ("CU_ID", "identity", "integer", False),
+        ("CU_NAM_Customer_Name", "value", "text", True),
+        ("CU_COU_Customer_Country", "value", "text", False),
+        ("segment", "knot", "text", False),
+        ("GEN_ID", "value", "integer", False),
+        ("changed_at", "timestamp", "time", True),
+    ]
+    assert columns[4].knot == "SEG"
+
+
+# ============================================================================
+# File Tests
+# ============================================================================
+
+
+def test_synthesize_writes_one_file_per_staging_table(tmp_path):
+    """Every staging table and unstaged knot domain gets a file."""
+    written = synthesize(_spec(), tmp_path, rows=30, versions=3)
+
+    assert [(t.table, t.rows, t.keys) for t in written] == [
+        ("stg_erp", 30, 10),
+        ("stg_crm", 30, 10),
+        ("stg_GEN_Gender", 5, 5),
+    ]
+    assert all(t.path.exists() for t in written)
+    assert written[0].path == tmp_path / "stg_erp.parquet"
+    columns = duckdb.sql(f"DESCRIBE FROM '{written[0].path}'").fetchall()
+    assert [column[0] for column in columns] == [
+        "customer_id",
+        "CU_ID",
+        "CU_NAM_Customer_Name",
+        "CU_COU_Customer_Country",
+        "segment",
+        "GEN_ID",
+        "changed_at",
+    ]
+    assert _rows(written[2], "GEN_ID")[0][:2] == (1, "Gender-1")
+
+
+def test_historized_attributes_get_versions(tmp_path):
+    """Each key has one row per version; only historized values change."""
+    erp = synthesize(_spec(), tmp_path, rows=30, versions=3)[0]
+
+    rows = _rows(erp, "customer_id, changed_at")
+    versions = [row for row in rows if row[0] == "K1"]
+    assert len(versions) == 3
+    assert len({row[2] for row in versions}) == 3  # Name
+    assert len({row[3] for row in versions}) == 1  # Country
+    assert len({row[6] for row in versions}) == 3  # changed_at
+    assert all(len(row[3]) == 2 for row in rows)  # Fits varchar(2)
+    assert {row[4] for row in rows} <= {f"Segment-{i}" for i in range(1, 6)}
+    assert {row[5] for row in rows} <= set(range(1, 6))
+
+
+def test_sources_share_overlapping_keys_and_values(tmp_path):
+    """Sources of an anchor overlap on a share of keys and agree on them."""
+    erp, crm, _ = synthesize(_spec(), tmp_path, rows=40, versions=1, overlap=0.25)
+
+    erp_rows = {row[0]: row for row in _rows(erp)}
+    crm_rows = {row[0]: row for row in _rows(crm)}
+    shared = erp_rows.keys() & crm_rows.keys()
+    assert len(shared) == 10
+    assert all(erp_rows[key] == crm_rows[key] for key in shared)
+    assert len(erp_rows.keys() | crm_rows.keys()) == 70
+
+
+def test_values_fit_declared_types(tmp_path):
+    """Integers, decimals, dates and short strings stay within their types."""
+    anchor = Anchor(
+        mnemonic="PR",
+        descriptor="Product",
+        identity="int",
+        staging_mappings=[
+            StagingMapping(
+                system="erp",
+                tenant="ACME",
+                table="stg_products",
+                natural_key_columns=["code"],
+                columns=[
+                    StagingColumn(name="code", type="int"),
+                    StagingColumn(name="stock", type="smallint"),
+                    StagingColumn(name="price", type="decimal(5,2)"),
+                    StagingColumn(name="active", type="boolean"),
+                    StagingColumn(name="launched", type="date"),
+                    StagingColumn(name="grade", type="char(1)"),
+                    StagingColumn(name="note", type="text"),
+                ],
+            )
+        ],
+    )
+
+    (table,) = synthesize(
+        Spec(anchors=[anchor]), tmp_path, rows=200, file_format=SourceFormat.CSV
+    )
+
+    assert table.path.name == "stg_products.csv"
+    rows = duckdb.sql(f"FROM read_csv('{table.path}', header = true)").fetchall()
+    assert sorted(row[0] for row in rows) == list(range(1, 201))
+    assert all(0 <= row[1] < 30000 for row in rows)
+    assert all(0 <= row[2] < 1000 for row in rows)
+    assert {row[3] for row in rows} == {True, False}
+    assert all(len(row[5]) == 1 for row in rows)
+    assert all(row[6].startswith("note-") for row in rows)
+
+
+def test_roles_reference_delivered_keys(tmp_path):
+    """Tie and nexus staging reference keys the anchors' sources deliver."""
+    tie = Tie(
+        roles=[
+            Role(role="has", type_="CU", identifier=True),
+            Role(role="in", type_="SEG", identifier=False),
+        ],
+        staging_mappings=[
+            TieStagingMapping(
+                system="erp",
+                tenant="ACME",
+                table="stg_customer_segments",
+                natural_key_columns={"has": ["customer_id"]},
+                columns=[
+                    StagingColumn(name="customer_id", type="varchar(20)"),
+                    StagingColumn(name="SEG_ID_in", type="int"),
+                ],
+            )
+        ],
+    )
+    nexus = Nexus(
+        mnemonic="VI",
+        descriptor="Visit",
+        identity="bigint",
+        roles=[Role(role="by", type_="CU", identifier=True)],
+        staging_mappings=[
+            StagingMapping(
+                system="erp",
+                tenant="ACME",
+                table="stg_visits",
+                natural_key_columns=["visit_id"],
+                columns=[
+                    StagingColumn(name="visit_id", type="varchar(20)"),
+                    StagingColumn(name="CU_ID_by", type="bigint"),
+                ],
+            )
+        ],
+    )
+    spec = _spec().model_copy(update={"ties": [tie], "nexuses": [nexus]})
+
+    written = {
+        t.table: t
+        for t in synthesize(
+            spec, tmp_path, rows=30, tables=["stg_customer_segments", "stg_visits"]
+        )
+    }
+
+    assert set(written) == {"stg_customer_segments", "stg_visits"}
+    erp_keys = {f"K{key}" for key in range(1, 11)}  # 30 rows, 3 versions
+    assert {row[0] for row in _rows(written["stg_customer_segments"])} <= erp_keys
+    assert {row[1] for row in _rows(written["stg_customer_segments"])} <= set(
+        range(1, 6)
+    )
+    assert {row[1] for row in _rows(written["stg_visits"])} <= set(range(1, 11))
+
+
+def test_text_keys_fit_their_columns(tmp_path):
+    """Keys too long for a key column are base 36 of its width everywhere."""
+    anchor = Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="int",
+        staging_mappings=[
+            StagingMapping(
+                system="erp",
+                tenant="ACME",
+                table="stg_customers",
+                natural_key_columns=["customer_id"],
+                columns=[StagingColumn(name="customer_id", type="varchar(3)")],
+            )
+        ],
+    )
+    tie = Tie(
+        roles=[
+            Role(role="of", type_="CU", identifier=True),
+            Role(role="by", type_="CU", identifier=True),
+        ],
+        staging_mappings=[
+            TieStagingMapping(
+                system="erp",
+                tenant="ACME",
+                table="stg_referrals",
+                natural_key_columns={"of": ["customer_id"], "by": ["referrer_id"]},
+                columns=[
+                    StagingColumn(name="customer_id", type="varchar(20)"),
+                    StagingColumn(name="referrer_id", type="varchar(20)"),
+                ],
+            )
+        ],
+    )
+    spec = Spec(anchors=[anchor], ties=[tie])
+
+    customers, referrals = synthesize(spec, tmp_path, rows=2000)
+
+    keys = [row[0] for row in _rows(customers)]
+    assert len(set(keys)) == 2000
+    assert {len(key) for key in keys} == {3}
+    assert {key for row in _rows(referrals) for key in row} <= set(keys)
+
+    with pytest.raises(ValueError, match="50000 keys of CU do not fit"):
+        synthesize(spec, tmp_path, rows=50000)
+
+
+def test_synthesize_is_reproducible_per_seed(tmp_path):
+    """The same seed writes the same values; another seed changes them."""
+    first = synthesize(_spec(), tmp_path / "a", rows=10, tables=["stg_erp"])[0]
+    again = synthesize(_spec(), tmp_path / "b", rows=10, tables=["stg_erp"])[0]
+    other = synthesize(_spec(), tmp_path / "c", rows=10, seed=1, tables=["stg_erp"])
+
+    order = "customer_id, changed_at"
+    assert _rows(first, order) == _rows(again, order)
+    assert _rows(first, order) != _rows(other[0], order)
+
+
+def test_synthesize_rejects_unknown_tables(tmp_path):
+    """Naming a table the spec does not stage is an error."""
+    with pytest.raises(ValueError, match="unknown staging tables: stg_nope"):
+        synthesize(_spec(), tmp_path, tables=["stg_nope"])
+
+
+def test_synthetic_files_load_through_generated_sql(tmp_path):
+    """Generated loads read the files in place and build every history."""
+    data = tmp_path / "data"
+    spec = _spec(str(data))
+    written = synthesize(spec, data, rows=30, versions=3, dialect="duckdb")
+    database = str(tmp_path / "dab.duckdb")
+    with closing(duckdb.connect(database)) as connection:
+        connection.execute(f"CREATE TABLE stg_GEN_Gender AS FROM '{written[2].path}'")
+
+    report = run_phases(
+        [
+            {
+                **generate_all_ddl(spec, "duckdb"),
+                **generate_all_views(spec, "duckdb"),
+            },
+            generate_all_dml(spec, "duckdb"),
+        ],
+        build_dependency_graph(spec),
+        duckdb_connector(database),
+        read="duckdb",
+        write="duckdb",
+    )
+
+    assert report.ok, [r.error for r in report.results if r.error]
+    with closing(duckdb.connect(database)) as connection:
+        counts = {
+            table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: S608
+            for table in (
+                "CU_Customer",
+                "CU_NAM_Customer_Name",
+                "CU_COU_Customer_Country",
+                "GEN_Gender",
+            )
+        }
+    # 10 keys per source, 5 of them shared, 3 names each
+    assert counts == {
+        "CU_Customer": 15,
+        "CU_NAM_Customer_Name": 45,
+        "CU_COU_Customer_Country": 15,
+        "GEN_Gender": 5,
+    }
+
+
+# ============================================================================
+# CLI Tests
+# ============================================================================
+
+_SPEC = """
+anchor:
+  - mnemonic: PR
+    descriptor: Product
+    identity: int
+    attribute:
+      - mnemonic: NAM
+        descriptor: Name
+        dataRange: varchar(40)
+    staging_mappings:
+      - system: erp
+        tenant: default
+        table: stg_products
+        natural_key_columns:
+          - ProductID
+        column_mappings:
+          NAM: ProductName
+        columns:
+          - name: ProductID
+            type: varchar(10)
+          - name: ProductName
+            type: varchar(40)
+"""
+
+
+def test_dab_synth_writes_files(tmp_path):
+    """architect dab synth writes a file per staging table next to the spec."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_SPEC)
+
+    result = runner.invoke(app, ["dab", "synth", str(spec_path), "--rows", "25"])
+    assert result.exit_code == 0, result.output
+    assert "stg_products: 25 rows" in result.output
+    assert (tmp_path / "synth" / "stg_products.parquet").exists()
+
+    result = runner.invoke(
+        app,
+        [
+            "dab",
+            "synth",
+            str(spec_path),
+            "-f",
+            "csv",
+            "-o",
+            str(tmp_path / "out"),
+            "-t",
+            "stg_products",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    header = (tmp_path / "out" / "stg_products.csv").read_text().splitlines()[0]
+    assert header == "ProductID,ProductName"
+
+
+def test_dab_synth_unknown_table(tmp_path):
+    """architect dab synth exits 1 for tables the spec does not stage."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(_SPEC)
+
+    result = runner.invoke(app, ["dab", "synth", str(spec_path), "-t", "stg_nope"])
+    assert result.exit_code == 1
+    assert "unknown staging tables" in result.output
+
+
+def test_dab_synth_missing_spec(tmp_path):
+    """architect dab synth with a missing spec exits with an error."""
+    result = runner.invoke(app, ["dab", "synth", str(tmp_path / "missing.yaml")])
+    assert result.exit_code == 1
+    assert "spec file not found" in result.output
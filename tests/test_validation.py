@@ -117,6 +117,209 @@ anchor:
     assert "NAM" in error_messages
 
 
+def test_watermark_column_must_be_declared(tmp_path: Path) -> None:
+    """A staging watermark column missing from the mapping's columns errors."""
+    spec_yaml = tmp_path / "watermark.yaml"
+    spec_yaml.write_text(
+        """
+anchor:
+  - mnemonic: CU
+    descriptor: Customer
+    identity: int
+    staging_mappings:
+      - system: ERP
+        tenant: ACME
+        table: stg_customers
+        natural_key_columns: [customer_id]
+        columns:
+          - name: customer_id
+            type: int
+        watermark_column: loaded_at
+"""
+    )
+
+    result = validate_spec(spec_yaml)
+    assert not result.is_valid
+    error_messages = " ".join([e.message for e in result.errors])
+    assert "Watermark column 'loaded_at' is not declared" in error_messages
+
+
+@pytest.mark.parametrize(
+    ("watermark_type", "valid"),
+    [
+        ("bigint", True),
+        ("timestamp", True),
+        ("date", True),
+        ("varchar(20)", False),
+        ("decimal(10, 2)", False),
+    ],
+)
+def test_watermark_column_must_be_integer_or_temporal(
+    tmp_path: Path, watermark_type: str, valid: bool
+) -> None:
+    """Watermarks of a type the load-control table cannot hold error."""
+    spec_yaml = tmp_path / "watermark.yaml"
+    spec_yaml.write_text(
+        f"""
+anchor:
+  - mnemonic: CU
+    descriptor: Customer
+    identity: int
+    staging_mappings:
+      - system: ERP
+        tenant: ACME
+        table: stg_customers
+        natural_key_columns: [customer_id]
+        columns:
+          - name: customer_id
+            type: int
+          - name: loaded_at
+            type: {watermark_type}
+        watermark_column: loaded_at
+"""
+    )
+
+    result = validate_spec(spec_yaml)
+
+    assert result.is_valid is valid
+    if not valid:
+        (error,) = result.errors
+        assert error.field_path == "anchor[0].staging_mappings[0].watermark_column"
+        assert f"has type '{watermark_type}'" in error.message
+        assert "must be integer or temporal" in error.message
+
+
+def test_cdc_mapping_rejects_watermark(tmp_path: Path) -> None:
+    """A staging mapping reading a CDC source cannot also be watermarked."""
+    spec_yaml = tmp_path / "cdc.yaml"
+    spec_yaml.write_text(
+        """
+anchor:
+  - mnemonic: CU
+    descriptor: Customer
+    identity: int
+    staging_mappings:
+      - system: ERP
+        tenant: ACME
+        table: stg_customers
+        natural_key_columns: [customer_id]
+        columns:
+          - name: loaded_at
+            type: timestamp
+        watermark_column: loaded_at
+        cdc:
+          table: sales.customers
+"""
+    )
+
+    result = validate_spec(spec_yaml)
+    assert not result.is_valid
+    (error,) = result.errors
+    assert error.field_path == "anchor[0].staging_mappings[0].cdc"
+    assert "reads a CDC source" in error.message
+
+
+def test_knot_values_must_map_knotted_attributes(tmp_path: Path) -> None:
+    """Knot value mappings name knotted attributes of their anchor."""
+    spec_yaml = tmp_path / "knots.yaml"
+    spec_yaml.write_text(
+        """
+anchor:
+  - mnemonic: PR
+    descriptor: Product
+    identity: int
+    attribute:
+      - mnemonic: NAM
+        descriptor: Name
+        dataRange: varchar(40)
+    staging_mappings:
+      - system: ERP
+        tenant: ACME
+        table: stg_products
+        natural_key_columns: [product_id]
+        knot_values:
+          NAM: name
+"""
+    )
+
+    result = validate_spec(spec_yaml)
+    assert not result.is_valid
+    (error,) = result.errors
+    assert error.field_path == "anchor[0].staging_mappings[0].knot_values"
+    assert "'NAM' of staging table 'stg_products'" in error.message
+
+
+def test_tie_natural_keys_must_name_anchor_roles(tmp_path: Path) -> None:
+    """Tie staging natural keys resolve anchor roles only."""
+    spec_yaml = tmp_path / "tie_keys.yaml"
+    spec_yaml.write_text(
+        """
+anchor:
+  - mnemonic: CU
+    descriptor: Customer
+    identity: int
+  - mnemonic: OR
+    descriptor: Order
+    identity: int
+
+tie:
+  - role:
+      - role: customer
+        type: CU
+      - role: order
+        type: OR
+    staging_mappings:
+      - system: ERP
+        tenant: ACME
+        table: stg_orders
+        natural_key_columns:
+          customer: [customer_id]
+          buyer: [buyer_id]
+"""
+    )
+
+    result = validate_spec(spec_yaml)
+    assert not result.is_valid
+    (error,) = result.errors
+    assert error.field_path == "tie[0].staging_mappings[0].natural_key_columns"
+    assert "names 'buyer', which is not an anchor role" in error.message
+
+
+def test_keymap_anchor_staging_delivers_no_ids(tmp_path: Path) -> None:
+    """Key-mapped anchors take identities from the key map only."""
+    spec_yaml = tmp_path / "keymap.yaml"
+    spec_yaml.write_text(
+        """
+anchor:
+  - mnemonic: CU
+    descriptor: Customer
+    identity: bigint
+    keymap: true
+    staging_mappings:
+      - system: ERP
+        tenant: ACME
+        table: stg_customers
+        natural_key_columns: [customer_id]
+        columns:
+          - name: CU_ID
+            type: bigint
+  - mnemonic: OR
+    descriptor: Order
+    identity: bigint
+    keymap: true
+"""
+    )
+
+    result = validate_spec(spec_yaml)
+    assert not result.is_valid
+    messages = sorted(e.message for e in result.errors)
+    assert messages == [
+        "Anchor 'Order' has a key map but no staging mappings to take keysets from",
+        "Staging table 'stg_customers' declares 'CU_ID', which the key map of "
+        "anchor 'Customer' assigns",
+    ]
+
+
 def test_mnemonic_collision_reports_both_entities(fixtures_dir: Path) -> None:
     """Mnemonic collision error should name both conflicting entities."""
     result = validate_spec(fixtures_dir / "invalid_spec_duplicate_mnemonic.yaml")
@@ -210,6 +413,53 @@ def test_nexus_bad_knot_reference(fixtures_dir: Path) -> None:
     assert "NONEXISTENT" in error_messages
 
 
+def test_nexus_staging_reads_no_change_feed(tmp_path: Path) -> None:
+    """Nexus staging mappings declare watermarks and consume no CDC feed."""
+    spec_yaml = tmp_path / "nexus_staging.yaml"
+    spec_yaml.write_text(
+        """
+anchor:
+  - mnemonic: ST
+    descriptor: Stage
+    identity: int
+nexus:
+  - mnemonic: EV
+    descriptor: Event
+    identity: int
+    role:
+      - role: wasHeldAt
+        type: ST
+    staging_mappings:
+      - system: ERP
+        tenant: ACME
+        table: stg_events
+        natural_key_columns: [event_id]
+        watermark_column: changed_at
+      - system: CRM
+        tenant: ACME
+        table: stg_event_changes
+        natural_key_columns: [event_id]
+        cdc:
+          table: events
+"""
+    )
+
+    result = validate_spec(spec_yaml)
+    assert not result.is_valid
+    assert sorted((e.field_path, e.message) for e in result.errors) == [
+        (
+            "nexus[0].staging_mappings[0].watermark_column",
+            "Watermark column 'changed_at' is not declared in columns of "
+            "staging table 'stg_events'",
+        ),
+        (
+            "nexus[0].staging_mappings[1].cdc",
+            "Staging table 'stg_event_changes' of nexus 'Event' cannot read "
+            "a CDC source",
+        ),
+    ]
+
+
 def test_duplicate_tie_composition(fixtures_dir: Path) -> None:
     """Two ties with same composition should error."""
     result = validate_spec(fixtures_dir / "duplicate_tie.yaml")
@@ -233,3 +483,177 @@ def test_pydantic_validation_error_with_line_mapping(fixtures_dir: Path) -> None
     # Should have error about missing mnemonic
     error_messages = " ".join([e.message for e in result.errors])
     assert "mnemonic" in error_messages.lower() or "required" in error_messages.lower()
+
+
+def _write_domains(root: Path) -> Path:
+    """Write a spec split into a root file and per-domain files."""
+    (root / "domains").mkdir()
+    (root / "spec.yaml").write_text(
+        "include:\n  - knots.yaml\n  - domains/*.yaml\n"
+        "anchor:\n  - mnemonic: PN\n    descriptor: Person\n    identity: int\n"
+    )
+    (root / "knots.yaml").write_text(
+        "knot:\n  - mnemonic: GEN\n    descriptor: Gender\n"
+        "    identity: int\n    dataRange: varchar(10)\n"
+    )
+    (root / "domains" / "actors.yaml").write_text(
+        "anchor:\n"
+        "  - mnemonic: AC\n"
+        "    descriptor: Actor\n"
+        "    identity: int\n"
+        "    attribute:\n"
+        "      - mnemonic: GEN\n"
+        "        descriptor: Gender\n"
+        "        knotRange: GEN\n"
+        "tie:\n"
+        "  - role:\n"
+        "      - role: subset\n        type: AC\n        identifier: false\n"
+        "      - role: of\n        type: PN\n        identifier: false\n"
+    )
+    return root / "spec.yaml"
+
+
+def test_include_merges_files_with_cross_file_references(tmp_path: Path) -> None:
+    """Included files merge into one spec; references may cross files."""
+    result = validate_spec(_write_domains(tmp_path))
+
+    assert result.is_valid, format_errors(result.errors)
+    assert result.spec is not None
+    assert [a.mnemonic for a in result.spec.anchors] == ["PN", "AC"]
+    assert [k.mnemonic for k in result.spec.knots] == ["GEN"]
+    assert len(result.spec.ties) == 1
+    assert result.files == [
+        tmp_path.resolve() / "spec.yaml",
+        tmp_path.resolve() / "knots.yaml",
+        tmp_path.resolve() / "domains" / "actors.yaml",
+    ]
+
+
+def test_cross_file_errors_point_at_their_file(tmp_path: Path) -> None:
+    """Referential errors carry the file, field path and line of the entity."""
+    spec_path = _write_domains(tmp_path)
+    (tmp_path / "knots.yaml").write_text(
+        "knot:\n  - mnemonic: PN\n    descriptor: Pronoun\n"
+        "    identity: int\n    dataRange: varchar(10)\n"
+    )
+
+    result = validate_spec(spec_path)
+
+    assert not result.is_valid
+    errors = {e.field_path: e for e in result.errors}
+    knot_ref = errors["anchor[0].attribute[0].knotRange"]
+    assert knot_ref.file == "domains/actors.yaml"
+    assert knot_ref.line == 8
+    assert "Line 8: Attribute 'Gender' references nonexistent knot 'GEN'" in (
+        format_errors([knot_ref])
+    )
+    assert errors["mnemonic.PN"].message == (
+        "Duplicate mnemonic 'PN' found in Anchor 'Person' (spec.yaml) "
+        "and Knot 'Pronoun' (knots.yaml)"
+    )
+
+
+def test_include_errors(tmp_path: Path) -> None:
+    """Unmatched includes and invalid included files are reported per file."""
+    spec_path = _write_domains(tmp_path)
+    spec_path.write_text("include:\n  - knots.yaml\n  - missing/*.yaml\n")
+    (tmp_path / "knots.yaml").write_text("knot:\n  - descriptor: Gender\n")
+
+    result = validate_spec(spec_path)
+
+    assert not result.is_valid
+    assert [(e.file, e.field_path, e.line) for e in result.errors] == [
+        ("spec.yaml", "include[1]", 3),
+        ("knots.yaml", "knot.0.mnemonic", None),
+        ("knots.yaml", "knot.0.identity", None),
+        ("knots.yaml", "knot.0.dataRange", None),
+    ]
+    assert "Include 'missing/*.yaml' matches no files" in format_errors(result.errors)
+
+
+def test_include_must_list_paths(tmp_path: Path) -> None:
+    """An include that is not a path or list of paths is an error."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text("include:\n  name: knots.yaml\n")
+
+    result = validate_spec(spec_path)
+
+    assert [(e.field_path, e.line) for e in result.errors] == [("include", 1)]
+
+
+def test_include_cycles_load_each_file_once(tmp_path: Path) -> None:
+    """Files including each other are loaded once."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text("include: other.yaml\nknot: []\n")
+    (tmp_path / "other.yaml").write_text(
+        "include: spec.yaml\nanchor:\n  - mnemonic: PN\n"
+        "    descriptor: Person\n    identity: int\n"
+    )
+
+    result = validate_spec(spec_path)
+
+    assert result.is_valid
+    assert result.spec is not None
+    assert len(result.spec.anchors) == 1
+
+
+def test_unchanged_files_are_not_parsed_again(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Files are cached by content: an edit re-parses only the edited file."""
+    from collections import OrderedDict
+
+    from data_architect.validation import loader
+
+    parsed: list[str] = []
+    parse_file = loader._parse_file
+
+    def _counting(text: str) -> loader._ParsedFile:
+        parsed.append(text)
+        return parse_file(text)
+
+    monkeypatch.setattr(loader, "_cache", OrderedDict())
+    monkeypatch.setattr(loader, "_parse_file", _counting)
+    spec_path = _write_domains(tmp_path)
+
+    assert validate_spec(spec_path).is_valid
+    assert len(parsed) == 3
+    assert validate_spec(spec_path).is_valid
+    assert len(parsed) == 3
+
+    knots = tmp_path / "knots.yaml"
+    knots.write_text(knots.read_text().replace("Gender", "Sex"))
+    result = validate_spec(spec_path)
+    assert len(parsed) == 4
+    assert result.spec is not None
+    assert result.spec.knots[0].descriptor == "Sex"
+
+
+def test_included_files_parse_in_worker_processes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Enough uncached YAML is parsed by a process pool, same result."""
+    from collections import OrderedDict
+
+    from data_architect.validation import loader
+
+    monkeypatch.setattr(loader, "_cache", OrderedDict())
+    monkeypatch.setattr(loader, "_PARALLEL_MIN_BYTES", 0)
+
+    result = validate_spec(_write_domains(tmp_path), jobs=2)
+
+    assert result.is_valid, format_errors(result.errors)
+    assert result.spec is not None
+    assert [a.mnemonic for a in result.spec.anchors] == ["PN", "AC"]
+
+
+def test_format_errors_with_files() -> None:
+    """format_errors prefixes the file of errors in included files."""
+    from data_architect.validation.errors import ValidationError
+
+    errors = [
+        ValidationError(field_path="knot[0]", message="Bad", line=3, file="k.yaml"),
+        ValidationError(field_path="knot[1]", message="Worse", file="k.yaml"),
+    ]
+
+    assert format_errors(errors) == "k.yaml: Line 3: Bad\nk.yaml: knot[1]: Worse"
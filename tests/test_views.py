@@ -0,0 +1,474 @@
+"""Tests for latest view generation."""
+
+import pytest
+import sqlglot
+import sqlglot.expressions as sge
+
+from data_architect.generation.naming import (
+    difference_function_name,
+    latest_view_name,
+    point_in_time_function_name,
+)
+from data_architect.generation.views import (
+    build_difference_function,
+    build_latest_view,
+    build_materialized_latest,
+    build_materialized_refresh,
+    build_point_in_time_function,
+    generate_all_views,
+)
+from data_architect.models.anchor import Anchor, Attribute, Materialization
+from data_architect.models.knot import Knot
+from data_architect.models.spec import Spec
+
+
+def _customer() -> Anchor:
+    return Anchor(
+        mnemonic="CU",
+        descriptor="Customer",
+        identity="bigint",
+        attributes=[
+            Attribute(
+                mnemonic="NAM",
+                descriptor="Name",
+                data_range="varchar(40)",
+                time_range="datetime",
+            ),
+            Attribute(mnemonic="COU", descriptor="Country", data_range="varchar(15)"),
+            Attribute(
+                mnemonic="GEN",
+                descriptor="Gender",
+                knot_range="GEN",
+                time_range="datetime",
+            ),
+        ],
+    )
+
+
+def _gender() -> Knot:
+    return Knot(
+        mnemonic="GEN", descriptor="Gender", identity="int", data_range="varchar(10)"
+    )
+
+
+# ============================================================================
+# Naming Tests
+# ============================================================================
+
+
+def test_latest_view_name() -> None:
+    """Latest view is named l{mnemonic}_{descriptor}."""
+    assert latest_view_name(_customer()) == "lCU_Customer"
+
+
+# ============================================================================
+# Latest View Tests
+# ============================================================================
+
+
+def test_build_latest_view_is_create_view() -> None:
+    """Verify the generated AST is a CREATE VIEW statement."""
+    result = build_latest_view(_customer(), "postgres")
+
+    assert isinstance(result, sge.Create)
+    assert result.args["kind"] == "VIEW"
+
+
+def test_build_latest_view_postgres_uses_distinct_on() -> None:
+    """Historized attributes pick their latest row with DISTINCT ON."""
+    sql = build_latest_view(_customer(), "postgres").sql(dialect="postgres")
+
+    assert "CREATE OR REPLACE VIEW lCU_Customer" in sql
+    assert "DISTINCT ON (CU_ID)" in sql
+    assert "changed_at DESC" in sql
+    assert "QUALIFY" not in sql
+
+
+def test_build_latest_view_snowflake_uses_qualify() -> None:
+    """Historized attributes pick their latest row with QUALIFY ROW_NUMBER()."""
+    sql = build_latest_view(_customer(), "snowflake").sql(dialect="snowflake")
+
+    assert "QUALIFY" in sql
+    assert "ROW_NUMBER() OVER (PARTITION BY CU_ID ORDER BY changed_at DESC) = 1" in sql
+    assert "DISTINCT ON" not in sql
+
+
+def test_build_latest_view_tsql_uses_outer_apply_top_1() -> None:
+    """Historized attributes pick their latest row with OUTER APPLY TOP 1."""
+    sql = build_latest_view(_customer(), "tsql").sql(dialect="tsql")
+
+    assert "CREATE OR ALTER VIEW lCU_Customer" in sql
+    assert "OUTER APPLY" in sql
+    assert "TOP 1" in sql
+
+
+def test_build_latest_view_static_attribute_plain_left_join() -> None:
+    """Static attributes are joined directly on the anchor key."""
+    for dialect in ["postgres", "snowflake", "tsql"]:
+        sql = build_latest_view(_customer(), dialect).sql(dialect=dialect)
+
+        assert (
+            "LEFT JOIN CU_COU_Customer_Country AS CU_COU "
+            "ON CU_COU.CU_ID = CU_Customer.CU_ID"
+        ) in sql
+
+
+def test_build_latest_view_one_join_per_attribute() -> None:
+    """Every attribute is joined exactly once and no correlated MAX is used."""
+    result = build_latest_view(_customer(), "postgres")
+    sql = result.sql(dialect="postgres")
+
+    tables = {t.name for t in result.find_all(sge.Table)}
+    assert {
+        "CU_Customer",
+        "CU_NAM_Customer_Name",
+        "CU_COU_Customer_Country",
+        "CU_GEN_Customer_Gender",
+    } <= tables
+    assert "MAX(" not in sql.upper()
+
+
+def test_build_latest_view_exposes_changed_at_for_historized() -> None:
+    """Historized attributes expose their changed_at under a prefixed alias."""
+    sql = build_latest_view(_customer(), "postgres").sql(dialect="postgres")
+
+    assert "CU_NAM.changed_at AS CU_NAM_changed_at" in sql
+    assert "CU_COU_changed_at" not in sql
+
+
+def test_build_latest_view_resolves_knot_value() -> None:
+    """Knotted attributes expose the FK and the knot value when knots are given."""
+    sql = build_latest_view(_customer(), "postgres", [_gender()]).sql(
+        dialect="postgres"
+    )
+
+    assert "CU_GEN.GEN_ID AS CU_GEN_GEN_ID" in sql
+    assert "LEFT JOIN GEN_Gender AS kCU_GEN" in sql
+    assert "kCU_GEN.GEN_Gender AS CU_GEN_Customer_Gender" in sql
+
+
+def test_build_latest_view_without_knots_skips_knot_join() -> None:
+    """Without knot definitions only the knot FK is exposed."""
+    sql = build_latest_view(_customer(), "postgres").sql(dialect="postgres")
+
+    assert "CU_GEN_GEN_ID" in sql
+    assert "GEN_Gender AS" not in sql
+
+
+def test_build_latest_view_reserved_word_mnemonic() -> None:
+    """Anchors whose mnemonic is a reserved word (e.g. OR) still parse."""
+    anchor = Anchor(
+        mnemonic="OR",
+        descriptor="Order",
+        identity="int",
+        attributes=[
+            Attribute(mnemonic="DAT", descriptor="OrderDate", data_range="datetime")
+        ],
+    )
+
+    for dialect in ["postgres", "snowflake", "tsql"]:
+        sql = build_latest_view(anchor, dialect).sql(dialect=dialect)
+        sqlglot.parse_one(sql, dialect=dialect)
+        assert "FROM OR_Order" in sql
+
+
+def test_build_latest_view_anchor_without_attributes() -> None:
+    """An anchor without attributes yields a view over the anchor only."""
+    anchor = Anchor(mnemonic="AC", descriptor="Actor", identity="int")
+    sql = build_latest_view(anchor, "postgres").sql(dialect="postgres")
+
+    assert sql == (
+        "CREATE OR REPLACE VIEW lAC_Actor AS SELECT AC_Actor.AC_ID FROM AC_Actor"
+    )
+
+
+def test_build_latest_view_wide_anchor() -> None:
+    """A 40-attribute anchor yields one join per attribute."""
+    anchor = Anchor(
+        mnemonic="WI",
+        descriptor="Wide",
+        identity="int",
+        attributes=[
+            Attribute(
+                mnemonic=f"A{i:02d}",
+                descriptor=f"Attr{i:02d}",
+                data_range="int",
+                time_range="datetime" if i % 2 else None,
+            )
+            for i in range(40)
+        ],
+    )
+
+    result = build_latest_view(anchor, "snowflake")
+
+    assert len(list(result.find_all(sge.Join))) == 40
+
+
+# ============================================================================
+# Point-in-Time Function Tests
+# ============================================================================
+
+
+def test_point_in_time_function_names() -> None:
+    """Point-in-time and difference functions are named p/d{anchor table}."""
+    assert point_in_time_function_name(_customer()) == "pCU_Customer"
+    assert difference_function_name(_customer()) == "dCU_Customer"
+
+
+def test_build_point_in_time_function_is_create_function() -> None:
+    """Verify the generated AST is a CREATE FUNCTION statement."""
+    for dialect in ["postgres", "snowflake", "tsql"]:
+        result = build_point_in_time_function(_customer(), dialect)
+
+        assert isinstance(result, sge.Create)
+        assert result.args["kind"] == "FUNCTION"
+
+
+def test_build_point_in_time_function_postgres_lateral_seek() -> None:
+    """Postgres probes each attribute with a LATERAL LIMIT 1 seek."""
+    sql = build_point_in_time_function(_customer(), "postgres").sql(dialect="postgres")
+
+    assert "CREATE OR REPLACE FUNCTION pCU_Customer(" in sql
+    assert "timepoint TIMESTAMPTZ" in sql
+    assert "knownpoint TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP" in sql
+    assert "RETURNS TABLE (" in sql
+    assert "LEFT JOIN LATERAL" in sql
+    assert "attr.changed_at <= timepoint" in sql
+    assert "attr.recorded_at <= knownpoint" in sql
+    assert "LIMIT 1" in sql
+
+
+def test_build_point_in_time_function_tsql_inline_tvf() -> None:
+    """T-SQL emits an inline table-valued function with OUTER APPLY TOP 1."""
+    sql = build_point_in_time_function(_customer(), "tsql").sql(dialect="tsql")
+
+    assert "CREATE OR ALTER FUNCTION pCU_Customer(@timepoint" in sql
+    assert "RETURNS TABLE AS RETURN SELECT" in sql
+    assert "OUTER APPLY" in sql
+    assert "attr.changed_at <= @timepoint" in sql
+    assert "attr.recorded_at <= @knownpoint" in sql
+
+
+def test_build_point_in_time_function_snowflake_filters_then_ranks() -> None:
+    """Snowflake filters on the timepoint before ranking with QUALIFY."""
+    sql = build_point_in_time_function(_customer(), "snowflake").sql(
+        dialect="snowflake"
+    )
+
+    assert "changed_at <= timepoint AND recorded_at <= knownpoint" in sql
+    assert "QUALIFY" in sql
+    assert "\\n" not in sql
+
+
+def test_build_point_in_time_function_duckdb_table_macro() -> None:
+    """DuckDB emits a table macro with a constant knownpoint default."""
+    sql = build_point_in_time_function(_customer(), "duckdb").sql(dialect="duckdb")
+
+    assert sql.startswith(
+        "CREATE OR REPLACE MACRO pCU_Customer(timepoint, "
+        "knownpoint := CAST('infinity' AS TIMESTAMPTZ)) AS TABLE\nSELECT"
+    )
+    assert "QUALIFY" in sql
+
+
+def test_build_point_in_time_function_static_attribute_plain_join() -> None:
+    """Static attributes have no temporal filter in the point-in-time function."""
+    sql = build_point_in_time_function(_customer(), "postgres").sql(dialect="postgres")
+
+    assert "LEFT JOIN CU_COU_Customer_Country AS CU_COU" in sql
+
+
+def test_build_point_in_time_function_returns_knot_value() -> None:
+    """Knot values are resolved in the point-in-time function too."""
+    sql = build_point_in_time_function(_customer(), "postgres", [_gender()]).sql(
+        dialect="postgres"
+    )
+
+    assert "CU_GEN_Customer_Gender VARCHAR(10)" in sql
+    assert "kCU_GEN.GEN_Gender AS CU_GEN_Customer_Gender" in sql
+
+
+# ============================================================================
+# Difference Function Tests
+# ============================================================================
+
+
+def test_build_difference_function_collects_change_points() -> None:
+    """Change points are the distinct changed_at of historized attributes."""
+    sql = build_difference_function(_customer(), "postgres").sql(dialect="postgres")
+
+    assert "CREATE OR REPLACE FUNCTION dCU_Customer(" in sql
+    assert "fromtime TIMESTAMPTZ, totime TIMESTAMPTZ" in sql
+    assert "changed_at BETWEEN fromtime AND totime" in sql
+    assert "UNION" in sql
+    assert "timepoints.changed_at AS inspected_at" in sql
+    assert "attr.changed_at <= timepoints.changed_at" in sql
+
+
+def test_build_difference_function_snowflake_uses_asof_join() -> None:
+    """Snowflake resolves each change point with ASOF JOIN."""
+    sql = build_difference_function(_customer(), "snowflake").sql(dialect="snowflake")
+
+    assert "ASOF JOIN" in sql
+    assert "MATCH_CONDITION (timepoints.changed_at >= CU_NAM.changed_at)" in sql
+
+
+def test_build_difference_function_duckdb_uses_asof_left_join() -> None:
+    """DuckDB resolves each change point with ASOF LEFT JOIN."""
+    sql = build_difference_function(_customer(), "duckdb").sql(dialect="duckdb")
+
+    assert "CREATE OR REPLACE MACRO dCU_Customer(fromtime, totime, " in sql
+    assert "ASOF LEFT JOIN (" in sql
+    assert "AND timepoints.changed_at >= CU_NAM.changed_at" in sql
+
+
+def test_build_difference_function_tsql_outer_apply() -> None:
+    """T-SQL resolves each change point with OUTER APPLY TOP 1."""
+    sql = build_difference_function(_customer(), "tsql").sql(dialect="tsql")
+
+    assert "CREATE OR ALTER FUNCTION dCU_Customer(@fromtime" in sql
+    assert "BETWEEN @fromtime AND @totime" in sql
+    assert "OUTER APPLY" in sql
+
+
+def test_build_difference_function_requires_historized_attribute() -> None:
+    """Anchors without historized attributes have no change points."""
+    anchor = Anchor(
+        mnemonic="AC",
+        descriptor="Actor",
+        identity="int",
+        attributes=[Attribute(mnemonic="NAM", descriptor="Name", data_range="int")],
+    )
+
+    with pytest.raises(ValueError, match="no historized attributes"):
+        build_difference_function(anchor, "postgres")
+
+
+# ============================================================================
+# Materialized Latest State Tests
+# ============================================================================
+
+
+def _materialized(warehouse: str | None = "etl_wh") -> Anchor:
+    return _customer().model_copy(
+        update={
+            "materialize": Materialization(target_lag="5 minutes", warehouse=warehouse)
+        }
+    )
+
+
+def test_materialized_latest_snowflake_dynamic_table() -> None:
+    """Snowflake materializes the latest state as a dynamic table."""
+    (ast,) = build_materialized_latest(_materialized(), "snowflake", [_gender()])
+    sql = ast.sql(dialect="snowflake")
+
+    assert sql.startswith(
+        "CREATE OR REPLACE DYNAMIC TABLE mCU_Customer "
+        "TARGET_LAG='5 minutes' WAREHOUSE=etl_wh AS SELECT"
+    )
+    assert "QUALIFY" in sql
+    (refresh,) = build_materialized_refresh(_materialized(), "snowflake")
+    sql = refresh.sql(dialect="snowflake")
+    assert sql == "ALTER DYNAMIC TABLE mCU_Customer REFRESH"
+
+
+def test_materialized_latest_snowflake_requires_warehouse() -> None:
+    """A dynamic table without a warehouse cannot refresh."""
+    with pytest.raises(ValueError, match="dynamic tables require a warehouse"):
+        build_materialized_latest(_materialized(warehouse=None), "snowflake")
+
+
+def test_materialized_latest_postgres_refreshes_concurrently() -> None:
+    """Postgres indexes the identity so refreshes do not block readers."""
+    view, index = build_materialized_latest(_materialized(), "postgres", [_gender()])
+
+    assert view.sql(dialect="postgres").startswith(
+        "CREATE MATERIALIZED VIEW IF NOT EXISTS mCU_Customer AS SELECT"
+    )
+    assert index.sql(dialect="postgres") == (
+        "CREATE UNIQUE INDEX IF NOT EXISTS mCU_Customer_key ON mCU_Customer(CU_ID)"
+    )
+    (refresh,) = build_materialized_refresh(_materialized(), "postgres")
+    assert refresh.sql(dialect="postgres") == (
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY mCU_Customer"
+    )
+
+
+def test_materialized_latest_tsql_snapshot_table() -> None:
+    """SQL Server keeps a snapshot table rebuilt from the latest state."""
+    (ast,) = build_materialized_latest(_materialized(), "tsql", [_gender()])
+    delete, insert = build_materialized_refresh(_materialized(), "tsql", [_gender()])
+
+    assert "CREATE TABLE mCU_Customer" in ast.sql(dialect="tsql")
+    assert "PRIMARY KEY (CU_ID)" in ast.sql(dialect="tsql")
+    assert delete.sql(dialect="tsql") == "DELETE FROM mCU_Customer"
+    assert insert.sql(dialect="tsql").startswith(
+        "INSERT INTO mCU_Customer (CU_ID, CU_COU_Customer_Country, "
+    )
+    assert "OUTER APPLY" in insert.sql(dialect="tsql")
+
+
+# ============================================================================
+# Integration Tests
+# ============================================================================
+
+
+def test_generate_all_views_one_file_per_anchor() -> None:
+    """Every anchor gets a latest view; historized anchors also p/d functions."""
+    spec = Spec(
+        anchors=[
+            _customer(),
+            Anchor(mnemonic="AC", descriptor="Actor", identity="int"),
+        ],
+        knots=[_gender()],
+    )
+
+    result = generate_all_views(spec, "postgres")
+
+    assert list(result.keys()) == [
+        "lAC_Actor.sql",
+        "lCU_Customer.sql",
+        "pCU_Customer.sql",
+        "dCU_Customer.sql",
+    ]
+
+
+def test_generate_all_views_materialized_anchor() -> None:
+    """A materialized anchor adds its m file after the latest view."""
+    spec = Spec(anchors=[_materialized()], knots=[_gender()])
+
+    result = generate_all_views(spec, "postgres")
+
+    assert list(result.keys())[:2] == ["lCU_Customer.sql", "mCU_Customer.sql"]
+    assert result["mCU_Customer.sql"].endswith(
+        "CREATE UNIQUE INDEX IF NOT EXISTS mCU_Customer_key ON mCU_Customer(CU_ID);"
+    )
+
+
+def test_dab_generate_writes_latest_views(tmp_path) -> None:
+    """architect dab generate writes latest views next to the table DDL."""
+    from typer.testing import CliRunner
+
+    from data_architect.cli import app
+
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_text(
+        """
+anchor:
+  - mnemonic: CU
+    descriptor: Customer
+    identity: int
+    attribute:
+      - mnemonic: NAM
+        descriptor: Name
+        timeRange: datetime
+        dataRange: varchar(40)
+"""
+    )
+
+    result = CliRunner().invoke(app, ["dab", "generate", str(spec_path)])
+
+    assert result.exit_code == 0
+    view_file = tmp_path / "output" / "ddl" / "lCU_Customer.sql"
+    assert view_file.exists()
+    assert "DISTINCT ON" in view_file.read_text()
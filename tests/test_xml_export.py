@@ -75,6 +75,30 @@ def test_check_staging_mappings_detected():
     assert "1 staging mapping" in extensions[0]
 
 
+def test_check_nexus_staging_mappings_detected():
+    """Nexus with staging_mappings returns warning."""
+    spec = Spec(
+        anchors=[Anchor(mnemonic="ST", descriptor="Stage", identity="int")],
+        nexuses=[
+            Nexus(
+                mnemonic="EV",
+                descriptor="Event",
+                identity="int",
+                roles=[Role(type_="ST", role="at")],
+                staging_mappings=[
+                    StagingMapping(
+                        system="erp",
+                        tenant="acme",
+                        table="stg_events",
+                        natural_key_columns=["event_id"],
+                    )
+                ],
+            )
+        ],
+    )
+    assert check_yaml_extensions(spec) == ["Nexus 'EV' has 1 staging mapping"]
+
+
 def test_check_staging_column_detected():
     """Attribute with staging_column returns warning."""
     spec = Spec(